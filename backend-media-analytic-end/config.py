@@ -24,9 +24,56 @@ class Config:
     DATABASE_URL: str = "sqlite:///./database/media_analytics.db"
     
     # Crawler settings
-    CRAWL_INTERVAL = 86400  # 1 Day
+    CRAWL_INTERVAL = 86400  # 1 Day (initial per-source interval, then adapted)
+    SOURCE_CRAWL_JITTER = 0.1  # +/- fraction of the interval added at random
+    SOURCE_CRAWL_RETRY_DELAY = 120  # seconds to postpone a source job while another crawl runs
+    SOURCE_JOB_SYNC_INTERVAL = 600  # seconds between syncs of per-source jobs with news_sources
+    CLEANUP_JOB_SYNC_INTERVAL = 600  # seconds between syncs of cleanup jobs with cleanup_schedules
+    SCHEDULER_MAX_WORKERS = 4  # threads shared by scheduled crawl and cleanup jobs
+    SCHEDULER_MISFIRE_GRACE_TIME = 3600  # seconds a missed job (e.g. during a restart) may still run late
     MAX_ARTICLES_PER_SOURCE = 10
+    CRAWL_RUN_TIMEOUT = 1800  # seconds; a crawl stops fetching after this and saves what it has
+    CRAWL_SOURCE_TIMEOUT = 300  # seconds per source before moving on to the next one
+    HTTP_MAX_RETRIES = 3  # retries of a timed-out / 5xx / 429 request
+    HTTP_RETRY_BASE_DELAY = 1.0  # seconds; backoff is random(0, base * 2 ** attempt)
+    HTTP_RETRY_MAX_DELAY = 60  # seconds; cap of one backoff, including Retry-After
+    CIRCUIT_BREAKER_THRESHOLD = 5  # consecutive failed requests before a host is skipped
+    CIRCUIT_BREAKER_COOLDOWN = 300  # seconds a host is skipped before one trial request
+    HTTP_MAX_RESPONSE_BYTES = 5 * 1024 * 1024  # pages/feeds above this size are not downloaded
+    SITEMAP_MAX_BYTES = 50 * 1024 * 1024  # uncompressed size limit of one sitemap (sitemaps.org protocol)
+    SITEMAP_MAX_FILES = 5  # sitemaps read per crawl of a source (an index and its newest children)
+    PARSE_POOL_WORKERS = 0  # processes parsing article pages during crawls (0: inline; e.g. CPU cores - 1)
+    PIPELINE_QUEUE_SIZE = 200  # crawled articles waiting to be saved before crawling blocks
+    PERSIST_BATCH_SIZE = 25  # articles saved per transaction during a crawl
+    PERSIST_FLUSH_SECONDS = 2  # a partial batch is saved after this idle time
+    RATE_LIMIT_REQUESTS_PER_SECOND = 1.0  # per host; sources override via config["rate_limit"]
+    RATE_LIMIT_BURST = 2  # requests a host may get back to back
+    RESPECT_ROBOTS_CRAWL_DELAY = True  # slow a host down to its robots.txt Crawl-delay
+    ROBOTS_MAX_CRAWL_DELAY = 30  # seconds; larger Crawl-delay values are capped
+    ROBOTS_CACHE_TTL = 86400  # seconds a fetched robots.txt is reused
+    ROBOTS_FETCH_TIMEOUT = 10
+    LINK_MAX_TRANSIENT_FAILURES = 3  # timeouts/5xx in a row before an article URL is marked inactive
+    SEARCH_CRAWL_TIMEOUT = 8  # seconds, live fetch budget of /crawler/search-crawl
+    SEARCH_CRAWL_MAX_WORKERS = 8
+    DETECT_TIMEOUT = 8  # seconds, overall deadline of source auto-detection (POST /v1/sources)
+    DETECT_PROBE_TIMEOUT = 5  # seconds per detection request
+    DETECT_MAX_WORKERS = 10  # concurrent detection probes (feed paths, homepage, sitemap, robots.txt)
+    DETECTION_CACHE_TTL = 7 * 86400  # seconds a domain's detection result is reused
+    CRAWL_JOB_WORKERS = 1  # background crawl jobs run one at a time
+    CRAWL_JOB_HISTORY = 50  # finished jobs kept for GET /crawler/jobs
+    CRAWL_JOB_HEARTBEAT_INTERVAL = 2.0  # seconds between job heartbeats / checks for cancellations made on other workers
+    CRAWL_JOB_STALE_AFTER = 60  # seconds without heartbeat before an unfinished job counts as failed (worker died)
+    EVENT_BUS_QUEUE_SIZE = 256  # buffered events per SSE client before dropping the oldest
+    EVENT_RELAY_INTERVAL = 1.0  # seconds between writes/reads of the events shared by API workers
+    EVENT_RELAY_RETENTION = 3600  # seconds relayed events are kept in the database
+    SSE_HEARTBEAT_SECONDS = 15
+    LEADER_ELECTION_ENABLED = True  # only the lease holder runs crawl/cleanup schedulers
+    LEADER_LEASE_TTL = 30  # seconds before a dead leader's lease can be taken over
+    LEADER_RENEW_INTERVAL = 10  # seconds between lease renewals / takeover attempts
     LOG_LEVEL: str = "INFO"
+
+    # Analytics
+    TREND_WINDOW_HOURS = 168  # 7 days of hourly keyword buckets
     
     # News Sources
     NEWS_SOURCES = [
@@ -63,6 +110,8 @@ class Config:
     # Cache
     CACHE_TYPE = 'redis'
     REDIS_URL = 'redis://localhost:6379/0'
+    SEARCH_CACHE_TTL = 300  # seconds
+    SEARCH_CACHE_MAX_ENTRIES = 256
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -6,6 +6,10 @@ from .middleware import log_request
 from ..database.repository import init_db, initialize_hardcoded_sources, get_session
 from ..utils.logger import get_logger
 from ..crawler.hybrid_manager import get_crawler_manager
+from ..crawler.parse_pool import shutdown_parse_pool
+from ..services.trend_engine import get_trend_engine
+from ..utils.leader import get_leader_elector
+from ..utils.event_bus import start_event_relay, stop_event_relay
 from config import config
 import os
 
@@ -48,12 +52,32 @@ async def startup_event():
     finally:
         session.close()
 
+    # Rebuild keyword trend buckets (afterwards caught up from the DB on every trending request)
+    session = get_session()
+    try:
+        get_trend_engine().warm_up(session)
+    except Exception as e:
+        logger.error(f"Failed to warm up trend engine: {e}")
+    finally:
+        session.close()
+
     # Initialize hybrid crawler manager
     logger.info("Initializing hybrid crawler manager...")
     manager = get_crawler_manager()
     manager.initialize_crawler()
+    manager.restore_state()
     logger.info("Hybrid crawler manager initialized")
 
+    # Crawl events are published on the leader; relay them to SSE clients of every worker
+    start_event_relay()
+
+    # The crawl/cleanup scheduler runs only on the worker holding the scheduler lease
+    elector = get_leader_elector()
+    elector.on_elected(manager.become_leader)
+    elector.on_demoted(manager.step_down)
+    elector.on_renewed(manager.apply_saved_state)  # auto crawl changes made through other workers
+    elector.start()
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -63,9 +87,12 @@ async def health_check():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down Media Analytics Backend...")
+    get_leader_elector().stop()
     manager = get_crawler_manager()
     manager.shutdown()
     logger.info("Hybrid crawler manager shut down")
+    shutdown_parse_pool()
+    stop_event_relay()
 
 if __name__ == "__main__":
     import uvicorn
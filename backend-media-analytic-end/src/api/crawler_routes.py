@@ -3,16 +3,26 @@ Hybrid Crawler API Routes
 Provides endpoints for manual and automatic crawling control
 """
 
-from fastapi import APIRouter, HTTPException, Query, Depends, Body
+import asyncio
+import json
+import time
+
+from fastapi import APIRouter, HTTPException, Query, Depends, Body, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime
 
-from ..database.repository import get_session, get_session as get_db_session
-from ..crawler.news_crawler import NewsCrawler
+from config import config
+from ..database.repository import get_session, get_session as get_db_session, get_active_sources, search_articles_indexed, invalidate_detection
+from ..crawler.search_crawler import KeywordSearchCrawler
+from ..crawler.dynamic_crawler import detection_domain
 
 from ..utils.logger import get_logger
 from ..crawler.hybrid_manager import get_crawler_manager
+from ..crawler.jobs import get_job_manager, FINISHED
+from ..crawler.http_client import get_http_client
+from ..utils.event_bus import get_event_bus
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/v1/crawler", tags=["crawler"])
@@ -26,93 +36,264 @@ def get_db():
 
 # Endpoint: Real-time manual crawling sesuai keyword pencarian
 @router.post("/search-crawl")
-async def search_crawl_endpoint(
+def search_crawl_endpoint(
     keyword: str = Body(..., embed=True, description="Keyword/topik pencarian berita"),
+    live: bool = Body(True, embed=True, description="Also fetch fresh matches from the sources"),
+    stream: bool = Body(True, embed=True, description="Stream results as NDJSON"),
+    timeout_seconds: float = Body(config.SEARCH_CRAWL_TIMEOUT, embed=True, gt=0, le=30),
+    limit: int = Body(50, embed=True, ge=1, le=200),
     db: Session = Depends(get_db)
 ):
     """
-    Real-time crawling sesuai keyword/topik pencarian user (manual search)
-    - Melakukan crawling ke semua sumber aktif
-    - Memfilter hasil sesuai keyword
-    - Hasil tidak langsung masuk ke tabel utama artikel, hanya dikembalikan ke frontend
-    - (Opsional) Simpan ke tabel sementara/manual jika ingin history
+    Tiered keyword search (manual search)
+    - Tier 1: stored articles from the full-text index, returned immediately
+    - Tier 2 (live=true): keyword-targeted fetch of active sources (RSS entries
+      first, index-page links for HTML sources) bounded by timeout_seconds
+    - Live hits are not saved to the articles table, only returned to the frontend
+    - limit applies to each tier: at most limit indexed articles and limit live hits
+
+    With stream=true the response is NDJSON: one "indexed" event, one "live"
+    event per source as it finishes, then a "done" event.
     """
+    keyword = keyword.strip()
+    if not keyword:
+        raise HTTPException(status_code=400, detail="Keyword is required")
+
     try:
-        # Inisialisasi NewsCrawler manual (bisa tanpa auto-crawler manager)
-        crawler = NewsCrawler(db_session=db)
-        all_articles = crawler.crawl_all()
-        # Filter hasil sesuai keyword (judul/konten mengandung keyword, case-insensitive)
-        filtered = [
-            a for a in all_articles
-            if keyword.lower() in (a["title"].lower() + " " + (a["content"] or "").lower())
-        ]
-
-        # (Opsional) Simpan ke tabel/manual_search jika ingin history pencarian
-        # Contoh: simpan ke SearchHistory (sudah ada), atau buat tabel baru jika ingin
-        # from ..database.repository import add_search_history
-        # add_search_history(db, keyword)
+        started = time.monotonic()
+        indexed = search_articles_indexed(db, keyword, limit=limit)
+        sources = get_active_sources(db) if live else []
+    except Exception as e:
+        logger.error(f"Error in search-crawl endpoint: {e}")
+        raise HTTPException(status_code=500, detail=f"Search crawl failed: {str(e)}")
 
-        return {
-            "status": "success",
-            "message": f"Crawling manual sesuai keyword '{keyword}' selesai. Ditemukan {len(filtered)} artikel.",
+    def events():
+        yield {"type": "indexed", "keyword": keyword, "articles": indexed, "articles_count": len(indexed)}
+
+        seen_urls = {a["url"] for a in indexed}
+        live_count = 0
+        timed_out = []
+        for result in KeywordSearchCrawler().search(keyword, sources, timeout_seconds, limit=limit):
+            new_articles = [a for a in result["articles"] if a["url"] not in seen_urls]
+            seen_urls.update(a["url"] for a in new_articles)
+            live_count += len(new_articles)
+            if result["timed_out"]:
+                timed_out.append(result["source"])
+            yield {"type": "live", **result, "articles": new_articles}
+
+        yield {
+            "type": "done",
             "keyword": keyword,
-            "articles_count": len(filtered),
-            "articles": filtered,
+            "indexed_count": len(indexed),
+            "live_count": live_count,
+            "sources_checked": len(sources),
+            "timed_out_sources": timed_out,
+            "elapsed_ms": int((time.monotonic() - started) * 1000),
             "timestamp": datetime.utcnow().isoformat()
         }
-    except Exception as e:
-        logger.error(f"Error in search-crawl endpoint: {e}")
-        raise HTTPException(status_code=500, detail=f"Search crawl failed: {str(e)}")
 
+    if stream:
+        return StreamingResponse((json.dumps(event) + "\n" for event in events()),
+                                 media_type="application/x-ndjson")
+
+    articles = []
+    summary = {}
+    for event in events():
+        if event["type"] in ("indexed", "live"):
+            articles.extend(event["articles"])
+        else:
+            summary = event
+
+    return {
+        "status": "success",
+        "message": f"Pencarian keyword '{keyword}' selesai. Ditemukan {len(articles)} artikel.",
+        "keyword": keyword,
+        "articles_count": len(articles),
+        "indexed_count": summary["indexed_count"],
+        "live_count": summary["live_count"],
+        "timed_out_sources": summary["timed_out_sources"],
+        "elapsed_ms": summary["elapsed_ms"],
+        "articles": articles,
+        "timestamp": summary["timestamp"]
+    }
 
-@router.post("/manual-crawl")
-async def manual_crawl_endpoint(db: Session = Depends(get_db)):
+
+@router.post("/manual-crawl", status_code=202)
+def manual_crawl_endpoint():
     """
     Manually trigger crawling via button/API call
     
+    The crawl runs as a background job; poll GET /v1/crawler/jobs/{job_id}
+    for progress, per-source status and the final result.
+
     Returns:
-        - status: success/error
-        - message: operation details
-        - articles_count: number of articles found
-        - crawl_number: sequential crawl number
-        - timestamp: when crawl was performed
+        - job_id: id of the queued crawl job (or of the one already queued/running)
+        - status: job status (queued, or running for an existing job)
+        - coalesced: true if a crawl job was already queued or running and is returned instead
+        - status_url: where to poll the job
+        - timestamp: when the job was queued
     
     Example:
         POST /v1/crawler/manual-crawl
         Response: {
-            "status": "success",
-            "message": "Manual crawl completed. Found 45 articles.",
-            "articles_count": 45,
-            "crawl_number": 5,
+            "job_id": "3f2b9c...",
+            "status": "queued",
+            "coalesced": false,
+            "message": "Manual crawl queued",
+            "status_url": "/v1/crawler/jobs/3f2b9c...",
             "timestamp": "2024-01-19T10:30:00.000000"
         }
     """
     try:
         manager = get_crawler_manager()
-        result = manager.run_manual_crawl()
-        
-        if result.get("status") == "error":
-            raise HTTPException(status_code=500, detail=result.get("message"))
-        
-        return result
+        job = manager.submit_manual_crawl()
+        return {
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "coalesced": job["coalesced"],
+            "message": "Joined the crawl already in progress" if job["coalesced"] else "Manual crawl queued",
+            "status_url": f"/v1/crawler/jobs/{job['job_id']}",
+            "timestamp": job["created_at"]
+        }
         
-    except HTTPException:
-        raise
     except Exception as e:
         logger.error(f"Error in manual crawl endpoint: {e}")
         raise HTTPException(status_code=500, detail=f"Manual crawl failed: {str(e)}")
 
 
+@router.post("/jobs", status_code=202)
+def create_crawl_job_endpoint(
+    kind: str = Body("manual", embed=True, pattern="^manual$", description="Job type")
+):
+    """
+    Queue a crawl job and return immediately
+
+    Returns:
+        Job object (see GET /jobs/{job_id})
+    """
+    try:
+        return get_crawler_manager().submit_manual_crawl()
+    except Exception as e:
+        logger.error(f"Error creating crawl job: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/jobs")
+def list_crawl_jobs_endpoint(limit: int = Query(20, ge=1, le=100)):
+    """List recent crawl jobs, newest first"""
+    try:
+        return {"jobs": get_job_manager().list(limit)}
+    except Exception as e:
+        logger.error(f"Error listing crawl jobs: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/jobs/{job_id}")
+def get_crawl_job_endpoint(job_id: str):
+    """
+    Get progress of a crawl job
+
+    Returns:
+        - status: queued/running/succeeded/failed/cancelled
+        - progress: sources_total, sources_done, percent
+        - sources: per-source status (incl. skipped), articles_count, error and
+          truncated (source time budget spent)
+        - articles_count / inserted_count: totals after saving
+        - result: final crawl result (when finished)
+    """
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Crawl job not found")
+    return job
+
+
+@router.post("/jobs/{job_id}/cancel", status_code=202)
+def cancel_crawl_job_endpoint(job_id: str):
+    """
+    Cancel a queued or running crawl job
+
+    Works on every API worker, whichever worker runs the job: that worker
+    picks up the request within CRAWL_JOB_HEARTBEAT_INTERVAL seconds.
+    A running crawl stops before its next article fetch, skips the remaining
+    sources and still saves the articles collected so far; the job then ends
+    with status "cancelled". Cancelling a job that joined another crawl
+    (coalesced) cancels that shared crawl.
+
+    Returns:
+        The job (cancel_requested: true); 404 if unknown, 409 if already finished
+    """
+    manager = get_job_manager()
+    job = manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Crawl job not found")
+    if job["status"] in FINISHED:
+        raise HTTPException(status_code=409, detail=f"Crawl job already {job['status']}")
+    return manager.cancel(job_id)
+
+
+@router.get("/events")
+async def crawl_events_endpoint(
+    request: Request,
+    topics: Optional[str] = Query(None, description="Comma-separated topics to receive (default: all)")
+):
+    """
+    Server-Sent Events stream of crawl progress and newly saved articles
+
+    Topics:
+        - crawl_started: trigger, sources_total
+        - source_started: trigger, source
+        - source_finished: trigger, source, articles_count, error
+        - articles_saved: trigger, articles_count, inserted_count
+        - article_saved: title, url, source, sentiment, keywords_flagged, crawled_date
+        - crawl_finished / crawl_failed: trigger, articles_count / error
+
+    Each client has a bounded buffer; if it reads too slowly the oldest events
+    are dropped instead of slowing down the crawler. Events of crawls on other
+    API workers (the scheduler leader) arrive through the event relay, up to
+    EVENT_RELAY_INTERVAL seconds late.
+
+    Example:
+        const events = new EventSource("/v1/crawler/events?topics=source_finished,article_saved");
+        events.addEventListener("article_saved", e => console.log(JSON.parse(e.data)));
+    """
+    bus = get_event_bus()
+    subscription = bus.subscribe([t.strip() for t in topics.split(",") if t.strip()] if topics else None)
+
+    async def stream():
+        last_sent = time.monotonic()
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                events = subscription.drain()
+                for event in events:
+                    yield f"id: {event['id']}\nevent: {event['topic']}\ndata: {json.dumps(event['data'])}\n\n"
+                if events:
+                    last_sent = time.monotonic()
+                    continue
+                if time.monotonic() - last_sent >= config.SSE_HEARTBEAT_SECONDS:
+                    yield ": keep-alive\n\n"
+                    last_sent = time.monotonic()
+                await asyncio.sleep(0.25)
+        finally:
+            bus.unsubscribe(subscription)
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
 @router.post("/auto-crawl/start")
-async def start_auto_crawl_endpoint(db: Session = Depends(get_db)):
+def start_auto_crawl_endpoint(response: Response, db: Session = Depends(get_db)):
     """
     Start automatic crawling
     
-    Automatically crawls at configured interval (default: every hour)
+    Schedules one crawl job per active source. Each starts at the configured
+    interval and adapts to how many new articles the source yields
     Can be stopped with /auto-crawl/stop endpoint
     
     Returns:
-        - status: started/already_running/error
+        - status: started/already_running/error, or accepted (202) when this
+          API worker is not the scheduler leader: the request is stored and
+          the leader applies it on its next lease renewal
         - message: operation details
         - interval_seconds: crawling interval
         - timestamp: when operation was performed
@@ -129,15 +310,19 @@ async def start_auto_crawl_endpoint(db: Session = Depends(get_db)):
     try:
         manager = get_crawler_manager()
         result = manager.start_auto_crawling()
+        if result.get("status") == "accepted":
+            response.status_code = 202
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error starting auto crawl: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/auto-crawl/stop")
-async def stop_auto_crawl_endpoint(db: Session = Depends(get_db)):
+def stop_auto_crawl_endpoint(response: Response, db: Session = Depends(get_db)):
     """
     Stop automatic crawling
     
@@ -145,7 +330,9 @@ async def stop_auto_crawl_endpoint(db: Session = Depends(get_db)):
     Can be restarted with /auto-crawl/start endpoint
     
     Returns:
-        - status: stopped/not_running/error
+        - status: stopped/not_running/error, or accepted (202) when this API
+          worker is not the scheduler leader (applied by the leader on its
+          next lease renewal)
         - message: operation details
         - timestamp: when operation was performed
     
@@ -160,34 +347,51 @@ async def stop_auto_crawl_endpoint(db: Session = Depends(get_db)):
     try:
         manager = get_crawler_manager()
         result = manager.stop_auto_crawling()
+        if result.get("status") == "accepted":
+            response.status_code = 202
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error stopping auto crawl: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/auto-crawl/status")
-async def get_auto_crawl_status_endpoint(db: Session = Depends(get_db)):
+def get_auto_crawl_status_endpoint(db: Session = Depends(get_db)):
     """
     Get current status of automatic crawling
     
     Returns:
         - auto_running: whether auto crawling is active
+        - is_leader: whether this API worker holds the scheduler lease
         - interval_seconds: current crawling interval
         - last_crawl_time: timestamp of last crawl
         - total_crawls: total number of crawls performed
         - scheduler_running: whether scheduler is running
+        - crawl_in_progress: whether a crawl (manual or auto) is running now
+        - current_crawl: trigger, job_id, source_id and started_at of the running crawl
+        - source_jobs: per-source schedule (source_id, name, interval_seconds, next_run_time)
+        - cleanup_jobs: cleanup schedules on the same scheduler (schedule_id, interval_minutes, next_run_time)
+        - circuit_breakers: per-host circuit state of hosts that failed recently
         - timestamp: when status was queried
     
+    Never blocks on a running crawl.
+
     Example:
         GET /v1/crawler/auto-crawl/status
         Response: {
             "auto_running": true,
+            "is_leader": true,
             "interval_seconds": 3600,
             "last_crawl_time": "2024-01-19T09:30:00.000000",
             "total_crawls": 5,
             "scheduler_running": true,
+            "crawl_in_progress": false,
+            "current_crawl": null,
+            "source_jobs": [{"source_id": 1, "name": "crawl Detik Lampung", "interval_seconds": 5400,
+                             "next_run_time": "2024-01-19T11:12:40+00:00"}],
             "timestamp": "2024-01-19T10:30:00.000000"
         }
     """
@@ -201,8 +405,58 @@ async def get_auto_crawl_status_endpoint(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/host-metrics")
+def get_host_metrics_endpoint():
+    """
+    Politeness and failure metrics per crawled host (this worker)
+
+    Returns:
+        - rate_limits: per host requests_per_second, burst, crawl_delay (robots.txt),
+          current_wait_seconds, requests, throttled (requests that had to wait)
+          and total_wait_seconds
+        - circuit_breakers: per host state, failures, times_opened, retry_in_seconds
+    """
+    try:
+        client = get_http_client()
+        return {"rate_limits": client.rate_limiter.stats(), "circuit_breakers": client.circuits()}
+    except Exception as e:
+        logger.error(f"Error getting host metrics: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/detection-cache")
+def invalidate_detection_cache_endpoint(
+    url: Optional[str] = Query(None, description="Site URL or domain; omit to clear the whole cache"),
+    db: Session = Depends(get_db)
+):
+    """
+    Forget cached crawl type detection results (feeds, sitemap, link patterns)
+
+    The next add-source, auto crawl or crawl-url request for the domain runs
+    detection again. Use it after a site moved its feed or changed layout.
+
+    Returns:
+        - status: success
+        - domain: invalidated domain (null when the whole cache was cleared)
+        - removed: number of cache entries removed
+    """
+    try:
+        domain = detection_domain(url) if url else None
+        if url and not domain:
+            raise HTTPException(status_code=400, detail=f"Invalid URL: {url}")
+        removed = invalidate_detection(db, domain)
+        logger.info(f"Detection cache invalidated for {domain or 'all domains'}: {removed} entries")
+        return {"status": "success", "domain": domain, "removed": removed}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error invalidating detection cache: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.put("/auto-crawl/interval")
-async def update_crawl_interval_endpoint(
+def update_crawl_interval_endpoint(
+    response: Response,
     interval_seconds: int = Query(..., ge=60, le=86400),
     db: Session = Depends(get_db)
 ):
@@ -211,9 +465,12 @@ async def update_crawl_interval_endpoint(
     
     Parameters:
         - interval_seconds: new interval in seconds (minimum: 60, maximum: 86400)
+          Learned per-source intervals are reset to this value
     
     Returns:
-        - status: success/error
+        - status: success/error, or accepted (202) when this API worker is
+          not the scheduler leader (the leader reschedules its jobs on its
+          next lease renewal)
         - message: operation details
         - new_interval: the updated interval
         - timestamp: when operation was performed
@@ -233,6 +490,8 @@ async def update_crawl_interval_endpoint(
         
         if result.get("status") == "error":
             raise HTTPException(status_code=400, detail=result.get("message"))
+        if result.get("status") == "accepted":
+            response.status_code = 202
         
         return result
         
@@ -244,7 +503,7 @@ async def update_crawl_interval_endpoint(
 
 
 @router.get("/info")
-async def get_crawler_info_endpoint(db: Session = Depends(get_db)):
+def get_crawler_info_endpoint(db: Session = Depends(get_db)):
     """
     Get crawler configuration information
     
@@ -279,10 +538,16 @@ async def get_crawler_info_endpoint(db: Session = Depends(get_db)):
                 "model_path": config.MODEL_PATH
             },
             "available_endpoints": [
-                "POST /manual-crawl - Trigger manual crawl via button",
+                "POST /search-crawl - Keyword search (index first, then live sources)",
+                "POST /manual-crawl - Queue a manual crawl job (button)",
+                "POST /jobs - Queue a crawl job",
+                "GET /jobs - List recent crawl jobs",
+                "GET /jobs/{job_id} - Crawl job progress and result",
+                "GET /events - Server-Sent Events stream of crawl progress",
                 "POST /auto-crawl/start - Start automatic crawling",
                 "POST /auto-crawl/stop - Stop automatic crawling",
                 "GET /auto-crawl/status - Get crawler status",
+                "GET /host-metrics - Rate limiting and circuit breaker state per host",
                 "PUT /auto-crawl/interval - Update crawl interval"
             ]
         }
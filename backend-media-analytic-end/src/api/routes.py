@@ -8,30 +8,25 @@ from ..database.repository import (
     clear_all_search_history, get_active_sources, get_all_sources_including_deleted,
     get_source_by_id, get_favorite_articles_detailed, get_favorite_by_article_id,
     remove_favorite_by_article_id, get_last_crawl_status, get_sources_summary,
-    get_inactive_sources, get_source_health, reactivate_source
+    get_inactive_sources, get_source_health, reactivate_source,
+    get_top_keywords_from_sketches
 )
 from ..database.repository import (
     create_cleanup_schedule, get_cleanup_schedules, delete_cleanup_schedule,
-    run_cleanup_for_schedule, run_due_schedules, cleanup_old_articles
+    update_cleanup_schedule, run_cleanup_for_schedule, cleanup_old_articles
 )
+from ..crawler.hybrid_manager import get_crawler_manager
 from ..database.models import Article, NewsSource, SearchHistory
 from ..database.schemas import NewsSourceCreate, NewsSourceUpdate
 from ..utils.logger import get_logger
+from ..utils.cache import get_search_cache, normalize_search_params
 from typing import List, Optional
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import datetime, date
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/v1")
 
-# Start background cleanup scheduler (poll every 60 seconds)
-try:
-    from ..utils.scheduler import start_scheduler
-    # start scheduler in background when routes module is imported
-    start_scheduler(poll_interval_seconds=60)
-except Exception:
-    logger.exception("Failed to start cleanup scheduler")
-
 def get_db():
     db = get_session()
     try:
@@ -51,18 +46,24 @@ def list_articles(
         if q and q.strip():
             add_search_history(db, q.strip())
 
+        cache = get_search_cache()
+        params = normalize_search_params(q, source)
+        cached = cache.get(params)
+        if cached is not None:
+            return cached
+
         query = db.query(Article)
 
-        if q:
-            like = f"%{q}%"
+        if params["q"]:
+            like = f"%{params['q']}%"
             query = query.filter(
                 (Article.title.ilike(like)) | 
                 (Article.content.ilike(like)) |
                 (Article.keywords_flagged.ilike(like))
             )
 
-        if source:
-            query = query.filter(Article.source == source)
+        if params["source"]:
+            query = query.filter(Article.source == params["source"])
 
         items = query.order_by(Article.crawled_date.desc()).all()
 
@@ -78,6 +79,7 @@ def list_articles(
                 "keywords_flagged": a.keywords_flagged,
             })
 
+        cache.set(params, results)
         return results
 
     except Exception:
@@ -338,7 +340,7 @@ def crawl_custom_url(url: str = Query(...), db: Session = Depends(get_db)):
     """Crawl a custom URL (user-provided) using dynamic crawler"""
     try:
         from ..crawler.dynamic_crawler import DynamicCrawler
-        crawler = DynamicCrawler()
+        crawler = DynamicCrawler(db_session=db)
         articles = crawler.crawl_url(url)
         return {
             "message": f"Crawled {url} successfully. Found {len(articles)} articles.",
@@ -562,6 +564,69 @@ def get_recent_articles_dashboard(limit: int = Query(10, ge=1, le=50)):
         logger.error(f"Error getting recent articles: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# ============= CACHE API =============
+
+@router.get("/cache/stats", response_model=dict)
+def get_cache_stats():
+    """Hit/miss metrics of the search result cache"""
+    try:
+        return get_search_cache().stats()
+    except Exception as e:
+        logger.error(f"Error getting cache stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ============= ANALYTICS API =============
+
+@router.get("/analytics/trending")
+def get_trending_keywords(
+    recent_hours: int = Query(3, ge=1, le=72),
+    limit: int = Query(20, ge=1, le=100),
+    min_count: int = Query(2, ge=1),
+    source: Optional[str] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Get emerging keywords ranked by burst score (z-score of the recent hourly
+    rate against the rest of the sliding window)
+    """
+    try:
+        from ..services.trend_engine import get_trend_engine
+        engine = get_trend_engine()
+        engine.catch_up(db)  # articles saved by crawls on any worker
+        return {
+            "recent_hours": recent_hours,
+            "window_hours": engine.window_hours,
+            "source": source,
+            "keywords": engine.trending(recent_hours=recent_hours, limit=limit, min_count=min_count, source=source),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Error getting trending keywords: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/analytics/top-keywords")
+def get_top_keywords(
+    kind: str = Query("keyword", pattern="^(keyword|entity)$"),
+    source: Optional[str] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    k: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """
+    Approximate top-k keywords or title entities over a date range
+    (default: last 90 days), answered by merging daily per-source sketches
+    """
+    try:
+        if start_date and end_date and start_date > end_date:
+            raise HTTPException(status_code=400, detail="start_date must be before end_date")
+        return get_top_keywords_from_sketches(db, kind=kind, start_day=start_date, end_day=end_date, source=source, k=k)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting top keywords: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/crawler/last-crawl-status")
 def get_last_crawl_status_api(db: Session = Depends(get_db)):
     """Get the status of the last crawl operation"""
@@ -592,11 +657,31 @@ class CleanupScheduleCreate(BaseModel):
     interval_minutes: int = 1440
 
 
+class CleanupScheduleUpdate(BaseModel):
+    name: Optional[str] = None
+    days_threshold: Optional[int] = None
+    interval_minutes: Optional[int] = None
+    active: Optional[bool] = None
+
+
+def _cleanup_schedule_dict(s) -> dict:
+    return {
+        "id": s.id,
+        "name": s.name,
+        "days_threshold": s.days_threshold,
+        "interval_minutes": s.interval_minutes,
+        "last_run": s.last_run.isoformat() if s.last_run else None,
+        "active": s.active,
+        "created_at": s.created_at.isoformat()
+    }
+
+
 @router.post("/cleanup/schedules", response_model=dict)
 def create_cleanup_schedule_endpoint(payload: CleanupScheduleCreate, db: Session = Depends(get_db)):
     """Create a cleanup schedule that will delete articles older than `days_threshold` every `interval_minutes`."""
     try:
         sched = create_cleanup_schedule(db, payload.name, payload.days_threshold, payload.interval_minutes)
+        get_crawler_manager().schedule_cleanup(sched.id, sched.interval_minutes)
         return {
             "id": sched.id,
             "name": sched.name,
@@ -615,15 +700,7 @@ def list_cleanup_schedules(db: Session = Depends(get_db)):
     """List all cleanup schedules"""
     try:
         schedules = get_cleanup_schedules(db)
-        return [{
-            "id": s.id,
-            "name": s.name,
-            "days_threshold": s.days_threshold,
-            "interval_minutes": s.interval_minutes,
-            "last_run": s.last_run.isoformat() if s.last_run else None,
-            "active": s.active,
-            "created_at": s.created_at.isoformat()
-        } for s in schedules]
+        return [_cleanup_schedule_dict(s) for s in schedules]
     except Exception as e:
         logger.error(f"Error listing cleanup schedules: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -636,6 +713,7 @@ def delete_cleanup_schedule_endpoint(schedule_id: int, db: Session = Depends(get
         success = delete_cleanup_schedule(db, schedule_id)
         if not success:
             raise HTTPException(status_code=404, detail="Schedule not found")
+        get_crawler_manager().unschedule_cleanup(schedule_id)
         return {"message": "Schedule deleted", "schedule_id": schedule_id}
     except HTTPException:
         raise
@@ -644,6 +722,26 @@ def delete_cleanup_schedule_endpoint(schedule_id: int, db: Session = Depends(get
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.put("/cleanup/schedules/{schedule_id}", response_model=dict)
+def update_cleanup_schedule_endpoint(schedule_id: int, payload: CleanupScheduleUpdate, db: Session = Depends(get_db)):
+    """Update a cleanup schedule; its job is rescheduled (or removed when deactivated)"""
+    try:
+        sched = update_cleanup_schedule(db, schedule_id, payload.dict(exclude_unset=True))
+        if not sched:
+            raise HTTPException(status_code=404, detail="Schedule not found")
+        manager = get_crawler_manager()
+        if sched.active:
+            manager.schedule_cleanup(sched.id, sched.interval_minutes, sched.last_run)
+        else:
+            manager.unschedule_cleanup(sched.id)
+        return _cleanup_schedule_dict(sched)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating cleanup schedule {schedule_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/cleanup/schedules/{schedule_id}/run", response_model=dict)
 def run_cleanup_schedule_now(schedule_id: int, db: Session = Depends(get_db)):
     """Trigger a specific cleanup schedule immediately"""
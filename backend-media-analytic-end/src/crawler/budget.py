@@ -0,0 +1,81 @@
+"""
+Crawl time budgets and cooperative cancellation
+A CrawlBudget is shared by one crawl run. The crawler checks it before every
+article fetch: once the run deadline or the current source's budget is spent,
+or the run was cancelled, it stops fetching and keeps what it collected.
+HTTP timeouts are also capped to the remaining time.
+"""
+
+import threading
+import time
+from typing import Optional, List
+
+# Reasons a crawl stopped early
+CANCELLED = "cancelled"
+RUN_DEADLINE = "run_deadline"
+SOURCE_BUDGET = "source_budget"
+
+
+class CrawlBudget:
+    """Deadline of a crawl run plus a per-source time budget"""
+
+    def __init__(self, run_seconds: Optional[float] = None, source_seconds: Optional[float] = None,
+                 cancel_event: Optional[threading.Event] = None) -> None:
+        self.started = time.monotonic()
+        self.run_deadline = self.started + run_seconds if run_seconds else None
+        self.source_seconds = source_seconds
+        self.source_deadline: Optional[float] = None
+        self.cancel_events: List[threading.Event] = [cancel_event or threading.Event()]
+        self.stop_reason: Optional[str] = None  # first reason the run stopped early, if any
+
+    def cancel(self) -> None:
+        self.cancel_events[0].set()
+
+    def add_cancel_event(self, event: threading.Event) -> None:
+        """Let another requester (e.g. a coalesced job) cancel this run too"""
+        self.cancel_events.append(event)
+
+    @property
+    def cancelled(self) -> bool:
+        return any(event.is_set() for event in self.cancel_events)
+
+    def start_source(self) -> None:
+        """Start the budget of the next source"""
+        self.source_deadline = time.monotonic() + self.source_seconds if self.source_seconds else None
+
+    def exhausted(self, source_only: bool = False) -> Optional[str]:
+        """
+        Check whether crawling must stop
+
+        Args:
+            source_only: Ignore the per-source budget (used between sources)
+
+        Returns:
+            None to continue, otherwise CANCELLED, RUN_DEADLINE or SOURCE_BUDGET
+        """
+        now = time.monotonic()
+        if self.cancelled:
+            reason = CANCELLED
+        elif self.run_deadline is not None and now >= self.run_deadline:
+            reason = RUN_DEADLINE
+        elif not source_only and self.source_deadline is not None and now >= self.source_deadline:
+            reason = SOURCE_BUDGET
+        else:
+            return None
+        if reason != SOURCE_BUDGET and self.stop_reason is None:
+            self.stop_reason = reason
+        return reason
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the nearest deadline (None = unlimited)"""
+        deadlines = [d for d in (self.run_deadline, self.source_deadline) if d is not None]
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - time.monotonic())
+
+    def timeout(self, default: float, minimum: float = 1.0) -> float:
+        """HTTP timeout for the next request, capped to the remaining time"""
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        return max(minimum, min(default, remaining))
@@ -0,0 +1,180 @@
+"""
+Main content extraction shared by NewsCrawler and DynamicCrawler
+One bottom-up pass over the page (children before parents) gives every
+element its text length, link text length and tag count by adding up its
+children's totals, so no subtree is walked twice.
+
+Scoring follows the paragraph heuristic used by readability tools: each
+paragraph (<p>, <pre>, <blockquote>, <td>, or a <div>/<font>/<section>
+holding only inline content, e.g. text split by <br>) is worth 1 point + 1 per comma + 1 per 100 characters (max 3). Its
+container gets the points and the container's parent half of them. Class
+and id names nudge the score (content/article/isi up, comment/sidebar/
+related down), and the total is scaled by (1 - link density). Pages without
+paragraphs fall back to the block with the highest text density.
+
+Subtrees in SKIP_TAGS (navigation, header, footer, aside, forms, ...) score
+nothing and their text is left out of the extracted content, also when they
+sit inside the chosen block. Inside the block, subtrees whose class/id names
+only match the negative names (inline ads, share buttons, tag lists, ...) are
+left out as well.
+"""
+
+import re
+from typing import Optional, Dict, Tuple
+
+from lxml import etree
+
+from .html_parser import HtmlElement
+
+# Subtrees that never hold article text
+SKIP_TAGS = frozenset({
+    "script", "style", "noscript", "template", "nav", "footer", "header", "aside",
+    "form", "iframe", "svg", "button", "select", "textarea",
+})
+PARAGRAPH_TAGS = frozenset({"p", "pre", "blockquote", "td"})
+BLOCK_TAGS = frozenset({
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "fieldset", "figure",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav",
+    "ol", "p", "pre", "section", "table", "ul",
+})
+DENSITY_TAGS = frozenset({"div", "section", "article", "main"})
+# Containers whose own text counts as a paragraph when they hold no block element
+INLINE_CONTAINER_TAGS = frozenset({"div", "font", "section"})
+
+POSITIVE_NAMES = re.compile(
+    r"article|body|content|entry|hentry|main|post|story|text|isi|detail|read|berita", re.IGNORECASE
+)
+NEGATIVE_NAMES = re.compile(
+    r"comment|komentar|sidebar|footer|related|terkait|share|social|widget|banner|promo|"
+    r"menu|nav|popular|populer|terpopuler|breadcrumb|tags?\b|author|meta|\bads?\b|iklan",
+    re.IGNORECASE,
+)
+CLASS_WEIGHT = 25
+MIN_PARAGRAPH_LENGTH = 25
+
+# Text of a block without noise subtrees: a text node is kept if it has no
+# more noise ancestors (SKIP_TAGS or negative-only class/id names) than the
+# block itself ($outside)
+_REGEXP_NS = {"re": "http://exslt.org/regular-expressions"}
+_NAMES = "concat(@class, ' ', @id)"
+_NOISE_TEST = (
+    " or ".join(f"self::{tag}" for tag in sorted(SKIP_TAGS))
+    + f" or (re:test({_NAMES}, '{NEGATIVE_NAMES.pattern}', 'i')"
+    + f" and not(re:test({_NAMES}, '{POSITIVE_NAMES.pattern}', 'i')))"
+)
+_NOISE_ANCESTORS = etree.XPath(f"count(ancestor-or-self::*[{_NOISE_TEST}])", namespaces=_REGEXP_NS)
+_BLOCK_TEXT_NODES = etree.XPath(
+    f"descendant-or-self::text()[count(ancestor::*[{_NOISE_TEST}]) = $outside]",
+    namespaces=_REGEXP_NS, smart_strings=False,
+)
+
+# Per element: text length, link text length, tag count, own paragraph points,
+# points of paragraph children (handed on to the grandparent), block score
+_Stats = Tuple[int, int, int, float, float, float]
+_EMPTY: _Stats = (0, 0, 1, 0.0, 0.0, 0.0)
+
+
+def _paragraph_points(text_length: int, text: str) -> float:
+    return 1 + text.count(",") + min(text_length / 100, 3)
+
+
+def _class_weight(element: HtmlElement) -> int:
+    names = f"{element.get('class', '')} {element.get('id', '')}"
+    if not names.strip():
+        return 0
+    weight = 0
+    if NEGATIVE_NAMES.search(names):
+        weight -= CLASS_WEIGHT
+    if POSITIVE_NAMES.search(names):
+        weight += CLASS_WEIGHT
+    return weight
+
+
+def _own_text(element: HtmlElement) -> str:
+    """Text directly inside an element (its text and the tails of its children)"""
+    parts = [element.text or ""]
+    parts.extend(child.tail or "" for child in element)
+    return " ".join(part.strip() for part in parts if part and not part.isspace())
+
+
+def find_main_block(root: HtmlElement, min_length: int = 200) -> Optional[HtmlElement]:
+    """
+    Find the element holding the main text of a page
+
+    Args:
+        root: Parsed page (see html_parser.parse_html); it is not modified
+        min_length: Minimum non-link text length of the chosen block
+
+    Returns:
+        The main content element, or None if no block has enough text
+    """
+    stats: Dict[HtmlElement, _Stats] = {}
+    best, best_score = None, 0.0
+    dense, dense_score = None, 0.0
+
+    # Pre-order list reversed: every element comes after all of its descendants
+    for element in reversed(list(root.iter(etree.Element))):
+        tag = element.tag if isinstance(element.tag, str) else ""
+        if tag in SKIP_TAGS:
+            stats[element] = _EMPTY
+            continue
+
+        own = _own_text(element)
+        text = len(own)
+        links = 0
+        tags = 1
+        child_points = 0.0  # paragraphs directly inside
+        grandchild_points = 0.0  # paragraphs one level further down
+        has_block_child = False
+        for child in element.iterchildren(etree.Element):
+            child_text, child_links, child_tags, child_para, child_child_para, _ = stats.get(child, _EMPTY)
+            text += child_text
+            links += child_links
+            tags += child_tags
+            child_points += child_para
+            grandchild_points += child_child_para
+            has_block_child = has_block_child or child.tag in BLOCK_TAGS
+        if tag == "a":
+            links = text
+
+        # Paragraph points go to the container (via child_points) and half to its parent
+        points = 0.0
+        score = child_points + grandchild_points / 2
+        if tag in PARAGRAPH_TAGS and text - links >= MIN_PARAGRAPH_LENGTH:
+            points = _paragraph_points(text, own)
+        elif tag in INLINE_CONTAINER_TAGS and not has_block_child and len(own) >= MIN_PARAGRAPH_LENGTH:
+            # Text split by <br> instead of <p>: the element is its own container
+            score += _paragraph_points(len(own), own)
+        stats[element] = (text, links, tags, points, child_points, score)
+
+        content = text - links
+        if content < min_length:
+            continue
+        link_density = links / text if text else 1.0
+        if score > 0:
+            score = (score + _class_weight(element)) * (1 - link_density)
+            if score > best_score:
+                best, best_score = element, score
+        if tag in DENSITY_TAGS and tags > 1 and content / tags > dense_score:
+            dense, dense_score = element, content / tags
+
+    return best if best is not None else dense
+
+
+def extract_main_content(root: HtmlElement, min_length: int = 200) -> Optional[str]:
+    """
+    Text of the main content block of a page
+
+    Args:
+        root: Parsed page
+        min_length: Minimum non-link text length of the block
+
+    Returns:
+        The block's visible text without noise subtrees, or None if the page
+        has no such block
+    """
+    block = find_main_block(root, min_length)
+    if block is None:
+        return None
+    parts = (text.strip() for text in _BLOCK_TEXT_NODES(block, outside=_NOISE_ANCESTORS(block)))
+    return " ".join(part for part in parts if part) or None
@@ -5,19 +5,74 @@ Falls back to RSS/Sitemap if detected
 """
 
 import re
+import time
 import feedparser
-from typing import Optional, List, Dict, Any
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from functools import partial
+from typing import Optional, List, Dict, Any, Callable
 from urllib.parse import urljoin, urlparse
 from datetime import datetime
 
 import requests
-from bs4 import BeautifulSoup, NavigableString
+from lxml import etree
+from sqlalchemy.orm import Session
 
 from config import config
 from ..utils.logger import get_logger
+from ..database.repository import get_detection, save_detection, save_link_patterns
+from .robots import get_robots_cache
+from .http_client import HTML_CONTENT_TYPES, content_type, read_body
+from .html_parser import HtmlElement, HtmlFeed, parse_html, anchors, drop, select, select_one, text_of
+from .content_extractor import extract_main_content
 
 logger = get_logger(__name__)
 
+_NON_CONTENT_TAGS = etree.XPath("//script | //style | //nav | //footer | //header")
+_LINK_NOISE_TAGS = etree.XPath("//script | //style | //nav | //footer | //header | //aside")
+# Containers whose class/id looks like navigation, ads or widgets
+_NOISE_CONTAINERS = etree.XPath(
+    "//*[re:test(@class, $classes, 'i') or re:test(@id, $ids, 'i')]",
+    namespaces={"re": "http://exslt.org/regular-expressions"},
+)
+_NOISE_CLASSES = (
+    r'(sidebar|footer|header|nav|menu|breadcrumb|comment|related|'
+    r'advertisement|ads|social|widget|slide|banner|popover|modal|'
+    r'pagination|pager|next-|prev-|share-|follow-|subscribe-)'
+)
+_NOISE_IDS = r'(sidebar|footer|header|nav|menu|ads|comment|related|social)'
+
+# Common RSS feed paths, probed concurrently by detect_crawl_type
+_FEED_PATHS = ('/rss', '/rss.xml', '/feed', '/feed.xml', '/feeds', '/feeds/rss', '/index.php/rss')
+_FEED_PROBES = tuple(f"rss:{path}" for path in _FEED_PATHS)
+_FEED_TYPES = ("rss", "atom", "xml")
+_FEED_ROOTS = re.compile(rb"<(rss|feed|rdf:RDF)[\s>]")
+
+
+def looks_like_feed(media_type: str, head: bytes) -> bool:
+    """
+    Whether a response is an RSS/Atom feed, from its Content-Type and first bytes
+
+    A site that answers every path with its homepage (200, text/html) is not a feed.
+    """
+    if _FEED_ROOTS.search(head):
+        return True
+    return any(kind in media_type for kind in _FEED_TYPES) and b"<html" not in head.lower()
+
+
+def detection_domain(url: str) -> str:
+    """Detection cache key of a URL: its host, lowercased, without "www." """
+    host = urlparse(url if '//' in url else 'https://' + url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def article_link_pattern(url: str) -> Optional[str]:
+    """Section prefix of an article URL ("/berita/"); None for top-level or date-first paths"""
+    segments = [segment for segment in urlparse(url).path.split('/') if segment]
+    if len(segments) < 2 or segments[0].isdigit():
+        return None
+    return f"/{segments[0].lower()}/"
+
 
 class DynamicCrawler:
     """
@@ -26,8 +81,9 @@ class DynamicCrawler:
     Automatically detects RSS feeds and sitemaps
     """
 
-    def __init__(self, max_articles: Optional[int] = None) -> None:
+    def __init__(self, max_articles: Optional[int] = None, db_session: Optional[Session] = None) -> None:
         self.max_articles = max_articles or config.MAX_ARTICLES_PER_SOURCE
+        self.db_session = db_session  # enables the per-domain detection cache
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
         }
@@ -61,78 +117,183 @@ class DynamicCrawler:
             "viber.com", "line.me", "kakao.com", "wa.me", "whatsa",
         ]
 
-    def detect_crawl_type(self, url: str) -> Dict[str, Any]:
+    def detect_crawl_type(self, url: str, timeout: Optional[float] = None, use_cache: bool = True) -> Dict[str, Any]:
         """
         Detect the best crawling method for a URL
         Priority: RSS Feed > Sitemap > HTML Structure Analysis
-        Returns: {'type': 'rss'|'sitemap'|'html', 'config': {...}}
+
+        All probes (common feed paths, homepage <link> tags, sitemap.xml,
+        robots.txt) run concurrently under one deadline; the first confirmed
+        feed wins and the remaining probes are abandoned. With a db_session the
+        result is cached per domain (DETECTION_CACHE_TTL); a detection cut
+        short by the deadline is not cached.
+
+        Args:
+            url: Site URL
+            timeout: Overall detection deadline in seconds (default DETECT_TIMEOUT)
+            use_cache: Reuse a cached result of the domain
+
+        Returns: {'type': 'rss'|'sitemap'|'html', 'config': {...}, 'detected': bool, 'cached': bool}
         """
+        cached = self._cached_detection(url) if use_cache else None
+        if cached:
+            logger.info(f"Using cached detection for {url}: {cached['crawl_type']}")
+            return self._detection_result(url, cached['crawl_type'], cached['feed_urls'], cached['sitemap_url'],
+                                          cached=True)
         try:
-            # Check for RSS feeds in common locations
-            rss_feeds = self._detect_rss_feeds(url)
+            deadline = time.monotonic() + (timeout or config.DETECT_TIMEOUT)
+            probes = {**self._feed_probes(url, deadline), **self._sitemap_probes(url, deadline)}
+            results = self._run_probes(probes, deadline, stop=lambda name, found: name in _FEED_PROBES and found)
+
+            rss_feeds = self._collect_feeds(results)
+            sitemap_url = results.get("sitemap") or results.get("robots")
             if rss_feeds:
+                crawl_type = 'rss'
                 logger.info(f"Detected RSS feed at {url}: {rss_feeds[0]}")
-                return {
-                    'type': 'rss',
-                    'config': {'rss_url': rss_feeds[0]},
-                    'detected': True
-                }
-
-            # Check for sitemap
-            sitemap_url = self._detect_sitemap(url)
-            if sitemap_url:
+            elif sitemap_url:
+                # Check for sitemap
+                crawl_type = 'sitemap'
                 logger.info(f"Detected Sitemap at {url}: {sitemap_url}")
-                return {
-                    'type': 'sitemap',
-                    'config': {'sitemap_url': sitemap_url},
-                    'detected': True
-                }
-
-            # Fallback to HTML structure analysis
-            logger.info(f"Using heuristic HTML crawling for {url}")
-            return {
-                'type': 'html',
-                'config': {'base_url': url},
-                'detected': False
-            }
+            else:
+                # Fallback to HTML structure analysis
+                crawl_type = 'html'
+                logger.info(f"Using heuristic HTML crawling for {url}")
+
+            if rss_feeds or len(results) == len(probes):
+                self._cache_detection(url, crawl_type, rss_feeds, sitemap_url)
+            return self._detection_result(url, crawl_type, rss_feeds, sitemap_url)
         except Exception as e:
             logger.error(f"Error detecting crawl type for {url}: {e}")
-            return {
-                'type': 'html',
-                'config': {'base_url': url},
-                'detected': False
-            }
+            return self._detection_result(url, 'html', [], None)
+
+    @staticmethod
+    def _detection_result(url: str, crawl_type: str, feed_urls: List[str], sitemap_url: Optional[str],
+                          cached: bool = False) -> Dict[str, Any]:
+        if crawl_type == 'rss' and feed_urls:
+            return {'type': 'rss', 'config': {'rss_url': feed_urls[0]}, 'detected': True, 'cached': cached}
+        if crawl_type == 'sitemap' and sitemap_url:
+            return {'type': 'sitemap', 'config': {'sitemap_url': sitemap_url}, 'detected': True, 'cached': cached}
+        return {'type': 'html', 'config': {'base_url': url}, 'detected': False, 'cached': cached}
+
+    def _cached_detection(self, url: str) -> Optional[Dict[str, Any]]:
+        """Cached detection of the URL's domain (None without a db_session)"""
+        if not self.db_session:
+            return None
+        try:
+            return get_detection(self.db_session, detection_domain(url))
+        except Exception as e:
+            logger.warning(f"Could not read detection cache for {url}: {e}")
+            return None
+
+    def _cache_detection(self, url: str, crawl_type: str, feed_urls: List[str], sitemap_url: Optional[str]) -> None:
+        if self.db_session:
+            save_detection(self.db_session, detection_domain(url), crawl_type, feed_urls, sitemap_url)
 
     def _detect_rss_feeds(self, url: str) -> List[str]:
         """
-        Detect RSS feeds by checking common paths and HTML meta tags
+        Detect RSS feeds by checking common paths and HTML meta tags (concurrently)
         """
-        rss_urls = []
+        cached = self._cached_detection(url)
+        if cached:
+            return cached['feed_urls']
+        deadline = time.monotonic() + config.DETECT_TIMEOUT
+        return self._collect_feeds(self._run_probes(self._feed_probes(url, deadline), deadline))
+
+    def _detect_sitemap(self, url: str) -> Optional[str]:
+        """
+        Detect sitemap.xml location (/sitemap.xml, else the Sitemap lines of robots.txt)
+        """
+        deadline = time.monotonic() + config.DETECT_TIMEOUT
+        results = self._run_probes(self._sitemap_probes(url, deadline), deadline)
+        return results.get("sitemap") or results.get("robots")
+
+    def _feed_probes(self, url: str, deadline: float) -> Dict[str, Callable[[], Any]]:
+        """Probe per common feed path (confirmed feed URL or None) and the homepage's feed links"""
+        base_domain = self._get_base_domain(url)
+        probes: Dict[str, Callable[[], Any]] = {
+            f"rss:{path}": partial(self._probe_feed, base_domain + path, deadline) for path in _FEED_PATHS
+        }
+        probes["homepage"] = partial(self._homepage_feeds, url, deadline)
+        return probes
+
+    def _sitemap_probes(self, url: str, deadline: float) -> Dict[str, Callable[[], Any]]:
         base_domain = self._get_base_domain(url)
 
-        # Common RSS feed paths
-        common_paths = [
-            '/rss',
-            '/rss.xml',
-            '/feed',
-            '/feed.xml',
-            '/feeds',
-            '/feeds/rss',
-            '/index.php/rss',
-        ]
+        def robots_sitemap() -> Optional[str]:
+            # robots.txt is cached and shared with the rate limiter
+            for sitemap in get_robots_cache().get(base_domain).sitemaps:
+                if time.monotonic() >= deadline:
+                    return None
+                if self._url_exists(sitemap, self._probe_timeout(deadline)):
+                    return sitemap
+            return None
 
-        for path in common_paths:
-            test_url = base_domain + path
-            if self._url_exists(test_url):
-                rss_urls.append(test_url)
+        return {
+            "sitemap": partial(self._probe_url, base_domain + '/sitemap.xml', deadline),
+            "robots": robots_sitemap,
+        }
 
-        # Check for RSS links in HTML meta tags
+    def _run_probes(self, probes: Dict[str, Callable[[], Any]], deadline: float,
+                    stop: Optional[Callable[[str, Any], bool]] = None) -> Dict[str, Any]:
+        """
+        Run probes concurrently until all finish, stop(name, result) is true, or the deadline
+
+        Returns:
+            Results of the finished probes by name (None for probes that failed)
+        """
+        results: Dict[str, Any] = {}
+        executor = ThreadPoolExecutor(max_workers=min(config.DETECT_MAX_WORKERS, len(probes)))
+        futures = {executor.submit(probe): name for name, probe in probes.items()}
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            for future in as_completed(futures, timeout=max(deadline - time.monotonic(), 0)):
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    logger.debug(f"Detection probe {name} failed: {e}")
+                    results[name] = None
+                if stop and stop(name, results[name]):
+                    break
+        except FuturesTimeoutError:
+            logger.info(f"Detection deadline reached with {len(futures) - len(results)} probe(s) pending")
+        finally:
+            # Probes still running end on their own (their timeouts stop at the deadline)
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results
+
+    @staticmethod
+    def _collect_feeds(results: Dict[str, Any]) -> List[str]:
+        """Feeds found by the probes: common paths in order, then homepage links (up to 3)"""
+        rss_urls = [results[name] for name in _FEED_PROBES if results.get(name)]
+        for full_url in results.get("homepage") or []:
+            if full_url not in rss_urls:
+                rss_urls.append(full_url)
+        return rss_urls[:3]  # Return up to 3 feeds
+
+    @staticmethod
+    def _probe_timeout(deadline: float) -> float:
+        timeout = min(config.DETECT_PROBE_TIMEOUT, deadline - time.monotonic())
+        if timeout <= 0:
+            raise TimeoutError("Detection deadline reached")
+        return timeout
+
+    def _probe_feed(self, url: str, deadline: float) -> Optional[str]:
+        """url if it serves a feed (one GET, only the first bytes are read)"""
+        with requests.get(url, headers=self.headers, timeout=self._probe_timeout(deadline),
+                          stream=True) as response:
+            if response.status_code >= 400:
+                return None
+            head = next(response.iter_content(1024), b"")
+            return url if looks_like_feed(content_type(response), head) else None
+
+    def _homepage_feeds(self, url: str, deadline: float) -> List[str]:
+        """Feed URLs advertised by <link rel="alternate"> / <link rel="feed"> on the page"""
+        rss_urls = []
+        try:
+            root = self._fetch_html(url, timeout=self._probe_timeout(deadline))
 
             # Look for RSS/Atom links
-            for link in soup.find_all('link', {'rel': ['alternate', 'feed']}):
+            for link in select(root, 'link[rel~=alternate], link[rel~=feed]'):
                 href = link.get('href')
                 if href and ('rss' in href.lower() or 'feed' in href.lower() or 'atom' in href.lower()):
                     full_url = urljoin(url, href)
@@ -140,48 +301,36 @@ class DynamicCrawler:
                         rss_urls.append(full_url)
         except Exception as e:
             logger.warning(f"Could not parse HTML for RSS detection at {url}: {e}")
+        return rss_urls
 
-        return rss_urls[:3]  # Return up to 3 feeds
-
-    def _detect_sitemap(self, url: str) -> Optional[str]:
-        """
-        Detect sitemap.xml location
-        """
-        base_domain = self._get_base_domain(url)
-        sitemap_url = base_domain + '/sitemap.xml'
-
-        if self._url_exists(sitemap_url):
-            return sitemap_url
-
-        # Check robots.txt for sitemap location
-        try:
-            robots_url = base_domain + '/robots.txt'
-            response = requests.get(robots_url, headers=self.headers, timeout=10)
-            for line in response.text.split('\n'):
-                if line.lower().startswith('sitemap:'):
-                    sitemap = line.split(':', 1)[1].strip()
-                    if self._url_exists(sitemap):
-                        return sitemap
-        except Exception as e:
-            logger.debug(f"Could not check robots.txt: {e}")
+    def _probe_url(self, url: str, deadline: float) -> Optional[str]:
+        return url if self._url_exists(url, self._probe_timeout(deadline)) else None
 
-        return None
-
-    def _url_exists(self, url: str) -> bool:
+    def _url_exists(self, url: str, timeout: float = 5) -> bool:
         """
         Check if a URL is accessible
         """
         try:
-            response = requests.head(url, headers=self.headers, timeout=5, allow_redirects=True)
+            response = requests.head(url, headers=self.headers, timeout=timeout, allow_redirects=True)
             return response.status_code < 400
         except Exception:
-            # Try GET if HEAD fails
+            # Try GET if HEAD fails (status only, the body is not downloaded)
             try:
-                response = requests.get(url, headers=self.headers, timeout=5)
-                return response.status_code < 400
+                with requests.get(url, headers=self.headers, timeout=timeout, stream=True) as response:
+                    return response.status_code < 400
             except Exception:
                 return False
 
+    def _fetch_html(self, url: str, timeout: float) -> HtmlElement:
+        """
+        GET an HTML page, parsing it while it downloads (type and size checked, see read_body)
+        """
+        with requests.get(url, headers=self.headers, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            feed = HtmlFeed()
+            read_body(response, content_types=HTML_CONTENT_TYPES, on_chunk=feed.feed)
+            return feed.close()
+
     def _get_base_domain(self, url: str) -> str:
         """
         Extract base domain from URL
@@ -248,15 +397,18 @@ class DynamicCrawler:
         """
         articles = []
         try:
-            response = requests.get(base_url, headers=self.headers, timeout=15)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            root = self._fetch_html(base_url, timeout=15)
         except Exception as e:
             logger.error(f"Error fetching {base_url}: {e}")
             return articles
 
         # Find potential article links using heuristics
-        article_links = self._find_article_links(soup, base_url)
+        article_links = self._find_article_links(root, base_url)
+        cached = self._cached_detection(base_url)
+        learned = cached['link_patterns'] if cached else []
+        if learned:
+            # Sections that yielded articles before are fetched first (stable: ranking kept within groups)
+            article_links.sort(key=lambda link: article_link_pattern(link['url']) not in learned)
 
         seen_urls = set()
         for link_data in article_links[:self.max_articles]:
@@ -281,9 +433,20 @@ class DynamicCrawler:
             })
 
         logger.info(f"Found {len(articles)} articles at {base_url}")
+        if cached is not None and articles:
+            self._learn_link_patterns(base_url, articles, learned)
         return articles
 
-    def _find_article_links(self, soup: BeautifulSoup, base_url: str) -> List[Dict[str, Any]]:
+    def _learn_link_patterns(self, base_url: str, articles: List[Dict[str, Any]], learned: List[str]) -> None:
+        """Remember the URL sections of extracted articles for the domain (newest counts first, up to 5)"""
+        counts = Counter(article_link_pattern(article['url']) for article in articles)
+        counts.pop(None, None)
+        patterns = [pattern for pattern, _ in counts.most_common()]
+        patterns = (patterns + [pattern for pattern in learned if pattern not in counts])[:5]
+        if patterns != learned:
+            save_link_patterns(self.db_session, detection_domain(base_url), patterns)
+
+    def _find_article_links(self, root: HtmlElement, base_url: str) -> List[Dict[str, Any]]:
         """
         Use heuristics to find article links on a page
         Looks for common patterns and link density
@@ -293,32 +456,13 @@ class DynamicCrawler:
         article_links = []
 
         # Remove script, style, and navigation elements
-        for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside']):
-            element.decompose()
-
-        # Remove common non-article containers with expanded patterns
-        exclude_patterns = re.compile(
-            r'(sidebar|footer|header|nav|menu|breadcrumb|comment|related|'
-            r'advertisement|ads|social|widget|slide|banner|popover|modal|'
-            r'pagination|pager|next-|prev-|share-|follow-|subscribe-)',
-            re.IGNORECASE
-        )
-        
-        for container in soup.find_all(class_=exclude_patterns):
-            container.decompose()
+        drop(_LINK_NOISE_TAGS(root))
 
-        # Also remove by id patterns
-        exclude_id_patterns = re.compile(
-            r'(sidebar|footer|header|nav|menu|ads|comment|related|social)',
-            re.IGNORECASE
-        )
-        for container in soup.find_all(id=exclude_id_patterns):
-            container.decompose()
+        # Remove common non-article containers (by class or id pattern)
+        drop(_NOISE_CONTAINERS(root, classes=_NOISE_CLASSES, ids=_NOISE_IDS))
 
         # Find all anchor tags
-        all_links = soup.find_all('a', href=True)
-
-        for link in all_links:
+        for link in anchors(root):
             href = link.get('href', '').strip()
             if not href:
                 continue
@@ -328,13 +472,13 @@ class DynamicCrawler:
                 full_url = urljoin(base_url, href)
 
                 # Extract title heuristics
-                title = link.get_text(strip=True)
+                title = text_of(link)
 
                 # If title is too short, try parent heading elements
                 if len(title) < 10:
-                    parent = link.find_parent(['h1', 'h2', 'h3', 'h4'])
-                    if parent:
-                        title = parent.get_text(strip=True)
+                    parent = next(link.iterancestors('h1', 'h2', 'h3', 'h4'), None)
+                    if parent is not None:
+                        title = text_of(parent)
 
                 # Filter out very short titles and obvious non-article text
                 if len(title) > 10 and not self._is_navigation_text(title):
@@ -503,16 +647,13 @@ class DynamicCrawler:
     def _fetch_article_content(self, url: str, timeout: int = 10) -> Optional[str]:
         """
         Fetch and extract main content from an article URL
-        Uses DOM density heuristic and common content selectors
+        Uses common content selectors, then main content block scoring
         """
         try:
-            response = requests.get(url, headers=self.headers, timeout=timeout)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            root = self._fetch_html(url, timeout=timeout)
 
             # Remove non-content elements
-            for element in soup(['script', 'style', 'nav', 'footer', 'header', '.sidebar', '.ads', '.advertisement']):
-                element.decompose()
+            drop(_NON_CONTENT_TAGS(root))
 
             # Try common content selectors first
             content_selectors = [
@@ -535,15 +676,15 @@ class DynamicCrawler:
 
             content = None
             for selector in content_selectors:
-                element = soup.select_one(selector)
-                if element:
-                    content = element.get_text(' ', strip=True)
+                element = select_one(root, selector)
+                if element is not None:
+                    content = text_of(element, ' ')
                     if len(content) > 200:
                         return content[:5000]  # Limit content length
 
-            # Fallback: Use DOM density heuristic
+            # Fallback: main content block (paragraph scoring / text density)
             if not content or len(content) < 200:
-                content = self._extract_by_dom_density(soup)
+                content = extract_main_content(root)
 
             return content[:5000] if content else None
 
@@ -551,39 +692,11 @@ class DynamicCrawler:
             logger.warning(f"Error fetching content from {url}: {e}")
             return None
 
-    def _extract_by_dom_density(self, soup: BeautifulSoup) -> Optional[str]:
-        """
-        Extract main content using DOM density analysis
-        Find the element with highest text-to-tag ratio
-        """
-        best_element = None
-        best_score = 0
-
-        for element in soup.find_all(['div', 'section', 'article', 'main']):
-            text_length = len(element.get_text())
-            tag_count = len(element.find_all())
-
-            if tag_count == 0:
-                continue
-
-            # DOM density = text length / number of tags
-            density = text_length / (tag_count + 1)
-
-            if density > best_score and text_length > 200:
-                best_score = density
-                best_element = element
-
-        if best_element:
-            return best_element.get_text(' ', strip=True)[:5000]
-
-        return None
-
     def _clean_html(self, html_text: str) -> str:
         """
         Remove HTML tags from text
         """
-        soup = BeautifulSoup(html_text, 'html.parser')
-        return soup.get_text(' ', strip=True)
+        return text_of(parse_html(html_text), ' ')
 
     def _extract_domain_name(self, url: str) -> str:
         """
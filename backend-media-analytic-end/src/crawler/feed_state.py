@@ -0,0 +1,89 @@
+"""
+Per-feed high-water marks for incremental RSS crawling
+A feed keeps the newest publish time it has been processed up to and the
+GUIDs of the entries already handled. Entries at or below the mark, or with a
+known GUID, are skipped, so re-crawling an unchanged feed fetches no article
+pages. The GUID set also covers feeds without dates and entries sharing the
+mark's timestamp.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional, List, Any, Iterable
+
+# GUIDs kept per feed; feeds list 10-100 entries, so this spans many crawls
+MAX_SEEN_GUIDS = 500
+
+
+@dataclass
+class FeedState:
+    """High-water mark of one feed (NewsSource.feed_high_water_mark / feed_seen_guids)"""
+    high_water_mark: Optional[datetime] = None
+    seen_guids: List[str] = field(default_factory=list)
+
+
+def entry_guid(entry: Any) -> Optional[str]:
+    """Stable id of a feedparser entry: <guid>/<id>, else its link"""
+    return entry.get("id") or entry.get("link")
+
+
+def entry_published(entry: Any) -> Optional[datetime]:
+    """Publish (or update) time of a feedparser entry as naive UTC"""
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    if not parsed:
+        return None
+    try:
+        return datetime(*parsed[:6])
+    except (TypeError, ValueError):
+        return None
+
+
+def new_entries(entries: Iterable[Any], state: Optional[FeedState]) -> List[Any]:
+    """
+    Entries not processed yet (feed order kept)
+
+    Args:
+        entries: feedparser entries
+        state: The feed's state; None processes every entry
+    """
+    entries = list(entries)
+    if state is None:
+        return entries
+    seen = set(state.seen_guids)
+    fresh = []
+    for entry in entries:
+        if entry_guid(entry) in seen:
+            continue
+        published = entry_published(entry)
+        if published is not None and state.high_water_mark is not None and published <= state.high_water_mark:
+            continue
+        fresh.append(entry)
+    return fresh
+
+
+def advance(state: Optional[FeedState], processed: List[Any], complete: bool) -> FeedState:
+    """
+    State after a crawl
+
+    Args:
+        state: State before the crawl
+        processed: New entries that were handled (stored or rejected)
+        complete: Every new entry was handled; if the crawl stopped early
+            (article limit, time budget) the mark stays put and only the
+            handled GUIDs are remembered, so the rest is picked up next time
+
+    Returns:
+        The new state
+    """
+    state = state or FeedState()
+    mark = state.high_water_mark
+    if complete:
+        for entry in processed:
+            published = entry_published(entry)
+            if published is not None and (mark is None or published > mark):
+                mark = published
+
+    guids = [guid for guid in (entry_guid(entry) for entry in processed) if guid]
+    known = set(guids)
+    seen = guids + [guid for guid in state.seen_guids if guid not in known]
+    return FeedState(high_water_mark=mark, seen_guids=seen[:MAX_SEEN_GUIDS])
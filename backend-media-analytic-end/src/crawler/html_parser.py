@@ -0,0 +1,240 @@
+"""
+HTML parsing fast path
+Pages are parsed with lxml (libxml2, C) instead of BeautifulSoup's pure-Python
+html.parser. Lookups the crawlers run on every page (anchors, <article>
+blocks, text extraction) are precompiled XPath expressions; CSS selectors from
+code or source configs are translated to XPath once and cached. HtmlFeed
+parses a page chunk by chunk while it is being downloaded.
+
+CSS translation uses cssselect when it is installed; otherwise a built-in
+translator covers the selector subset the crawlers use: tag, *, .class, #id,
+[attr], [attr=v], [attr~=v], [attr^=v], [attr$=v], [attr*=v], descendant and
+child combinators, and comma-separated groups.
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional, List, Union
+
+from lxml import etree, html as lxml_html
+
+try:
+    from cssselect import HTMLTranslator as _CssTranslator
+except ImportError:  # optional
+    _CssTranslator = None
+
+HtmlElement = lxml_html.HtmlElement
+
+# Hot lookups, compiled once
+_ANCHORS = etree.XPath("descendant-or-self::a[@href]")
+_FIRST_ANCHOR = etree.XPath("(descendant::a[@href])[1]")
+_TEXT_NODES = etree.XPath(
+    "descendant-or-self::text()[not(ancestor::script or ancestor::style or ancestor::template)]",
+    smart_strings=False,
+)
+
+
+def parse_html(markup: Union[str, bytes]) -> HtmlElement:
+    """
+    Parse an HTML page
+
+    Args:
+        markup: Page as bytes (preferred: lxml reads the <meta charset>) or text
+
+    Returns:
+        Root element (an empty <html> for empty or unparsable input)
+    """
+    if not markup or not markup.strip():
+        return lxml_html.Element("html")
+    try:
+        return lxml_html.document_fromstring(markup)
+    except ValueError:
+        # str with an XML encoding declaration
+        return lxml_html.document_fromstring(markup.encode("utf-8"))
+    except etree.ParserError:
+        return lxml_html.Element("html")
+
+
+class HtmlFeed:
+    """
+    Incremental parse_html: feed() the body chunks as they arrive, close() for the root
+
+    Gives the same tree as parse_html on the joined bytes, without holding the
+    whole page and its tree in memory at once.
+    """
+
+    def __init__(self) -> None:
+        self._parser = lxml_html.HTMLParser()
+        self._empty = True
+
+    def feed(self, chunk: bytes) -> None:
+        if chunk:
+            self._parser.feed(chunk)
+            self._empty = self._empty and not chunk.strip()
+
+    def close(self) -> HtmlElement:
+        """Root element (an empty <html> for empty or unparsable input)"""
+        try:
+            root = self._parser.close()
+        except (etree.ParserError, etree.XMLSyntaxError):
+            return lxml_html.Element("html")
+        return lxml_html.Element("html") if self._empty or root is None else root
+
+
+def anchors(node: HtmlElement) -> List[HtmlElement]:
+    """All <a href> elements in a node (document order)"""
+    return _ANCHORS(node)
+
+
+def first_anchor(node: HtmlElement) -> Optional[HtmlElement]:
+    """First <a href> inside a node (BeautifulSoup's node.find("a", href=True))"""
+    found = _FIRST_ANCHOR(node)
+    return found[0] if found else None
+
+
+def text_of(node: HtmlElement, separator: str = "") -> str:
+    """
+    Visible text of a node, like BeautifulSoup's get_text(separator, strip=True)
+
+    Script, style and template contents and comments are left out.
+    """
+    parts = (text.strip() for text in _TEXT_NODES(node))
+    return separator.join(part for part in parts if part)
+
+
+def drop(nodes: List[HtmlElement]) -> None:
+    """Remove elements with their subtrees (the text following them is kept)"""
+    for node in nodes:
+        if node.getparent() is not None:
+            node.drop_tree()
+
+
+def select(node: HtmlElement, selector: str) -> List[HtmlElement]:
+    """Elements matching a CSS selector, searched below (and including) node"""
+    return compile_selector(selector)(node)
+
+
+def select_one(node: HtmlElement, selector: str) -> Optional[HtmlElement]:
+    found = select(node, selector)
+    return found[0] if found else None
+
+
+@lru_cache(maxsize=256)
+def compile_selector(selector: str) -> etree.XPath:
+    """
+    Translate a CSS selector to a compiled XPath (cached)
+
+    Raises:
+        ValueError: The selector is not supported
+    """
+    if _CssTranslator is not None:
+        try:
+            return etree.XPath(_CssTranslator().css_to_xpath(selector))
+        except Exception as e:
+            raise ValueError(f"Unsupported CSS selector {selector!r}: {e}") from None
+    return etree.XPath(css_to_xpath(selector))
+
+
+# --- Built-in CSS -> XPath translation (used without cssselect) ---
+
+_TOKEN = re.compile(r"""
+    \s*(?P<combinator>[>+~,])\s*
+  | (?P<space>\s+)
+  | (?P<tag>\*|[A-Za-z][\w-]*)
+  | \#(?P<id>[\w-]+)
+  | \.(?P<cls>[\w-]+)
+  | \[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[~^$*|]?=)\s*(?P<value>"[^"]*"|'[^']*'|[^\]\s]+)\s*)?\]
+""", re.VERBOSE)
+
+
+def _literal(value: str) -> str:
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    return "concat(" + ", '\"', ".join(f'"{part}"' for part in value.split('"')) + ")"
+
+
+def _attribute_test(attr: str, op: Optional[str], value: Optional[str]) -> str:
+    if op is None:
+        return f"@{attr}"
+    if value[:1] in "\"'":
+        value = value[1:-1]
+    literal = _literal(value)
+    if op == "=":
+        return f"@{attr} = {literal}"
+    if op == "~=":
+        return f"contains(concat(' ', normalize-space(@{attr}), ' '), {_literal(' ' + value + ' ')})"
+    if op == "^=":
+        return f"starts-with(@{attr}, {literal})"
+    if op == "$=":
+        return f"substring(@{attr}, string-length(@{attr}) - {len(value) - 1}) = {literal}"
+    if op == "*=":
+        return f"contains(@{attr}, {literal})"
+    return f"(@{attr} = {literal} or starts-with(@{attr}, {_literal(value + '-')}))"  # |=
+
+
+def css_to_xpath(selector: str) -> str:
+    """
+    Translate the supported CSS subset to XPath (relative to the context node)
+
+    Raises:
+        ValueError: The selector uses unsupported syntax (pseudo-classes, +, ~ ...)
+    """
+    groups: List[str] = []
+    steps: List[str] = []
+    axis = "descendant-or-self::"
+    tag: Optional[str] = None
+    tests: List[str] = []
+
+    def close_step() -> None:
+        nonlocal tag, tests
+        if tag is None and not tests:
+            return
+        step = axis + (tag or "*") + "".join(f"[{test}]" for test in tests)
+        steps.append(step)
+        tag, tests = None, []
+
+    pos = 0
+    selector = selector.strip()
+    if not selector:
+        raise ValueError("Empty CSS selector")
+    while pos < len(selector):
+        match = _TOKEN.match(selector, pos)
+        if not match or match.end() == pos:
+            raise ValueError(f"Unsupported CSS selector {selector!r} at {selector[pos:]!r}")
+        pos = match.end()
+        kind = "attr" if match.group("attr") else match.lastgroup
+
+        if kind in ("combinator", "space"):
+            combinator = match.group("combinator") or " "
+            if tag is None and not tests:
+                raise ValueError(f"Unsupported CSS selector {selector!r}")
+            close_step()
+            if combinator == ",":
+                groups.append("/".join(steps))
+                steps, axis = [], "descendant-or-self::"
+            elif combinator == ">":
+                axis = "child::"
+            elif combinator == " ":
+                axis = "descendant::"
+            else:
+                raise ValueError(f"Unsupported CSS combinator {combinator!r} in {selector!r}")
+        elif kind == "tag":
+            if tag is not None or tests:
+                raise ValueError(f"Unsupported CSS selector {selector!r}")
+            tag = match.group("tag").lower()
+        elif kind == "id":
+            tests.append(f"@id = {_literal(match.group('id'))}")
+        elif kind == "cls":
+            tests.append(
+                f"contains(concat(' ', normalize-space(@class), ' '), {_literal(' ' + match.group('cls') + ' ')})"
+            )
+        else:
+            tests.append(_attribute_test(match.group("attr"), match.group("op"), match.group("value")))
+
+    if tag is None and not tests:
+        raise ValueError(f"Unsupported CSS selector {selector!r}")
+    close_step()
+    groups.append("/".join(steps))
+    return " | ".join(groups)
@@ -0,0 +1,374 @@
+"""
+HTTP fetching with retries and per-host circuit breakers
+Transient failures (timeouts, connection errors, 5xx, 429) are retried with
+jittered exponential backoff; a Retry-After header overrides the computed
+delay. Every failed attempt counts against the host's circuit breaker: after
+CIRCUIT_BREAKER_THRESHOLD consecutive failures the host is skipped for
+CIRCUIT_BREAKER_COOLDOWN seconds instead of costing a full timeout per URL.
+After the cool-down one trial request decides whether the circuit closes.
+Each attempt first waits for its slot in the host's rate limiter.
+
+Pages are streamed: get_page() checks the Content-Type header before reading
+the body and stops at HTTP_MAX_RESPONSE_BYTES, so a video, PDF or a page
+bloated with inline images does not end up in memory and in the parser.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, List, Callable, Collection
+from urllib.parse import urlparse
+
+import requests
+
+from config import config
+from ..utils.logger import get_logger
+from .budget import CrawlBudget
+from .rate_limiter import HostRateLimiter, get_rate_limiter
+
+logger = get_logger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+HTML_CONTENT_TYPES = frozenset({"text/html", "application/xhtml+xml"})
+CHUNK_SIZE = 64 * 1024
+
+# Circuit states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of sending a request to a host whose circuit is open"""
+
+
+class UnsupportedContentType(requests.exceptions.RequestException):
+    """The response is not of an accepted type (e.g. a PDF or video behind an article URL)"""
+
+
+class ResponseTooLarge(requests.exceptions.RequestException):
+    """The response body exceeds the download size cap"""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker of one host"""
+
+    def __init__(self, failure_threshold: int, cooldown_seconds: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.trial_thread: Optional[int] = None  # thread sending the half-open trial
+        self.times_opened = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return CLOSED
+        if time.monotonic() - self.opened_at >= self.cooldown_seconds:
+            return HALF_OPEN
+        return OPEN
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now (only one trial request while half-open)"""
+        with self._lock:
+            state = self.state
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self.trial_in_flight:
+                self.trial_in_flight = True
+                self.trial_thread = threading.get_ident()
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            # A failed trial re-opens at once; a closed circuit opens at the threshold
+            if self.trial_in_flight or (self.opened_at is None and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                self.times_opened += 1
+            self.trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Free a half-open trial sent by this thread whose outcome was not recorded"""
+        with self._lock:
+            if self.trial_in_flight and self.trial_thread == threading.get_ident():
+                self.trial_in_flight = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        state = self.state
+        retry_in = None
+        if state == OPEN:
+            retry_in = round(self.cooldown_seconds - (time.monotonic() - self.opened_at), 1)
+        return {"state": state, "failures": self.failures, "times_opened": self.times_opened,
+                "retry_in_seconds": retry_in}
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """
+    Full-jitter exponential backoff
+
+    Args:
+        attempt: Number of the retry (0 for the first retry)
+        base_delay: Delay scale in seconds
+        max_delay: Upper bound of the delay
+
+    Returns:
+        Random delay between 0 and min(max_delay, base_delay * 2 ** attempt)
+    """
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date); None if absent or invalid"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def content_type(response: requests.Response) -> str:
+    """Media type of a response without parameters ("text/html; charset=utf-8" -> "text/html")"""
+    return response.headers.get("Content-Type", "").split(";", 1)[0].strip().lower()
+
+
+def read_body(response: requests.Response, max_bytes: Optional[int] = None,
+              content_types: Optional[Collection[str]] = None,
+              on_chunk: Optional[Callable[[bytes], None]] = None) -> bytes:
+    """
+    Read a streamed (stream=True) response body with type and size checks
+
+    Args:
+        response: Response whose body has not been read yet
+        max_bytes: Size cap of the (decoded) body; defaults to HTTP_MAX_RESPONSE_BYTES, 0 for none
+        content_types: Accepted media types; None accepts any. A missing header is accepted
+        on_chunk: Called with every chunk as it arrives (e.g. HtmlFeed.feed)
+
+    Returns:
+        The body; response.content and response.text also work afterwards
+
+    Raises:
+        UnsupportedContentType: Content-Type is not accepted (nothing is read)
+        ResponseTooLarge: Content-Length or the bytes read exceed max_bytes
+    """
+    max_bytes = config.HTTP_MAX_RESPONSE_BYTES if max_bytes is None else max_bytes
+    media_type = content_type(response)
+    if content_types is not None and media_type and media_type not in content_types:
+        response.close()
+        raise UnsupportedContentType(f"Unsupported content type {media_type} at {response.url}",
+                                     response=response)
+    length = response.headers.get("Content-Length", "")
+    if max_bytes and length.isdigit() and int(length) > max_bytes:
+        response.close()
+        raise ResponseTooLarge(f"Response of {length} bytes exceeds {max_bytes} at {response.url}",
+                               response=response)
+
+    chunks = []
+    size = 0
+    for chunk in response.iter_content(CHUNK_SIZE):
+        size += len(chunk)
+        if max_bytes and size > max_bytes:
+            response.close()
+            raise ResponseTooLarge(f"Response exceeds {max_bytes} bytes at {response.url}", response=response)
+        chunks.append(chunk)
+        if on_chunk:
+            on_chunk(chunk)
+    body = b"".join(chunks)
+    response._content = body
+    response._content_consumed = True
+    return body
+
+
+class HttpClient:
+    """GET with retry policy and circuit breakers shared by all crawl runs of this process"""
+
+    def __init__(self, max_retries: Optional[int] = None, base_delay: Optional[float] = None,
+                 max_delay: Optional[float] = None, failure_threshold: Optional[int] = None,
+                 cooldown_seconds: Optional[float] = None, session: Optional[Any] = None,
+                 rate_limiter: Optional[HostRateLimiter] = None) -> None:
+        self.max_retries = config.HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.base_delay = config.HTTP_RETRY_BASE_DELAY if base_delay is None else base_delay
+        self.max_delay = config.HTTP_RETRY_MAX_DELAY if max_delay is None else max_delay
+        self.failure_threshold = failure_threshold or config.CIRCUIT_BREAKER_THRESHOLD
+        self.cooldown_seconds = config.CIRCUIT_BREAKER_COOLDOWN if cooldown_seconds is None else cooldown_seconds
+        self.session = session or requests
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.sleep = time.sleep
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def configure_retries(self, max_retries: int, max_delay: float) -> None:
+        """Apply a crawler retry policy (HybridCrawlerConfig.max_retries / retry_delay)"""
+        self.max_retries = max_retries
+        self.max_delay = max_delay
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.cooldown_seconds)
+            return self._breakers[host]
+
+    def get(self, url: str, timeout: float = 15, budget: Optional[CrawlBudget] = None,
+            **kwargs) -> requests.Response:
+        """
+        Send a GET request, retrying transient failures
+
+        Args:
+            url: URL to fetch
+            timeout: Timeout of each attempt (capped to the budget's remaining time)
+            budget: Crawl budget; no retry is started once it is exhausted
+            **kwargs: Passed on to requests (headers, stream, ...)
+
+        Returns:
+            The response. A retryable status is returned as-is once retries
+            are used up, so callers can still raise_for_status()
+
+        Raises:
+            CircuitOpenError: The host's circuit is open
+            requests.exceptions.RequestException: The last attempt failed
+        """
+        breaker = self.breaker(url)
+        attempt = 0
+        while True:
+            response = None
+            if breaker.state == OPEN:
+                raise CircuitOpenError(f"Circuit open for {urlparse(url).netloc}")
+            self._wait_for_slot(url, budget)
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {urlparse(url).netloc}")
+            attempt_timeout = budget.timeout(timeout) if budget else timeout
+            try:
+                response = self.session.get(url, timeout=attempt_timeout, **kwargs)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                breaker.record_failure()
+                if not self._should_retry(attempt, budget):
+                    raise
+                delay = backoff_delay(attempt, self.base_delay, self.max_delay)
+                logger.debug(f"Retrying {url} in {delay:.1f}s after {type(e).__name__}")
+            except requests.exceptions.RequestException:
+                # Not retried (TooManyRedirects, InvalidURL, ChunkedEncodingError, ...)
+                breaker.record_failure()
+                raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                if not self._should_retry(attempt, budget):
+                    return response
+                delay = retry_after_seconds(response)
+                if delay is None:
+                    delay = backoff_delay(attempt, self.base_delay, self.max_delay)
+                delay = min(delay, self.max_delay)
+                logger.debug(f"Retrying {url} in {delay:.1f}s after HTTP {response.status_code}")
+            finally:
+                # Never leave the host's half-open trial taken (e.g. on an unexpected exception)
+                breaker.release_trial()
+
+            remaining = budget.remaining() if budget else None
+            if remaining is not None and delay >= remaining:
+                # Waiting would outlast the crawl budget: give up with what we have
+                if response is not None:
+                    return response
+                raise requests.exceptions.Timeout(f"Crawl budget exhausted before retrying {url}")
+            if response is not None:
+                response.close()
+            self._wait(delay, budget)
+            attempt += 1
+
+    def get_page(self, url: str, timeout: float = 15, budget: Optional[CrawlBudget] = None,
+                 max_bytes: Optional[int] = None,
+                 content_types: Optional[Collection[str]] = HTML_CONTENT_TYPES,
+                 on_chunk: Optional[Callable[[bytes], None]] = None, **kwargs) -> requests.Response:
+        """
+        GET a page as a stream, reading the body only if its type and size are acceptable
+
+        Args:
+            url: URL to fetch
+            timeout: Timeout of each attempt
+            budget: Crawl budget
+            max_bytes: Size cap (see read_body)
+            content_types: Accepted media types; None for any (feeds)
+            on_chunk: Called with every body chunk (incremental parsing)
+            **kwargs: Passed on to requests (headers, ...)
+
+        Returns:
+            The response with its body read. Error responses (4xx/5xx) are
+            returned unread for raise_for_status()
+
+        Raises:
+            UnsupportedContentType, ResponseTooLarge: See read_body
+            CircuitOpenError, requests.exceptions.RequestException: See get
+        """
+        response = self.get(url, timeout=timeout, budget=budget, stream=True, **kwargs)
+        if response.status_code >= 400:
+            response.close()
+            return response
+        read_body(response, max_bytes, content_types, on_chunk)
+        return response
+
+    def _wait_for_slot(self, url: str, budget: Optional[CrawlBudget]) -> None:
+        """Wait until the host's rate limiter lets the request through"""
+        delay = self.rate_limiter.reserve(url)
+        if not delay:
+            return
+        remaining = budget.remaining() if budget else None
+        if remaining is not None and delay >= remaining:
+            raise requests.exceptions.Timeout(f"Crawl budget exhausted while throttled on {url}")
+        self._wait(delay, budget)
+        if budget and budget.cancelled:
+            raise requests.exceptions.Timeout(f"Crawl cancelled while throttled on {url}")
+
+    def _should_retry(self, attempt: int, budget: Optional[CrawlBudget]) -> bool:
+        return attempt < self.max_retries and not (budget and budget.exhausted())
+
+    def _wait(self, delay: float, budget: Optional[CrawlBudget]) -> None:
+        """Sleep between attempts, waking up early if the crawl is cancelled"""
+        left = delay
+        while left > 0 and not (budget and budget.cancelled):
+            step = min(left, 1.0)
+            self.sleep(step)
+            left -= step
+
+    def circuits(self) -> Dict[str, Dict[str, Any]]:
+        """State of every host that has failed at least once (for status/metrics)"""
+        with self._lock:
+            breakers = list(self._breakers.items())
+        return {host: breaker.to_dict() for host, breaker in breakers
+                if breaker.failures or breaker.times_opened}
+
+    def open_hosts(self) -> List[str]:
+        return [host for host, state in self.circuits().items() if state["state"] == OPEN]
+
+
+# Global instance
+_client: Optional[HttpClient] = None
+
+
+def get_http_client() -> HttpClient:
+    """Get or create the global HTTP client (breaker state is per process)"""
+    global _client
+    if _client is None:
+        _client = HttpClient()
+    return _client
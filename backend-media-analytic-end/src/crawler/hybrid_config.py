@@ -29,12 +29,15 @@ class HybridCrawlerConfig:
     # Enable logging untuk hybrid crawler
     enable_logging: bool = True
     
-    # Timeout untuk individual crawl (seconds)
+    # Timeout untuk individual crawl (seconds, None = config.CRAWL_RUN_TIMEOUT)
     crawl_timeout: Optional[int] = None
+
+    # Time budget per source within a crawl (seconds, None = config.CRAWL_SOURCE_TIMEOUT)
+    source_timeout: Optional[int] = None
     
-    # Retry policy untuk failed crawls
+    # Retry policy untuk failed requests (timeout, 5xx, 429); backoff dibatasi retry_delay
     max_retries: int = 3
-    retry_delay: int = 60  # seconds
+    retry_delay: int = 60  # seconds, max wait sebelum satu retry
     
     # Thread pool size untuk concurrent crawling (future feature)
     max_workers: int = 5
@@ -1,22 +1,63 @@
 """
 Hybrid Crawler Manager
 Manages both manual (button-triggered) and automatic crawling
-Provides centralized control for crawling operations
+Provides centralized control for crawling operations and owns the
+background scheduler, which also runs the article cleanup schedules
 """
 
+import random
 import threading
-from typing import Optional, Dict, Any
-from datetime import datetime
+from typing import Optional, Dict, Any, Callable, List, Tuple
+from datetime import datetime, timedelta, timezone
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.triggers.interval import IntervalTrigger
 
 from config import config
 from ..utils.logger import get_logger
-from .news_crawler import NewsCrawler
-from ..database.repository import get_session
+from .news_crawler import NewsCrawler, load_sentiment_analyzer
+from .jobs import get_job_manager
+from .hybrid_config import HybridCrawlerConfig, DEFAULT_HYBRID_CONFIG
+from .http_client import get_http_client
+from .adaptive_schedule import next_crawl_interval, jitter_seconds
+from .budget import CrawlBudget, CANCELLED
+from ..database.repository import (
+    get_session, get_schedulable_sources, record_source_schedule, reset_source_intervals,
+    get_cleanup_schedules, run_cleanup_for_schedule,
+    get_crawler_state, save_crawler_state, record_crawl_completed
+)
+from ..utils.event_bus import publish_event
 
 logger = get_logger(__name__)
 
+SOURCE_JOB_PREFIX = "source_crawl:"
+SYNC_JOB_ID = "sync_source_jobs"
+CLEANUP_JOB_PREFIX = "cleanup:"
+CLEANUP_SYNC_JOB_ID = "sync_cleanup_jobs"
+
+# Upper bound of the random delay before an overdue or never-crawled source runs
+FIRST_RUN_SPREAD_SECONDS = 300
+
+
+class _CrawlRun:
+    """One in-flight crawl; concurrent crawl requests join it instead of starting another"""
+
+    def __init__(self, trigger: str, job_id: Optional[str] = None, source_id: Optional[int] = None,
+                 budget: Optional[CrawlBudget] = None) -> None:
+        self.trigger = trigger
+        self.job_id = job_id
+        self.source_id = source_id  # None = all sources
+        self.budget = budget or CrawlBudget()
+        self.started_at = datetime.utcnow()
+        self.listeners: List[Callable[..., None]] = []
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"trigger": self.trigger, "job_id": self.job_id, "source_id": self.source_id,
+                "started_at": self.started_at.isoformat(), "cancel_requested": self.budget.cancelled}
+
 
 class HybridCrawlerManager:
     """
@@ -24,33 +65,136 @@ class HybridCrawlerManager:
     
     Features:
     - Manual crawling triggered via API endpoint
-    - Automatic crawling based on configurable interval
+    - Automatic crawling with one scheduler job per source, whose interval
+      adapts to the source's rate of new articles (within
+      HybridCrawlerConfig.min_interval / max_interval) plus jitter
     - Start/Stop auto crawling
     - Get crawler status
     - Thread-safe operations
+
+    Concurrency model:
+    - _state_lock guards scheduler/interval/counter changes and is only held
+      for short critical sections, never for the duration of a crawl
+    - Only one crawl runs at a time (single flight): a manual crawl requested
+      while another full crawl runs joins it and gets its result (and waits
+      for a running single-source crawl first); a source job that fires
+      during a running crawl is postponed
+    - Every crawl uses its own DB session and NewsCrawler; only the sentiment
+      model is shared
+    - Every crawl has a CrawlBudget: a run deadline (crawl_timeout), a
+      per-source budget (source_timeout) and a cancel flag set through
+      crawl jobs; articles collected before stopping are still saved
+    - get_status() reads an immutable snapshot and never takes a lock
+
+    Multiple API workers:
+    - Only the worker holding the scheduler lease (see utils/leader.py) runs
+      the scheduler; become_leader()/step_down() are wired to the leader
+      elector at startup. Auto crawl controls on other workers only store the
+      desired state in crawler_state (status "accepted"); the leader applies
+      it on its next lease renewal (apply_saved_state). Manual crawls run on
+      any worker.
+
+    Persistence:
+    - Jobs live in an SQLAlchemy job store in the application database, so
+      per-source next run times survive restarts and leader changes. Jobs
+      missed while no worker was scheduling run once (coalesced) if they are
+      at most SCHEDULER_MISFIRE_GRACE_TIME late, otherwise at their next slot.
+    - auto_running, the interval, crawl_count and last_crawl_time are stored
+      in crawler_state and restored by restore_state()
+
+    Cleanup schedules:
+    - Every active CleanupSchedule row is an interval job on the same
+      scheduler (and thread pool) as the crawl jobs. Changes made through the
+      API on the leader apply immediately; changes made on another worker are
+      picked up every CLEANUP_JOB_SYNC_INTERVAL seconds.
     """
 
-    def __init__(self):
+    def __init__(self, hybrid_config: HybridCrawlerConfig = DEFAULT_HYBRID_CONFIG):
+        self.hybrid_config = hybrid_config
         self.scheduler: Optional[BackgroundScheduler] = None
-        self.crawler: Optional[NewsCrawler] = None
+        self.analyzer = None
         self.is_auto_running: bool = False
         self.last_crawl_time: Optional[datetime] = None
         self.crawl_count: int = 0
-        self.lock = threading.Lock()
         self.crawl_interval: int = config.CRAWL_INTERVAL
+        # Without leader election this process owns the scheduler unconditionally
+        self.is_leader: bool = not config.LEADER_ELECTION_ENABLED
+        self._state_lock = threading.Lock()
+        self._analyzer_lock = threading.Lock()
+        self._current_run: Optional[_CrawlRun] = None
+        self._status: Dict[str, Any] = {}
+        self._refresh_status()
+        get_http_client().configure_retries(hybrid_config.max_retries, hybrid_config.retry_delay)
         
         logger.info("HybridCrawlerManager initialized")
 
     def initialize_crawler(self) -> None:
-        """Initialize the news crawler instance"""
+        """Load the sentiment model shared by all crawl runs"""
         try:
-            session = get_session()
-            self.crawler = NewsCrawler(db_session=session)
-            logger.info("Crawler instance initialized")
+            self._get_analyzer()
+            logger.info("Crawler sentiment model initialized")
         except Exception as e:
             logger.error(f"Failed to initialize crawler: {e}")
             raise
 
+    def restore_state(self, quiet: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Load interval and crawl counters saved by a previous run (or another worker)
+
+        Args:
+            quiet: Log at debug level (periodic refresh on the leader)
+
+        Returns:
+            The persisted state, or None if there is none yet
+        """
+        session = get_session()
+        try:
+            state = get_crawler_state(session)
+        except Exception as e:
+            logger.error(f"Could not restore crawler state: {e}")
+            state = None
+        finally:
+            session.close()
+        if state is None:
+            return None
+
+        with self._state_lock:
+            self.crawl_interval = state["crawl_interval"] or self.crawl_interval
+            self.crawl_count = state["crawl_count"]
+            self.last_crawl_time = state["last_crawl_time"]
+            self._refresh_status()
+        (logger.debug if quiet else logger.info)(
+            f"Restored crawler state: auto_running={state['auto_running']}, "
+            f"interval={self.crawl_interval}s, crawls={self.crawl_count}")
+        return state
+
+    def _save_state(self, **fields) -> None:
+        session = get_session()
+        try:
+            save_crawler_state(session, **fields)
+        finally:
+            session.close()
+
+    def _get_analyzer(self):
+        with self._analyzer_lock:
+            if self.analyzer is None:
+                self.analyzer = load_sentiment_analyzer()
+            return self.analyzer
+
+    def _refresh_status(self) -> None:
+        """Publish a new status snapshot (call with _state_lock held)"""
+        run = self._current_run
+        self._status = {
+            "auto_running": self.is_auto_running,
+            "is_leader": self.is_leader,
+            "interval_seconds": self.crawl_interval,
+            "last_crawl_time": self.last_crawl_time.isoformat() if self.last_crawl_time else None,
+            "total_crawls": self.crawl_count,
+            "scheduler_running": bool(self.scheduler and self.scheduler.running),
+            "crawl_in_progress": run is not None,
+            "current_crawl": run.to_dict() if run else None,
+        }
+
     def start_auto_crawling(self) -> Dict[str, Any]:
         """
         Start automatic crawling with configured interval
@@ -58,7 +202,10 @@ class HybridCrawlerManager:
         Returns:
             Dictionary with status and details
         """
-        with self.lock:
+        with self._state_lock:
+            if not self.is_leader:
+                self._save_state(auto_running=True)
+                return self._accepted_response("Auto crawling start")
             if self.is_auto_running:
                 return {
                     "status": "already_running",
@@ -67,28 +214,22 @@ class HybridCrawlerManager:
                 }
 
             try:
-                if self.crawler is None:
-                    self.initialize_crawler()
-
-                if self.scheduler is None:
-                    self.scheduler = BackgroundScheduler()
-
-                # Add job if not already added
-                existing_jobs = self.scheduler.get_jobs()
-                if not any(job.name == 'auto_crawl' for job in existing_jobs):
-                    self.scheduler.add_job(
-                        self._auto_crawl_job,
-                        'interval',
-                        seconds=self.crawl_interval,
-                        id='auto_crawl',
-                        name='auto_crawl',
-                        replace_existing=True
-                    )
-
-                if not self.scheduler.running:
-                    self.scheduler.start()
+                self._ensure_scheduler()
+
+                # Per-source jobs, re-synced periodically to pick up added/removed sources
+                self._sync_source_jobs()
+                self.scheduler.add_job(
+                    run_source_job_sync,
+                    'interval',
+                    seconds=config.SOURCE_JOB_SYNC_INTERVAL,
+                    id=SYNC_JOB_ID,
+                    name=SYNC_JOB_ID,
+                    replace_existing=True
+                )
 
                 self.is_auto_running = True
+                self._save_state(auto_running=True, crawl_interval=self.crawl_interval)
+                self._refresh_status()
                 logger.info(f"Auto crawling started with interval {self.crawl_interval}s")
 
                 return {
@@ -109,10 +250,16 @@ class HybridCrawlerManager:
         """
         Stop automatic crawling
         
+        A crawl that is already running is not interrupted. Cleanup jobs keep
+        running.
+
         Returns:
             Dictionary with status and details
         """
-        with self.lock:
+        with self._state_lock:
+            if not self.is_leader:
+                self._save_state(auto_running=False)
+                return self._accepted_response("Auto crawling stop")
             if not self.is_auto_running:
                 return {
                     "status": "not_running",
@@ -120,10 +267,11 @@ class HybridCrawlerManager:
                 }
 
             try:
-                if self.scheduler and self.scheduler.running:
-                    self.scheduler.shutdown(wait=False)
-                    self.is_auto_running = False
-                    logger.info("Auto crawling stopped")
+                self._remove_crawl_jobs()
+                self.is_auto_running = False
+                self._save_state(auto_running=False)
+                self._refresh_status()
+                logger.info("Auto crawling stopped")
 
                 return {
                     "status": "stopped",
@@ -138,90 +286,399 @@ class HybridCrawlerManager:
                     "message": f"Failed to stop auto crawling: {str(e)}"
                 }
 
-    def run_manual_crawl(self) -> Dict[str, Any]:
+    def submit_manual_crawl(self) -> Dict[str, Any]:
+        """
+        Queue a manual crawl as a background job (button action)
+
+        If a manual crawl job is already queued or running (on any worker),
+        that job is returned instead of queueing another one (with
+        "coalesced": true).
+
+        Returns:
+            Job dictionary (job_id, status, progress...)
+        """
+        job, existing = get_job_manager().submit_once(
+            "manual", lambda job: self.run_manual_crawl(progress=job.handle_event, job_id=job.id,
+                                                        cancel_event=job.cancel_event)
+        )
+        return {**job, "coalesced": existing}
+
+    def run_manual_crawl(self, progress: Optional[Callable[..., None]] = None,
+                         job_id: Optional[str] = None,
+                         cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
         """
-        Manually trigger crawling (button action)
+        Manually trigger crawling and wait for it to finish
+
+        If another crawl is running, waits for it and returns its result
+        instead of starting a second crawl.
+
+        Args:
+            progress: Optional progress callback forwarded to crawl_all
+            job_id: Id of the crawl job running this crawl, if any
+            cancel_event: Set to stop the crawl early (also stops a crawl this call joined)
         
         Returns:
             Dictionary with crawl results and details
         """
-        with self.lock:
-            try:
-                if self.crawler is None:
-                    self.initialize_crawler()
+        run, owner = self._begin_crawl("manual", job_id, progress, wait=True, cancel_event=cancel_event)
+        if not owner:
+            logger.info(f"Manual crawl joined the running {run.trigger} crawl")
+            run.done.wait()
+            return {**run.result, "coalesced": True}
 
-                logger.info("Manual crawl triggered")
-                articles = self._perform_crawl()
+        logger.info("Manual crawl triggered")
+        try:
+            articles_count = self._perform_crawl(run)
+            return self._finish_crawl(run, articles_count=articles_count)
+        except Exception as e:
+            logger.error(f"Error in manual crawl: {e}")
+            return self._finish_crawl(run, error=e)
+
+    def _ensure_scheduler(self) -> None:
+        """Create and start the scheduler shared by crawl and cleanup jobs (call with _state_lock held)"""
+        if self.scheduler is None:
+            # Own engine: the job store disposes it on scheduler shutdown
+            jobstore = SQLAlchemyJobStore(
+                url=config.DATABASE_URL,
+                tablename="apscheduler_jobs",
+                engine_options={"connect_args": {"check_same_thread": False}} if "sqlite" in config.DATABASE_URL else None,
+            )
+            self.scheduler = BackgroundScheduler(
+                jobstores={"default": jobstore},
+                executors={"default": ThreadPoolExecutor(config.SCHEDULER_MAX_WORKERS)},
+                job_defaults={
+                    "max_instances": 1,
+                    "coalesce": True,
+                    "misfire_grace_time": config.SCHEDULER_MISFIRE_GRACE_TIME,
+                },
+            )
+        if not self.scheduler.running:
+            self.scheduler.start()
+
+    def _remove_crawl_jobs(self) -> None:
+        """Drop the per-source and source-sync jobs from the (persistent) job store"""
+        if self.scheduler and self.scheduler.running:
+            for job in self.scheduler.get_jobs():
+                if job.id.startswith(SOURCE_JOB_PREFIX) or job.id == SYNC_JOB_ID:
+                    job.remove()
+
+    def sync_cleanup_jobs(self) -> None:
+        """Make the cleanup jobs match the active CleanupSchedule rows (no-op unless scheduling)"""
+        scheduler = self.scheduler
+        if scheduler is None or not scheduler.running:
+            return
+        session = get_session()
+        try:
+            schedules = [s for s in get_cleanup_schedules(session) if s.active]
+            wanted = {f"{CLEANUP_JOB_PREFIX}{s.id}": (s.id, s.interval_minutes, s.last_run) for s in schedules}
+        finally:
+            session.close()
+
+        for job in scheduler.get_jobs():
+            if job.id.startswith(CLEANUP_JOB_PREFIX) and job.id not in wanted:
+                job.remove()
+                logger.info(f"Removed cleanup job {job.id}")
+        for schedule_id, interval_minutes, last_run in wanted.values():
+            job = scheduler.get_job(f"{CLEANUP_JOB_PREFIX}{schedule_id}")
+            if job is None or job.trigger.interval != timedelta(minutes=interval_minutes):
+                self.schedule_cleanup(schedule_id, interval_minutes, last_run)
+
+    def schedule_cleanup(self, schedule_id: int, interval_minutes: int, last_run: Optional[datetime] = None) -> None:
+        """
+        Add or replace the job of a cleanup schedule
 
-                self.last_crawl_time = datetime.utcnow()
-                self.crawl_count += 1
+        Args:
+            schedule_id: CleanupSchedule id
+            interval_minutes: Run every X minutes
+            last_run: Last execution (naive UTC); a schedule that never ran or is overdue runs now
+        """
+        scheduler = self.scheduler
+        if scheduler is None or not scheduler.running:
+            return
+        now = datetime.now(timezone.utc)
+        due = last_run.replace(tzinfo=timezone.utc) + timedelta(minutes=interval_minutes) if last_run else now
+        scheduler.add_job(
+            run_cleanup_job,
+            trigger=IntervalTrigger(minutes=interval_minutes),
+            args=[schedule_id],
+            id=f"{CLEANUP_JOB_PREFIX}{schedule_id}",
+            name=f"cleanup schedule {schedule_id}",
+            next_run_time=max(due, now),
+            replace_existing=True
+        )
+        logger.info(f"Scheduled cleanup {schedule_id} every {interval_minutes} min")
+
+    def unschedule_cleanup(self, schedule_id: int) -> None:
+        scheduler = self.scheduler
+        if scheduler is None or not scheduler.running:
+            return
+        job = scheduler.get_job(f"{CLEANUP_JOB_PREFIX}{schedule_id}")
+        if job:
+            job.remove()
+            logger.info(f"Removed cleanup job {job.id}")
+
+    def _cleanup_job(self, schedule_id: int) -> None:
+        session = get_session()
+        try:
+            run_cleanup_for_schedule(session, schedule_id)
+        except ValueError:
+            # Deleted or deactivated on another worker since the last sync
+            self.unschedule_cleanup(schedule_id)
+        except Exception as e:
+            session.rollback()
+            logger.exception(f"Failed running scheduled cleanup for id={schedule_id}: {e}")
+        finally:
+            session.close()
+
+    def _sync_source_jobs(self) -> None:
+        """Add a scheduler job for every schedulable source and drop jobs of removed ones"""
+        scheduler = self.scheduler
+        if scheduler is None:
+            return
+        session = get_session()
+        try:
+            sources = get_schedulable_sources(session)
+        finally:
+            session.close()
+
+        wanted = {f"{SOURCE_JOB_PREFIX}{s['id']}": s for s in sources}
+        existing = {job.id for job in scheduler.get_jobs() if job.id.startswith(SOURCE_JOB_PREFIX)}
+        for job_id in existing - wanted.keys():
+            scheduler.remove_job(job_id)
+            logger.info(f"Removed crawl job {job_id}")
+
+        now = datetime.utcnow()
+        for job_id, source in wanted.items():
+            if job_id in existing:
+                continue
+            interval = self._clamp_interval(source["crawl_interval_seconds"] or self.crawl_interval)
+            due = source["last_crawled_at"] + timedelta(seconds=interval) if source["last_crawled_at"] else now
+            if due <= now:
+                due = now + timedelta(seconds=random.uniform(0, FIRST_RUN_SPREAD_SECONDS))
+            scheduler.add_job(
+                run_source_crawl_job,
+                trigger=self._source_trigger(interval),
+                args=[source["id"]],
+                id=job_id,
+                name=f"crawl {source['name']}",
+                next_run_time=due.replace(tzinfo=timezone.utc),  # stored times are naive UTC
+                replace_existing=True
+            )
+            logger.info(f"Scheduled {source['name']} every {interval}s, first run at {due.isoformat()}")
+
+    def _clamp_interval(self, interval: int) -> int:
+        """Keep an interval within the configured adaptive bounds"""
+        return int(min(max(interval, self.hybrid_config.min_interval), self.hybrid_config.max_interval))
+
+    def _source_trigger(self, interval: int) -> IntervalTrigger:
+        return IntervalTrigger(seconds=interval, jitter=jitter_seconds(interval, config.SOURCE_CRAWL_JITTER) or None)
+
+    def _source_crawl_job(self, source_id: int) -> None:
+        """
+        Scheduler job crawling one source, then adapting its interval to the
+        number of new articles found. Postponed if another crawl is running.
+        """
+        run, owner = self._begin_crawl("auto", source_id=source_id)
+        if not owner:
+            logger.info(f"Crawl of source {source_id} postponed: a {run.trigger} crawl is running")
+            self._postpone_source_job(source_id)
+            return
 
-                return {
-                    "status": "success",
-                    "message": f"Manual crawl completed. Found {len(articles)} articles.",
-                    "articles_count": len(articles),
+        inserted_by_source: Dict[str, int] = {}
+
+        def capture_inserts(event, **data):
+            if event == "articles_saved":
+                inserted_by_source.update(data.get("inserted_by_source") or {})
+
+        run.listeners.append(capture_inserts)
+        try:
+            logger.info(f"Auto crawl of source {source_id} started")
+            articles_count = self._perform_crawl(run, source_ids=[source_id])
+            self._finish_crawl(run, articles_count=articles_count)
+        except Exception as e:
+            logger.error(f"Error in auto crawl of source {source_id}: {e}")
+            self._finish_crawl(run, error=e)
+
+        self._adapt_source_interval(source_id, sum(inserted_by_source.values()))
+
+    def _adapt_source_interval(self, source_id: int, inserted: int) -> None:
+        job_id = f"{SOURCE_JOB_PREFIX}{source_id}"
+        scheduler = self.scheduler  # None once this worker stepped down
+        job = scheduler.get_job(job_id) if scheduler else None
+        current = int(job.trigger.interval.total_seconds()) if job else self.crawl_interval
+        interval = self._clamp_interval(next_crawl_interval(
+            current, inserted, config.MAX_ARTICLES_PER_SOURCE,
+            self.hybrid_config.min_interval, self.hybrid_config.max_interval,
+        ))
+
+        session = get_session()
+        try:
+            record_source_schedule(session, source_id, interval, inserted)
+        finally:
+            session.close()
+
+        if job and interval != current:
+            scheduler.reschedule_job(job_id, trigger=self._source_trigger(interval))
+        logger.info(f"Source {source_id}: {inserted} new articles, next interval {interval}s (was {current}s)")
+
+    def _postpone_source_job(self, source_id: int) -> None:
+        if self.scheduler is None:
+            return
+        delay = config.SOURCE_CRAWL_RETRY_DELAY + random.uniform(0, config.SOURCE_CRAWL_RETRY_DELAY / 2)
+        try:
+            self.scheduler.modify_job(f"{SOURCE_JOB_PREFIX}{source_id}",
+                                      next_run_time=datetime.now(timezone.utc) + timedelta(seconds=delay))
+        except Exception as e:
+            logger.warning(f"Could not postpone crawl of source {source_id}: {e}")
+
+    def _begin_crawl(self, trigger: str, job_id: Optional[str] = None,
+                     progress: Optional[Callable[..., None]] = None,
+                     source_id: Optional[int] = None, wait: bool = False,
+                     cancel_event: Optional[threading.Event] = None) -> Tuple[_CrawlRun, bool]:
+        """
+        Start a crawl run, or join the one in flight
+
+        A full crawl request joins a running full crawl. Otherwise, while a
+        crawl runs, it waits for it to finish (wait=True) or gives up.
+
+        Returns:
+            (run, owner): owner is True if the caller started the run and must perform the crawl
+        """
+        while True:
+            with self._state_lock:
+                run = self._current_run
+                if run is None:
+                    run = _CrawlRun(trigger, job_id, source_id, self._new_budget(cancel_event))
+                    self._current_run = run
+                    self._refresh_status()
+                    if progress is not None:
+                        run.listeners.append(progress)
+                    return run, True
+                if run.source_id is None and source_id is None:
+                    if progress is not None:
+                        run.listeners.append(progress)
+                    if cancel_event is not None:
+                        run.budget.add_cancel_event(cancel_event)
+                    return run, False
+                if not wait:
+                    return run, False
+            run.done.wait()
+
+    def _new_budget(self, cancel_event: Optional[threading.Event] = None) -> CrawlBudget:
+        return CrawlBudget(
+            run_seconds=self.hybrid_config.crawl_timeout or config.CRAWL_RUN_TIMEOUT,
+            source_seconds=self.hybrid_config.source_timeout or config.CRAWL_SOURCE_TIMEOUT,
+            cancel_event=cancel_event,
+        )
+
+    def _finish_crawl(self, run: _CrawlRun, articles_count: Optional[int] = None,
+                      error: Optional[Exception] = None) -> Dict[str, Any]:
+        """Record the outcome of the run, release waiting requests and return the result"""
+        total = None
+        if error is None:
+            session = get_session()
+            try:
+                total = record_crawl_completed(session, datetime.utcnow())
+            finally:
+                session.close()
+        with self._state_lock:
+            if error is None:
+                self.last_crawl_time = datetime.utcnow()
+                self.crawl_count = total if total is not None else self.crawl_count + 1
+                stopped = run.budget.stop_reason
+                if stopped is None:
+                    message = f"{run.trigger.capitalize()} crawl completed. Found {articles_count} articles."
+                else:
+                    message = (f"{run.trigger.capitalize()} crawl stopped early ({stopped}). "
+                               f"Saved {articles_count} articles collected before stopping.")
+                result = {
+                    "status": "cancelled" if stopped == CANCELLED else "success",
+                    "message": message,
+                    "articles_count": articles_count,
                     "crawl_number": self.crawl_count,
+                    "trigger": run.trigger,
+                    "stopped_reason": stopped,
                     "timestamp": self.last_crawl_time.isoformat()
                 }
-
-            except Exception as e:
-                logger.error(f"Error in manual crawl: {e}")
-                return {
+            else:
+                result = {
                     "status": "error",
-                    "message": f"Manual crawl failed: {str(e)}"
+                    "message": f"{run.trigger.capitalize()} crawl failed: {str(error)}",
+                    "trigger": run.trigger,
                 }
+            run.result = result
+            self._current_run = None
+            self._refresh_status()
+        run.done.set()
+        return result
 
-    def _auto_crawl_job(self) -> None:
+    def _perform_crawl(self, run: _CrawlRun, source_ids: Optional[List[int]] = None) -> int:
         """
-        Background job for automatic crawling
-        Called by scheduler at configured intervals
-        """
-        try:
-            logger.info("Auto crawl job started")
-            articles = self._perform_crawl()
-            self.last_crawl_time = datetime.utcnow()
-            self.crawl_count += 1
-            logger.info(f"Auto crawl completed. Found {len(articles)} articles")
+        Perform the actual crawling operation with a dedicated session and crawler
 
-        except Exception as e:
-            logger.error(f"Error in auto crawl job: {e}")
+        Progress events are forwarded to the run's listeners and published on
+        the event bus (topic = event name, plus crawl_finished / crawl_failed)
+        for the SSE stream.
 
-    def _perform_crawl(self) -> list:
-        """
-        Perform the actual crawling operation
+        Args:
+            run: The crawl run being performed
+            source_ids: Only crawl these sources (default: all active sources)
         
         Returns:
-            List of articles found
+            Number of articles saved
         """
-        try:
-            if self.crawler is None:
-                self.initialize_crawler()
+        def on_progress(event, **data):
+            publish_event(event, {"trigger": run.trigger, **data})
+            for listener in list(run.listeners):
+                listener(event, **data)
 
-            # Perform crawl
-            articles = self.crawler.crawl_all()
-            logger.info(f"Crawl operation completed: {len(articles)} articles found")
-            return articles
+        session = get_session()
+        try:
+            crawler = NewsCrawler(db_session=session, analyzer=self._get_analyzer())
+            articles_count = crawler.crawl_all(progress=on_progress, source_ids=source_ids, budget=run.budget)
+            logger.info(f"Crawl operation completed: {articles_count} articles found")
+            publish_event("crawl_finished", {"trigger": run.trigger, "source_id": run.source_id,
+                                             "articles_count": articles_count})
+            return articles_count
 
         except Exception as e:
             logger.error(f"Error performing crawl: {e}")
+            publish_event("crawl_failed", {"trigger": run.trigger, "source_id": run.source_id, "error": str(e)[:200]})
             raise
+        finally:
+            session.close()
 
     def get_status(self) -> Dict[str, Any]:
         """
-        Get current status of the hybrid crawler
+        Get current status of the hybrid crawler (lock-free snapshot)
         
         Returns:
             Dictionary containing crawler status information
         """
-        with self.lock:
-            return {
-                "auto_running": self.is_auto_running,
-                "interval_seconds": self.crawl_interval,
-                "last_crawl_time": self.last_crawl_time.isoformat() if self.last_crawl_time else None,
-                "total_crawls": self.crawl_count,
-                "scheduler_running": self.scheduler.running if self.scheduler else False,
-                "timestamp": datetime.utcnow().isoformat()
-            }
+        return {**self._status, "source_jobs": self._source_jobs(), "cleanup_jobs": self._cleanup_jobs(),
+                "circuit_breakers": get_http_client().circuits(), "timestamp": datetime.utcnow().isoformat()}
+
+    def _source_jobs(self) -> List[Dict[str, Any]]:
+        """Per-source schedule (reads the scheduler's job store, not the manager state)"""
+        scheduler = self.scheduler
+        if scheduler is None or not scheduler.running:
+            return []
+        return [{
+            "source_id": job.args[0],
+            "name": job.name,
+            "interval_seconds": int(job.trigger.interval.total_seconds()),
+            "next_run_time": job.next_run_time.isoformat() if job.next_run_time else None,
+        } for job in scheduler.get_jobs() if job.id.startswith(SOURCE_JOB_PREFIX)]
+
+    def _cleanup_jobs(self) -> List[Dict[str, Any]]:
+        scheduler = self.scheduler
+        if scheduler is None or not scheduler.running:
+            return []
+        return [{
+            "schedule_id": job.args[0],
+            "interval_minutes": int(job.trigger.interval.total_seconds() // 60),
+            "next_run_time": job.next_run_time.isoformat() if job.next_run_time else None,
+        } for job in scheduler.get_jobs() if job.id.startswith(CLEANUP_JOB_PREFIX)]
 
     def update_interval(self, interval_seconds: int) -> Dict[str, Any]:
         """
@@ -233,23 +690,29 @@ class HybridCrawlerManager:
         Returns:
             Dictionary with update status
         """
-        with self.lock:
-            try:
-                if interval_seconds < 60:
-                    return {
-                        "status": "error",
-                        "message": "Interval must be at least 60 seconds"
-                    }
+        if interval_seconds < 60:
+            return {
+                "status": "error",
+                "message": "Interval must be at least 60 seconds"
+            }
 
+        with self._state_lock:
+            try:
                 self.crawl_interval = interval_seconds
-
-                # If scheduler is running, update the job
-                if self.scheduler and self.is_auto_running:
-                    self.scheduler.reschedule_job(
-                        'auto_crawl',
-                        trigger=IntervalTrigger(seconds=interval_seconds)
-                    )
-
+                self._save_state(crawl_interval=interval_seconds)
+
+                # Restart every source from the new interval; they adapt again from there
+                session = get_session()
+                try:
+                    reset_source_intervals(session)
+                finally:
+                    session.close()
+                if not self.is_leader:
+                    self._refresh_status()
+                    return self._accepted_response(f"Interval update to {interval_seconds} seconds")
+                self._reschedule_source_jobs(interval_seconds)
+
+                self._refresh_status()
                 logger.info(f"Crawl interval updated to {interval_seconds}s")
 
                 return {
@@ -266,16 +729,101 @@ class HybridCrawlerManager:
                     "message": f"Failed to update interval: {str(e)}"
                 }
 
+    def _reschedule_source_jobs(self, interval_seconds: int) -> None:
+        """Restart every source job from the given interval (call with _state_lock held)"""
+        if self.scheduler and self.is_auto_running:
+            for job in self.scheduler.get_jobs():
+                if job.id.startswith(SOURCE_JOB_PREFIX):
+                    self.scheduler.reschedule_job(job.id, trigger=self._source_trigger(interval_seconds))
+
+    def _accepted_response(self, action: str) -> Dict[str, Any]:
+        return {
+            "status": "accepted",
+            "message": f"{action} saved; the scheduler leader worker applies it within "
+                       f"{config.LEADER_RENEW_INTERVAL} seconds",
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+    def apply_saved_state(self) -> None:
+        """
+        Leader elector renewal callback: apply auto crawl settings that API
+        calls on other workers stored in crawler_state
+        """
+        with self._state_lock:
+            if not self.is_leader:
+                return
+            interval_before = self.crawl_interval
+        state = self.restore_state(quiet=True)
+        if state is None:
+            return
+        if self.crawl_interval != interval_before:
+            with self._state_lock:
+                self._reschedule_source_jobs(self.crawl_interval)
+            logger.info(f"Applied crawl interval {self.crawl_interval}s saved by another worker")
+        if state["auto_running"] and not self.is_auto_running:
+            logger.info("Starting auto crawling as requested through another worker")
+            self.start_auto_crawling()
+        elif not state["auto_running"] and self.is_auto_running:
+            logger.info("Stopping auto crawling as requested through another worker")
+            self.stop_auto_crawling()
+
+    def become_leader(self) -> None:
+        """
+        Leader elector callback: this worker now owns the scheduler
+
+        Persisted jobs resume where the previous leader left off; auto
+        crawling is switched on again if it was on (or auto_start is set and
+        nothing was persisted yet).
+        """
+        state = self.restore_state()
+        with self._state_lock:
+            self.is_leader = True
+            self._ensure_scheduler()
+            self.scheduler.add_job(
+                run_cleanup_job_sync,
+                'interval',
+                seconds=config.CLEANUP_JOB_SYNC_INTERVAL,
+                id=CLEANUP_SYNC_JOB_ID,
+                name=CLEANUP_SYNC_JOB_ID,
+                replace_existing=True
+            )
+            self._refresh_status()
+        self.sync_cleanup_jobs()
+        if state["auto_running"] if state else self.hybrid_config.auto_start:
+            logger.info("Resuming auto crawling on the new scheduler leader")
+            self.start_auto_crawling()
+        else:
+            with self._state_lock:
+                self._remove_crawl_jobs()
+
+    def step_down(self) -> None:
+        """
+        Leader elector callback: stop scheduling; a running crawl or cleanup
+        finishes normally. Jobs and auto_running stay persisted for the next leader.
+        """
+        with self._state_lock:
+            scheduler, self.scheduler = self.scheduler, None
+            if scheduler and scheduler.running:
+                # Also shuts its executor down for good: a re-election builds a new scheduler
+                scheduler.shutdown(wait=False)
+            self.is_auto_running = False
+            self.is_leader = False
+            self._refresh_status()
+
     def shutdown(self) -> None:
         """Gracefully shutdown the crawler and scheduler"""
-        with self.lock:
-            try:
-                if self.scheduler and self.scheduler.running:
-                    self.scheduler.shutdown(wait=True)
+        try:
+            with self._state_lock:
+                scheduler = self.scheduler
                 self.is_auto_running = False
-                logger.info("HybridCrawlerManager shut down gracefully")
-            except Exception as e:
-                logger.error(f"Error during shutdown: {e}")
+                self._refresh_status()
+            # Outside the lock: waiting for a running auto crawl needs _finish_crawl
+            if scheduler and scheduler.running:
+                scheduler.shutdown(wait=True)
+            get_job_manager().shutdown()
+            logger.info("HybridCrawlerManager shut down gracefully")
+        except Exception as e:
+            logger.error(f"Error during shutdown: {e}")
 
 
 # Global instance
@@ -288,3 +836,22 @@ def get_crawler_manager() -> HybridCrawlerManager:
     if _manager is None:
         _manager = HybridCrawlerManager()
     return _manager
+
+
+# Scheduler job entry points. Jobs are stored in a persistent job store, which
+# needs importable functions rather than bound methods.
+
+def run_source_crawl_job(source_id: int) -> None:
+    get_crawler_manager()._source_crawl_job(source_id)
+
+
+def run_source_job_sync() -> None:
+    get_crawler_manager()._sync_source_jobs()
+
+
+def run_cleanup_job(schedule_id: int) -> None:
+    get_crawler_manager()._cleanup_job(schedule_id)
+
+
+def run_cleanup_job_sync() -> None:
+    get_crawler_manager().sync_cleanup_jobs()
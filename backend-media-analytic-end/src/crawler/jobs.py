@@ -0,0 +1,352 @@
+"""
+Crawl job subsystem
+Runs blocking crawl work on a thread pool so API handlers return immediately
+with a job id; progress, per-source status and results are read back via
+GET /v1/crawler/jobs/{id}. POST /v1/crawler/jobs/{id}/cancel sets the job's
+cancel event, which the crawl checks before every article fetch.
+
+Jobs are stored in the crawl_jobs table, so every API worker can read, list
+and cancel them whichever worker runs them. The running worker writes
+progress on every event and, every CRAWL_JOB_HEARTBEAT_INTERVAL seconds,
+refreshes a heartbeat and picks up cancellations requested through other
+workers. A single-flight job (submit_once) holds a unique slot per kind in
+the table, so two workers cannot both queue one.
+"""
+
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Callable, List, Tuple
+
+from config import config
+from ..database.repository import (
+    get_session, create_crawl_job, get_crawl_job, get_active_crawl_job, list_crawl_jobs, update_crawl_job,
+    request_crawl_job_cancel, touch_crawl_jobs, fail_stale_crawl_jobs, prune_crawl_jobs,
+)
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+SKIPPED = "skipped"  # per-source status: not crawled because the run stopped early
+
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+def _iso(ts: Optional[datetime]) -> Optional[str]:
+    return ts.isoformat() if ts else None
+
+
+class CrawlJob:
+    """State of one crawl job on the worker running it, updated from crawler progress events"""
+
+    def __init__(self, kind: str) -> None:
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = QUEUED
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.sources_total = 0
+        self.sources_done = 0
+        self.sources: Dict[str, Dict[str, Any]] = {}
+        self.articles_count = 0
+        self.inserted_count = 0
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def handle_event(self, event: str, **data) -> None:
+        """
+        Progress callback passed to NewsCrawler.crawl_all
+
+        Events: crawl_started(sources_total), source_started(source),
+        source_finished(source, articles_count, error, truncated/skipped),
+        articles_saved(articles_count, inserted_count)
+        """
+        now = datetime.utcnow()
+        with self._lock:
+            if event == "crawl_started":
+                self.sources_total = data.get("sources_total", 0)
+            elif event == "source_started":
+                self.sources[data["source"]] = {"status": RUNNING, "articles_count": 0, "error": None,
+                                                "started_at": _iso(now), "finished_at": None}
+            elif event == "source_finished":
+                entry = self.sources.setdefault(data["source"], {"started_at": None})
+                if data.get("skipped"):
+                    status = SKIPPED
+                else:
+                    status = FAILED if data.get("error") else SUCCEEDED
+                entry.update({
+                    "status": status,
+                    "articles_count": data.get("articles_count", 0),
+                    "error": data.get("error"),
+                    "truncated": bool(data.get("truncated")),
+                    "finished_at": _iso(now),
+                })
+                self.sources_done += 1
+            elif event == "articles_saved":
+                self.articles_count = data.get("articles_count", 0)
+                self.inserted_count = data.get("inserted_count", 0)
+            else:
+                return
+        self.save()
+
+    def save(self) -> None:
+        """Write the job's progress and status to the crawl_jobs table"""
+        with self._lock:
+            fields = {
+                "status": self.status,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "sources_total": self.sources_total,
+                "sources_done": self.sources_done,
+                "sources": {name: dict(entry) for name, entry in self.sources.items()},
+                "articles_count": self.articles_count,
+                "inserted_count": self.inserted_count,
+                "result": self.result,
+                "error": self.error,
+            }
+        session = get_session()
+        try:
+            update_crawl_job(session, self.id, **fields)
+        except Exception as e:
+            logger.error(f"Could not save crawl job {self.id}: {e}")
+        finally:
+            session.close()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "job_id": self.id,
+                "kind": self.kind,
+                "status": self.status,
+                "created_at": _iso(self.created_at),
+                "started_at": _iso(self.started_at),
+                "finished_at": _iso(self.finished_at),
+                "progress": {
+                    "sources_total": self.sources_total,
+                    "sources_done": self.sources_done,
+                    "percent": round(100 * self.sources_done / self.sources_total, 1) if self.sources_total else 0.0,
+                },
+                "sources": {name: dict(entry) for name, entry in self.sources.items()},
+                "articles_count": self.articles_count,
+                "inserted_count": self.inserted_count,
+                "result": self.result,
+                "error": self.error,
+                "cancel_requested": self.cancel_event.is_set(),
+            }
+
+
+class CrawlJobManager:
+    """Submits crawl jobs to a thread pool; job state lives in the database"""
+
+    def __init__(self, max_workers: Optional[int] = None, history_size: Optional[int] = None,
+                 heartbeat_interval: Optional[float] = None) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or config.CRAWL_JOB_WORKERS,
+                                           thread_name_prefix="crawl-job")
+        self.history_size = history_size or config.CRAWL_JOB_HISTORY
+        self.heartbeat_interval = heartbeat_interval or config.CRAWL_JOB_HEARTBEAT_INTERVAL
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._local: Dict[str, CrawlJob] = {}  # unfinished jobs run by this worker
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+
+    def submit(self, kind: str, work: Callable[[CrawlJob], Dict[str, Any]]) -> CrawlJob:
+        """
+        Queue a job
+
+        Args:
+            kind: Job type label (e.g. "manual")
+            work: Callable receiving the job (use job.handle_event as progress
+                  callback and job.cancel_event to stop early) and returning
+                  the result dict; a result with status "error" marks the job
+                  failed, "cancelled" marks it cancelled
+
+        Returns:
+            The queued job
+        """
+        job = CrawlJob(kind)
+        session = get_session()
+        try:
+            create_crawl_job(session, job.id, kind, self.worker_id)
+        finally:
+            session.close()
+        self._start(job, work)
+        return job
+
+    def submit_once(self, kind: str, work: Callable[[CrawlJob], Dict[str, Any]]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Queue a job unless one of the same kind is already queued or running
+        on any worker
+
+        A job whose cancellation was requested does not count, nor does a job
+        whose worker stopped sending heartbeats (it is marked failed).
+
+        Args:
+            kind: Job type label (e.g. "manual")
+            work: See submit()
+
+        Returns:
+            (job dict, existing): the queued or running job and True, or the
+            newly queued job and False
+        """
+        job = CrawlJob(kind)
+        session = get_session()
+        try:
+            fail_stale_crawl_jobs(session, datetime.utcnow() - timedelta(seconds=config.CRAWL_JOB_STALE_AFTER))
+            while True:
+                created = create_crawl_job(session, job.id, kind, self.worker_id, single_flight=True)
+                if created is not None:
+                    break
+                existing = get_active_crawl_job(session, kind)
+                if existing is not None:
+                    return existing, True
+                # The active job finished in between: try again
+        finally:
+            session.close()
+        self._start(job, work)
+        return created, False
+
+    def _start(self, job: CrawlJob, work: Callable[[CrawlJob], Dict[str, Any]]) -> None:
+        with self._lock:
+            self._local[job.id] = job
+            if self._heartbeat_thread is None or not self._heartbeat_thread.is_alive():
+                self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, name="crawl-job-heartbeat",
+                                                          daemon=True)
+                self._heartbeat_thread.start()
+        self.executor.submit(self._run, job, work)
+        logger.info(f"Crawl job {job.id} ({job.kind}) queued")
+
+    def _run(self, job: CrawlJob, work: Callable[[CrawlJob], Dict[str, Any]]) -> None:
+        try:
+            self._poll_cancellations()
+            if job.cancel_event.is_set():
+                job.status = CANCELLED
+                job.finished_at = datetime.utcnow()
+                logger.info(f"Crawl job {job.id} cancelled before it started")
+                return
+            job.status = RUNNING
+            job.started_at = datetime.utcnow()
+            job.save()
+            try:
+                result = work(job)
+                job.result = result
+                if isinstance(result, dict) and result.get("status") == "error":
+                    job.status = FAILED
+                    job.error = result.get("message")
+                elif isinstance(result, dict) and result.get("status") == "cancelled":
+                    job.status = CANCELLED
+                else:
+                    job.status = SUCCEEDED
+            except Exception as e:
+                logger.exception(f"Crawl job {job.id} failed")
+                job.status = FAILED
+                job.error = str(e)
+            job.finished_at = datetime.utcnow()
+            logger.info(f"Crawl job {job.id} finished with status {job.status}")
+        finally:
+            job.save()
+            with self._lock:
+                self._local.pop(job.id, None)
+            self._prune()
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stop_event.wait(self.heartbeat_interval):
+            try:
+                self._poll_cancellations()
+            except Exception as e:
+                logger.error(f"Crawl job heartbeat failed: {e}")
+
+    def _poll_cancellations(self) -> None:
+        """Refresh the heartbeat of local jobs and apply cancellations requested on other workers"""
+        with self._lock:
+            jobs = dict(self._local)
+        if not jobs:
+            return
+        session = get_session()
+        try:
+            cancelled = touch_crawl_jobs(session, list(jobs))
+        finally:
+            session.close()
+        for job_id in cancelled:
+            if not jobs[job_id].cancel_event.is_set():
+                jobs[job_id].cancel_event.set()
+                logger.info(f"Crawl job {job_id} cancelled through another worker")
+
+    def _prune(self) -> None:
+        """Drop the oldest finished jobs beyond history_size"""
+        session = get_session()
+        try:
+            prune_crawl_jobs(session, self.history_size)
+        except Exception as e:
+            logger.error(f"Could not prune crawl jobs: {e}")
+        finally:
+            session.close()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """The job dict (from any worker), or None if unknown"""
+        session = get_session()
+        try:
+            return get_crawl_job(session, job_id)
+        finally:
+            session.close()
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Request cancellation of a queued or running job (on any worker)
+
+        A running crawl stops before its next article fetch and still saves
+        what it collected. Cancelling a finished job has no effect. A job run
+        by another worker sees the request within CRAWL_JOB_HEARTBEAT_INTERVAL
+        seconds.
+
+        Returns:
+            The job dict, or None if unknown
+        """
+        session = get_session()
+        try:
+            job = request_crawl_job_cancel(session, job_id)
+        finally:
+            session.close()
+        with self._lock:
+            local = self._local.get(job_id)
+        if local is not None:
+            local.cancel_event.set()
+        if job is not None and job["status"] not in FINISHED:
+            logger.info(f"Cancellation of crawl job {job_id} requested")
+        return job
+
+    def list(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent jobs first"""
+        session = get_session()
+        try:
+            return list_crawl_jobs(session, limit)
+        finally:
+            session.close()
+
+    def shutdown(self) -> None:
+        self._stop_event.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global instance
+_job_manager: Optional[CrawlJobManager] = None
+
+
+def get_job_manager() -> CrawlJobManager:
+    """Get or create the global crawl job manager instance"""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = CrawlJobManager()
+    return _job_manager
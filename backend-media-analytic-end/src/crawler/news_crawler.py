@@ -1,28 +1,40 @@
 import re
+from dataclasses import asdict
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable
 
 import requests
 import feedparser
 
-from bs4 import BeautifulSoup
-
 from config import config
 from ..utils.logger import get_logger
 from ..utils.keyword_extractor import extract_keywords_high_accuracy, format_keywords_for_db
 from ..ml.sentiment_analyzer import SentimentAnalyzer
+from .budget import CrawlBudget, SOURCE_BUDGET
+from .http_client import HttpClient, CircuitOpenError, RETRY_STATUSES, CHUNK_SIZE, get_http_client
+from .html_parser import HtmlElement, HtmlFeed, anchors, first_anchor, select, select_one, text_of
+from .parse_pool import ArticleBatch, ArticleTask, extract_article_text, get_parse_pool, is_authentic_article
+from .pipeline import PersistStage
+from .sitemap import discover_urls
+from .feed_state import FeedState, new_entries, advance, entry_published
 from ..database.repository import (
-    save_articles_bulk,
-    cleanup_old_articles,
     get_sources,
     is_link_active,
     mark_link_inactive,
     mark_link_timeout,
+    mark_link_failed,
     mark_link_active,
+    get_feed_state,
 )
 
 logger = get_logger(__name__)
 
+
+def load_sentiment_analyzer() -> SentimentAnalyzer:
+    """Load the sentiment model (slow; share the instance between crawlers)"""
+    return SentimentAnalyzer(model_path="src/ml/model")
+
+
 class NewsCrawler:
     """
     A crawler for collecting news articles from various sources.
@@ -31,10 +43,16 @@ class NewsCrawler:
     Handles RSS and HTML-based crawling, sentiment analysis, and keyword extraction.
     """
 
-    def __init__(self, db_session: Optional[Any] = None, max_per_source: Optional[int] = None) -> None:
+    def __init__(self, db_session: Optional[Any] = None, max_per_source: Optional[int] = None,
+                 analyzer: Optional[SentimentAnalyzer] = None, http_client: Optional[HttpClient] = None) -> None:
         self.db_session = db_session
         self.max_per_source = max_per_source or config.MAX_ARTICLES_PER_SOURCE
-        self.analyzer = SentimentAnalyzer(model_path="src/ml/model")
+        self.analyzer = analyzer or load_sentiment_analyzer()
+        self.budget: Optional[CrawlBudget] = None  # set by crawl_all
+        self.unchanged_sources = set()  # sources with nothing new since their last successful crawl
+        self.feed_states: Optional[Dict[str, FeedState]] = None  # staged by crawl_all, stored after saving
+        self.queued_urls = set()  # article URLs downloaded in this crawl_all run (dedup across sources)
+        self.http = http_client or get_http_client()
         
         # Keywords to exclude (non-authentic articles)
         self.exclude_keywords = [
@@ -65,7 +83,9 @@ class NewsCrawler:
             "viber.com", "line.me", "kakao.com", "wa.me", "whatsa",
         ]
 
-    def _create_article_dict(self, title: str, url: str, source: str, content: str) -> Dict[str, Any]:
+    def _create_article_dict(self, title: str, url: str, source: str, content: str,
+                             published_date: Optional[datetime] = None, keywords_flagged: Optional[str] = None,
+                             sentiment: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Create a standardized article dictionary with sentiment analysis and high-accuracy keywords.
 
@@ -74,15 +94,20 @@ class NewsCrawler:
             url: Article URL
             source: Source name
             content: Article content
+            published_date: Publish time (UTC) when the source provides it (RSS)
+            keywords_flagged: Keywords already extracted (parse pool); extracted here if None
+            sentiment: Prediction already made (batched); predicted here if None
 
         Returns:
             Dictionary containing article data with sentiment and keywords
         """
-        # Extract keywords dengan akurasi tinggi (judul + konten)
-        keywords = extract_keywords_high_accuracy(title, content, max_keywords=10)
-        keywords_str = format_keywords_for_db(keywords)
-        
-        sentiment_result = self.analyzer.predict(content or title)
+        keywords_str = keywords_flagged
+        if keywords_str is None:
+            # Extract keywords dengan akurasi tinggi (judul + konten)
+            keywords = extract_keywords_high_accuracy(title, content, max_keywords=10)
+            keywords_str = format_keywords_for_db(keywords)
+
+        sentiment_result = sentiment or self.analyzer.predict(content or title)
 
         return {
             "title": title,
@@ -95,12 +120,14 @@ class NewsCrawler:
             "prob_negative": sentiment_result["prob_negative"],
             "prob_neutral": sentiment_result["prob_neutral"],
             "prob_positive": sentiment_result["prob_positive"],
+            "published_date": published_date,
             "crawled_date": datetime.utcnow(),
         }
 
     def _is_authentic_article(self, title: str, url: str, content: str) -> bool:
         """
         Filter articles to keep only authentic news articles and exclude non-article pages.
+        (see parse_pool.is_authentic_article)
         
         Args:
             title: Article title
@@ -110,37 +137,7 @@ class NewsCrawler:
         Returns:
             True if article is authentic, False otherwise
         """
-        # Check content length (articles should have substantial content)
-        if not content or len(content) < 200:
-            return False
-        
-        # Check title length
-        if not title or len(title.strip()) < 5:
-            return False
-        
-        # For Lampung Pro, URL filtering is already strict (/news/ path, lampungpro.co domain)
-        # so we can skip exclude keyword checks to avoid false negatives
-        # For Detik, also relax checks since they have good editorial standards
-        if "lampungpro.co" not in url.lower() and "detik.com" not in url.lower():
-            # Check URL and title for exclude keywords (for other sources)
-            combined_text = (title + " " + url).lower()
-            for keyword in self.exclude_keywords:
-                if keyword in combined_text:
-                    return False
-            
-            # Check if content has article markers (paragraphs, sentences, etc)
-            # Articles typically have multiple sentences or significant text
-            sentence_count = combined_text.count(".") + combined_text.count("!") + combined_text.count("?")
-            if sentence_count < 2:
-                return False
-        else:
-            # For Lampung Pro and Detik, just check that title+content has some punctuation
-            combined = (title + " " + content).lower()
-            sentence_count = combined.count(".") + combined.count("!") + combined.count("?")
-            if sentence_count < 1:
-                return False
-        
-        return True
+        return is_authentic_article(title, url, content, self.exclude_keywords)
 
     def _is_valid_article_url(self, url: str, allowed_domain: str = None) -> bool:
         """
@@ -191,18 +188,172 @@ class NewsCrawler:
         
         return True
 
-    def crawl_all(self):
+    def _out_of_time(self, source_name: str) -> bool:
+        """True once the crawl was cancelled or its run/source time budget is spent"""
+        if self.budget is None:
+            return False
+        reason = self.budget.exhausted()
+        if reason:
+            logger.info(f"{source_name}: stopped fetching articles ({reason})")
+            return True
+        return False
+
+    def _get(self, url: str, timeout: float, **kwargs) -> requests.Response:
+        """GET through the shared retrying client; timeouts are capped to the crawl budget"""
+        return self.http.get_page(url, timeout=timeout, budget=self.budget, content_types=None, **kwargs)
+
+    def _fetch_html(self, url: str, timeout: float, **kwargs) -> HtmlElement:
+        """
+        GET an HTML page and parse it while it downloads
+
+        Raises:
+            requests.exceptions.HTTPError: Error status
+            UnsupportedContentType, ResponseTooLarge: Not an HTML page or over the size cap
+        """
+        feed = HtmlFeed()
+        response = self.http.get_page(url, timeout=timeout, budget=self.budget, on_chunk=feed.feed, **kwargs)
+        response.raise_for_status()
+        return feed.close()
+
+    def _new_batch(self) -> ArticleBatch:
+        """Parse batch of one source's article pages (see parse_pool.py)"""
+        return ArticleBatch(get_parse_pool(), self.max_per_source)
+
+    def _queue_article(self, batch: ArticleBatch, url: str, title: str, source_name: str,
+                       content_selectors: Optional[List[str]] = None, min_content: int = 200, content: str = "",
+                       fetch: bool = True, prefer_page: bool = False,
+                       published_date: Optional[datetime] = None) -> bool:
+        """
+        Download an article page and hand it to the parse pool
+
+        Args:
+            batch: The source's batch
+            content: Text already known (RSS); with fetch=False only this is processed
+            fetch: Download the page
+            prefer_page: Use the page text whenever it has more than 150 characters (else the longer text wins)
+            min_content: Content length below which the article is rejected
+
+        Returns:
+            False if the page was needed but could not be downloaded for now (timeout, host
+            down, budget spent) so the entry should be retried; True once the page was
+            downloaded, no download was needed, the link is given up on (inactive) or the URL
+            was already queued in this run. Known content is queued for parsing either way.
+        """
+        if url in self.queued_urls:
+            return True
+        body = self._download_article(url, source_name) if fetch else None
+        handled = not fetch or bool(body) or not is_link_active(url)
+        if handled:
+            self.queued_urls.add(url)
+        if body or content:
+            batch.add(ArticleTask(
+                url, title, source_name, body, content, prefer_page, tuple(content_selectors or ()),
+                min_content, tuple(self.exclude_keywords), published_date,
+            ))
+        return handled
+
+    def _finish_batch(self, batch: ArticleBatch) -> List[Dict[str, Any]]:
+        """Wait for the batch and build the accepted articles, with sentiment predicted in one batch"""
+        for parsed in batch.results():
+            if parsed.page_text:
+                # Mark link as active on successful fetch
+                mark_link_active(parsed.url)
+        accepted = batch.accepted()
+        sentiments = self._predict_sentiments([parsed.content or parsed.title for parsed in accepted])
+        return [
+            self._create_article_dict(parsed.title, parsed.url, parsed.source, parsed.content, parsed.published_date,
+                                      keywords_flagged=parsed.keywords_flagged, sentiment=sentiment)
+            for parsed, sentiment in zip(accepted, sentiments)
+        ]
+
+    def _predict_sentiments(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Sentiment of several texts; in chunks of BATCH_SIZE when the analyzer has predict_batch"""
+        predict_batch = getattr(self.analyzer, "predict_batch", None)
+        if predict_batch is None:
+            return [self.analyzer.predict(text) for text in texts]
+        results = []
+        for start in range(0, len(texts), config.BATCH_SIZE):
+            results.extend(predict_batch(texts[start:start + config.BATCH_SIZE]))
+        return results
+
+    def _load_feed_state(self, source_name: str) -> Optional[FeedState]:
+        """Stored high-water mark of a source's feed; None (every entry is new) outside crawl_all"""
+        if self.feed_states is None or not self.db_session:
+            return None
+        stored = get_feed_state(self.db_session, source_name)
+        return FeedState(**stored) if stored else None
+
+    def _stage_feed_state(self, source_name: str, state: Optional[FeedState], processed: list,
+                          complete: bool) -> None:
+        """Remember the feed's new high-water mark; crawl_all stores it once the articles are saved"""
+        if self.feed_states is not None:
+            self.feed_states[source_name] = advance(state, processed, complete)
+
+    def crawl_all(self, progress: Optional[Callable[..., None]] = None, source_ids: Optional[List[int]] = None,
+                  budget: Optional[CrawlBudget] = None):
+        """
+        Crawl every active source and save the results.
+
+        Old articles are removed by the scheduled cleanup jobs, not here.
+
+        Articles go through a PersistStage (see pipeline.py): each source's
+        articles are saved in micro-batches while the next source is crawled,
+        so a failure later in the run keeps what was saved before.
+
+        With a budget, fetching stops once it is cancelled or its deadline
+        passes (remaining sources are skipped) and each source stops after its
+        own time budget; whatever was collected is still saved.
+
+        Args:
+            progress: Optional callback called as progress(event, **data) with
+                      crawl_started, source_started, source_finished (incl.
+                      truncated / skipped) and articles_saved (incl.
+                      inserted_by_source, stop_reason) events
+            source_ids: Only crawl these sources (default: all active sources)
+            budget: Optional run deadline, per-source budget and cancellation
+
+        Returns:
+            Number of crawled articles saved
+        """
         from ..database.repository import record_crawl_result
-        
-        all_articles = []
 
-        # Load sources from database (both hardcoded and user-added)
-        if self.db_session:
+        def notify(event, **data):
+            if progress is None:
+                return
+            try:
+                progress(event, **data)
+            except Exception as e:
+                logger.warning(f"Progress callback failed on {event}: {e}")
+
+        self.budget = budget
+        self.unchanged_sources = set()
+        self.feed_states = {}
+        self.queued_urls = set()
+
+        if not self.db_session:
+            logger.warning("No database session available - crawler cannot run")
+            return 0
+
+        persist = PersistStage()
+        try:
+            # Load sources from database (both hardcoded and user-added)
             sources = get_sources(self.db_session)
+            if source_ids is not None:
+                sources = [s for s in sources if s.id in source_ids]
             logger.info(f"Found {len(sources)} sources in database")
+            notify("crawl_started", sources_total=sum(1 for s in sources if s.active))
             
             for source in sources:
                 if source.active:
+                    reason = budget.exhausted(source_only=True) if budget else None
+                    if reason:
+                        notify("source_finished", source=source.name, articles_count=0, error=None,
+                               skipped=True, reason=reason)
+                        continue
+                    if budget:
+                        budget.start_source()
+                    self.http.rate_limiter.configure_source(source)
+                    notify("source_started", source=source.name)
                     try:
                         logger.info(f"Crawling: {source.name} ({source.crawl_type})")
                         
@@ -221,22 +372,35 @@ class NewsCrawler:
                         
                         # Record crawl result for source health tracking
                         articles_count = len(source_articles)
-                        record_crawl_result(self.db_session, source.id, articles_count)
+                        record_crawl_result(self.db_session, source.id, articles_count,
+                                            unchanged=source.name in self.unchanged_sources)
                         
-                        all_articles.extend(source_articles)
+                        for article in source_articles:
+                            persist.put(article)
+                        state = self.feed_states.pop(source.name, None)
+                        persist.source_done(source.name, asdict(state) if state else None)
+                        stopped = budget.exhausted() if budget else None
+                        if stopped == SOURCE_BUDGET:
+                            logger.warning(f"{source.name}: time budget of {budget.source_seconds}s spent")
+                        notify("source_finished", source=source.name, articles_count=articles_count, error=None,
+                               truncated=bool(stopped))
                     except Exception as e:
                         logger.error(f"Error crawling {source.name}: {e}")
+                        self.feed_states.pop(source.name, None)
                         # Record failure for source health tracking
                         record_crawl_result(self.db_session, source.id, 0, failure_reason=str(e)[:100])
-        else:
-            logger.warning("No database session available - crawler cannot run")
-            return []
-
-        # logger.info(all_articles)
-        save_articles_bulk(all_articles)
-        cleanup_old_articles(days=30)  # hapus data lebih dari 7 hari
-        logger.info(f"Crawling completed - Total articles: {len(all_articles)}")
-        return all_articles
+                        notify("source_finished", source=source.name, articles_count=0, error=str(e)[:200])
+        finally:
+            # Also on errors: save what was crawled so far
+            stats = persist.close()
+
+        if stats["failed_count"]:
+            logger.error(f"{stats['failed_count']} crawled articles could not be saved")
+        notify("articles_saved", articles_count=stats["articles_count"], inserted_count=stats["inserted_count"],
+               inserted_by_source=stats["inserted_by_source"], stop_reason=budget.stop_reason if budget else None)
+        logger.info(f"Crawling completed - Total articles: {stats['articles_count']} "
+                    f"({stats['batches']} batches)")
+        return stats["articles_count"]
 
     def crawl_generic(self, source):
         """Generic crawler for RSS or HTML sources based on config"""
@@ -244,6 +408,8 @@ class NewsCrawler:
             return self._crawl_rss_generic(source)
         elif source.crawl_type == "html":
             return self._crawl_html_generic(source)
+        elif source.crawl_type == "sitemap":
+            return self._crawl_sitemap_generic(source)
         else:
             logger.error(f"Unknown source type: {source.crawl_type}")
             return []
@@ -263,7 +429,7 @@ class NewsCrawler:
         
         try:
             # feedparser.parse() doesn't support timeout parameter, use requests to fetch with timeout
-            response = requests.get(rss_url, headers=headers, timeout=15)
+            response = self._get(rss_url, timeout=15, headers=headers)
             feed = feedparser.parse(response.text)
 
             if feed.bozo:
@@ -278,13 +444,25 @@ class NewsCrawler:
             logger.error(f"Error fetching RSS from {rss_url}: {e}")
             return []
 
-        articles = []
-        for entry in feed.entries[:self.max_per_source]:
+        state = self._load_feed_state(source_name)
+        entries = new_entries(feed.entries, state)
+        if not entries:
+            logger.info(f"{source_name}: no new RSS entries since {state.high_water_mark}")
+            self.unchanged_sources.add(source_name)
+            return []
+
+        content_selectors = self._content_selectors(config)
+        batch = self._new_batch()
+        processed = []
+        for entry in entries[:self.max_per_source]:
+            if self._out_of_time(source_name):
+                break
             try:
                 link = entry.get("link")
                 title = entry.get("title", "").strip()
 
                 if not link or not title:
+                    processed.append(entry)
                     continue
 
                 content = ""
@@ -293,27 +471,21 @@ class NewsCrawler:
                 elif "summary" in entry:
                     content = entry.summary
 
-                # Fallback to HTML if content too short
-                if len(content) < 200:
-                    html_content = self.get_article_content(link, {"name": source_name})
-                    if html_content and len(html_content) > len(content):
-                        content = html_content
-
-                if len(content) < 150:
-                    logger.debug(f"{source_name}: Skipping article with insufficient content: {title[:50]}")
-                    continue
-
-                # Filter only authentic articles
-                if not self._is_authentic_article(title, link, content):
-                    logger.debug(f"{source_name}: Skipping non-authentic article: {title[:50]}")
-                    continue
-
-                articles.append(self._create_article_dict(title, link, source_name, content))
+                # Fallback to HTML if content too short; content checks and the
+                # authenticity filter run in the parse pool
+                if self._queue_article(batch, link, title, source_name, content_selectors, min_content=150,
+                                       content=content, fetch=len(content) < 200,
+                                       published_date=entry_published(entry)):
+                    processed.append(entry)  # else not downloaded: retried next crawl
             except Exception as e:
                 logger.warning(f"{source_name}: Error processing RSS entry: {e}")
                 continue
 
-        logger.info(f"{source_name}: extracted {len(articles)} articles from RSS")
+        articles = self._finish_batch(batch)
+        if batch.rejected:
+            logger.debug(f"{source_name}: skipped RSS entries: {batch.rejected}")
+        self._stage_feed_state(source_name, state, processed, complete=len(processed) == len(entries))
+        logger.info(f"{source_name}: extracted {len(articles)} articles from RSS ({len(entries)} new entries)")
         return articles
 
     def _crawl_html_generic(self, source):
@@ -331,23 +503,27 @@ class NewsCrawler:
 
         link_selector = config.get("link_selector", "a[href]")
         title_selector = config.get("title_selector", "")
-        content_selector = config.get("content_selector", "")
+        content_selectors = self._content_selectors(config)
         filters = config.get("filters", {})
         headers = config.get("headers", {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"})
 
         try:
-            r = requests.get(index_url, headers=headers, timeout=15)
-            r.raise_for_status()
-            soup = BeautifulSoup(r.text, "html.parser")
+            root = self._fetch_html(index_url, timeout=15, headers=headers)
         except Exception as e:
             logger.error(f"{source_name}: Failed fetching index from {index_url}: {e}")
             return []
 
-        candidates = soup.select(link_selector)
+        try:
+            candidates = select(root, link_selector)
+        except ValueError as e:
+            logger.warning(f"{source_name}: {e}, using all links")
+            candidates = anchors(root)
         seen_urls = set()
-        articles = []
+        batch = self._new_batch()
 
         for a in candidates:
+            if self._out_of_time(source_name):
+                break
             try:
                 href = a.get("href", "").strip()
                 if not href:
@@ -369,7 +545,7 @@ class NewsCrawler:
                     continue
 
                 # Additional filter: Skip navigation/UI text
-                text = a.get_text(strip=True)
+                text = text_of(a)
                 if self._is_navigation_text(text):
                     logger.debug(f"{source_name}: Skipping navigation link: {text[:50]}")
                     continue
@@ -384,8 +560,7 @@ class NewsCrawler:
                         skip = True
                         break
                     elif key == "text_contains":
-                        link_text = a.get_text(strip=True)
-                        if value not in link_text:
+                        if value not in text:
                             skip = True
                             break
                 if skip:
@@ -396,46 +571,102 @@ class NewsCrawler:
                 seen_urls.add(href)
 
                 # Get title
-                title = a.get_text(strip=True)
+                title = text
                 if not title and title_selector:
-                    title_el = a.select_one(title_selector)
-                    if title_el:
-                        title = title_el.get_text(strip=True)
+                    title_el = select_one(a, title_selector)
+                    if title_el is not None:
+                        title = text_of(title_el)
                 if not title:
                     title = href.split("/")[-1].replace("-", " ").strip()
 
                 if not title:
                     continue
 
-                # Get content
-                content = self.get_article_content(href, {"name": source_name})
-                if content_selector and content:
-                    # Try to extract specific content
-                    soup_content = BeautifulSoup(content, "html.parser")
-                    content_el = soup_content.select_one(content_selector)
-                    if content_el:
-                        content = content_el.get_text(" ", strip=True)
-
-                if not content or len(content) < 200:
-                    logger.debug(f"{source_name}: Insufficient content for {title[:50]}")
+                # Get content (content checks and the authenticity filter run in the parse pool)
+                self._queue_article(batch, href, title, source_name, content_selectors)
+
+                if batch.full():
+                    break
+            except Exception as e:
+                logger.warning(f"{source_name}: Error processing link: {e}")
+                continue
+
+        articles = self._finish_batch(batch)
+        if batch.rejected:
+            logger.debug(f"{source_name}: skipped articles: {batch.rejected}")
+        logger.info(f"{source_name}: extracted {len(articles)} articles from HTML")
+        return articles
+    
+    def _crawl_sitemap_generic(self, source):
+        """
+        Crawl the article URLs a sitemap (or sitemap index) lists since the source's last successful crawl
+
+        The sitemap is streamed (see sitemap.py); only the newest new URLs are fetched.
+        """
+        source_config = source.config if hasattr(source, 'config') else source.get("config", {})
+        source_name = source.name if hasattr(source, 'name') else source.get("name", "Unknown")
+        base_url = source.base_url if hasattr(source, 'base_url') else source.get("base_url", "")
+        since = (source.last_successful_crawl if hasattr(source, 'last_successful_crawl')
+                 else source.get("last_successful_crawl"))
+
+        sitemap_url = source_config.get("sitemap_url") or (base_url.rstrip("/") + "/sitemap.xml" if base_url else "")
+        if not sitemap_url:
+            logger.error(f"{source_name}: No sitemap_url or base_url in config")
+            return []
+
+        content_selectors = self._content_selectors(source_config)
+        headers = source_config.get("headers", {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"})
+
+        def fetch(url):
+            response = self.http.get(url, timeout=20, budget=self.budget, stream=True, headers=headers)
+            response.raise_for_status()
+            return response.iter_content(CHUNK_SIZE)
+
+        try:
+            entries = discover_urls(
+                fetch, sitemap_url, since=since, limit=self.max_per_source * 3,
+                max_sitemaps=config.SITEMAP_MAX_FILES, max_bytes=config.SITEMAP_MAX_BYTES,
+                should_stop=lambda: self._out_of_time(source_name),
+            )
+        except Exception as e:
+            logger.error(f"{source_name}: Failed reading sitemap {sitemap_url}: {e}")
+            return []
+
+        if not entries:
+            logger.info(f"{source_name}: no new URLs in sitemap since {since}")
+            self.unchanged_sources.add(source_name)
+            return []
+
+        batch = self._new_batch()
+        for entry in entries:
+            if self._out_of_time(source_name):
+                break
+            try:
+                url = entry.url
+                if not is_link_active(url):
+                    logger.debug(f"{source_name}: Skipping inactive link: {url}")
+                    continue
+                if not self._is_valid_article_url(url, base_url):
                     continue
 
-                # Filter only authentic articles
-                if not self._is_authentic_article(title, href, content):
-                    logger.debug(f"{source_name}: Skipping non-authentic article: {title[:50]}")
+                title = entry.title or url.rstrip("/").split("/")[-1].replace("-", " ").strip()
+                if not title:
                     continue
 
-                articles.append(self._create_article_dict(title, href, source_name, content))
+                self._queue_article(batch, url, title, source_name, content_selectors)
 
-                if len(articles) >= self.max_per_source:
+                if batch.full():
                     break
             except Exception as e:
-                logger.warning(f"{source_name}: Error processing link: {e}")
+                logger.warning(f"{source_name}: Error processing sitemap URL: {e}")
                 continue
 
-        logger.info(f"{source_name}: extracted {len(articles)} articles from HTML")
+        articles = self._finish_batch(batch)
+        if batch.rejected:
+            logger.debug(f"{source_name}: skipped sitemap URLs: {batch.rejected}")
+        logger.info(f"{source_name}: extracted {len(articles)} articles from sitemap ({len(entries)} new URLs)")
         return articles
-    
+
     def crawl_source(self, source):
         """
         Crawl a news source (NewsSource object or dictionary)
@@ -463,7 +694,7 @@ class NewsCrawler:
                 base_url = source.base_url if hasattr(source, 'base_url') else source.get("base_url")
                 
                 if base_url:
-                    dynamic = DynamicCrawler()
+                    dynamic = DynamicCrawler(db_session=self.db_session)
                     detection = dynamic.detect_crawl_type(base_url)
                     
                     # Update crawl_type and config based on detection
@@ -492,7 +723,9 @@ class NewsCrawler:
         # Route to appropriate crawler method based on crawl_type
         if crawl_type == "rss":
             articles = self._crawl_rss_generic(source)
-        elif crawl_type in ["sitemap", "html"]:
+        elif crawl_type == "sitemap":
+            articles = self._crawl_sitemap_generic(source)
+        elif crawl_type == "html":
             articles = self._crawl_html_generic(source)
         elif crawl_type == "auto":
             # Fallback to HTML if auto-detection failed
@@ -520,11 +753,7 @@ class NewsCrawler:
         headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"}
 
         try:
-            session = requests.Session()
-            session.headers.update(headers)
-            r = session.get(url, timeout=15)
-            r.raise_for_status()
-            soup = BeautifulSoup(r.text, "html.parser")
+            root = self._fetch_html(url, timeout=15, headers=headers)
         except Exception:
             logger.exception("Kompas: failed fetching index")
             return []
@@ -533,18 +762,20 @@ class NewsCrawler:
         candidates = []
         # target main content blocks if present (best-effort)
         for sel in ["main", ".kp--content", ".container", ".read--list", ".latest__list", ".article__list", ".section--list"]:
-            container = soup.select_one(sel)
-            if container:
-                candidates.extend(container.find_all("a", href=True))
+            container = select_one(root, sel)
+            if container is not None:
+                candidates.extend(anchors(container))
 
         # fallback all anchors if container picks none
         if not candidates:
-            candidates = soup.find_all("a", href=True)
+            candidates = anchors(root)
 
         seen_urls = set()
-        articles = []
+        batch = self._new_batch()
         for a in candidates:
-            href = a["href"].strip()
+            if self._out_of_time("Kompas"):
+                break
+            href = a.get("href", "").strip()
             if not href:
                 continue
 
@@ -570,33 +801,29 @@ class NewsCrawler:
             seen_urls.add(href)
 
             # title heuristic: text of anchor or parent heading
-            title = a.get_text(strip=True)
+            title = text_of(a)
             if not title:
                 # try nearby heading tags
-                parent = a.find_parent()
-                if parent:
+                parent = a.getparent()
+                if parent is not None:
                     for tag in ["h1", "h2", "h3", "h4", "strong"]:
-                        ttag = parent.select_one(tag)
-                        if ttag and ttag.get_text(strip=True):
-                            title = ttag.get_text(strip=True)
+                        ttag = select_one(parent, tag)
+                        if ttag is not None and text_of(ttag):
+                            title = text_of(ttag)
                             break
             if not title:
                 title = href.split("/")[-1].replace("-", " ").strip()
 
-            # fetch article content (this function is already in your class)
-            content = self.get_article_content(href, {"name": "Kompas"})
-            
-            # Filter only authentic articles
-            if not self._is_authentic_article(title, href, content):
-                logger.debug(f"Kompas: Skipping non-authentic article: {title}")
-                continue
-            
-            articles.append(self._create_article_dict(title, href, "Kompas", content))
+            # fetch article content; the authenticity filter runs in the parse pool
+            self._queue_article(batch, href, title, "Kompas")
 
             # break early if reached per-source max
-            if len(articles) >= self.max_per_source:
+            if batch.full():
                 break
 
+        articles = self._finish_batch(batch)
+        if batch.rejected:
+            logger.debug(f"Kompas: skipped articles: {batch.rejected}")
         logger.info(f"Kompas: found {len(articles)} articles")
         return articles
 
@@ -608,24 +835,24 @@ class NewsCrawler:
         headers = {"User-Agent": "Mozilla/5.0"}
 
         try:
-            r = requests.get(url, headers=headers, timeout=15)
-            r.raise_for_status()
-            soup = BeautifulSoup(r.text, "html.parser")
+            root = self._fetch_html(url, timeout=15, headers=headers)
         except Exception as e:
             logger.error(f"Detik: Gagal fetch halaman: {e}")
             return []
 
-        articles = []
+        batch = self._new_batch()
         seen_urls = set()
         total_links = 0
         skipped_count = {}
 
         # Fetch all article links from article elements
-        for article_elem in soup.select("article"):
+        for article_elem in select(root, "article"):
+            if self._out_of_time("Detik"):
+                break
             try:
                 # Find link within article
-                link_elem = article_elem.find("a", href=True)
-                if not link_elem:
+                link_elem = first_anchor(article_elem)
+                if link_elem is None:
                     continue
                 
                 link = link_elem.get("href")
@@ -653,15 +880,15 @@ class NewsCrawler:
                 
                 # Try h2, h3, or strong in article first
                 for selector in ["h2", "h3", "strong", "a.title"]:
-                    title_elem = article_elem.find(selector)
-                    if title_elem:
-                        title = title_elem.get_text(strip=True)
+                    title_elem = select_one(article_elem, selector)
+                    if title_elem is not None:
+                        title = text_of(title_elem)
                         if title and len(title) > 5:
                             break
                 
                 # Fallback to link text if no title found
                 if not title or len(title) < 5:
-                    title = link_elem.get_text(strip=True)
+                    title = text_of(link_elem)
                 
                 # Last resort: extract from URL slug
                 if not title or len(title) < 5:
@@ -673,32 +900,20 @@ class NewsCrawler:
                     skipped_count[reason] = skipped_count.get(reason, 0) + 1
                     continue
                 
-                # Fetch content
-                content = self.get_article_content(link, {"name": "Detik"})
-                
-                # Validate content
-                if not content or len(content) < 150:
-                    reason = "Content too short"
-                    skipped_count[reason] = skipped_count.get(reason, 0) + 1
-                    continue
-                
-                # Filter only authentic articles
-                if not self._is_authentic_article(title, link, content):
-                    reason = "Not authentic"
-                    skipped_count[reason] = skipped_count.get(reason, 0) + 1
-                    continue
-                
-                logger.debug(f"Detik: Accepted: {title[:50]}")
-                articles.append(self._create_article_dict(title, link, "Detik", content))
+                # Fetch content (validated and filtered in the parse pool)
+                self._queue_article(batch, link, title, "Detik", min_content=150)
                 
                 # Fetch up to max articles
-                if len(articles) >= self.max_per_source:
+                if batch.full():
                     break
 
             except Exception as e:
                 logger.debug(f"Detik: Error processing article: {e}")
                 continue
 
+        articles = self._finish_batch(batch)
+        for reason, count in batch.rejected.items():
+            skipped_count[reason] = skipped_count.get(reason, 0) + count
         logger.info(f"Detik: Processed {total_links} links -> {len(articles)} artikel")
         if skipped_count:
             logger.debug(f"Detik skip reasons: {skipped_count}")
@@ -725,22 +940,20 @@ class NewsCrawler:
         }
 
         try:
-            r = requests.get(url, headers=headers, timeout=20)
-            r.raise_for_status()
-            soup = BeautifulSoup(r.text, "html.parser")
+            root = self._fetch_html(url, timeout=20, headers=headers)
         except Exception:
             logger.exception("Radar Lampung: gagal fetch halaman utama")
             return []
 
-        articles = []
+        batch = self._new_batch()
         seen_urls = set()
 
         # Radar Lampung (Disway) menyebar link artikel di banyak container
-        anchors = soup.find_all("a", href=True)
-
-        for a in anchors:
+        for a in anchors(root):
+            if self._out_of_time("Radar Lampung"):
+                break
             try:
-                href = a["href"].strip()
+                href = a.get("href", "").strip()
 
                 if not href:
                     continue
@@ -768,30 +981,22 @@ class NewsCrawler:
                     continue
                 seen_urls.add(href)
 
-                title = a.get_text(strip=True)
+                title = text_of(a)
                 if not title or len(title) < 10:
                     continue
 
-                # ambil konten artikel
-                content = self.get_article_content(href, {"name": "Radar"})
+                # ambil konten artikel (validasi konten & filter di parse pool)
+                self._queue_article(batch, href, title, "Radar Lampung", min_content=300)
 
-                # validasi konten
-                if not content or len(content) < 300:
-                    continue
-
-                # Apply authentic article filter
-                if not self._is_authentic_article(title, href, content):
-                    logger.debug(f"Radar: Skipping non-authentic article: {title}")
-                    continue
-
-                articles.append(self._create_article_dict(title, href, "Radar Lampung", content))
-
-                if len(articles) >= self.max_per_source:
+                if batch.full():
                     break
 
             except Exception:
                 logger.exception("Radar Lampung: gagal parsing artikel")
 
+        articles = self._finish_batch(batch)
+        if batch.rejected:
+            logger.debug(f"Radar: skipped articles: {batch.rejected}")
         logger.info(f"Radar Lampung: berhasil crawl {len(articles)} artikel")
         return articles
 
@@ -808,16 +1013,16 @@ class NewsCrawler:
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
         }
 
-        articles = []
+        batch = self._new_batch()
         seen_urls = set()
 
         try:
-            r = requests.get(lampung_url, headers=headers, timeout=15)
-            r.raise_for_status()
-            soup = BeautifulSoup(r.text, "html.parser")
+            root = self._fetch_html(lampung_url, timeout=15, headers=headers)
             
             # Extract SEMUA links dari halaman
-            for link_elem in soup.find_all("a", href=True):
+            for link_elem in anchors(root):
+                if self._out_of_time("Suara"):
+                    break
                 try:
                     href = link_elem.get("href", "").strip()
                     
@@ -847,7 +1052,7 @@ class NewsCrawler:
                     seen_urls.add(href)
                     
                     # Get title dari link text
-                    title = link_elem.get_text(strip=True)
+                    title = text_of(link_elem)
                     
                     # If title kosong, extract dari URL slug
                     if not title or len(title) < 5:
@@ -866,22 +1071,10 @@ class NewsCrawler:
                         # Actually Lampung is OK - it's the region
                         pass
                     
-                    # Fetch article content
-                    content = self.get_article_content(href, {"name": "Suara"})
+                    # Fetch article content (validated in the parse pool)
+                    self._queue_article(batch, href, title, "Suara", min_content=250)
                     
-                    if not content or len(content) < 250:
-                        logger.debug(f"Suara: Content too short ({len(content)} chars): {title[:40]}")
-                        continue
-                    
-                    # Validate authentic
-                    if not self._is_authentic_article(title, href, content):
-                        logger.debug(f"Suara: Not authentic: {title[:40]}")
-                        continue
-                    
-                    logger.debug(f"Suara: Accepted - {title[:50]}")
-                    articles.append(self._create_article_dict(title, href, "Suara", content))
-                    
-                    if len(articles) >= self.max_per_source:
+                    if batch.full():
                         break
                         
                 except Exception as e:
@@ -891,6 +1084,9 @@ class NewsCrawler:
         except Exception as e:
             logger.warning(f"Suara: Crawl failed: {e}")
 
+        articles = self._finish_batch(batch)
+        if batch.rejected:
+            logger.debug(f"Suara: skipped articles: {batch.rejected}")
         logger.info(f"Suara: {len(articles)} artikel")
         return articles
         
@@ -913,53 +1109,58 @@ class NewsCrawler:
 
         
         rss_url = "https://lampung.tribunnews.com/rss"
-        feed = feedparser.parse(rss_url, request_headers=HEADERS_TRIBUN)
+        # Fetch with requests: feedparser.parse(url) has no timeout
+        try:
+            response = self._get(rss_url, timeout=15, headers=HEADERS_TRIBUN)
+            feed = feedparser.parse(response.content)
+        except Exception as e:
+            logger.error(f"Error fetching Tribun Lampung RSS: {e}")
+            return []
 
         if feed.bozo:
             logger.warning("Tribun Lampung RSS bozo error (encoding issue), prioritizing HTML crawling")
             # Don't return empty - try to parse entries despite bozo flag
 
-        articles = []
+        state = self._load_feed_state("Tribun Lampung")
+        entries = new_entries(feed.entries, state)
+        if feed.entries and not entries:
+            logger.info(f"Tribun Lampung: no new RSS entries since {state.high_water_mark}")
+            self.unchanged_sources.add("Tribun Lampung")
+            return []
+
+        batch = self._new_batch()
+        processed = []
 
-        for entry in feed.entries[: self.max_per_source]:
+        for entry in entries[: self.max_per_source]:
+            if self._out_of_time("Tribun Lampung"):
+                break
             link = entry.get("link")
             title = entry.get("title", "").strip()
 
             if not link or not title:
+                processed.append(entry)
                 continue
 
             # === PRIORITAS HTML CRAWLING (RSS summary is low quality) ===
             # Tribun Lampung RSS summary hanya berisi image embed, bukan artikel content
             # Lebih baik fetch HTML langsung untuk content extraction
+            # === FALLBACK ke RSS CONTENT jika HTML gagal ===
             content = ""
-            
-            html_content = self.get_article_content(
-                link,
-                {"name": "Tribun Lampung"}
-            )
-            
-            if html_content and len(html_content) > 150:
-                content = html_content
-            else:
-                # === FALLBACK ke RSS CONTENT jika HTML gagal ===
-                if "content" in entry and entry.content:
-                    content = entry.content[0].value
-                elif "summary" in entry:
-                    content = entry.summary
-
-            # VALIDASI MINIMAL
-            if len(content) < 150:
-                logger.debug(f"Tribun Lampung: Content too short ({len(content)} chars): {title}")
-                continue
-
-            # Apply authentic article filter
-            if not self._is_authentic_article(title, link, content):
-                logger.debug(f"Tribun Lampung: Skipping non-authentic article: {title}")
-                continue
-
-            articles.append(self._create_article_dict(title, link, "Tribun Lampung", content))
+            if "content" in entry and entry.content:
+                content = entry.content[0].value
+            elif "summary" in entry:
+                content = entry.summary
+
+            # Validasi minimal & filter authentic di parse pool
+            if self._queue_article(batch, link, title, "Tribun Lampung", min_content=150, content=content,
+                                   prefer_page=True, published_date=entry_published(entry)):
+                processed.append(entry)  # else the page failed (summary is only an image): retried next crawl
             # time.sleep(5)
 
+        articles = self._finish_batch(batch)
+        if batch.rejected:
+            logger.debug(f"Tribun Lampung: skipped entries: {batch.rejected}")
+        self._stage_feed_state("Tribun Lampung", state, processed, complete=len(processed) == len(entries))
         logger.info(f"Tribun Lampung: {len(articles)} artikel")
         return articles
     
@@ -971,19 +1172,17 @@ class NewsCrawler:
         headers = {"User-Agent": "Mozilla/5.0"}
 
         try:
-            r = requests.get(base, headers=headers, timeout=15)
-            r.raise_for_status()
-            home_soup = BeautifulSoup(r.text, "html.parser")
+            home_root = self._fetch_html(base, timeout=15, headers=headers)
         except Exception:
             logger.exception("Lampung Pro: gagal fetch")
             return []
 
-        articles = []
+        batch = self._new_batch()
         seen = set()
 
         # Find category page links on homepage
         category_urls = set()
-        for link in home_soup.find_all("a", href=True):
+        for link in anchors(home_root):
             href = link.get("href", "").strip()
             if "/kategori/news/" in href:
                 if href.startswith("/"):
@@ -994,17 +1193,19 @@ class NewsCrawler:
 
         # Crawl articles from each category page
         for cat_url in list(category_urls)[:5]:  # Limit to 5 categories
+            if self._out_of_time("Lampung Pro"):
+                break
             try:
-                r = requests.get(cat_url, headers=headers, timeout=15)
-                r.raise_for_status()
-                soup = BeautifulSoup(r.text, "html.parser")
+                root = self._fetch_html(cat_url, timeout=15, headers=headers)
             except Exception:
                 logger.debug(f"Lampung Pro: Failed to fetch category: {cat_url[:50]}")
                 continue
 
             # Extract article links from category page
-            for a in soup.find_all("a", href=True):
-                href = a["href"].strip()
+            for a in anchors(root):
+                if self._out_of_time("Lampung Pro"):
+                    break
+                href = a.get("href", "").strip()
                 if not href:
                     continue
                 if href.startswith("/"):
@@ -1023,25 +1224,19 @@ class NewsCrawler:
                     continue
                 seen.add(href)
 
-                title = a.get_text(strip=True)
+                title = text_of(a)
                 if not title or len(title) < 5:
                     continue
 
-                content = self.get_article_content(href, {"name": "Lampung Pro"})
-                if not content or len(content) < 150:
-                    continue
-                if not self._is_authentic_article(title, href, content):
-                    continue
+                self._queue_article(batch, href, title, "Lampung Pro", min_content=150)
 
-                logger.debug(f"Lampung Pro: Accepted - {title[:50]}")
-                articles.append(self._create_article_dict(title, href, "Lampung Pro", content))
-
-                if len(articles) >= self.max_per_source:
+                if batch.full():
                     break
             
-            if len(articles) >= self.max_per_source:
+            if batch.full():
                 break
 
+        articles = self._finish_batch(batch)
         logger.info(f"Lampung Pro: {len(articles)} artikel")
         return articles
     
@@ -1087,28 +1282,61 @@ class NewsCrawler:
             'crawled_date': datetime.utcnow()
         }
     
-    def get_article_content(self, url, source=None):
+    @staticmethod
+    def _content_selectors(source_config: Optional[Dict[str, Any]]) -> List[str]:
+        """content_selector of a source config (a CSS selector or a list of them)"""
+        selectors = (source_config or {}).get("content_selector") or []
+        return [selectors] if isinstance(selectors, str) else list(selectors)
+
+    def get_article_content(self, url, source=None, content_selectors: Optional[List[str]] = None):
         """
         Fetch article content from a URL with timeout handling and link status tracking.
         
         Args:
             url: Article URL to fetch
             source: Source information (dict with 'name' key)
+            content_selectors: CSS selectors of the source (config["content_selector"]),
+                tried on the fetched page before the built-in ones
             
         Returns:
             Article content text, or empty string if fetch fails
         """
+        source_name = source.get("name", "Unknown") if source else "Unknown"
+        feed = HtmlFeed()
+        if self._download_article(url, source_name, on_chunk=feed.feed) is None:
+            return ""
+
+        content = extract_article_text(feed.close(), content_selectors or [], source_name)
+        if content:
+            # Mark link as active on successful fetch
+            mark_link_active(url)
+        return content
+
+    def _download_article(self, url: str, source_name: str,
+                          on_chunk: Optional[Callable[[bytes], None]] = None) -> Optional[bytes]:
+        """
+        Download an article page, tracking link status on failures
+
+        Args:
+            on_chunk: Receives the body while it downloads (incremental parsing)
+
+        Returns:
+            The raw page, or None if it was skipped or failed
+        """
+        if self.budget and self.budget.exhausted():
+            return None
+
         # Check if link is marked as inactive - skip if it is
         if not is_link_active(url):
             logger.debug(f"Skipping inactive link: {url}")
-            return ""
-        
-        source_name = source.get("name", "Unknown") if source else "Unknown"
-        
+            return None
+
         try:
-            r = requests.get(
-                url, 
-                timeout=20, 
+            response = self.http.get_page(
+                url,
+                timeout=20,
+                budget=self.budget,
+                on_chunk=on_chunk,
                 headers={
                     "User-Agent": (
                         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -1118,72 +1346,42 @@ class NewsCrawler:
                     "Referer": "https://lampung.tribunnews.com"
                 }
             )
-            r.raise_for_status()
-            soup = BeautifulSoup(r.content, "lxml")
-
-            selectors = [
-                "div.post-content",          # Radar Lampung (Disway)
-                "div.post-body",             # fallback Disway
-                "div#article-content",       # Kompas
-                "div.read__content",         # Kompas
-                "div.detail__body-text",     # Detik
-                "div.content-article",       # Suara
-                "div.box-content",           # Tribun Lampung (TribunOS)
-                "div.col-8",                 # Tribun detail page
-                "article"
-            ]
-
-            for sel in selectors:
-                el = soup.select_one(sel)
-                if el:
-                    content = el.get_text(" ", strip=True)
-                    if content:
-                        # Mark link as active on successful fetch
-                        mark_link_active(url)
-                        return content
-            
-            # Fallback for Lampung Pro: Find div with multiple paragraphs (content container)
-            divs = soup.find_all("div")
-            for div in divs:
-                direct_paragraphs = div.find_all("p", recursive=False)
-                if len(direct_paragraphs) >= 3:  # Article content containers have multiple direct p tags
-                    content = div.get_text(" ", strip=True)
-                    if content and len(content) > 100:
-                        mark_link_active(url)
-                        return content
-
-            content = soup.get_text(" ", strip=True)
-            if content:
-                # Mark link as active on successful fetch
-                mark_link_active(url)
-            return content
-            
+            response.raise_for_status()
+            return response.content
+        except CircuitOpenError:
+            # The host is down, not this URL: leave its link status alone
+            logger.debug(f"Skipping {source_name} article, host circuit open: {url}")
+            return None
+
         except requests.exceptions.Timeout:
             logger.warning(f"Timeout fetching {source_name} article: {url}")
             mark_link_timeout(url, source_name)
-            return ""
+            return None
             
         except requests.exceptions.ConnectionError:
             logger.warning(f"Connection error fetching {source_name} article: {url}")
-            mark_link_inactive(url, "Connection error", source_name)
-            return ""
+            mark_link_failed(url, "Connection error", source_name)
+            return None
             
         except requests.exceptions.HTTPError as e:
-            status_code = e.response.status_code if e.response else "Unknown"
+            status_code = e.response.status_code if e.response is not None else "Unknown"
             logger.warning(f"HTTP {status_code} error fetching {source_name} article: {url}")
             reason = f"HTTP {status_code} Error" if status_code != "Unknown" else "HTTP Error"
-            mark_link_inactive(url, reason, source_name)
-            return ""
+            if status_code in RETRY_STATUSES:
+                mark_link_failed(url, reason, source_name)
+            else:
+                mark_link_inactive(url, reason, source_name)
+            return None
             
         except requests.exceptions.RequestException as e:
             logger.warning(f"Request error fetching {source_name} article: {url} - {str(e)}")
             mark_link_inactive(url, f"Request error: {str(e)[:100]}", source_name)
-            return ""
+            return None
             
         except Exception as e:
             logger.exception(f"Unexpected error fetching {source_name} article: {url}")
             mark_link_inactive(url, f"Error: {str(e)[:100]}", source_name)
-            return ""
+            return None
 
     def _is_navigation_text(self, text: str) -> bool:
         """
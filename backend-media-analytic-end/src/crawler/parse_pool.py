@@ -0,0 +1,286 @@
+"""
+Process-pool parsing stage for article pages
+Parsing a page, extracting its body text and keywords and the authenticity
+filter are CPU-bound Python; in the crawler process they share one core under
+the GIL. With PARSE_POOL_WORKERS > 0 the raw page bodies are shipped to worker
+processes instead, which return the title, content, keywords and the filter
+decision. Sentiment inference stays in the crawler process, batched per source
+(the model is loaded once).
+
+A crawler adds each downloaded page to an ArticleBatch and goes on fetching
+while earlier pages are parsed, so downloads overlap parsing and parsing
+spreads over the cores. With PARSE_POOL_WORKERS = 0 pages are parsed inline.
+"""
+
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Optional, List, Dict, Tuple, Iterable, NamedTuple
+
+from config import config
+from ..utils.logger import get_logger
+from ..utils.keyword_extractor import extract_keywords_high_accuracy, format_keywords_for_db
+from .html_parser import HtmlElement, parse_html, select_one, text_of
+from .content_extractor import extract_main_content
+
+logger = get_logger(__name__)
+
+# Article containers of the hardcoded sources, tried after a source's own content_selector
+CONTENT_SELECTORS = (
+    "div.post-content",          # Radar Lampung (Disway)
+    "div.post-body",             # fallback Disway
+    "div#article-content",       # Kompas
+    "div.read__content",         # Kompas
+    "div.detail__body-text",     # Detik
+    "div.content-article",       # Suara
+    "div.box-content",           # Tribun Lampung (TribunOS)
+    "div.col-8",                 # Tribun detail page
+    "article",
+)
+
+# Rejection reasons of ParsedArticle
+TOO_SHORT = "Content too short"
+NOT_AUTHENTIC = "Not authentic"
+FAILED = "Parse error"
+
+
+class ArticleTask(NamedTuple):
+    """An article page to parse (picklable: sent to a worker process)"""
+    url: str
+    title: str
+    source: str
+    body: Optional[bytes] = None  # raw HTML of the article page; None when content is already known
+    content: str = ""  # text known beforehand (RSS summary); the page text replaces it when longer
+    prefer_page: bool = False  # page text over content whenever it has more than 150 characters
+    content_selectors: Tuple[str, ...] = ()  # the source's content_selector
+    min_content: int = 200  # shorter content is rejected
+    exclude_keywords: Tuple[str, ...] = ()  # see is_authentic_article
+    published_date: Optional[datetime] = None
+
+
+class ParsedArticle(NamedTuple):
+    """Result of parse_article"""
+    url: str
+    title: str
+    source: str
+    content: str
+    keywords_flagged: str = ""
+    published_date: Optional[datetime] = None
+    page_text: bool = False  # the page body yielded text (the link works)
+    rejected: Optional[str] = None  # None if accepted, else TOO_SHORT, NOT_AUTHENTIC or FAILED
+
+
+def extract_article_text(root: HtmlElement, content_selectors: Iterable[str] = (),
+                         source_name: str = "Unknown") -> str:
+    """
+    Body text of a parsed article page
+
+    Source-configured selectors are tried first, then the containers of the
+    hardcoded sources, then the main content block by paragraph scoring, then
+    the whole page text.
+    """
+    for sel in list(content_selectors) + list(CONTENT_SELECTORS):
+        try:
+            el = select_one(root, sel)
+        except ValueError as e:
+            logger.warning(f"{source_name}: {e}")
+            continue
+        if el is not None:
+            content = text_of(el, " ")
+            if content:
+                return content
+
+    # Fallback (e.g. Lampung Pro, no known container): main content block by paragraph scoring
+    content = extract_main_content(root, min_length=100)
+    if content:
+        return content
+    return text_of(root, " ")
+
+
+def is_authentic_article(title: str, url: str, content: str, exclude_keywords: Iterable[str]) -> bool:
+    """
+    Filter articles to keep only authentic news articles and exclude non-article pages.
+
+    Args:
+        title: Article title
+        url: Article URL
+        content: Article content
+        exclude_keywords: Words marking non-article pages (NewsCrawler.exclude_keywords)
+
+    Returns:
+        True if article is authentic, False otherwise
+    """
+    # Check content length (articles should have substantial content)
+    if not content or len(content) < 200:
+        return False
+
+    # Check title length
+    if not title or len(title.strip()) < 5:
+        return False
+
+    # For Lampung Pro, URL filtering is already strict (/news/ path, lampungpro.co domain)
+    # so we can skip exclude keyword checks to avoid false negatives
+    # For Detik, also relax checks since they have good editorial standards
+    if "lampungpro.co" not in url.lower() and "detik.com" not in url.lower():
+        # Check URL and title for exclude keywords (for other sources)
+        combined_text = (title + " " + url).lower()
+        for keyword in exclude_keywords:
+            if keyword in combined_text:
+                return False
+
+        # Check if content has article markers (paragraphs, sentences, etc)
+        # Articles typically have multiple sentences or significant text
+        sentence_count = combined_text.count(".") + combined_text.count("!") + combined_text.count("?")
+        if sentence_count < 2:
+            return False
+    else:
+        # For Lampung Pro and Detik, just check that title+content has some punctuation
+        combined = (title + " " + content).lower()
+        sentence_count = combined.count(".") + combined.count("!") + combined.count("?")
+        if sentence_count < 1:
+            return False
+
+    return True
+
+
+def parse_article(task: ArticleTask) -> ParsedArticle:
+    """Parse, extract, filter and extract keywords of one article (runs in a worker process)"""
+    content = task.content or ""
+    page_text = False
+    if task.body:
+        text = extract_article_text(parse_html(task.body), task.content_selectors, task.source)
+        page_text = bool(text)
+        if len(text) > len(content) or (task.prefer_page and len(text) > 150):
+            content = text
+
+    parsed = ParsedArticle(task.url, task.title, task.source, content, published_date=task.published_date,
+                           page_text=page_text)
+    if len(content) < task.min_content:
+        return parsed._replace(rejected=TOO_SHORT)
+    if not is_authentic_article(task.title, task.url, content, task.exclude_keywords):
+        return parsed._replace(rejected=NOT_AUTHENTIC)
+
+    # Extract keywords dengan akurasi tinggi (judul + konten)
+    keywords = extract_keywords_high_accuracy(task.title, content, max_keywords=10)
+    return parsed._replace(keywords_flagged=format_keywords_for_db(keywords))
+
+
+class ParsePool:
+    """Runs parse_article in worker processes (workers > 0) or inline"""
+
+    def __init__(self, workers: int = 0) -> None:
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._executor is None and self.workers > 0:
+                # spawn: forking the multi-threaded API process (schedulers, HTTP pools) is unsafe
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+                logger.info(f"Parse pool started with {self.workers} worker processes")
+            return self._executor
+
+    def submit(self, task: ArticleTask) -> Future:
+        """Future of parse_article(task)"""
+        executor = self._get_executor()
+        if executor is not None:
+            try:
+                return executor.submit(parse_article, task)
+            except (BrokenProcessPool, RuntimeError) as e:
+                # A worker died (e.g. killed for memory): start a fresh pool next time, parse this one here
+                logger.error(f"Parse pool unavailable, parsing inline: {e}")
+                self.shutdown(wait=False)
+
+        future: Future = Future()
+        try:
+            future.set_result(parse_article(task))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+class ArticleBatch:
+    """
+    Article pages of one source in flight in the parse pool
+
+    Results are kept in submission order. full() tells a crawl loop when
+    enough articles were accepted; it only waits for pages still being parsed
+    when they could reach the limit, so fetching goes on meanwhile.
+    """
+
+    def __init__(self, pool: ParsePool, limit: int) -> None:
+        self.pool = pool
+        self.limit = limit
+        self.parsed: List[ParsedArticle] = []
+        self.rejected: Dict[str, int] = {}
+        self._pending = deque()
+        self._accepted = 0
+
+    def add(self, task: ArticleTask) -> None:
+        self._pending.append((task, self.pool.submit(task)))
+
+    def _collect(self, block: bool) -> None:
+        """Take finished results from the front of the queue (waits for the first one if block)"""
+        while self._pending and (block or self._pending[0][1].done()):
+            task, future = self._pending.popleft()
+            block = False
+            try:
+                parsed = future.result()
+            except Exception as e:
+                logger.warning(f"{task.source}: Error parsing {task.url}: {e}")
+                parsed = ParsedArticle(task.url, task.title, task.source, "", rejected=FAILED)
+            self.parsed.append(parsed)
+            if parsed.rejected:
+                self.rejected[parsed.rejected] = self.rejected.get(parsed.rejected, 0) + 1
+            else:
+                self._accepted += 1
+
+    def full(self) -> bool:
+        """limit articles were accepted"""
+        self._collect(block=False)
+        while self._pending and self._accepted < self.limit <= self._accepted + len(self._pending):
+            self._collect(block=True)
+        return self._accepted >= self.limit
+
+    def results(self) -> List[ParsedArticle]:
+        """Wait for every page; all results (accepted and rejected) in submission order"""
+        while self._pending:
+            self._collect(block=True)
+        return self.parsed
+
+    def accepted(self) -> List[ParsedArticle]:
+        """Accepted articles, at most limit"""
+        return [parsed for parsed in self.results() if not parsed.rejected][:self.limit]
+
+
+# Global instance
+_pool: Optional[ParsePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> ParsePool:
+    """Get or create the global parse pool (worker processes start on first use)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParsePool(config.PARSE_POOL_WORKERS)
+        return _pool
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the worker processes of the global parse pool (app shutdown)"""
+    with _pool_lock:
+        pool = _pool
+    if pool is not None:
+        pool.shutdown()
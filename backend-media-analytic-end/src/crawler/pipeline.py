@@ -0,0 +1,146 @@
+"""
+Persist stage of the crawl pipeline
+crawl_all runs as stages: discover and fetch (the source crawlers), dedup (one
+URL set per run, checked before a page is downloaded), extract (parse pool),
+score (sentiment, batched per source) and persist. Persisting runs on its own
+thread fed through a bounded queue; articles are saved in micro-batches as
+sources finish, so:
+
+- memory does not grow with the number of sources (one source's articles plus
+  the queue are held at a time),
+- database writes overlap the next source's downloads,
+- a crash or a failing save loses only the articles not flushed yet.
+
+A source's feed high-water mark is saved only after its articles were
+flushed; if one of its batches failed it is not saved, so the entries are
+fetched again next crawl.
+"""
+
+import queue
+import threading
+from typing import Optional, List, Dict, Any, Callable
+
+from config import config
+from ..utils.logger import get_logger
+from ..database.repository import get_session, save_articles_bulk, save_feed_states
+
+logger = get_logger(__name__)
+
+_ARTICLE = "article"
+_SOURCE_DONE = "source_done"
+
+
+def _save_feed_state(source_name: str, state: Dict[str, Any]) -> None:
+    session = get_session()
+    try:
+        save_feed_states(session, {source_name: state})
+    finally:
+        session.close()
+
+
+class PersistStage:
+    """
+    Writer thread saving crawled articles in micro-batches
+
+    put() blocks while the queue is full (backpressure on the crawlers).
+    Call close() when the crawl is over, also after errors: it flushes what is
+    queued and waits for the writer.
+    """
+
+    def __init__(self, batch_size: Optional[int] = None, queue_size: Optional[int] = None,
+                 flush_seconds: Optional[float] = None,
+                 save: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]] = save_articles_bulk,
+                 save_feed_state: Callable[[str, Dict[str, Any]], None] = _save_feed_state) -> None:
+        """
+        Args:
+            batch_size: Articles per save (default PERSIST_BATCH_SIZE)
+            queue_size: Queued articles before put() blocks (default PIPELINE_QUEUE_SIZE)
+            flush_seconds: Idle time after which a partial batch is saved (default PERSIST_FLUSH_SECONDS)
+            save: Saves a batch, returns the newly inserted articles
+            save_feed_state: Stores the feed high-water mark of a finished source
+        """
+        self.batch_size = batch_size or config.PERSIST_BATCH_SIZE
+        self.flush_seconds = flush_seconds or config.PERSIST_FLUSH_SECONDS
+        self._save = save
+        self._save_feed_state = save_feed_state
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size or config.PIPELINE_QUEUE_SIZE)
+        self._pending: List[Dict[str, Any]] = []
+        self._failed_sources = set()
+
+        self.saved_count = 0
+        self.failed_count = 0
+        self.batches = 0
+        self.inserted_by_source: Dict[str, int] = {}
+
+        self._thread = threading.Thread(target=self._run, name="crawl-persist", daemon=True)
+        self._thread.start()
+
+    def put(self, article: Dict[str, Any]) -> None:
+        self._queue.put((_ARTICLE, article))
+
+    def source_done(self, source_name: str, feed_state: Optional[Dict[str, Any]] = None) -> None:
+        """Flush the source's articles, then store its feed state (if any)"""
+        self._queue.put((_SOURCE_DONE, source_name, feed_state))
+
+    def close(self) -> Dict[str, Any]:
+        """
+        Flush everything queued and stop the writer
+
+        Returns:
+            Dict with articles_count (saved), failed_count, inserted_count,
+            inserted_by_source and batches
+        """
+        self._queue.put(None)
+        self._thread.join()
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "articles_count": self.saved_count,
+            "failed_count": self.failed_count,
+            "inserted_count": sum(self.inserted_by_source.values()),
+            "inserted_by_source": dict(self.inserted_by_source),
+            "batches": self.batches,
+        }
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_seconds)
+            except queue.Empty:
+                self._flush()
+                continue
+            if item is None:
+                self._flush()
+                return
+            if item[0] == _ARTICLE:
+                self._pending.append(item[1])
+                if len(self._pending) >= self.batch_size:
+                    self._flush()
+            else:
+                _, source_name, feed_state = item
+                self._flush()
+                if feed_state is not None and source_name not in self._failed_sources:
+                    try:
+                        self._save_feed_state(source_name, feed_state)
+                    except Exception as e:
+                        logger.error(f"Error saving feed state of {source_name}: {e}")
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        try:
+            inserted = self._save(batch)
+        except Exception as e:
+            # Keep going: later batches (other sources) may still be saved
+            self.failed_count += len(batch)
+            self._failed_sources.update(article.get("source") for article in batch)
+            logger.error(f"Error saving {len(batch)} crawled articles: {e}")
+            return
+        self.batches += 1
+        self.saved_count += len(batch)
+        for article in inserted:
+            source = article.get("source")
+            self.inserted_by_source[source] = self.inserted_by_source.get(source, 0) + 1
+        logger.debug(f"Saved {len(batch)} articles ({len(inserted)} new)")
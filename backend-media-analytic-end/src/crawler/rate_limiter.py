@@ -0,0 +1,197 @@
+"""
+Per-host politeness rate limiting
+Every host gets a token bucket: up to `burst` requests back to back, then
+`requests_per_second` on average. A source can override both in its config:
+
+    {"rate_limit": {"requests_per_second": 0.5, "burst": 1}}
+
+A robots.txt Crawl-delay slows a host down further (one request per delay,
+no burst); the host's limit is re-derived whenever its robots.txt entry is
+refetched (every ROBOTS_CACHE_TTL seconds). Requests reserve a token and
+wait outside the lock, so concurrent fetches of the same host queue up
+instead of all firing at once.
+"""
+
+import threading
+import time
+from typing import Optional, Dict, Any
+from urllib.parse import urlparse
+
+from config import config
+from ..utils.logger import get_logger
+from .robots import RobotsCache, RobotsInfo, get_robots_cache
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate` tokens per second"""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Take a token; returns the seconds to wait before using it"""
+        self._refill(time.monotonic())
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def current_wait(self) -> float:
+        """Seconds a request made now would have to wait"""
+        self._refill(time.monotonic())
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class _HostLimit:
+    def __init__(self, bucket: Optional[TokenBucket], crawl_delay: Optional[float],
+                 robots: Optional[RobotsInfo]) -> None:
+        self.bucket = bucket  # None = unlimited
+        self.crawl_delay = crawl_delay
+        self.robots = robots  # robots.txt entry the limit was derived from
+        self.requests = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+
+
+class HostRateLimiter:
+    """Token bucket per host, configured from source configs and robots.txt"""
+
+    def __init__(self, requests_per_second: Optional[float] = None, burst: Optional[int] = None,
+                 respect_robots: Optional[bool] = None, robots_cache: Optional[RobotsCache] = None) -> None:
+        self.requests_per_second = (config.RATE_LIMIT_REQUESTS_PER_SECOND
+                                    if requests_per_second is None else requests_per_second)
+        self.burst = burst or config.RATE_LIMIT_BURST
+        self.respect_robots = config.RESPECT_ROBOTS_CRAWL_DELAY if respect_robots is None else respect_robots
+        self.robots_cache = robots_cache
+        self._overrides: Dict[str, Dict[str, Any]] = {}
+        self._hosts: Dict[str, _HostLimit] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, url: str, requests_per_second: Optional[float] = None, burst: Optional[int] = None) -> None:
+        """
+        Override the limit of the host of a URL (applies from the next request)
+
+        Args:
+            url: URL (or bare host name) of the host
+            requests_per_second: Average rate; 0 disables limiting for the host
+            burst: Requests allowed back to back
+        """
+        host = _host(url)
+        if not host:
+            return
+        override = {"requests_per_second": requests_per_second, "burst": burst}
+        with self._lock:
+            if self._overrides.get(host) != override:
+                self._overrides[host] = override
+                self._hosts.pop(host, None)
+
+    def configure_source(self, source: Any) -> None:
+        """Apply the `rate_limit` of a NewsSource (or source dict) config to all of its hosts"""
+        source_config = (source.config if hasattr(source, "config") else source.get("config")) or {}
+        limit = source_config.get("rate_limit")
+        if not isinstance(limit, dict):
+            return
+        base_url = source.base_url if hasattr(source, "base_url") else source.get("base_url")
+        for url in {base_url, source_config.get("rss_url"), source_config.get("index_url")}:
+            if url:
+                self.configure(url, limit.get("requests_per_second"), limit.get("burst"))
+
+    def reserve(self, url: str) -> float:
+        """
+        Reserve the next request slot of the URL's host
+
+        Args:
+            url: URL about to be requested
+
+        Returns:
+            Seconds the caller must wait before sending the request
+        """
+        host = _host(url)
+        limit = self._limit(host, url)
+        with self._lock:
+            wait = limit.bucket.reserve() if limit.bucket else 0.0
+            limit.requests += 1
+            if wait > 0:
+                limit.throttled += 1
+                limit.total_wait += wait
+        return wait
+
+    def _limit(self, host: str, url: str) -> _HostLimit:
+        """The host's limit, (re)built on first use and after its robots.txt entry was refetched"""
+        robots = None
+        if self.respect_robots and urlparse(url).path != "/robots.txt":
+            # Outside the lock: the first request of a host, and the first one
+            # after ROBOTS_CACHE_TTL, fetch robots.txt (itself through this
+            # limiter, hence the exception for robots.txt URLs)
+            robots = (self.robots_cache or get_robots_cache()).get(url)
+        with self._lock:
+            limit = self._hosts.get(host)
+            if limit is not None and (robots is None or limit.robots is robots):
+                return limit
+            override = self._overrides.get(host, {})
+
+        rate = override.get("requests_per_second")
+        rate = self.requests_per_second if rate is None else rate
+        burst = override.get("burst") or self.burst
+        crawl_delay = robots.crawl_delay if robots else None
+        if crawl_delay:
+            crawl_delay = min(crawl_delay, config.ROBOTS_MAX_CRAWL_DELAY)
+            rate = min(rate, 1 / crawl_delay) if rate else 1 / crawl_delay
+            burst = 1
+
+        with self._lock:
+            current = self._hosts.get(host)
+            if current is not None and current is not limit:
+                return current  # rebuilt by another thread meanwhile
+            if current is not None and current.bucket and current.bucket.rate == rate \
+                    and current.bucket.burst == burst:
+                bucket = current.bucket  # unchanged: keep the tokens already spent
+            else:
+                bucket = TokenBucket(rate, burst) if rate else None
+                if bucket and current is not None and current.bucket:
+                    # Requests already sent (e.g. robots.txt itself) count against the new limit
+                    current.bucket._refill(time.monotonic())
+                    bucket.tokens = min(bucket.burst, current.bucket.tokens)
+            new = _HostLimit(bucket, crawl_delay, robots)
+            if current is not None:
+                if current.crawl_delay != crawl_delay:
+                    logger.info(f"{host}: robots.txt Crawl-delay changed from {current.crawl_delay} to {crawl_delay}")
+                new.requests, new.throttled, new.total_wait = current.requests, current.throttled, current.total_wait
+            self._hosts[host] = new
+            return new
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Rate, current wait and throttle counts per host"""
+        with self._lock:
+            return {host: {
+                "requests_per_second": round(limit.bucket.rate, 3) if limit.bucket else None,
+                "burst": limit.bucket.burst if limit.bucket else None,
+                "crawl_delay": limit.crawl_delay,
+                "current_wait_seconds": round(limit.bucket.current_wait(), 2) if limit.bucket else 0.0,
+                "requests": limit.requests,
+                "throttled": limit.throttled,
+                "total_wait_seconds": round(limit.total_wait, 2),
+            } for host, limit in self._hosts.items()}
+
+
+def _host(url: str) -> str:
+    return (urlparse(url).netloc or url).lower()
+
+
+# Global instance
+_rate_limiter: Optional[HostRateLimiter] = None
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Get or create the global per-host rate limiter"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = HostRateLimiter()
+    return _rate_limiter
@@ -0,0 +1,144 @@
+"""
+Cached robots.txt lookups
+robots.txt of each host is fetched at most once per ROBOTS_CACHE_TTL seconds
+and shared by the rate limiter (Crawl-delay) and DynamicCrawler (Sitemap).
+The fetch goes through the shared HttpClient, so it waits for the host's
+rate limit and counts against (and respects) the host's circuit breaker.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Dict, List, Any
+from urllib.parse import urlparse
+
+from config import config
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ROBOTS_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+
+@dataclass
+class RobotsInfo:
+    """The parts of a robots.txt the crawler uses"""
+    crawl_delay: Optional[float] = None
+    sitemaps: List[str] = field(default_factory=list)
+
+
+def parse_robots(text: str, agent: str = "*") -> RobotsInfo:
+    """
+    Parse Crawl-delay and Sitemap lines of a robots.txt
+
+    Args:
+        text: robots.txt content
+        agent: Product token whose group is used; the "*" group is the fallback
+
+    Returns:
+        RobotsInfo with the crawl delay of the matching group and all sitemaps
+    """
+    info = RobotsInfo()
+    delays: Dict[str, float] = {}
+    group: List[str] = []
+    in_rules = False  # a User-agent line after rules starts a new group
+
+    for raw in text.splitlines():
+        line = raw.split("#", 1)[0].strip()
+        if ":" not in line:
+            continue
+        key, value = (part.strip() for part in line.split(":", 1))
+        key = key.lower()
+        if key == "user-agent":
+            if in_rules:
+                group, in_rules = [], False
+            group.append(value.lower())
+        elif key == "sitemap":
+            if value:
+                info.sitemaps.append(value)
+        else:
+            in_rules = True
+            if key == "crawl-delay":
+                try:
+                    delay = float(value)
+                except ValueError:
+                    continue
+                for name in group:
+                    delays.setdefault(name, delay)
+
+    agent = agent.lower()
+    info.crawl_delay = delays.get(agent, delays.get("*"))
+    return info
+
+
+class RobotsCache:
+    """robots.txt per host with a time-to-live"""
+
+    def __init__(self, ttl_seconds: Optional[int] = None, http_client: Optional[Any] = None) -> None:
+        self.ttl_seconds = ttl_seconds or config.ROBOTS_CACHE_TTL
+        self.http_client = http_client  # None = the global HttpClient
+        self._entries: Dict[str, tuple] = {}  # base url -> (fetched_at, RobotsInfo)
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+
+    def get(self, url: str) -> RobotsInfo:
+        """
+        robots.txt info of the host of a URL (fetched on first use)
+
+        Args:
+            url: Any URL of the host
+
+        Returns:
+            RobotsInfo (empty if robots.txt is missing or unreachable)
+        """
+        parsed = urlparse(url)
+        base = f"{parsed.scheme or 'https'}://{parsed.netloc.lower()}"
+        with self._lock:
+            entry = self._entries.get(base)
+            if entry and time.monotonic() - entry[0] < self.ttl_seconds:
+                return entry[1]
+            fetch_lock = self._fetch_locks.setdefault(base, threading.Lock())
+
+        # One fetch per host even if several threads need it at once
+        with fetch_lock:
+            with self._lock:
+                entry = self._entries.get(base)
+                if entry and time.monotonic() - entry[0] < self.ttl_seconds:
+                    return entry[1]
+            info = self._fetch(base)
+            with self._lock:
+                self._entries[base] = (time.monotonic(), info)
+            return info
+
+    def _fetch(self, base: str) -> RobotsInfo:
+        # Imported here: http_client -> rate_limiter -> robots
+        from .http_client import get_http_client
+        client = self.http_client or get_http_client()
+        try:
+            response = client.get(base + "/robots.txt", headers={"User-Agent": ROBOTS_USER_AGENT},
+                                  timeout=config.ROBOTS_FETCH_TIMEOUT)
+            if response.status_code >= 400:
+                return RobotsInfo()
+            info = parse_robots(response.text)
+            if info.crawl_delay:
+                logger.info(f"{base}: robots.txt Crawl-delay {info.crawl_delay}s")
+            return info
+        except Exception as e:
+            logger.debug(f"Could not fetch robots.txt of {base}: {e}")
+            return RobotsInfo()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Global instance
+_robots_cache: Optional[RobotsCache] = None
+
+
+def get_robots_cache() -> RobotsCache:
+    """Get or create the global robots.txt cache"""
+    global _robots_cache
+    if _robots_cache is None:
+        _robots_cache = RobotsCache()
+    return _robots_cache
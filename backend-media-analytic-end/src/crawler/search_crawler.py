@@ -0,0 +1,181 @@
+"""
+Keyword-targeted live search over news sources
+Used by POST /v1/crawler/search-crawl after answering from the search index.
+
+- Fetches every source concurrently with one shared deadline, through the
+  shared HttpClient (retries, circuit breakers, per-host rate limits)
+- Stops once the requested number of hits is collected
+- RSS sources: only feed entries whose title/summary match the keyword
+- HTML sources: only index-page links whose anchor text matches the keyword
+- No article pages, sentiment or keyword extraction: results are lightweight
+  hits that are streamed back as each source finishes
+"""
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterator
+from urllib.parse import urljoin
+
+import requests
+import feedparser
+
+from config import config
+from ..utils.logger import get_logger
+from .budget import CrawlBudget
+from .html_parser import parse_html, anchors, text_of
+from .http_client import HttpClient, get_http_client
+
+logger = get_logger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def keyword_tokens(keyword: str) -> List[str]:
+    """Lowercased words of a keyword; a text matches when it contains all of them"""
+    return re.findall(r"\w+", (keyword or "").lower())
+
+
+def matches_keyword(text: str, tokens: List[str]) -> bool:
+    if not tokens or not text:
+        return False
+    text = text.lower()
+    return all(token in text for token in tokens)
+
+
+class KeywordSearchCrawler:
+    """Bounded, concurrent keyword search across active sources"""
+
+    def __init__(self, max_workers: Optional[int] = None, max_per_source: Optional[int] = None,
+                 request_timeout: float = 5.0, http_client: Optional[HttpClient] = None) -> None:
+        self.max_workers = max_workers or config.SEARCH_CRAWL_MAX_WORKERS
+        self.max_per_source = max_per_source or config.MAX_ARTICLES_PER_SOURCE
+        self.request_timeout = request_timeout
+        self.http = http_client or get_http_client()
+
+    def search(self, keyword: str, sources: List[Dict[str, Any]], deadline_seconds: float,
+               limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Search all sources for the keyword, yielding one result per source as
+        soon as it finishes. Sources still running at the deadline are yielded
+        last with timed_out=True.
+
+        Args:
+            keyword: Search keyword or phrase
+            sources: Source dicts (name, base_url, crawl_type, config)
+            deadline_seconds: Total time budget for all sources
+            limit: Stop once this many hits were yielded (the last result is
+                   truncated, sources still running are cancelled)
+
+        Yields:
+            {"source", "articles", "error", "timed_out", "elapsed_ms"}
+        """
+        tokens = keyword_tokens(keyword)
+        if not tokens or not sources:
+            return
+
+        start = time.monotonic()
+        deadline = start + deadline_seconds
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(sources)))
+        futures = {executor.submit(self._search_source, source, tokens, deadline): source for source in sources}
+        pending = set(futures)
+        remaining = limit
+        try:
+            for future in as_completed(futures, timeout=max(deadline - time.monotonic(), 0)):
+                pending.discard(future)
+                source = futures[future]
+                try:
+                    articles, error = future.result(), None
+                except Exception as e:
+                    articles, error = [], str(e)[:200]
+                    logger.warning(f"Search crawl failed for {source['name']}: {e}")
+                if remaining is not None:
+                    articles = articles[:remaining]
+                    remaining -= len(articles)
+                yield {
+                    "source": source["name"],
+                    "articles": articles,
+                    "error": error,
+                    "timed_out": False,
+                    "elapsed_ms": int((time.monotonic() - start) * 1000),
+                }
+                if remaining is not None and remaining <= 0:
+                    logger.info(f"Search crawl limit of {limit} hits reached, {len(pending)} source(s) cancelled")
+                    return
+        except FuturesTimeoutError:
+            logger.info(f"Search crawl deadline reached with {len(pending)} source(s) pending")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for future in pending:
+            yield {
+                "source": futures[future]["name"],
+                "articles": [],
+                "error": None,
+                "timed_out": True,
+                "elapsed_ms": int((time.monotonic() - start) * 1000),
+            }
+
+    def _search_source(self, source: Dict[str, Any], tokens: List[str], deadline: float) -> List[Dict[str, Any]]:
+        source_config = source.get("config") or {}
+        if source_config.get("rss_url"):
+            return self._search_rss(source, source_config["rss_url"], tokens, deadline)
+        index_url = source_config.get("index_url") or source.get("base_url")
+        if index_url:
+            return self._search_html(source, index_url, source_config.get("link_filter"), tokens, deadline)
+        return []
+
+    def _fetch(self, url: str, deadline: float) -> requests.Response:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("Search deadline reached")
+        # The budget caps timeouts, retries and rate-limit waits to the search deadline
+        response = self.http.get_page(url, timeout=self.request_timeout, budget=CrawlBudget(run_seconds=remaining),
+                                      content_types=None, headers={"User-Agent": USER_AGENT})
+        response.raise_for_status()
+        return response
+
+    def _search_rss(self, source, rss_url, tokens, deadline) -> List[Dict[str, Any]]:
+        feed = feedparser.parse(self._fetch(rss_url, deadline).content)
+        hits = []
+        for entry in feed.entries:
+            title = (entry.get("title") or "").strip()
+            link = entry.get("link")
+            summary = _TAG_RE.sub(" ", entry.get("summary") or "").strip()
+            if not title or not link or not matches_keyword(f"{title} {summary}", tokens):
+                continue
+            published = entry.get("published_parsed")
+            hits.append(self._hit(source, title, link, summary,
+                                  datetime(*published[:6]).isoformat() if published else None))
+            if len(hits) >= self.max_per_source:
+                break
+        return hits
+
+    def _search_html(self, source, index_url, link_filter, tokens, deadline) -> List[Dict[str, Any]]:
+        root = parse_html(self._fetch(index_url, deadline).content)
+        hits = []
+        seen = set()
+        for a in anchors(root):
+            title = text_of(a, " ")
+            if len(title) < 10 or not matches_keyword(title, tokens):
+                continue
+            link = urljoin(index_url, a.get("href", "").strip())
+            if link in seen or (link_filter and link_filter not in link):
+                continue
+            seen.add(link)
+            hits.append(self._hit(source, title, link, "", None))
+            if len(hits) >= self.max_per_source:
+                break
+        return hits
+
+    @staticmethod
+    def _hit(source, title, url, summary, published_date) -> Dict[str, Any]:
+        return {
+            "title": title,
+            "url": url,
+            "source": source["name"],
+            "summary": summary[:300],
+            "published_date": published_date,
+        }
@@ -0,0 +1,239 @@
+"""
+Streaming sitemap reader
+Sitemaps, sitemap indexes and gzip'd sitemaps (.xml.gz) are parsed with
+lxml's iterparse while they download: each <url>/<sitemap> element is handled
+and freed as soon as it is complete, so a 50 MB sitemap never sits in memory.
+
+Entries are filtered by <lastmod> / <news:publication_date> against the
+source's last successful crawl; child sitemaps of an index that have not
+changed since then are not fetched at all.
+"""
+
+import gzip
+import heapq
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Iterable, Iterator, Callable, NamedTuple
+
+from lxml import etree
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+NEWS_NS = "http://www.google.com/schemas/sitemap-news/0.9"
+GZIP_MAGIC = b"\x1f\x8b"
+
+_URL_TAGS = ("url", f"{{{SITEMAP_NS}}}url")
+_SITEMAP_TAGS = ("sitemap", f"{{{SITEMAP_NS}}}sitemap")
+
+
+class SitemapEntry(NamedTuple):
+    """A <url> of a sitemap or a <sitemap> of an index"""
+    url: str
+    lastmod: Optional[datetime] = None  # naive UTC
+    title: Optional[str] = None  # <news:title> of news sitemaps
+    is_index: bool = False  # a child sitemap listed by an index
+
+
+class SitemapTooLarge(ValueError):
+    """The (uncompressed) sitemap exceeds the size cap"""
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a W3C datetime ("2026-01-10", "2026-01-10T08:00:00+07:00", "...Z")
+
+    Returns:
+        Naive UTC datetime (like the timestamps stored in the database), or None
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class _ChunkReader:
+    """File-like view of an iterable of byte chunks, raising past max_bytes"""
+
+    def __init__(self, chunks: Iterable[bytes], max_bytes: int = 0) -> None:
+        self._chunks = iter(chunks)
+        self._buffer = b""
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        self.bytes_read += len(data)
+        if self.max_bytes and self.bytes_read > self.max_bytes:
+            raise SitemapTooLarge(f"Sitemap exceeds {self.max_bytes} bytes")
+        return data
+
+    def peek(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        return self._buffer[:size]
+
+
+class _CappedReader:
+    """Counts the bytes read from a stream (the decompressed side of a .gz)"""
+
+    def __init__(self, stream, max_bytes: int) -> None:
+        self._stream = stream
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._stream.read(size)
+        self.bytes_read += len(data)
+        if self.max_bytes and self.bytes_read > self.max_bytes:
+            raise SitemapTooLarge(f"Sitemap exceeds {self.max_bytes} bytes")
+        return data
+
+
+def _open(chunks: Iterable[bytes], max_bytes: int):
+    """File-like of the sitemap XML; gzip'd bodies are decompressed on the fly"""
+    reader = _ChunkReader(chunks)
+    if reader.peek(2) == GZIP_MAGIC:
+        return _CappedReader(gzip.GzipFile(fileobj=reader, mode="rb"), max_bytes)
+    reader.max_bytes = max_bytes
+    return reader
+
+
+def iter_sitemap(chunks: Iterable[bytes], max_bytes: int = 0) -> Iterator[SitemapEntry]:
+    """
+    Stream the entries of a sitemap or sitemap index
+
+    Args:
+        chunks: Body as byte chunks (e.g. response.iter_content()), plain or gzip'd
+        max_bytes: Cap on the uncompressed XML (0 for none)
+
+    Yields:
+        SitemapEntry for every <url> (sitemap) or <sitemap> (index, is_index=True)
+
+    Raises:
+        SitemapTooLarge: The XML exceeds max_bytes
+        lxml.etree.XMLSyntaxError: Not well-formed XML
+    """
+    events = etree.iterparse(
+        _open(chunks, max_bytes), events=("end",), tag=_URL_TAGS + _SITEMAP_TAGS,
+        resolve_entities=False, no_network=True, huge_tree=False,
+    )
+    for _, element in events:
+        loc = lastmod = title = None
+        for child in element.iter(etree.Element):
+            name = child.tag.rpartition("}")[2]
+            if name == "loc" and loc is None:
+                loc = (child.text or "").strip()
+            elif name == "lastmod" and lastmod is None:
+                lastmod = parse_lastmod(child.text)
+            elif name == "publication_date":
+                # News sitemaps: the publication date is the better freshness signal
+                lastmod = parse_lastmod(child.text) or lastmod
+            elif name == "title" and child.tag == f"{{{NEWS_NS}}}title":
+                title = (child.text or "").strip() or None
+        index_entry = element.tag in _SITEMAP_TAGS
+
+        # Free the element and the siblings already handled
+        element.clear()
+        parent = element.getparent()
+        while parent is not None and element.getprevious() is not None:
+            del parent[0]
+
+        if loc:
+            yield SitemapEntry(loc, lastmod, None if index_entry else title, index_entry)
+
+
+def _is_stale(entry: SitemapEntry, since: Optional[datetime]) -> bool:
+    """Not modified after since; a date-only lastmod (midnight) counts for its whole day"""
+    if since is None or entry.lastmod is None:
+        return False
+    lastmod = entry.lastmod
+    if lastmod.hour == lastmod.minute == lastmod.second == lastmod.microsecond == 0:
+        lastmod += timedelta(days=1)
+    return lastmod <= since
+
+
+def _newest_first(entry: SitemapEntry):
+    # Undated entries rank after dated ones; nlargest keeps document order among equals
+    return (entry.lastmod is not None, entry.lastmod or datetime.min)
+
+
+def discover_urls(fetch: Callable[[str], Iterable[bytes]], sitemap_url: str,
+                  since: Optional[datetime] = None, limit: int = 50, max_sitemaps: int = 5,
+                  max_bytes: int = 0, should_stop: Optional[Callable[[], bool]] = None) -> List[SitemapEntry]:
+    """
+    New article URLs of a sitemap (following sitemap indexes)
+
+    Args:
+        fetch: Returns the body chunks of a URL (raises on HTTP errors). A child
+            sitemap that fails to download or parse is logged and skipped
+        sitemap_url: Sitemap or sitemap index URL
+        since: Only URLs modified/published after this (naive UTC); None for all.
+            URLs without a date are kept, they cannot be proven old
+        limit: Newest URLs to return (kept in a bounded heap while streaming)
+        max_sitemaps: Sitemaps fetched per call, including the index
+        max_bytes: Cap on each uncompressed sitemap
+        should_stop: Checked between sitemaps (crawl budget)
+
+    Returns:
+        Up to limit entries, newest first (empty: nothing new)
+
+    Raises:
+        Exception: Fetching or parsing sitemap_url itself failed before any entry was read
+    """
+    newest: List[SitemapEntry] = []
+    pending = [sitemap_url]
+    seen = set()
+    fetched = 0
+
+    while pending and fetched < max_sitemaps:
+        if should_stop and should_stop():
+            break
+        url = pending.pop(0)
+        if url in seen:
+            continue
+        seen.add(url)
+        fetched += 1
+
+        children: List[SitemapEntry] = []
+        fresh: List[SitemapEntry] = []
+        try:
+            for entry in iter_sitemap(fetch(url), max_bytes):
+                if _is_stale(entry, since):
+                    continue
+                if entry.is_index:
+                    children.append(entry)
+                else:
+                    fresh.append(entry)
+                    if len(fresh) >= limit * 4:
+                        fresh = heapq.nlargest(limit, fresh, key=_newest_first)
+        except Exception as e:
+            if url == sitemap_url and not fresh and not children:
+                raise
+            logger.warning(f"Sitemap {url}: {e} (keeping {len(fresh)} entries read so far)")
+
+        newest = heapq.nlargest(limit, newest + fresh, key=_newest_first)
+        # Changed child sitemaps, most recently modified first
+        pending.extend(child.url for child in sorted(children, key=_newest_first, reverse=True))
+
+    return newest
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, Date, Text, Boolean, JSON, ForeignKey, LargeBinary, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
@@ -49,6 +49,15 @@ class NewsSource(Base):
     last_crawl_article_count = Column(Integer, default=0)  # Number of articles in last crawl
     failure_reason = Column(String(255), nullable=True)  # Reason why source is inactive
     inactivity_detected_at = Column(DateTime, nullable=True)  # When inactivity was detected
+
+    # Adaptive per-source scheduling
+    crawl_interval_seconds = Column(Integer, nullable=True)  # Current adaptive interval (NULL = default)
+    last_crawl_inserted_count = Column(Integer, default=0)  # New (not yet stored) articles in last crawl
+    last_crawled_at = Column(DateTime, nullable=True)  # Last scheduled crawl attempt
+
+    # Incremental RSS crawling (see crawler/feed_state.py)
+    feed_high_water_mark = Column(DateTime, nullable=True)  # Newest entry publish time processed
+    feed_seen_guids = Column(JSON, nullable=True)  # GUIDs of entries already processed (newest first)
     
     deleted_at = Column(DateTime, nullable=True)  # Soft delete support
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -100,3 +109,110 @@ class CleanupSchedule(Base):
     active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class KeywordBackfillCheckpoint(Base):
+    """Resumable progress of a keyword re-extraction backfill run"""
+    __tablename__ = 'keyword_backfill_checkpoints'
+
+    id = Column(Integer, primary_key=True)
+    job_name = Column(String(100), unique=True, nullable=False)
+    last_article_id = Column(Integer, default=0)  # highest article id already processed
+    processed_count = Column(Integer, default=0)
+    updated_count = Column(Integer, default=0)  # rows whose keywords actually changed
+    started_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class KeywordSketchRecord(Base):
+    """Serialized Count-Min + Space-Saving sketch of keywords/entities per source per day"""
+    __tablename__ = 'keyword_sketches'
+    __table_args__ = (UniqueConstraint('source', 'day', 'kind', name='uq_keyword_sketch'),)
+
+    id = Column(Integer, primary_key=True)
+    source = Column(String(100), nullable=False, index=True)
+    day = Column(Date, nullable=False, index=True)
+    kind = Column(String(20), nullable=False)  # 'keyword' or 'entity'
+    data = Column(LargeBinary, nullable=False)  # KeywordSketch.to_bytes()
+    article_count = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class SchedulerLease(Base):
+    """Lease row electing the one API worker that runs background schedulers"""
+    __tablename__ = 'scheduler_leases'
+
+    name = Column(String(100), primary_key=True)
+    holder = Column(String(200), nullable=False)  # "<hostname>:<pid>:<random>" of the owning worker
+    acquired_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)  # lease is free for takeover after this
+
+
+class CrawlerState(Base):
+    """Persisted HybridCrawlerManager state (single row), restored when a worker becomes scheduler leader"""
+    __tablename__ = 'crawler_state'
+
+    id = Column(Integer, primary_key=True)  # always 1
+    auto_running = Column(Boolean, default=False)  # auto crawling switched on via the API
+    crawl_interval = Column(Integer, nullable=True)  # set via /auto-crawl/interval (NULL = config default)
+    crawl_count = Column(Integer, default=0)
+    last_crawl_time = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class DetectionCache(Base):
+    """Auto-detection result per domain, shared by add_source, crawl_source and /crawler/crawl-url"""
+    __tablename__ = 'detection_cache'
+
+    domain = Column(String(255), primary_key=True)  # host without "www."
+    crawl_type = Column(String(20), nullable=False)  # 'rss', 'sitemap' or 'html'
+    feed_urls = Column(JSON, nullable=True)  # confirmed RSS/Atom feeds (best first)
+    sitemap_url = Column(String(500), nullable=True)
+    link_patterns = Column(JSON, nullable=True)  # URL path prefixes of extracted articles, e.g. "/berita/"
+    detected_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)  # detection is redone after this
+
+
+class DataVersion(Base):
+    """Named counter bumped when shared data changes; workers compare it to drop stale in-process caches"""
+    __tablename__ = 'data_versions'
+
+    name = Column(String(100), primary_key=True)  # e.g. "articles" (search result cache generation)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class BusEvent(Base):
+    """Event published on one API worker, relayed to the SSE clients of the others"""
+    __tablename__ = 'bus_events'
+
+    id = Column(Integer, primary_key=True)
+    origin = Column(String(200), nullable=False)  # relay id of the publishing worker
+    topic = Column(String(100), nullable=False)
+    data = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class CrawlJobRecord(Base):
+    """Background crawl job, readable and cancellable from every API worker"""
+    __tablename__ = 'crawl_jobs'
+
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+    kind = Column(String(50), nullable=False)  # e.g. "manual"
+    # Set to kind while a single-flight job is queued/running: one such job per kind across workers
+    active_kind = Column(String(50), unique=True, nullable=True)
+    worker = Column(String(200), nullable=False)  # "<hostname>:<pid>" of the worker running the job
+    status = Column(String(20), nullable=False, index=True)  # queued/running/succeeded/failed/cancelled
+    cancel_requested = Column(Boolean, default=False)
+    sources_total = Column(Integer, default=0)
+    sources_done = Column(Integer, default=0)
+    sources = Column(JSON, nullable=True)  # per-source status, see CrawlJob.handle_event
+    articles_count = Column(Integer, default=0)
+    inserted_count = Column(Integer, default=0)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, default=datetime.utcnow)  # refreshed by the running worker
@@ -1,10 +1,16 @@
 import os
-from sqlalchemy import create_engine, func
+import random
+import re
+import time
+from sqlalchemy import create_engine, func, text, update, or_, case
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker, Session
-from .models import Base, Article, NewsSource, Favorite, SearchHistory, LinkStatus, CleanupSchedule
+from .models import Base, Article, NewsSource, Favorite, SearchHistory, LinkStatus, CleanupSchedule, KeywordSketchRecord, SchedulerLease, CrawlerState, DetectionCache, DataVersion, BusEvent, CrawlJobRecord
 from config import config
 from ..utils.logger import get_logger
+from ..utils.cache import invalidate_search_cache
+from ..utils.event_bus import publish_event
 from .db import get_connection
 from datetime import datetime, timedelta
 
@@ -23,6 +29,7 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    ensure_search_index()
     logger.info("Database initialized")
 
 def get_session() -> Session:
@@ -81,16 +88,37 @@ def save_article(article: dict):
     conn.close()
 
 
-def save_articles_bulk(articles: list):
+def _existing_urls(session: Session, urls: list, chunk_size: int = 500) -> set:
+    """Return which of the given URLs are already stored"""
+    existing = set()
+    for i in range(0, len(urls), chunk_size):
+        chunk = urls[i:i + chunk_size]
+        existing.update(url for (url,) in session.query(Article.url).filter(Article.url.in_(chunk)))
+    return existing
+
+
+def save_articles_bulk(articles: list) -> list:
+    """
+    Insert or update crawled articles in one transaction.
+
+    Returns:
+        List of article dicts that were newly inserted (not updates)
+    """
     session = get_session()
+    inserted = []
     try:
+        urls = list({a.get("url") for a in articles if a.get("url")})
+        existing = _existing_urls(session, urls)
+
         seen_urls = set()
         for article in articles:
             url = article.get("url")
             if not url or url in seen_urls:
                 continue
             seen_urls.add(url)
-            upsert_article(session, article)
+            obj = upsert_article(session, article)
+            if obj is not None and url not in existing:
+                inserted.append(article)
 
         session.commit()
     except Exception as e:
@@ -99,6 +127,36 @@ def save_articles_bulk(articles: list):
     finally:
         session.close()
 
+    if seen_urls:
+        invalidate_search_cache()
+    _on_articles_inserted(inserted)
+    return inserted
+
+
+def _on_articles_inserted(articles: list) -> None:
+    """Feed newly inserted articles to the incremental analytics and the event bus"""
+    if not articles:
+        return
+    for article in articles:
+        crawled_date = article.get("crawled_date")
+        publish_event("article_saved", {
+            "title": article.get("title"),
+            "url": article.get("url"),
+            "source": article.get("source"),
+            "sentiment": article.get("sentiment"),
+            "keywords_flagged": article.get("keywords_flagged"),
+            "crawled_date": crawled_date.isoformat() if isinstance(crawled_date, datetime) else crawled_date,
+        })
+
+    session = get_session()
+    try:
+        update_keyword_sketches(session, articles)
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error updating keyword sketches: {e}")
+    finally:
+        session.close()
+
 def extract_keywords_flagged(text: str) -> list[str]:
     keywords = {
         "korupsi", "kriminal", "demo",
@@ -118,9 +176,13 @@ def cleanup_old_articles(days: int = 30):
         "DELETE FROM articles WHERE crawled_date < datetime('now', ?);",
         (f"-{days} days",)
     )
+    deleted = cursor.rowcount
     conn.commit()
     conn.close()
 
+    if deleted:
+        invalidate_search_cache()
+
 
 def create_cleanup_schedule(session: Session, name: str | None, days_threshold: int = 30, interval_minutes: int = 1440) -> CleanupSchedule:
     """Create a new cleanup schedule (default daily, 30 days threshold)."""
@@ -153,6 +215,20 @@ def delete_cleanup_schedule(session: Session, schedule_id: int) -> bool:
     return True
 
 
+def update_cleanup_schedule(session: Session, schedule_id: int, data: dict) -> CleanupSchedule | None:
+    """Update name/days_threshold/interval_minutes/active of a cleanup schedule. Returns None if not found."""
+    schedule = session.query(CleanupSchedule).filter_by(id=schedule_id).first()
+    if not schedule:
+        return None
+    for key in ('name', 'days_threshold', 'interval_minutes', 'active'):
+        if key in data and data[key] is not None:
+            setattr(schedule, key, data[key])
+    session.commit()
+    session.refresh(schedule)
+    logger.info(f"Updated cleanup schedule: id={schedule_id}, {data}")
+    return schedule
+
+
 def run_cleanup_for_schedule(session: Session, schedule_id: int) -> dict:
     """Execute cleanup for a specific schedule and update last_run."""
     schedule = session.query(CleanupSchedule).filter_by(id=schedule_id, active=True).first()
@@ -172,32 +248,6 @@ def run_cleanup_for_schedule(session: Session, schedule_id: int) -> dict:
     }
 
 
-def run_due_schedules(session: Session):
-    """Find schedules due to run and execute cleanup. Returns list of executed schedule ids."""
-    now = datetime.utcnow()
-    executed = []
-    schedules = session.query(CleanupSchedule).filter_by(active=True).all()
-    for s in schedules:
-        run = False
-        if not s.last_run:
-            run = True
-        else:
-            delta = now - s.last_run
-            if delta.total_seconds() >= s.interval_minutes * 60:
-                run = True
-
-        if run:
-            try:
-                cleanup_old_articles(days=s.days_threshold)
-                s.last_run = now
-                session.commit()
-                executed.append(s.id)
-                logger.info(f"Scheduled cleanup executed for schedule id={s.id}")
-            except Exception as e:
-                session.rollback()
-                logger.exception(f"Failed running scheduled cleanup for id={s.id}: {e}")
-    return executed
-
 def get_dashboard_stats():
     """Get dashboard statistics"""
     session = get_session()
@@ -304,7 +354,7 @@ def add_source(session: Session, source_data: dict):
     if crawl_type == 'auto' or source_data.get('auto_detect', True):
         try:
             logger.info(f"Auto-detecting crawl type for {base_url}...")
-            dynamic = DynamicCrawler()
+            dynamic = DynamicCrawler(db_session=session)
             detection = dynamic.detect_crawl_type(base_url)
             
             crawl_type = detection['type']
@@ -326,7 +376,7 @@ def add_source(session: Session, source_data: dict):
         if crawl_type == 'rss' and 'rss_url' not in config:
             # Try to find RSS URL if not provided
             try:
-                dynamic = DynamicCrawler()
+                dynamic = DynamicCrawler(db_session=session)
                 rss_feeds = dynamic._detect_rss_feeds(base_url)
                 if rss_feeds:
                     config['rss_url'] = rss_feeds[0]
@@ -527,7 +577,8 @@ def get_all_sources_including_deleted(session: Session) -> list:
 
 # ============= SOURCE HEALTH TRACKING =============
 
-def record_crawl_result(session: Session, source_id: int, articles_count: int, failure_reason: str = None) -> bool:
+def record_crawl_result(session: Session, source_id: int, articles_count: int, failure_reason: str = None,
+                        unchanged: bool = False) -> bool:
     """
     Record crawl result for a source.
     Auto-mark as inactive if no articles found on consecutive crawls.
@@ -536,6 +587,8 @@ def record_crawl_result(session: Session, source_id: int, articles_count: int, f
         source_id: ID of the source
         articles_count: Number of articles found (0 if none)
         failure_reason: Reason for failure (if any)
+        unchanged: The source was read but had nothing new since its last
+                   successful crawl (incremental sitemap); 0 articles is then not a failure
     
     Returns:
         True if source is still active, False if marked inactive
@@ -554,6 +607,12 @@ def record_crawl_result(session: Session, source_id: int, articles_count: int, f
             source.inactivity_detected_at = None
             source.active = True  # Re-activate if it was inactive
             logger.info(f"Crawl success for {source.name}: {articles_count} articles")
+        elif unchanged and not failure_reason:
+            # Healthy, nothing published since the last successful crawl (which stays the cut-off)
+            source.consecutive_failures = 0
+            source.last_crawl_article_count = 0
+            source.failure_reason = None
+            logger.info(f"No new articles for {source.name} since {source.last_successful_crawl}")
         else:
             # No articles found - increment failure counter
             source.consecutive_failures += 1
@@ -575,6 +634,105 @@ def record_crawl_result(session: Session, source_id: int, articles_count: int, f
         session.rollback()
         return False
 
+def get_schedulable_sources(session: Session) -> list:
+    """
+    Active, non-deleted sources with their adaptive scheduling state
+
+    Returns:
+        List of dicts: id, name, crawl_interval_seconds, last_crawled_at
+    """
+    sources = session.query(NewsSource)\
+        .filter(NewsSource.active == True, NewsSource.deleted_at == None)\
+        .all()
+    return [{
+        'id': s.id,
+        'name': s.name,
+        'crawl_interval_seconds': s.crawl_interval_seconds,
+        'last_crawled_at': s.last_crawled_at,
+    } for s in sources]
+
+
+def record_source_schedule(session: Session, source_id: int, interval_seconds: int, inserted_count: int) -> bool:
+    """
+    Store the outcome of a scheduled crawl and the next adaptive interval
+
+    Args:
+        source_id: ID of the source
+        interval_seconds: Interval to use until the next crawl
+        inserted_count: New articles stored by this crawl
+
+    Returns:
+        True if the source exists
+    """
+    try:
+        source = session.query(NewsSource).filter_by(id=source_id).first()
+        if not source:
+            return False
+        source.crawl_interval_seconds = interval_seconds
+        source.last_crawl_inserted_count = inserted_count
+        source.last_crawled_at = datetime.utcnow()
+        session.commit()
+        return True
+    except Exception as e:
+        logger.error(f"Error recording schedule for source {source_id}: {e}")
+        session.rollback()
+        return False
+
+def get_feed_state(session: Session, source_name: str) -> dict | None:
+    """
+    High-water mark of a source's RSS feed
+
+    Returns:
+        Dict with high_water_mark and seen_guids, or None if the source does not exist
+    """
+    source = session.query(NewsSource).filter_by(name=source_name).first()
+    if not source:
+        return None
+    return {
+        'high_water_mark': source.feed_high_water_mark,
+        'seen_guids': list(source.feed_seen_guids or []),
+    }
+
+
+def save_feed_states(session: Session, states: dict) -> int:
+    """
+    Store feed high-water marks after the crawled articles were saved
+
+    Args:
+        states: Source name -> dict with high_water_mark and seen_guids
+
+    Returns:
+        Number of sources updated
+    """
+    if not states:
+        return 0
+    try:
+        sources = session.query(NewsSource).filter(NewsSource.name.in_(list(states))).all()
+        for source in sources:
+            state = states[source.name]
+            source.feed_high_water_mark = state['high_water_mark']
+            source.feed_seen_guids = list(state['seen_guids'])
+        session.commit()
+        return len(sources)
+    except Exception as e:
+        logger.error(f"Error saving feed high-water marks: {e}")
+        session.rollback()
+        return 0
+
+
+def reset_source_intervals(session: Session) -> int:
+    """Forget learned crawl intervals so every source restarts from the default"""
+    try:
+        count = session.query(NewsSource).filter(NewsSource.crawl_interval_seconds != None)\
+            .update({NewsSource.crawl_interval_seconds: None}, synchronize_session=False)
+        session.commit()
+        return count
+    except Exception as e:
+        logger.error(f"Error resetting source intervals: {e}")
+        session.rollback()
+        return 0
+
+
 def get_inactive_sources(session: Session) -> list:
     """Get all inactive sources with reason for inactivity"""
     sources = session.query(NewsSource)\
@@ -620,6 +778,9 @@ def get_source_health(session: Session, source_id: int = None) -> dict:
             'last_successful_crawl': source.last_successful_crawl.isoformat() if source.last_successful_crawl else None,
             'last_crawl_article_count': source.last_crawl_article_count,
             'inactivity_detected_at': source.inactivity_detected_at.isoformat() if source.inactivity_detected_at else None,
+            'crawl_interval_seconds': source.crawl_interval_seconds,
+            'last_crawl_inserted_count': source.last_crawl_inserted_count,
+            'last_crawled_at': source.last_crawled_at.isoformat() if source.last_crawled_at else None,
             'status': 'active' if source.active else 'inactive'
         }
     else:
@@ -640,6 +801,9 @@ def get_source_health(session: Session, source_id: int = None) -> dict:
                 'last_successful_crawl': source.last_successful_crawl.isoformat() if source.last_successful_crawl else None,
                 'last_crawl_article_count': source.last_crawl_article_count,
                 'inactivity_detected_at': source.inactivity_detected_at.isoformat() if source.inactivity_detected_at else None,
+                'crawl_interval_seconds': source.crawl_interval_seconds,
+                'last_crawl_inserted_count': source.last_crawl_inserted_count,
+                'last_crawled_at': source.last_crawled_at.isoformat() if source.last_crawled_at else None,
                 'status': 'active' if source.active else 'inactive'
             })
         
@@ -856,7 +1020,7 @@ def is_link_active(url: str) -> bool:
         link_status = session.query(LinkStatus).filter(LinkStatus.url == url).first()
         if not link_status:
             return True  # Default to active if not in database
-        return link_status.status == 'active'
+        return link_status.status != 'inactive'  # 'timeout' links are retried on the next crawl
     except Exception:
         # If table doesn't exist or other error, default to active
         return True
@@ -901,6 +1065,39 @@ def mark_link_inactive(url: str, reason: str = "Connection timeout", source: str
         session.close()
 
 
+def mark_link_failed(url: str, reason: str, source: str = None) -> None:
+    """
+    Record a transient failure (timeout, connection error, 5xx) of a link.
+    The link stays crawlable until it fails LINK_MAX_TRANSIENT_FAILURES times
+    in a row; a successful fetch resets the count.
+    
+    Args:
+        url: The URL that failed
+        reason: Reason of the failure
+        source: The news source this URL came from
+    """
+    session = get_session()
+    try:
+        link_status = session.query(LinkStatus).filter(LinkStatus.url == url).first()
+        if not link_status:
+            link_status = LinkStatus(url=url, source=source, failure_count=0)
+            session.add(link_status)
+
+        link_status.failure_count = (link_status.failure_count or 0) + 1
+        link_status.reason = reason
+        link_status.last_checked = datetime.utcnow()
+        link_status.status = (
+            'inactive' if link_status.failure_count >= config.LINK_MAX_TRANSIENT_FAILURES else 'timeout'
+        )
+        session.commit()
+        logger.debug(f"Link failed ({link_status.failure_count}x): {url} - Reason: {reason}")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error recording link failure: {e}")
+    finally:
+        session.close()
+
+
 def mark_link_timeout(url: str, source: str = None) -> None:
     """
     Mark a link as having a timeout error.
@@ -909,7 +1106,7 @@ def mark_link_timeout(url: str, source: str = None) -> None:
         url: The URL that timed out
         source: The news source this URL came from
     """
-    mark_link_inactive(url, "Connection timeout", source)
+    mark_link_failed(url, "Connection timeout", source)
 
 
 def mark_link_active(url: str) -> None:
@@ -1036,3 +1233,771 @@ def get_sources_summary(session: Session) -> dict:
             'inactive_sources': 0,
             'error': str(e)
         }
+
+
+# ==================== SCHEDULER LEASES ====================
+
+def acquire_lease(session: Session, name: str, holder: str, ttl_seconds: int) -> bool:
+    """
+    Acquire or renew a named lease
+
+    A single conditional UPDATE takes the row when it is held by `holder` or
+    has expired, so two workers can never both succeed.
+
+    Args:
+        name: Lease name
+        holder: Unique id of the calling worker
+        ttl_seconds: Lease duration from now
+
+    Returns:
+        True if `holder` owns the lease until now + ttl_seconds
+    """
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=ttl_seconds)
+    try:
+        result = session.execute(
+            update(SchedulerLease)
+            .where(SchedulerLease.name == name)
+            .where(or_(SchedulerLease.holder == holder, SchedulerLease.expires_at < now))
+            .values(holder=holder, expires_at=expires_at,
+                    acquired_at=case((SchedulerLease.holder == holder, SchedulerLease.acquired_at), else_=now))
+        )
+        if result.rowcount:
+            session.commit()
+            return True
+        # Lease is held by a live worker, or the row does not exist yet
+        if session.get(SchedulerLease, name) is not None:
+            session.rollback()
+            return False
+        session.add(SchedulerLease(name=name, holder=holder, acquired_at=now, expires_at=expires_at))
+        session.commit()
+        return True
+    except (IntegrityError, OperationalError) as e:
+        # Another worker inserted the row first, or the database is locked
+        session.rollback()
+        logger.debug(f"Could not acquire lease {name}: {e}")
+        return False
+
+
+def release_lease(session: Session, name: str, holder: str) -> bool:
+    """Give up a lease held by `holder` so another worker can take over immediately"""
+    try:
+        count = session.query(SchedulerLease)\
+            .filter(SchedulerLease.name == name, SchedulerLease.holder == holder)\
+            .delete()
+        session.commit()
+        return count > 0
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error releasing lease {name}: {e}")
+        return False
+
+
+def get_lease(session: Session, name: str) -> dict | None:
+    """Current holder and expiry of a lease, or None if nobody ever held it"""
+    lease = session.get(SchedulerLease, name)
+    if not lease:
+        return None
+    return {
+        'name': lease.name,
+        'holder': lease.holder,
+        'acquired_at': lease.acquired_at.isoformat() if lease.acquired_at else None,
+        'expires_at': lease.expires_at.isoformat(),
+        'expired': lease.expires_at < datetime.utcnow(),
+    }
+
+
+# ==================== CRAWLER STATE ====================
+
+CRAWLER_STATE_ID = 1
+
+
+def get_crawler_state(session: Session) -> dict | None:
+    """Persisted crawler manager state, or None if it was never saved"""
+    state = session.get(CrawlerState, CRAWLER_STATE_ID)
+    if not state:
+        return None
+    return {
+        'auto_running': bool(state.auto_running),
+        'crawl_interval': state.crawl_interval,
+        'crawl_count': state.crawl_count or 0,
+        'last_crawl_time': state.last_crawl_time,
+    }
+
+
+def save_crawler_state(session: Session, **fields) -> bool:
+    """
+    Store auto_running and/or crawl_interval of the crawler manager
+
+    Args:
+        fields: auto_running, crawl_interval
+
+    Returns:
+        True if saved
+    """
+    try:
+        state = session.get(CrawlerState, CRAWLER_STATE_ID)
+        if state is None:
+            state = CrawlerState(id=CRAWLER_STATE_ID, crawl_count=0)
+            session.add(state)
+        for key in ('auto_running', 'crawl_interval'):
+            if key in fields:
+                setattr(state, key, fields[key])
+        session.commit()
+        return True
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error saving crawler state: {e}")
+        return False
+
+
+def record_crawl_completed(session: Session, finished_at: datetime) -> int | None:
+    """
+    Count a completed crawl (from any worker) and store its time
+
+    Returns:
+        Total number of completed crawls, or None on error
+    """
+    try:
+        result = session.execute(
+            update(CrawlerState)
+            .where(CrawlerState.id == CRAWLER_STATE_ID)
+            .values(crawl_count=CrawlerState.crawl_count + 1, last_crawl_time=finished_at)
+        )
+        if not result.rowcount:
+            session.add(CrawlerState(id=CRAWLER_STATE_ID, crawl_count=1, last_crawl_time=finished_at))
+        session.commit()
+        return session.get(CrawlerState, CRAWLER_STATE_ID).crawl_count
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error recording crawl completion: {e}")
+        return None
+
+
+# ==================== DATA VERSIONS ====================
+
+def get_data_version(session: Session, name: str) -> int:
+    """Current value of a shared version counter (0 if never bumped)"""
+    version = session.query(DataVersion.version).filter(DataVersion.name == name).scalar()
+    return version or 0
+
+
+def bump_data_version(session: Session, name: str) -> int:
+    """
+    Increment a shared version counter, visible to every worker
+
+    Returns:
+        The new version
+
+    Raises:
+        SQLAlchemyError: The counter could not be written
+    """
+    for _ in range(2):
+        try:
+            result = session.execute(
+                update(DataVersion).where(DataVersion.name == name)
+                .values(version=DataVersion.version + 1, updated_at=datetime.utcnow())
+            )
+            if not result.rowcount:
+                session.add(DataVersion(name=name, version=1, updated_at=datetime.utcnow()))
+            session.commit()
+            return get_data_version(session, name)
+        except IntegrityError:
+            # Created by another worker in the meantime: increment that row
+            session.rollback()
+    raise IntegrityError(f"bump {name}", None, Exception("data version row kept conflicting"))
+
+
+# ==================== EVENT RELAY ====================
+
+def append_bus_events(session: Session, origin: str, events: list) -> int:
+    """
+    Store published events for the other API workers
+
+    Args:
+        origin: Relay id of the publishing worker
+        events: Event dicts with topic and data
+
+    Returns:
+        Number of events stored
+    """
+    if not events:
+        return 0
+    session.add_all([BusEvent(origin=origin, topic=e["topic"], data=e["data"]) for e in events])
+    session.commit()
+    return len(events)
+
+
+def get_last_bus_event_id(session: Session) -> int:
+    return session.query(func.max(BusEvent.id)).scalar() or 0
+
+
+def get_bus_events(session: Session, after_id: int, exclude_origin: str, limit: int = 500) -> list:
+    """Events stored after `after_id` by other workers, oldest first"""
+    rows = session.query(BusEvent).filter(BusEvent.id > after_id, BusEvent.origin != exclude_origin)\
+        .order_by(BusEvent.id).limit(limit).all()
+    return [{'id': r.id, 'topic': r.topic, 'data': r.data} for r in rows]
+
+
+def prune_bus_events(session: Session, older_than: datetime) -> int:
+    """Delete relayed events created before `older_than`"""
+    deleted = session.query(BusEvent).filter(BusEvent.created_at < older_than).delete(synchronize_session=False)
+    session.commit()
+    return deleted
+
+
+# ==================== CRAWL JOBS ====================
+
+_FINISHED_JOB_STATUSES = ('succeeded', 'failed', 'cancelled')
+
+
+def _crawl_job_dict(row: CrawlJobRecord) -> dict:
+    total, done = row.sources_total or 0, row.sources_done or 0
+    return {
+        'job_id': row.id,
+        'kind': row.kind,
+        'status': row.status,
+        'worker': row.worker,
+        'created_at': row.created_at.isoformat() if row.created_at else None,
+        'started_at': row.started_at.isoformat() if row.started_at else None,
+        'finished_at': row.finished_at.isoformat() if row.finished_at else None,
+        'progress': {
+            'sources_total': total,
+            'sources_done': done,
+            'percent': round(100 * done / total, 1) if total else 0.0,
+        },
+        'sources': row.sources or {},
+        'articles_count': row.articles_count or 0,
+        'inserted_count': row.inserted_count or 0,
+        'result': row.result,
+        'error': row.error,
+        'cancel_requested': bool(row.cancel_requested),
+    }
+
+
+def create_crawl_job(session: Session, job_id: str, kind: str, worker: str, single_flight: bool = False) -> dict | None:
+    """
+    Store a new queued crawl job
+
+    Args:
+        job_id: Job id
+        kind: Job type (e.g. "manual")
+        worker: Id of the worker that runs the job
+        single_flight: Fail if a job of this kind is already queued or running
+                       (on any worker); enforced by a unique column
+
+    Returns:
+        The job dict, or None if single_flight and another job is active
+    """
+    row = CrawlJobRecord(id=job_id, kind=kind, worker=worker, status='queued',
+                         active_kind=kind if single_flight else None, sources={})
+    session.add(row)
+    try:
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        return None
+    return _crawl_job_dict(row)
+
+
+def get_crawl_job(session: Session, job_id: str) -> dict | None:
+    row = session.get(CrawlJobRecord, job_id)
+    return _crawl_job_dict(row) if row else None
+
+
+def get_active_crawl_job(session: Session, kind: str) -> dict | None:
+    """The single-flight job of this kind that is queued or running, if any"""
+    row = session.query(CrawlJobRecord).filter(CrawlJobRecord.active_kind == kind).first()
+    return _crawl_job_dict(row) if row else None
+
+
+def list_crawl_jobs(session: Session, limit: int = 20) -> list:
+    """Most recent jobs first"""
+    rows = session.query(CrawlJobRecord).order_by(CrawlJobRecord.created_at.desc()).limit(limit).all()
+    return [_crawl_job_dict(r) for r in rows]
+
+
+def update_crawl_job(session: Session, job_id: str, **fields) -> bool:
+    """
+    Store progress or the outcome of a job
+
+    A finished status (succeeded/failed/cancelled) frees the job's
+    single-flight slot.
+
+    Args:
+        fields: status, started_at, finished_at, sources_total, sources_done,
+                sources, articles_count, inserted_count, result, error
+
+    Returns:
+        True if the job exists
+    """
+    values = {key: fields[key] for key in ('status', 'started_at', 'finished_at', 'sources_total', 'sources_done',
+                                           'sources', 'articles_count', 'inserted_count', 'result', 'error')
+              if key in fields}
+    values['heartbeat_at'] = datetime.utcnow()
+    if values.get('status') in _FINISHED_JOB_STATUSES:
+        values['active_kind'] = None
+    result = session.execute(update(CrawlJobRecord).where(CrawlJobRecord.id == job_id).values(**values))
+    session.commit()
+    return bool(result.rowcount)
+
+
+def request_crawl_job_cancel(session: Session, job_id: str) -> dict | None:
+    """
+    Flag a queued or running job for cancellation (the running worker polls the flag)
+
+    The job gives up its single-flight slot right away, so a new job of the
+    same kind can be queued while it winds down.
+
+    Returns:
+        The job dict, or None if unknown
+    """
+    session.execute(
+        update(CrawlJobRecord)
+        .where(CrawlJobRecord.id == job_id, CrawlJobRecord.status.notin_(_FINISHED_JOB_STATUSES))
+        .values(cancel_requested=True, active_kind=None)
+    )
+    session.commit()
+    return get_crawl_job(session, job_id)
+
+
+def touch_crawl_jobs(session: Session, job_ids: list) -> list:
+    """
+    Refresh the heartbeat of jobs running on the calling worker
+
+    Returns:
+        Ids of those jobs whose cancellation was requested
+    """
+    if not job_ids:
+        return []
+    session.execute(update(CrawlJobRecord).where(CrawlJobRecord.id.in_(job_ids))
+                    .values(heartbeat_at=datetime.utcnow()))
+    session.commit()
+    rows = session.query(CrawlJobRecord.id).filter(CrawlJobRecord.id.in_(job_ids),
+                                                   CrawlJobRecord.cancel_requested == True).all()
+    return [r.id for r in rows]
+
+
+def fail_stale_crawl_jobs(session: Session, stale_before: datetime) -> int:
+    """
+    Mark unfinished jobs whose worker stopped sending heartbeats (it died) as failed
+
+    Returns:
+        Number of jobs marked failed
+    """
+    count = session.query(CrawlJobRecord).filter(
+        CrawlJobRecord.status.notin_(_FINISHED_JOB_STATUSES), CrawlJobRecord.heartbeat_at < stale_before
+    ).update({CrawlJobRecord.status: 'failed', CrawlJobRecord.active_kind: None,
+              CrawlJobRecord.error: 'Worker running the job stopped', CrawlJobRecord.finished_at: datetime.utcnow()},
+             synchronize_session=False)
+    session.commit()
+    if count:
+        logger.warning(f"Marked {count} crawl job(s) of stopped workers as failed")
+    return count
+
+
+def prune_crawl_jobs(session: Session, keep: int) -> int:
+    """Delete finished jobs beyond the `keep` most recent jobs"""
+    keep_ids = session.query(CrawlJobRecord.id).order_by(CrawlJobRecord.created_at.desc()).limit(keep)
+    deleted = session.query(CrawlJobRecord).filter(
+        CrawlJobRecord.status.in_(_FINISHED_JOB_STATUSES), CrawlJobRecord.id.notin_(keep_ids)
+    ).delete(synchronize_session=False)
+    session.commit()
+    return deleted
+
+
+# ==================== KEYWORD SKETCHES ====================
+
+_SKETCH_WRITE_ATTEMPTS = 10
+_SKETCH_RETRY_DELAY = 0.02  # seconds; jittered and growing with each attempt, so writers stop colliding
+
+
+def _sketch_items(articles: list) -> dict:
+    """Keywords and title entities of articles, per sketch kind"""
+    from ..utils.keyword_extractor import parse_keywords_from_db, extract_entities
+
+    return {
+        "keyword": [parse_keywords_from_db(a.get("keywords_flagged")) for a in articles],
+        "entity": [extract_entities(a.get("title", "")) for a in articles],
+    }
+
+
+def _merge_into_sketch_row(session: Session, source: str, day, kind: str, items_per_article: list) -> None:
+    """
+    Add items to one sketch row, safe against concurrent writers
+
+    The merged sketch is written with a conditional UPDATE on the data that
+    was read (compare-and-swap); if another worker changed the row in
+    between, or inserted it first, the row is read again and merged again
+    after a short random pause.
+
+    Raises:
+        OperationalError: The row kept changing under us (or the database stayed locked)
+    """
+    from ..utils.sketches import KeywordSketch
+
+    for attempt in range(_SKETCH_WRITE_ATTEMPTS):
+        row = session.query(KeywordSketchRecord.id, KeywordSketchRecord.data).filter_by(
+            source=source, day=day, kind=kind).first()
+        sketch = KeywordSketch.from_bytes(row.data) if row else KeywordSketch()
+        for items in items_per_article:
+            sketch.add_all(items)
+        try:
+            if row is None:
+                session.add(KeywordSketchRecord(source=source, day=day, kind=kind, data=sketch.to_bytes(),
+                                                article_count=len(items_per_article)))
+                session.commit()
+                return
+            result = session.execute(
+                update(KeywordSketchRecord)
+                .where(KeywordSketchRecord.id == row.id, KeywordSketchRecord.data == row.data)
+                .values(data=sketch.to_bytes(),
+                        article_count=func.coalesce(KeywordSketchRecord.article_count, 0) + len(items_per_article),
+                        updated_at=datetime.utcnow())
+            )
+            if result.rowcount:
+                session.commit()
+                return
+            session.rollback()
+        except (IntegrityError, OperationalError) as e:
+            # Inserted by another worker first, or the database is locked: retry
+            session.rollback()
+            logger.debug(f"Retrying sketch {source}/{day}/{kind}: {e}")
+        time.sleep(random.uniform(0, _SKETCH_RETRY_DELAY * (attempt + 1)))
+    raise OperationalError(f"keyword sketch {source}/{day}/{kind}", None,
+                           Exception(f"still conflicting after {_SKETCH_WRITE_ATTEMPTS} attempts"))
+
+
+def update_keyword_sketches(session: Session, articles: list) -> int:
+    """
+    Add articles' keywords and title entities to the per-source, per-day sketches.
+
+    Every row is merged and committed on its own with a compare-and-swap, so
+    crawls on several workers can update the same day's sketches.
+
+    Returns:
+        Number of sketch rows written
+    """
+    groups = {}
+    for article in articles:
+        source = article.get("source") or "Unknown"
+        day = (article.get("crawled_date") or datetime.utcnow()).date()
+        groups.setdefault((source, day), []).append(article)
+
+    written = 0
+    for (source, day), group in groups.items():
+        for kind, items_per_article in _sketch_items(group).items():
+            _merge_into_sketch_row(session, source, day, kind, items_per_article)
+            written += 1
+    return written
+
+
+def rebuild_keyword_sketches(session: Session, start_day=None, end_day=None) -> dict:
+    """
+    Rebuild the daily sketches from the stored articles, one day at a time
+
+    Covers articles crawled before sketches existed and keywords changed by
+    the keyword backfill. Each day's rows are replaced, so it can be rerun.
+    Today is left out by default: crawls are still adding to it.
+
+    Args:
+        start_day / end_day: Inclusive date range (default: first article's day to yesterday)
+
+    Returns:
+        Dict with start_day, end_day, days and articles
+    """
+    from ..utils.sketches import KeywordSketch
+
+    end_day = end_day or datetime.utcnow().date() - timedelta(days=1)
+    if start_day is None:
+        first = session.query(func.min(Article.crawled_date)).scalar()
+        start_day = first.date() if first else end_day
+
+    days = articles_total = 0
+    day = start_day
+    while day <= end_day:
+        day_start = datetime.combine(day, datetime.min.time())
+        rows = session.query(Article.source, Article.title, Article.keywords_flagged).filter(
+            Article.crawled_date >= day_start, Article.crawled_date < day_start + timedelta(days=1)
+        ).all()
+        groups = {}
+        for row in rows:
+            groups.setdefault(row.source or "Unknown", []).append(
+                {"title": row.title or "", "keywords_flagged": row.keywords_flagged})
+
+        session.query(KeywordSketchRecord).filter(KeywordSketchRecord.day == day).delete(synchronize_session=False)
+        for source, group in groups.items():
+            for kind, items_per_article in _sketch_items(group).items():
+                sketch = KeywordSketch()
+                for items in items_per_article:
+                    sketch.add_all(items)
+                session.add(KeywordSketchRecord(source=source, day=day, kind=kind, data=sketch.to_bytes(),
+                                                article_count=len(group)))
+        session.commit()
+        days += 1
+        articles_total += len(rows)
+        day += timedelta(days=1)
+
+    logger.info(f"Rebuilt keyword sketches of {days} days ({articles_total} articles)")
+    return {"start_day": start_day.isoformat(), "end_day": end_day.isoformat(), "days": days,
+            "articles": articles_total}
+
+
+def get_top_keywords_from_sketches(session: Session, kind: str = "keyword", start_day=None, end_day=None,
+                                   source: str = None, k: int = 50) -> dict:
+    """
+    Approximate top-k keywords/entities over a date range by merging the daily sketches.
+
+    Args:
+        kind: 'keyword' or 'entity'
+        start_day / end_day: Inclusive date range (default: last 90 days)
+        source: Restrict to one source (default: all sources)
+        k: Number of items to return
+    """
+    from ..utils.sketches import KeywordSketch, top_k_from_sketches
+
+    end_day = end_day or datetime.utcnow().date()
+    start_day = start_day or end_day - timedelta(days=89)
+
+    query = session.query(KeywordSketchRecord.data, KeywordSketchRecord.article_count).filter(
+        KeywordSketchRecord.kind == kind,
+        KeywordSketchRecord.day >= start_day,
+        KeywordSketchRecord.day <= end_day,
+    )
+    if source:
+        query = query.filter(KeywordSketchRecord.source == source)
+
+    rows = query.all()
+    sketches = [KeywordSketch.from_bytes(r.data) for r in rows]
+
+    return {
+        'kind': kind,
+        'source': source,
+        'start_date': start_day.isoformat(),
+        'end_date': end_day.isoformat(),
+        'sketches_merged': len(sketches),
+        'articles': sum(r.article_count or 0 for r in rows),
+        'items': top_k_from_sketches(sketches, k),
+    }
+
+
+# ==================== FULL-TEXT SEARCH INDEX ====================
+
+# SQLite FTS5 index over articles (external content, kept in sync by triggers,
+# so cleanup via raw sqlite3 connections is covered too)
+_FTS_STATEMENTS = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        title, content, keywords_flagged,
+        content='articles', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts(rowid, title, content, keywords_flagged)
+        VALUES (new.id, new.title, new.content, new.keywords_flagged);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, content, keywords_flagged)
+        VALUES ('delete', old.id, old.title, old.content, old.keywords_flagged);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, content, keywords_flagged)
+        VALUES ('delete', old.id, old.title, old.content, old.keywords_flagged);
+        INSERT INTO articles_fts(rowid, title, content, keywords_flagged)
+        VALUES (new.id, new.title, new.content, new.keywords_flagged);
+    END""",
+]
+
+# Engines (by id) on which the FTS5 index exists
+_fts_engines: set = set()
+
+
+def ensure_search_index(bind=None) -> bool:
+    """
+    Create the FTS5 search index on articles if missing (SQLite only).
+
+    Builds the index from existing rows the first time it is created.
+
+    Returns:
+        True if the index is available
+    """
+    bind = bind or engine
+    if bind.dialect.name != "sqlite":
+        return False
+    try:
+        with bind.begin() as conn:
+            exists = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+            )).first() is not None
+            for statement in _FTS_STATEMENTS:
+                conn.execute(text(statement))
+            if not exists:
+                conn.execute(text("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')"))
+                logger.info("Built full-text search index for articles")
+        _fts_engines.add(id(bind))
+        return True
+    except OperationalError as e:
+        logger.warning(f"FTS5 search index unavailable, falling back to LIKE search: {e}")
+        return False
+
+
+def _fts_query(keyword: str) -> str | None:
+    """All words of the keyword must match (prefix match), e.g. 'pemilu lampung' -> '"pemilu"* "lampung"*'"""
+    tokens = re.findall(r"\w+", keyword.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def search_articles_indexed(session: Session, keyword: str, source: str = None, limit: int = 50) -> list:
+    """
+    Search stored articles by keyword using the full-text index, ranked by
+    relevance (bm25); falls back to LIKE when FTS5 is not available.
+
+    Args:
+        session: Database session
+        keyword: Search keyword or phrase
+        source: Restrict to one source name
+        limit: Maximum number of articles
+
+    Returns:
+        List of article dicts
+    """
+    match = _fts_query(keyword)
+    if not match:
+        return []
+
+    articles = None
+    if id(session.get_bind()) in _fts_engines:
+        sql = "SELECT a.id FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid WHERE articles_fts MATCH :match"
+        params = {"match": match, "limit": limit}
+        if source:
+            sql += " AND a.source = :source"
+            params["source"] = source
+        sql += " ORDER BY articles_fts.rank LIMIT :limit"
+        try:
+            ids = [row[0] for row in session.execute(text(sql), params)]
+            by_id = {a.id: a for a in session.query(Article).filter(Article.id.in_(ids))} if ids else {}
+            articles = [by_id[i] for i in ids if i in by_id]
+        except OperationalError as e:
+            logger.warning(f"Full-text search failed, falling back to LIKE: {e}")
+
+    if articles is None:
+        like = f"%{keyword.strip()}%"
+        query = session.query(Article).filter(
+            (Article.title.ilike(like)) |
+            (Article.content.ilike(like)) |
+            (Article.keywords_flagged.ilike(like))
+        )
+        if source:
+            query = query.filter(Article.source == source)
+        articles = query.order_by(Article.crawled_date.desc()).limit(limit).all()
+
+    return [{
+        'id': a.id,
+        'title': a.title,
+        'url': a.url,
+        'source': a.source,
+        'sentiment': a.sentiment,
+        'keywords_flagged': a.keywords_flagged,
+        'published_date': a.published_date.isoformat() if a.published_date else None,
+        'crawled_date': a.crawled_date.isoformat() if a.crawled_date else None,
+    } for a in articles]
+
+
+# ==================== DETECTION CACHE ====================
+
+def get_detection(session: Session, domain: str) -> dict | None:
+    """
+    Cached auto-detection result of a domain
+
+    Returns:
+        Dict with crawl_type, feed_urls, sitemap_url, link_patterns and
+        detected_at, or None if the domain is not cached or the entry expired
+    """
+    entry = session.get(DetectionCache, domain)
+    if not entry or entry.expires_at < datetime.utcnow():
+        return None
+    return {
+        'domain': entry.domain,
+        'crawl_type': entry.crawl_type,
+        'feed_urls': list(entry.feed_urls or []),
+        'sitemap_url': entry.sitemap_url,
+        'link_patterns': list(entry.link_patterns or []),
+        'detected_at': entry.detected_at,
+    }
+
+
+def save_detection(session: Session, domain: str, crawl_type: str, feed_urls: list = None,
+                   sitemap_url: str = None, ttl_seconds: int = None) -> bool:
+    """
+    Store (or refresh) the detection result of a domain; learned link patterns are kept
+
+    Args:
+        domain: Host without "www."
+        crawl_type: 'rss', 'sitemap' or 'html'
+        feed_urls: Confirmed feeds
+        sitemap_url: Detected sitemap
+        ttl_seconds: Validity (default config.DETECTION_CACHE_TTL)
+
+    Returns:
+        True if saved
+    """
+    now = datetime.utcnow()
+    try:
+        entry = session.get(DetectionCache, domain)
+        if entry is None:
+            entry = DetectionCache(domain=domain)
+            session.add(entry)
+        entry.crawl_type = crawl_type
+        entry.feed_urls = list(feed_urls or [])
+        entry.sitemap_url = sitemap_url
+        entry.detected_at = now
+        entry.expires_at = now + timedelta(seconds=ttl_seconds or config.DETECTION_CACHE_TTL)
+        session.commit()
+        return True
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error caching detection of {domain}: {e}")
+        return False
+
+
+def save_link_patterns(session: Session, domain: str, link_patterns: list) -> bool:
+    """
+    Store the article URL patterns learned for a cached domain
+
+    Returns:
+        True if saved, False if the domain has no (unexpired) cache entry
+    """
+    try:
+        entry = session.get(DetectionCache, domain)
+        if not entry or entry.expires_at < datetime.utcnow():
+            return False
+        entry.link_patterns = list(link_patterns)
+        session.commit()
+        return True
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error saving link patterns of {domain}: {e}")
+        return False
+
+
+def invalidate_detection(session: Session, domain: str = None) -> int:
+    """
+    Drop cached detection results so the next request detects again
+
+    Args:
+        domain: Host to invalidate (without "www."); None clears the whole cache
+
+    Returns:
+        Number of entries removed
+    """
+    try:
+        query = session.query(DetectionCache)
+        if domain:
+            query = query.filter(DetectionCache.domain == domain)
+        count = query.delete()
+        session.commit()
+        return count
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error invalidating detection cache: {e}")
+        raise
@@ -0,0 +1,199 @@
+"""
+Keyword backfill service
+Re-extracts keywords_flagged for the whole article corpus (e.g. after tuning
+INDONESIAN_STOPWORDS or the scoring in keyword_extractor)
+
+- Streams articles from the DB in id-ordered chunks (keyset pagination)
+- Fans each chunk out to a process pool
+- Writes results back with bulk updates
+- Stores a checkpoint per job so an interrupted run can be continued
+
+Run:
+    python -m src.services.keyword_backfill --job stopwords-v2 --workers 4
+
+The daily keyword sketches (/analytics/top-keywords) are only fed by new
+crawls. Rebuild them from the stored articles after a backfill, or once to
+cover articles crawled before sketches existed:
+    python -m src.services.keyword_backfill --sketches
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+from sqlalchemy.orm import Session
+
+from ..database.models import Article, KeywordBackfillCheckpoint
+from ..utils.keyword_extractor import extract_keywords_batch
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def get_checkpoint(session: Session, job_name: str) -> Optional[KeywordBackfillCheckpoint]:
+    """Get the checkpoint of a backfill job (None if the job never ran)"""
+    return session.query(KeywordBackfillCheckpoint).filter_by(job_name=job_name).first()
+
+
+def _load_or_create_checkpoint(session: Session, job_name: str, restart: bool) -> KeywordBackfillCheckpoint:
+    checkpoint = get_checkpoint(session, job_name)
+    if checkpoint and restart:
+        session.delete(checkpoint)
+        session.commit()
+        checkpoint = None
+
+    if not checkpoint:
+        checkpoint = KeywordBackfillCheckpoint(job_name=job_name, last_article_id=0, processed_count=0, updated_count=0)
+        session.add(checkpoint)
+        session.commit()
+    return checkpoint
+
+
+def _split(rows: list, parts: int) -> List[list]:
+    """Split rows into at most `parts` contiguous slices"""
+    size = max(1, -(-len(rows) // parts))
+    return [rows[i:i + size] for i in range(0, len(rows), size)]
+
+
+def run_keyword_backfill(
+    session: Session,
+    job_name: str = "default",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    max_keywords: int = 10,
+    restart: bool = False,
+    max_chunks: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Re-extract keywords for every article, resuming from the job checkpoint.
+
+    Each chunk's keyword updates and checkpoint advance are committed in one
+    transaction, so an interruption loses at most the chunk in flight.
+
+    Args:
+        session: Database session
+        job_name: Checkpoint name; reuse it to continue an interrupted run
+        chunk_size: Number of articles read from the DB per chunk
+        workers: Process pool size (default: CPU count, <= 1 runs inline)
+        max_keywords: Maximum keywords per article
+        restart: Discard the existing checkpoint and start from the first article
+        max_chunks: Stop after this many chunks (None = until the corpus is done)
+
+    Returns:
+        Dictionary with progress details
+    """
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    checkpoint = _load_or_create_checkpoint(session, job_name, restart)
+
+    if checkpoint.completed_at and not restart:
+        logger.info(f"Keyword backfill '{job_name}' already completed at {checkpoint.completed_at}")
+
+    logger.info(
+        f"Keyword backfill '{job_name}' starting after article id {checkpoint.last_article_id} "
+        f"(chunk_size={chunk_size}, workers={workers})"
+    )
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    chunks_done = 0
+    try:
+        while max_chunks is None or chunks_done < max_chunks:
+            rows = session.query(Article.id, Article.title, Article.content, Article.keywords_flagged)\
+                .filter(Article.id > checkpoint.last_article_id)\
+                .order_by(Article.id)\
+                .limit(chunk_size)\
+                .all()
+
+            if not rows:
+                checkpoint.completed_at = datetime.utcnow()
+                session.commit()
+                break
+
+            previous = {r.id: r.keywords_flagged for r in rows}
+            payload = [(r.id, r.title, r.content) for r in rows]
+
+            if pool:
+                results = []
+                for part in pool.map(extract_keywords_batch, _split(payload, workers), [max_keywords] * workers):
+                    results.extend(part)
+            else:
+                results = extract_keywords_batch(payload, max_keywords=max_keywords)
+
+            mappings = [
+                {"id": article_id, "keywords_flagged": keywords}
+                for article_id, keywords in results
+                if keywords != previous.get(article_id)
+            ]
+            if mappings:
+                session.bulk_update_mappings(Article, mappings)
+
+            checkpoint.last_article_id = rows[-1].id
+            checkpoint.processed_count += len(rows)
+            checkpoint.updated_count += len(mappings)
+            checkpoint.completed_at = None
+            session.commit()
+
+            chunks_done += 1
+            logger.info(
+                f"Keyword backfill '{job_name}': processed {checkpoint.processed_count} articles "
+                f"({checkpoint.updated_count} updated), last id {checkpoint.last_article_id}"
+            )
+    except BaseException:
+        session.rollback()
+        logger.warning(f"Keyword backfill '{job_name}' interrupted at article id {checkpoint.last_article_id}")
+        raise
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+    return {
+        "job_name": job_name,
+        "last_article_id": checkpoint.last_article_id,
+        "processed_count": checkpoint.processed_count,
+        "updated_count": checkpoint.updated_count,
+        "completed": checkpoint.completed_at is not None,
+        "completed_at": checkpoint.completed_at.isoformat() if checkpoint.completed_at else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-extract keywords_flagged for all articles")
+    parser.add_argument("--job", default="default", help="checkpoint name (reuse to resume)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-keywords", type=int, default=10)
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start over")
+    parser.add_argument("--sketches", action="store_true",
+                        help="rebuild the daily keyword sketches from the stored articles instead")
+    args = parser.parse_args(argv)
+
+    from ..database.repository import get_session, init_db, rebuild_keyword_sketches
+
+    init_db()
+    session = get_session()
+    try:
+        if args.sketches:
+            logger.info(f"Keyword sketches rebuilt: {rebuild_keyword_sketches(session)}")
+            return 0
+        result = run_keyword_backfill(
+            session,
+            job_name=args.job,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            max_keywords=args.max_keywords,
+            restart=args.restart,
+        )
+        logger.info(f"Keyword backfill finished: {result}")
+    except KeyboardInterrupt:
+        logger.info("Keyword backfill stopped; rerun with the same --job to continue")
+        return 130
+    finally:
+        session.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,236 @@
+"""
+Keyword trend & burst detection engine
+Keeps per-keyword counts in hourly buckets over a sliding window and scores
+bursts as a z-score of the recent hourly rate against the baseline hours.
+
+The engine is fed incrementally from the articles table: catch_up() reads
+only the rows added since its last call (by id), so /v1/analytics/trending
+never rescans keywords_flagged. Every API worker catches up on its own, so the
+trends are the same on all of them, not only on the scheduler leader whose
+crawls insert the articles.
+"""
+
+import calendar
+import math
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Iterable
+
+from sqlalchemy import func
+
+from config import config
+from ..utils.keyword_extractor import parse_keywords_from_db
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Floor for the baseline standard deviation; news keywords are sparse, so a
+# keyword that never appeared before would otherwise get an infinite score
+MIN_BASELINE_STD = 0.5
+
+
+def _hour_index(ts: datetime) -> int:
+    """Hour number since epoch for a naive UTC datetime"""
+    return calendar.timegm(ts.utctimetuple()) // 3600
+
+
+class KeywordTrendEngine:
+    """
+    Streaming keyword counter with hourly buckets.
+
+    Buckets are keyed by hour index, then source name, holding a Counter of
+    keyword -> number of articles mentioning it in that hour.
+    """
+
+    def __init__(self, window_hours: Optional[int] = None) -> None:
+        self.window_hours = window_hours or config.TREND_WINDOW_HOURS
+        self._buckets: Dict[int, Dict[str, Counter]] = {}
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self.articles_ingested = 0
+        self.last_article_id: Optional[int] = None  # newest article read from the DB (None: never synced)
+
+    def ingest(self, articles: Iterable[dict], now: Optional[datetime] = None) -> int:
+        """
+        Add newly saved articles to the hourly buckets.
+
+        Args:
+            articles: Article dicts (crawler schema) with keywords_flagged
+            now: Reference time used for eviction (default: utcnow)
+
+        Returns:
+            Number of articles counted
+        """
+        now_hour = _hour_index(now or datetime.utcnow())
+        oldest_hour = now_hour - self.window_hours + 1
+        counted = 0
+
+        with self._lock:
+            for article in articles:
+                keywords = parse_keywords_from_db(article.get("keywords_flagged"))
+                if not keywords:
+                    continue
+                hour = _hour_index(article.get("crawled_date") or datetime.utcnow())
+                if hour < oldest_hour:
+                    continue
+                source = article.get("source") or "Unknown"
+                self._buckets.setdefault(hour, {}).setdefault(source, Counter()).update(keywords)
+                counted += 1
+
+            self.articles_ingested += counted
+            self._evict(oldest_hour)
+        return counted
+
+    def _evict(self, oldest_hour: int) -> None:
+        for hour in [h for h in self._buckets if h < oldest_hour]:
+            del self._buckets[hour]
+
+    def _hour_counts(self, hour: int, source: Optional[str]) -> Counter:
+        by_source = self._buckets.get(hour)
+        if not by_source:
+            return Counter()
+        if source:
+            return by_source.get(source, Counter())
+        total = Counter()
+        for counts in by_source.values():
+            total.update(counts)
+        return total
+
+    def trending(
+        self,
+        recent_hours: int = 3,
+        limit: int = 20,
+        min_count: int = 2,
+        source: Optional[str] = None,
+        now: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank keywords by burst score.
+
+        burst_score = (recent hourly rate - baseline mean) / max(baseline std, MIN_BASELINE_STD)
+        where the baseline is every hour of the window before the recent hours.
+
+        Args:
+            recent_hours: Size of the "now" window in hours
+            limit: Maximum keywords to return
+            min_count: Minimum mentions in the recent window
+            source: Restrict to one source name
+            now: Reference time (default: utcnow)
+
+        Returns:
+            List of keyword trend dicts sorted by burst_score descending
+        """
+        now_hour = _hour_index(now or datetime.utcnow())
+        recent_hours = max(1, min(recent_hours, self.window_hours - 1))
+        recent_range = range(now_hour - recent_hours + 1, now_hour + 1)
+        baseline_range = range(now_hour - self.window_hours + 1, now_hour - recent_hours + 1)
+        baseline_len = len(baseline_range)
+
+        with self._lock:
+            recent = Counter()
+            for hour in recent_range:
+                recent.update(self._hour_counts(hour, source))
+
+            candidates = {kw for kw, count in recent.items() if count >= min_count}
+            sums = Counter()
+            sq_sums = Counter()
+            for hour in baseline_range:
+                counts = self._hour_counts(hour, source)
+                for kw in candidates.intersection(counts):
+                    sums[kw] += counts[kw]
+                    sq_sums[kw] += counts[kw] ** 2
+
+        results = []
+        for kw in candidates:
+            mean = sums[kw] / baseline_len if baseline_len else 0.0
+            variance = (sq_sums[kw] / baseline_len - mean ** 2) if baseline_len else 0.0
+            std = math.sqrt(max(variance, 0.0))
+            rate = recent[kw] / recent_hours
+            results.append({
+                "keyword": kw,
+                "recent_count": recent[kw],
+                "recent_rate_per_hour": round(rate, 3),
+                "baseline_mean_per_hour": round(mean, 3),
+                "baseline_std": round(std, 3),
+                "burst_score": round((rate - mean) / max(std, MIN_BASELINE_STD), 3),
+            })
+
+        results.sort(key=lambda r: (r["burst_score"], r["recent_count"]), reverse=True)
+        return results[:limit]
+
+    def warm_up(self, session, now: Optional[datetime] = None) -> int:
+        """
+        Rebuild buckets from the articles crawled inside the window (startup).
+
+        Returns:
+            Number of articles counted
+        """
+        from ..database.models import Article
+
+        now = now or datetime.utcnow()
+        since = now - timedelta(hours=self.window_hours)
+        with self._sync_lock:
+            last_id = session.query(func.max(Article.id)).scalar() or 0
+            rows = session.query(Article.source, Article.keywords_flagged, Article.crawled_date)\
+                .filter(Article.crawled_date >= since, Article.keywords_flagged != None, Article.id <= last_id)\
+                .all()
+
+            with self._lock:
+                self._buckets.clear()
+                self.articles_ingested = 0
+            counted = self.ingest(
+                ({"source": r.source, "keywords_flagged": r.keywords_flagged, "crawled_date": r.crawled_date}
+                 for r in rows),
+                now=now,
+            )
+            self.last_article_id = last_id
+        logger.info(f"Trend engine warmed up with {counted} articles from the last {self.window_hours}h")
+        return counted
+
+    def catch_up(self, session, now: Optional[datetime] = None) -> int:
+        """
+        Count the articles inserted since the last warm_up/catch_up (by any worker)
+
+        Returns:
+            Number of articles counted
+        """
+        from ..database.models import Article
+
+        if self.last_article_id is None:
+            return self.warm_up(session, now=now)
+        with self._sync_lock:
+            rows = session.query(Article.id, Article.source, Article.keywords_flagged, Article.crawled_date)\
+                .filter(Article.id > self.last_article_id)\
+                .order_by(Article.id)\
+                .all()
+            if not rows:
+                return 0
+            counted = self.ingest(
+                ({"source": r.source, "keywords_flagged": r.keywords_flagged, "crawled_date": r.crawled_date}
+                 for r in rows),
+                now=now,
+            )
+            self.last_article_id = rows[-1].id
+        return counted
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "window_hours": self.window_hours,
+                "buckets": len(self._buckets),
+                "articles_ingested": self.articles_ingested,
+                "last_article_id": self.last_article_id,
+            }
+
+
+# Global instance
+_engine: Optional[KeywordTrendEngine] = None
+
+
+def get_trend_engine() -> KeywordTrendEngine:
+    """Get or create the global trend engine instance"""
+    global _engine
+    if _engine is None:
+        _engine = KeywordTrendEngine()
+    return _engine
@@ -0,0 +1,214 @@
+"""
+Search result cache
+Caches /v1/articles results keyed by normalized query parameters.
+
+- In-process LRU with TTL by default
+- Redis when Config.CACHE_TYPE == 'redis' and the server answers a ping
+  (falls back to memory otherwise)
+- Invalidated by a generation counter: every cache key contains the current
+  generation, and bump_generation() is called whenever articles are saved or
+  cleaned up, so stale results are never served after a crawl
+- The generation is shared by all API workers (crawls only run on the
+  scheduler leader): kept in Redis, or without Redis in the data_versions
+  table, so a crawl on one worker invalidates the memory caches of the others
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+from config import config
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+KEY_PREFIX = "search"
+GENERATION_KEY = f"{KEY_PREFIX}:generation"
+GENERATION_VERSION = "articles"  # data_versions row of the shared generation
+
+
+def normalize_search_params(q: Optional[str], source: Optional[str]) -> Dict[str, Optional[str]]:
+    """Normalize query parameters so equivalent searches share one cache entry"""
+    q = (q or "").strip().lower() or None
+    source = (source or "").strip() or None
+    return {"q": q, "source": source}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Not JSON serializable: {type(value)}")
+
+
+class SearchResultCache:
+    """LRU + TTL cache for search results with generation-based invalidation"""
+
+    def __init__(self, ttl_seconds: Optional[int] = None, max_entries: Optional[int] = None,
+                 cache_type: Optional[str] = None, redis_url: Optional[str] = None,
+                 shared_generation: bool = False) -> None:
+        """
+        Args:
+            shared_generation: Without Redis, keep the generation in the database
+                               (data_versions) instead of this process
+        """
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else config.SEARCH_CACHE_TTL
+        self.max_entries = max_entries if max_entries is not None else config.SEARCH_CACHE_MAX_ENTRIES
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._redis = None
+        self.shared_generation = shared_generation
+
+        cache_type = cache_type or config.CACHE_TYPE
+        if cache_type == "redis":
+            self._redis = self._connect_redis(redis_url or config.REDIS_URL)
+
+    @staticmethod
+    def _connect_redis(url: str):
+        try:
+            import redis
+            client = redis.Redis.from_url(url, socket_connect_timeout=0.5, socket_timeout=0.5)
+            client.ping()
+            logger.info(f"Search cache using Redis at {url}")
+            return client
+        except Exception as e:
+            logger.warning(f"Redis unavailable ({e}), search cache falling back to memory")
+            return None
+
+    @property
+    def backend(self) -> str:
+        return "redis" if self._redis is not None else "memory"
+
+    @property
+    def generation(self) -> int:
+        if self._redis is not None:
+            try:
+                return int(self._redis.get(GENERATION_KEY) or 0)
+            except Exception as e:
+                logger.debug(f"Redis generation read failed: {e}")
+        elif self.shared_generation:
+            from ..database.repository import get_session, get_data_version
+            session = get_session()
+            try:
+                return get_data_version(session, GENERATION_VERSION)
+            except Exception as e:
+                logger.debug(f"Database generation read failed: {e}")
+            finally:
+                session.close()
+        return self._generation
+
+    def _key(self, params: Dict[str, Any], generation: int) -> str:
+        digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()
+        return f"{KEY_PREFIX}:{generation}:{digest}"
+
+    def get(self, params: Dict[str, Any]) -> Optional[List[dict]]:
+        """Return the cached result for these (normalized) params, or None"""
+        key = self._key(params, self.generation)
+        value = self._get_redis(key) if self._redis is not None else self._get_memory(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, params: Dict[str, Any], value: List[dict]) -> None:
+        key = self._key(params, self.generation)
+        if self._redis is not None:
+            try:
+                self._redis.set(key, json.dumps(value, default=_json_default), ex=self.ttl_seconds)
+            except Exception as e:
+                logger.debug(f"Redis cache write failed: {e}")
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _get_memory(self, key: str) -> Optional[List[dict]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _get_redis(self, key: str) -> Optional[List[dict]]:
+        try:
+            raw = self._redis.get(key)
+        except Exception as e:
+            logger.debug(f"Redis cache read failed: {e}")
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    def bump_generation(self) -> int:
+        """Invalidate every cached result (called after articles change)"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self.invalidations += 1
+            generation = self._generation
+        if self._redis is not None:
+            try:
+                generation = int(self._redis.incr(GENERATION_KEY))
+            except Exception as e:
+                logger.debug(f"Redis generation bump failed: {e}")
+        elif self.shared_generation:
+            from ..database.repository import get_session, bump_data_version
+            session = get_session()
+            try:
+                generation = bump_data_version(session, GENERATION_VERSION)
+            except Exception as e:
+                logger.error(f"Database generation bump failed, other workers keep stale results: {e}")
+            finally:
+                session.close()
+        return generation
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "backend": self.backend,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+        stats["generation"] = self.generation
+        return stats
+
+
+# Global instance
+_cache: Optional[SearchResultCache] = None
+
+
+def get_search_cache() -> SearchResultCache:
+    """Get or create the global search cache instance"""
+    global _cache
+    if _cache is None:
+        _cache = SearchResultCache(shared_generation=True)
+    return _cache
+
+
+def invalidate_search_cache() -> None:
+    """Bump the generation of the global search cache; errors are only logged"""
+    try:
+        get_search_cache().bump_generation()
+    except Exception as e:
+        logger.error(f"Error invalidating search cache: {e}")
@@ -0,0 +1,233 @@
+"""
+Publish/subscribe event bus
+Used to stream crawl progress and newly saved articles to SSE clients.
+
+Every subscriber gets its own bounded buffer. publish() never blocks: when a
+subscriber's buffer is full its oldest event is dropped (and counted), so a
+slow consumer can never back-pressure the crawler.
+
+Crawls run only on the scheduler leader, while SSE clients may be connected to
+any API worker. With an EventRelay started (app startup), published events are
+also written to the bus_events table in batches, and every worker with
+subscribers reads the other workers' events from it every EVENT_RELAY_INTERVAL.
+"""
+
+import itertools
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Iterable
+
+from config import config
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class Subscription:
+    """Bounded event buffer of one subscriber"""
+
+    def __init__(self, topics: Optional[Iterable[str]] = None, max_events: Optional[int] = None) -> None:
+        self.topics = set(topics) if topics else None
+        self.max_events = max_events or config.EVENT_BUS_QUEUE_SIZE
+        self._events: deque = deque()
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def wants(self, topic: str) -> bool:
+        return self.topics is None or topic in self.topics
+
+    def push(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            if len(self._events) >= self.max_events:
+                self._events.popleft()
+                self.dropped += 1
+            self._events.append(event)
+
+    def drain(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Pop up to `limit` buffered events (oldest first) without blocking"""
+        with self._lock:
+            count = min(limit, len(self._events))
+            return [self._events.popleft() for _ in range(count)]
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+
+class EventBus:
+    """Fan-out of published events to all matching subscriptions"""
+
+    def __init__(self) -> None:
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.published = 0
+        self.relay: Optional["EventRelay"] = None  # shares events with the other API workers
+
+    def subscribe(self, topics: Optional[Iterable[str]] = None, max_events: Optional[int] = None) -> Subscription:
+        subscription = Subscription(topics, max_events)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+        if subscription.dropped:
+            logger.info(f"Event subscriber dropped {subscription.dropped} event(s) while connected")
+
+    def publish(self, topic: str, data: Dict[str, Any]) -> None:
+        """Deliver an event to every subscriber of the topic (and the relay); never blocks"""
+        relay = self.relay
+        if relay is not None:
+            relay.enqueue(topic, data)
+        self.deliver(topic, data)
+
+    def deliver(self, topic: str, data: Dict[str, Any]) -> None:
+        """Deliver to this worker's subscribers only (events relayed from other workers)"""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+            event = {
+                "id": next(self._ids),
+                "topic": topic,
+                "data": data,
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+            self.published += 1
+        for subscription in subscriptions:
+            if subscription.wants(topic):
+                subscription.push(event)
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscriptions)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "subscribers": len(self._subscriptions),
+                "published": self.published,
+                "dropped": sum(s.dropped for s in self._subscriptions),
+            }
+
+
+class EventRelay:
+    """
+    Shares a bus's events with the other API workers through the database
+
+    publish() only appends to a bounded outbox (the oldest event is dropped
+    when full); a daemon thread writes the outbox in one transaction per
+    interval and, while this worker has subscribers, delivers the events other
+    workers stored since the last read.
+    """
+
+    def __init__(self, bus: EventBus, interval: Optional[float] = None, retention: Optional[int] = None,
+                 max_pending: Optional[int] = None) -> None:
+        self.bus = bus
+        self.interval = interval or config.EVENT_RELAY_INTERVAL
+        self.retention = retention or config.EVENT_RELAY_RETENTION
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._outbox: deque = deque(maxlen=max_pending or config.EVENT_BUS_QUEUE_SIZE * 4)
+        self._last_id: Optional[int] = None  # last event read from the other workers (None: start at the end)
+        self._last_prune: Optional[float] = None  # monotonic time of the last prune
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def enqueue(self, topic: str, data: Dict[str, Any]) -> None:
+        self._outbox.append({"topic": topic, "data": data})
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self.bus.relay = self
+        self._thread = threading.Thread(target=self._loop, name="event-relay", daemon=True)
+        self._thread.start()
+        logger.info(f"Event relay started as {self.origin}")
+
+    def stop(self) -> None:
+        """Stop relaying; events still in the outbox are written first"""
+        if self.bus.relay is self:
+            self.bus.relay = None
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.sync()
+
+    def _loop(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.sync()
+
+    def sync(self) -> None:
+        """Write the outbox, read the other workers' new events and prune old ones (errors are logged)"""
+        from ..database.repository import (
+            get_session, append_bus_events, get_bus_events, get_last_bus_event_id, prune_bus_events,
+        )
+
+        events = []
+        while self._outbox:
+            events.append(self._outbox.popleft())
+        session = get_session()
+        try:
+            try:
+                append_bus_events(session, self.origin, events)
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Event relay dropped {len(events)} event(s) of this worker: {e}")
+
+            if not self.bus.has_subscribers:
+                self._last_id = None  # nobody listening: skip what is published meanwhile
+            elif self._last_id is None:
+                self._last_id = get_last_bus_event_id(session)
+            else:
+                for event in get_bus_events(session, self._last_id, self.origin):
+                    self._last_id = event["id"]
+                    self.bus.deliver(event["topic"], event["data"])
+
+            if self._last_prune is None or time.monotonic() - self._last_prune >= self.retention / 10:
+                self._last_prune = time.monotonic()
+                prune_bus_events(session, datetime.utcnow() - timedelta(seconds=self.retention))
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Event relay sync failed: {e}")
+        finally:
+            session.close()
+
+
+# Global instance
+_bus: Optional[EventBus] = None
+
+
+def get_event_bus() -> EventBus:
+    """Get or create the global event bus instance"""
+    global _bus
+    if _bus is None:
+        _bus = EventBus()
+    return _bus
+
+
+def start_event_relay() -> EventRelay:
+    """Share the global bus's events with the other API workers (app startup)"""
+    bus = get_event_bus()
+    relay = bus.relay or EventRelay(bus)
+    relay.start()
+    return relay
+
+
+def stop_event_relay() -> None:
+    relay = get_event_bus().relay
+    if relay is not None:
+        relay.stop()
+
+
+def publish_event(topic: str, data: Dict[str, Any]) -> None:
+    """Publish on the global bus; errors are only logged"""
+    try:
+        get_event_bus().publish(topic, data)
+    except Exception as e:
+        logger.error(f"Error publishing {topic} event: {e}")
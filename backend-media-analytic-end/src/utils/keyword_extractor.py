@@ -190,6 +190,31 @@ def format_keywords_for_db(keywords: List[str], max_length: int = 512) -> str:
     return result if result else None
 
 
+def parse_keywords_from_db(keywords_str: str) -> List[str]:
+    """
+    Parse the comma-separated keywords_flagged column back into a list
+    (lowercased, deduplicated, order preserved)
+    """
+    if not keywords_str:
+        return []
+
+    result = []
+    for kw in keywords_str.split(","):
+        kw = kw.strip().lower()
+        if kw and kw not in result:
+            result.append(kw)
+    return result
+
+
+def extract_entities(text: str) -> List[str]:
+    """
+    Extract named entities (proper nouns, acronyms), e.g. from an article title
+    """
+    if not text:
+        return []
+    return [e for e in _extract_entities(text) if e.lower() not in INDONESIAN_STOPWORDS and len(e) > 2]
+
+
 # Backward compatibility - keep old function but improve it
 def extract_keywords_flagged(text: str) -> list:
     """
@@ -205,3 +230,21 @@ def extract_keywords_flagged(text: str) -> list:
     text = text.lower()
     found = [k for k in keywords if k in text]
     return found
+
+
+def extract_keywords_batch(rows: List[Tuple[int, str, str]], max_keywords: int = 10) -> List[Tuple[int, str]]:
+    """
+    Extract keywords untuk sekumpulan artikel sekaligus (dipakai oleh process pool saat backfill)
+
+    Args:
+        rows: List of (article_id, title, content)
+        max_keywords: Maximum keywords per article
+
+    Returns:
+        List of (article_id, comma-separated keywords string or None)
+    """
+    results = []
+    for article_id, title, content in rows:
+        keywords = extract_keywords_high_accuracy(title or "", content or "", max_keywords=max_keywords)
+        results.append((article_id, format_keywords_for_db(keywords)))
+    return results
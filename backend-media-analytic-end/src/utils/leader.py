@@ -0,0 +1,152 @@
+"""
+Leader election between API worker processes
+Under gunicorn every worker imports the app, so every worker would run its
+own crawl and cleanup schedulers. Workers instead compete for a lease row in
+the shared database; only the holder runs the schedulers. The holder renews
+the lease every LEADER_RENEW_INTERVAL seconds. If it dies, the lease expires
+after LEADER_LEASE_TTL seconds and another worker takes over on its next
+attempt. Renewal callbacks let the holder pick up state that other workers
+stored in the database (e.g. auto crawl start/stop requests).
+"""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Optional, Callable, Dict, Any, List
+
+from config import config
+from .logger import get_logger
+from ..database.repository import get_session, acquire_lease, release_lease
+
+logger = get_logger(__name__)
+
+SCHEDULER_LEASE = "background_schedulers"
+
+
+class LeaderElector:
+    """Keeps trying to acquire/renew a lease and reports leadership changes"""
+
+    def __init__(self, lease_name: str = SCHEDULER_LEASE, ttl_seconds: Optional[int] = None,
+                 renew_interval: Optional[int] = None) -> None:
+        self.lease_name = lease_name
+        self.ttl_seconds = ttl_seconds or config.LEADER_LEASE_TTL
+        self.renew_interval = renew_interval or config.LEADER_RENEW_INTERVAL
+        self.holder_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self._valid_until = 0.0  # monotonic time our last successful renewal is good for
+        self._on_elected: List[Callable[[], None]] = []
+        self._on_demoted: List[Callable[[], None]] = []
+        self._on_renewed: List[Callable[[], None]] = []
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def on_elected(self, callback: Callable[[], None]) -> None:
+        self._on_elected.append(callback)
+
+    def on_demoted(self, callback: Callable[[], None]) -> None:
+        self._on_demoted.append(callback)
+
+    def on_renewed(self, callback: Callable[[], None]) -> None:
+        """Called after every check that keeps an existing leadership"""
+        self._on_renewed.append(callback)
+
+    def start(self) -> None:
+        """Try once right away, then keep renewing in a daemon thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self.check()
+        self._thread = threading.Thread(target=self._loop, name="leader-election", daemon=True)
+        self._thread.start()
+        logger.info(f"Leader election started as {self.holder_id}")
+
+    def stop(self) -> None:
+        """Stop renewing and release the lease so another worker takes over without waiting for expiry"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        if self.is_leader:
+            self._set_leader(False)
+            session = get_session()
+            try:
+                release_lease(session, self.lease_name, self.holder_id)
+            finally:
+                session.close()
+
+    def check(self) -> bool:
+        """Acquire or renew the lease once; returns whether this worker is the leader"""
+        attempted_at = time.monotonic()
+        try:
+            session = get_session()
+            try:
+                acquired = acquire_lease(session, self.lease_name, self.holder_id, self.ttl_seconds)
+            finally:
+                session.close()
+        except Exception as e:
+            logger.error(f"Leader election error: {e}")
+            acquired = False
+
+        if acquired:
+            self._valid_until = attempted_at + self.ttl_seconds
+        # A failed renewal (e.g. database locked) does not end leadership while
+        # the previous lease is still valid: nobody else can take it before then
+        leader = acquired or attempted_at + self.renew_interval < self._valid_until
+        renewed = leader and self.is_leader
+        self._set_leader(leader)
+        if renewed:
+            self._run_callbacks(self._on_renewed)
+        return leader
+
+    def _loop(self) -> None:
+        while not self._stop_event.wait(self.renew_interval):
+            self.check()
+
+    def _set_leader(self, leader: bool) -> None:
+        if leader == self.is_leader:
+            return
+        self.is_leader = leader
+        if leader:
+            logger.info(f"{self.holder_id} became scheduler leader")
+        else:
+            logger.warning(f"{self.holder_id} lost scheduler leadership")
+        self._run_callbacks(self._on_elected if leader else self._on_demoted)
+
+    def _run_callbacks(self, callbacks: List[Callable[[], None]]) -> None:
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.exception(f"Leadership callback failed: {e}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"holder_id": self.holder_id, "is_leader": self.is_leader, "lease": self.lease_name}
+
+
+class _AlwaysLeader(LeaderElector):
+    """Used when LEADER_ELECTION_ENABLED is off: a single worker owns everything"""
+
+    def check(self) -> bool:
+        self._set_leader(True)
+        return True
+
+    def start(self) -> None:
+        self._stop_event.clear()
+        self.check()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._set_leader(False)
+
+
+# Global instance
+_elector: Optional[LeaderElector] = None
+
+
+def get_leader_elector() -> LeaderElector:
+    """Get or create the global leader elector of this worker"""
+    global _elector
+    if _elector is None:
+        _elector = LeaderElector() if config.LEADER_ELECTION_ENABLED else _AlwaysLeader()
+    return _elector
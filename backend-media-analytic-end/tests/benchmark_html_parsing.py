@@ -0,0 +1,145 @@
+"""
+Benchmark: index page parsing with BeautifulSoup/html.parser vs the lxml fast path
+
+Measures, per hardcoded source, the work the crawlers do on an index page:
+parse the page, collect every <a href> and read its text.
+
+Pages are read from tests/fixtures/pages/<source>.html. Save the live index
+pages first with:
+
+    python tests/benchmark_html_parsing.py --save
+
+Sources without a saved page are benchmarked on a generated page of similar
+shape (navigation, ~300 links, article blocks, inline scripts) so the script
+also runs offline.
+
+Usage:
+    python tests/benchmark_html_parsing.py [--save] [--rounds 20]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from bs4 import BeautifulSoup
+
+from src.crawler.html_parser import parse_html, anchors, text_of
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pages")
+
+# Index pages the hardcoded crawlers parse
+SOURCES = {
+    "kompas": "https://www.kompas.com/lampung/",
+    "detik": "https://www.detik.com/sumbagsel",
+    "radar_lampung": "https://radarlampung.disway.id/",
+    "suara": "https://www.suara.com/lampung",
+    "tribun_lampung": "https://lampung.tribunnews.com/",
+    "lampung_pro": "https://lampungpro.co",
+}
+
+HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
+
+
+def save_pages() -> None:
+    os.makedirs(PAGES_DIR, exist_ok=True)
+    for name, url in SOURCES.items():
+        try:
+            response = requests.get(url, headers=HEADERS, timeout=20)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"{name}: could not fetch {url}: {e}")
+            continue
+        with open(os.path.join(PAGES_DIR, f"{name}.html"), "wb") as f:
+            f.write(response.content)
+        print(f"{name}: saved {len(response.content) // 1024} KB")
+
+
+def generated_page(name: str, links: int = 300) -> bytes:
+    """Stand-in index page for a source without a saved page"""
+    rng = random.Random(name)
+    words = ["lampung", "bandar", "gubernur", "warga", "banjir", "pemilu", "harga", "pasar",
+             "polisi", "sekolah", "jalan", "tol", "kopi", "nelayan", "pemkot", "dprd"]
+    host = SOURCES[name].split("/")[2]
+
+    def title() -> str:
+        return " ".join(rng.choice(words).capitalize() for _ in range(rng.randint(6, 12)))
+
+    nav = "".join(f'<li><a href="/kategori/{w}">{w.title()}</a></li>' for w in words)
+    blocks = []
+    for i in range(links):
+        slug = "-".join(rng.choice(words) for _ in range(6))
+        href = f"https://{host}/read/2026/01/{i % 28 + 1:02d}/{100000 + i}/{slug}"
+        blocks.append(
+            f'<article class="list-content__item"><div class="media"><a href="{href}">'
+            f'<img src="https://img.{host}/{i}.jpg" alt=""></a></div>'
+            f'<div class="media__text"><h3 class="media__title"><a class="title" href="{href}">{title()}</a></h3>'
+            f'<span class="media__date">Senin, {i % 28 + 1} Januari 2026</span>'
+            f'<p>{title()} {title()}</p></div></article>'
+        )
+    script = "<script>window.dataLayer=[" + ",".join(f'{{"i":{i}}}' for i in range(400)) + "]</script>"
+    page = (
+        f"<!DOCTYPE html><html lang=\"id\"><head><meta charset=\"utf-8\"><title>{name}</title>"
+        f"{script}<style>.a{{color:red}}</style></head><body>"
+        f'<header class="header"><nav class="nav"><ul>{nav}</ul></nav></header>'
+        f'<main><div class="container"><div class="latest__list">{"".join(blocks)}</div></div></main>'
+        f'<aside class="sidebar">{nav}</aside><footer class="footer">{nav}{script}</footer></body></html>'
+    )
+    return page.encode("utf-8")
+
+
+def load_pages():
+    pages = {}
+    for name in SOURCES:
+        path = os.path.join(PAGES_DIR, f"{name}.html")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                pages[name] = (f.read(), "saved")
+        else:
+            pages[name] = (generated_page(name), "generated")
+    return pages
+
+
+def parse_before(content: bytes) -> int:
+    soup = BeautifulSoup(content.decode("utf-8", "replace"), "html.parser")
+    return sum(len(a.get_text(strip=True)) for a in soup.find_all("a", href=True))
+
+
+def parse_after(content: bytes) -> int:
+    root = parse_html(content)
+    return sum(len(text_of(a)) for a in anchors(root))
+
+
+def best_time(func, content: bytes, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(content)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--save", action="store_true", help="fetch and save the live index pages first")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.save:
+        save_pages()
+
+    print(f"{'source':<16}{'page':>10}{'links':>7}{'html.parser ms':>16}{'lxml ms':>10}{'speedup':>9}")
+    for name, (content, kind) in load_pages().items():
+        links = len(anchors(parse_html(content)))
+        before = best_time(parse_before, content, args.rounds) * 1000
+        after = best_time(parse_after, content, args.rounds) * 1000
+        print(f"{name:<16}{f'{len(content) // 1024}KB {kind[:3]}':>10}{links:>7}"
+              f"{before:>16.2f}{after:>10.2f}{before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: CPU-bound article processing inline vs in the process-pool parse stage
+
+Runs the crawl's per-article CPU work (parse the page, extract the body text,
+authenticity filter, keyword extraction) over many article pages through an
+ArticleBatch, once inline (PARSE_POOL_WORKERS = 0) and with worker processes,
+and reports pages per second. Pages are the article fixtures of
+tests/fixtures/articles padded toward the size of live article pages (~85 KB:
+related-article lists, inline scripts), each repeated with a unique URL.
+
+--latency adds a simulated download time per page in the submitting loop: the
+inline run pays latency + parse time per page, the pool parses while the next
+page downloads.
+
+Usage:
+    python tests/benchmark_parse_pool.py [--pages 400] [--workers 1 2 4] [--latency 0]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.crawler.parse_pool import ArticleBatch, ArticleTask, ParsePool
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "articles")
+
+
+def padded(page: bytes, name: str, links: int = 300) -> bytes:
+    """Article page with the related-article lists and scripts of a live page around the body"""
+    rng = random.Random(name)
+    words = ["lampung", "bandar", "gubernur", "warga", "banjir", "pemilu", "harga", "pasar",
+             "polisi", "sekolah", "jalan", "tol", "kopi", "nelayan", "pemkot", "dprd"]
+    related = "".join(
+        f'<li class="related__item"><a href="/read/{100000 + i}/{"-".join(rng.choice(words) for _ in range(6))}">'
+        f'{" ".join(rng.choice(words).capitalize() for _ in range(rng.randint(6, 12)))}</a></li>'
+        for i in range(links)
+    )
+    script = "<script>window.dataLayer=[" + ",".join(f'{{"i":{i},"k":"{rng.choice(words)}"}}' for i in range(1500)) + "]</script>"
+    extra = f'<aside class="sidebar"><ul>{related}</ul></aside>{script}</body>'.encode()
+    return page.replace(b"</body>", extra, 1) if b"</body>" in page else page + extra
+
+
+def load_tasks(count: int):
+    bodies = []
+    for name in sorted(os.listdir(FIXTURES)):
+        if name.endswith(".html"):
+            with open(os.path.join(FIXTURES, name), "rb") as f:
+                bodies.append(padded(f.read(), name))
+    return [
+        ArticleTask(f"https://news.example/read/{i}/berita-lampung-hari-ini", f"Berita Lampung hari ini nomor {i}.",
+                    "Benchmark", bodies[i % len(bodies)])
+        for i in range(count)
+    ]
+
+
+def run(pool: ParsePool, tasks, latency: float) -> float:
+    start = time.perf_counter()
+    batch = ArticleBatch(pool, limit=len(tasks))
+    for task in tasks:
+        if latency:
+            time.sleep(latency)
+        batch.add(task)
+        batch.full()
+    accepted = len(batch.accepted())
+    elapsed = time.perf_counter() - start
+    assert accepted, "no article accepted"
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated download ms per page")
+    args = parser.parse_args()
+
+    tasks = load_tasks(args.pages)
+    latency = args.latency / 1000
+    size = sum(len(task.body) for task in tasks) // len(tasks) // 1024
+    print(f"{len(tasks)} pages of ~{size} KB, {os.cpu_count()} CPUs, {args.latency:g} ms simulated download per page")
+    print(f"{'workers':<10}{'seconds':>10}{'pages/s':>10}{'speedup':>9}")
+
+    baseline = run(ParsePool(0), tasks, latency)
+    print(f"{'inline':<10}{baseline:>10.2f}{len(tasks) / baseline:>10.0f}{1:>8.1f}x")
+    for workers in args.workers:
+        pool = ParsePool(workers)
+        try:
+            run(pool, tasks[:workers * 4], 0)  # start the worker processes outside the timing
+            elapsed = run(pool, tasks, latency)
+        finally:
+            pool.shutdown()
+        print(f"{workers:<10}{elapsed:>10.2f}{len(tasks) / elapsed:>10.0f}{baseline / elapsed:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
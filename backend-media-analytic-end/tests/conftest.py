@@ -1,6 +1,36 @@
 import sys
 import os
 
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
 # Tambahkan root folder ke PYTHONPATH
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, ROOT_DIR)
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """
+    Point the app's database (sessions, scheduler job store, raw sqlite
+    connections) at an empty SQLite file, so tests never touch
+    ./database/media_analytics.db
+
+    Returns:
+        The temporary database URL
+    """
+    from config import config
+    from src.database import db, repository
+
+    path = tmp_path / "test.db"
+    url = f"sqlite:///{path}"
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    monkeypatch.setattr(config, "DATABASE_URL", url)
+    monkeypatch.setattr(db, "DB_PATH", str(path))
+    monkeypatch.setattr(repository, "engine", engine)
+    monkeypatch.setattr(repository, "SessionLocal",
+                        sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    repository.init_db()
+    yield url
+    engine.dispose()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Migration Script: Add Adaptive Scheduling Columns
+=======================================================
+
+Purpose:
+    Adds 3 new columns to news_sources table for per-source adaptive crawling
+    - crawl_interval_seconds (Integer): Current adaptive crawl interval
+    - last_crawl_inserted_count (Integer): New articles stored by the last crawl
+    - last_crawled_at (DateTime): Last scheduled crawl attempt
+
+Status:
+    - Database: SQLite (media_analytics.db)
+    - Backward Compatible: YES (all fields nullable or have defaults)
+    - Rollback Required: NO (safe to rerun)
+
+Run:
+    python migrate_add_adaptive_scheduling.py
+"""
+
+import sqlite3
+import os
+from datetime import datetime
+
+# Database path
+DB_PATH = os.path.join(os.getcwd(), "database", "media_analytics.db")
+
+# Migration definitions
+MIGRATIONS = [
+    {
+        "name": "Add crawl_interval_seconds column",
+        "sql": "ALTER TABLE news_sources ADD COLUMN crawl_interval_seconds INTEGER DEFAULT NULL;",
+        "description": "Adaptive crawl interval per source (NULL = default interval)"
+    },
+    {
+        "name": "Add last_crawl_inserted_count column",
+        "sql": "ALTER TABLE news_sources ADD COLUMN last_crawl_inserted_count INTEGER DEFAULT 0;",
+        "description": "Number of new articles stored by the last crawl"
+    },
+    {
+        "name": "Add last_crawled_at column",
+        "sql": "ALTER TABLE news_sources ADD COLUMN last_crawled_at DATETIME DEFAULT NULL;",
+        "description": "Timestamp of the last scheduled crawl attempt"
+    }
+]
+
+def column_exists(conn, table_name, column_name):
+    """Check if column already exists"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT {column_name} FROM {table_name} LIMIT 1")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+def run_migrations():
+    """Run all migrations"""
+    if not os.path.exists(DB_PATH):
+        print(f"❌ ERROR: Database not found at {DB_PATH}")
+        print("   Please ensure media_analytics.db exists before running migration")
+        return False
+    
+    print(f"📦 Database Path: {DB_PATH}")
+    print(f"📅 Migration Started: {datetime.now()}")
+    print("-" * 70)
+    
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    total_migrations = len(MIGRATIONS)
+    successful = 0
+    skipped = 0
+    failed = 0
+    
+    try:
+        for i, migration in enumerate(MIGRATIONS, 1):
+            name = migration["name"]
+            sql = migration["sql"]
+            desc = migration["description"]
+            column_name = sql.split("ADD COLUMN ")[1].split(" ")[0]
+            
+            print(f"\n[{i}/{total_migrations}] {name}")
+            print(f"    → {desc}")
+            
+            # Check if column already exists
+            if column_exists(conn, "news_sources", column_name):
+                print(f"    ✓ SKIPPED (column already exists)")
+                skipped += 1
+                continue
+            
+            try:
+                cursor.execute(sql)
+                conn.commit()
+                print(f"    ✓ SUCCESS")
+                successful += 1
+            except Exception as e:
+                print(f"    ✗ FAILED: {str(e)}")
+                failed += 1
+                continue
+        
+        print("\n" + "=" * 70)
+        print(f"📊 Migration Summary")
+        print(f"   ✓ Successful: {successful}/{total_migrations}")
+        print(f"   ↷ Skipped:   {skipped}/{total_migrations}")
+        print(f"   ✗ Failed:    {failed}/{total_migrations}")
+        
+        if failed == 0:
+            print(f"\n✅ Migration completed successfully!")
+            
+            # Show table structure
+            print("\n📋 Updated news_sources table structure:")
+            cursor.execute("PRAGMA table_info(news_sources)")
+            columns = cursor.fetchall()
+            print("   Columns:")
+            for col in columns:
+                col_name = col[1]
+                col_type = col[2]
+                is_pk = "PRIMARY KEY" if col[5] else ""
+                is_not_null = "NOT NULL" if col[3] else ""
+                
+                attrs = " ".join([is_pk, is_not_null]).strip()
+                if attrs:
+                    attrs = f"({attrs})"
+                print(f"     • {col_name}: {col_type} {attrs}".rstrip())
+            
+            return True
+        else:
+            print(f"\n⚠️  Migration completed with errors. Please review above.")
+            return False
+    
+    except Exception as e:
+        print(f"\n✗ FATAL ERROR: {str(e)}")
+        return False
+    
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    print("""
+╔═══════════════════════════════════════════════════════════════════╗
+║      ADAPTIVE SOURCE SCHEDULING - DATABASE MIGRATION              ║
+║                                                                   ║
+║  Adds columns to track:                                           ║
+║  • Adaptive crawl interval per source                            ║
+║  • New articles stored by the last crawl                         ║
+║  • Last scheduled crawl attempt                                  ║
+╚═══════════════════════════════════════════════════════════════════╝
+    """)
+    
+    success = run_migrations()
+    exit(0 if success else 1)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Migration Script: Add Feed High-Water Mark Columns
+=======================================================
+
+Purpose:
+    Adds 2 new columns to news_sources table for incremental RSS crawling
+    - feed_high_water_mark (DateTime): Newest feed entry publish time processed
+    - feed_seen_guids (JSON): GUIDs of feed entries already processed
+
+Status:
+    - Database: SQLite (media_analytics.db)
+    - Backward Compatible: YES (all fields nullable)
+    - Rollback Required: NO (safe to rerun)
+
+Run:
+    python migrate_add_feed_high_water_mark.py
+"""
+
+import sqlite3
+import os
+from datetime import datetime
+
+# Database path
+DB_PATH = os.path.join(os.getcwd(), "database", "media_analytics.db")
+
+# Migration definitions
+MIGRATIONS = [
+    {
+        "name": "Add feed_high_water_mark column",
+        "sql": "ALTER TABLE news_sources ADD COLUMN feed_high_water_mark DATETIME DEFAULT NULL;",
+        "description": "Newest RSS entry publish time processed (NULL = process the whole feed)"
+    },
+    {
+        "name": "Add feed_seen_guids column",
+        "sql": "ALTER TABLE news_sources ADD COLUMN feed_seen_guids JSON DEFAULT NULL;",
+        "description": "GUIDs of RSS entries already processed"
+    }
+]
+
+def column_exists(conn, table_name, column_name):
+    """Check if column already exists"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT {column_name} FROM {table_name} LIMIT 1")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+def run_migrations():
+    """Run all migrations"""
+    if not os.path.exists(DB_PATH):
+        print(f"❌ ERROR: Database not found at {DB_PATH}")
+        print("   Please ensure media_analytics.db exists before running migration")
+        return False
+    
+    print(f"📦 Database Path: {DB_PATH}")
+    print(f"📅 Migration Started: {datetime.now()}")
+    print("-" * 70)
+    
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    total_migrations = len(MIGRATIONS)
+    successful = 0
+    skipped = 0
+    failed = 0
+    
+    try:
+        for i, migration in enumerate(MIGRATIONS, 1):
+            name = migration["name"]
+            sql = migration["sql"]
+            desc = migration["description"]
+            column_name = sql.split("ADD COLUMN ")[1].split(" ")[0]
+            
+            print(f"\n[{i}/{total_migrations}] {name}")
+            print(f"    → {desc}")
+            
+            # Check if column already exists
+            if column_exists(conn, "news_sources", column_name):
+                print(f"    ✓ SKIPPED (column already exists)")
+                skipped += 1
+                continue
+            
+            try:
+                cursor.execute(sql)
+                conn.commit()
+                print(f"    ✓ SUCCESS")
+                successful += 1
+            except Exception as e:
+                print(f"    ✗ FAILED: {str(e)}")
+                failed += 1
+                continue
+        
+        print("\n" + "=" * 70)
+        print(f"📊 Migration Summary")
+        print(f"   ✓ Successful: {successful}/{total_migrations}")
+        print(f"   ↷ Skipped:   {skipped}/{total_migrations}")
+        print(f"   ✗ Failed:    {failed}/{total_migrations}")
+        
+        if failed == 0:
+            print(f"\n✅ Migration completed successfully!")
+            return True
+        else:
+            print(f"\n⚠️  Migration completed with errors. Please review above.")
+            return False
+    
+    except Exception as e:
+        print(f"\n✗ FATAL ERROR: {str(e)}")
+        return False
+    
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    print("""
+╔═══════════════════════════════════════════════════════════════════╗
+║      INCREMENTAL RSS CRAWLING - DATABASE MIGRATION                ║
+║                                                                   ║
+║  Adds columns to track per feed:                                  ║
+║  • Newest entry publish time processed (high-water mark)         ║
+║  • GUIDs of entries already processed                            ║
+╚═══════════════════════════════════════════════════════════════════╝
+    """)
+    
+    success = run_migrations()
+    exit(0 if success else 1)
@@ -0,0 +1,41 @@
+"""
+Test: adaptive per-source crawl intervals
+"""
+
+from src.crawler.adaptive_schedule import next_crawl_interval, jitter_seconds
+
+HOUR = 3600
+DAY = 86400
+WEEK = 604800
+
+
+def test_busy_source_is_crawled_more_often():
+    # 40 new articles in a day against a target of 25 per crawl
+    interval = next_crawl_interval(DAY, 40, 50, HOUR, WEEK)
+    assert HOUR <= interval < DAY
+
+    # Converges towards target / rate instead of jumping there at once
+    previous = DAY
+    for _ in range(10):
+        previous = next_crawl_interval(previous, int(40 * previous / DAY) or 1, 50, HOUR, WEEK)
+    assert abs(previous - DAY * 25 / 40) < 0.1 * DAY
+
+
+def test_idle_source_backs_off_up_to_the_maximum():
+    interval = next_crawl_interval(DAY, 0, 50, HOUR, WEEK)
+    assert DAY < interval < 2 * DAY
+    for _ in range(20):
+        interval = next_crawl_interval(interval, 0, 50, HOUR, WEEK)
+    assert interval == WEEK
+
+
+def test_full_page_hits_the_minimum():
+    interval = HOUR * 2
+    for _ in range(10):
+        interval = next_crawl_interval(interval, 50, 50, HOUR, WEEK)
+    assert interval == HOUR
+
+
+def test_jitter_is_a_fraction_of_the_interval():
+    assert jitter_seconds(DAY, 0.1) == 8640
+    assert jitter_seconds(DAY, 0) == 0
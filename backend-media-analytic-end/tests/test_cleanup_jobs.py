@@ -0,0 +1,60 @@
+"""
+Test: cleanup schedules run as jobs on the crawler manager's scheduler
+"""
+
+from src.crawler.hybrid_manager import HybridCrawlerManager, CLEANUP_JOB_PREFIX
+from src.database.repository import (
+    get_session, create_cleanup_schedule, update_cleanup_schedule, delete_cleanup_schedule
+)
+from src.database.models import CleanupSchedule
+
+
+def _cleanup_jobs(manager):
+    return {job["schedule_id"]: job for job in manager.get_status()["cleanup_jobs"]}
+
+
+def test_schedules_follow_the_database(temp_db):
+    session = get_session()
+    manager = HybridCrawlerManager()
+    try:
+        schedule = create_cleanup_schedule(session, "test", days_threshold=3650, interval_minutes=60)
+        manager.become_leader()
+        assert manager.get_status()["scheduler_running"]
+        assert _cleanup_jobs(manager)[schedule.id]["interval_minutes"] == 60
+
+        # Changed on another worker: picked up by the periodic sync
+        update_cleanup_schedule(session, schedule.id, {"interval_minutes": 30})
+        manager.sync_cleanup_jobs()
+        assert _cleanup_jobs(manager)[schedule.id]["interval_minutes"] == 30
+
+        manager._cleanup_job(schedule.id)
+        session.expire_all()
+        assert session.get(CleanupSchedule, schedule.id).last_run is not None
+
+        update_cleanup_schedule(session, schedule.id, {"active": False})
+        manager.sync_cleanup_jobs()
+        assert schedule.id not in _cleanup_jobs(manager)
+
+        manager.step_down()
+        assert not manager.get_status()["scheduler_running"]
+        assert manager.get_status()["cleanup_jobs"] == []
+    finally:
+        delete_cleanup_schedule(session, schedule.id)
+        session.close()
+        manager.shutdown()
+
+
+def test_stopping_auto_crawl_keeps_cleanup_jobs(temp_db):
+    session = get_session()
+    manager = HybridCrawlerManager()
+    try:
+        schedule = create_cleanup_schedule(session, "test", days_threshold=3650, interval_minutes=60)
+        manager.become_leader()
+        assert manager.start_auto_crawling()["status"] == "started"
+        assert manager.stop_auto_crawling()["status"] == "stopped"
+        assert manager.scheduler.get_job(f"{CLEANUP_JOB_PREFIX}{schedule.id}") is not None
+        assert manager.get_status()["source_jobs"] == []
+    finally:
+        delete_cleanup_schedule(session, schedule.id)
+        session.close()
+        manager.shutdown()
@@ -0,0 +1,84 @@
+"""
+Test: main content extraction on fixture article pages
+The fixtures are synthetic stand-ins written by hand, not saved pages. Each
+one follows the markup pattern of a source: Detik (<p> body with an inline
+scroll ad and a "Baca juga" table), Kompas (body nested in several wrapper
+divs), Tribun (body split by <br>), Radar Lampung (WordPress entry-content
+with a figure, blockquote, inline ad and share box) and Lampung Pro (table
+layout, <br>-split body inside <font>). Navigation, sidebars, related links,
+comments and a footer disclaimer surround the body. expected.json lists the
+first and last words of the body and noise that must not be extracted.
+"""
+
+import json
+import os
+
+import pytest
+
+from src.crawler.content_extractor import extract_main_content, find_main_block
+from src.crawler.html_parser import parse_html
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "articles")
+
+with open(os.path.join(FIXTURES, "expected.json"), encoding="utf-8") as f:
+    EXPECTED = json.load(f)
+
+
+def _page(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return parse_html(f.read())
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+def test_extracts_the_article_body(name):
+    expected = EXPECTED[name]
+    content = extract_main_content(_page(name))
+
+    assert content is not None
+    assert expected["starts_with"] in content
+    assert expected["ends_with"] in content
+    for noise in expected["excludes"]:
+        assert noise not in content
+
+
+def test_falls_back_to_text_density_without_paragraphs():
+    root = parse_html(
+        "<html><body><div class='menu'>" + "<a href='/k'>Kategori</a>" * 30 + "</div>"
+        "<div><span>" + "Isi berita tanpa paragraf. " * 20 + "</span><span>Sumber: redaksi</span></div></body></html>"
+    )
+    assert extract_main_content(root).startswith("Isi berita tanpa paragraf.")
+
+
+def test_short_or_empty_pages_have_no_main_block():
+    assert find_main_block(parse_html("<html><body><p>Terlalu pendek.</p></body></html>")) is None
+    assert extract_main_content(parse_html(b"")) is None
+
+
+def test_link_lists_do_not_win():
+    items = "".join(f"<p><a href='/read/{i}'>Judul berita terkait nomor {i} yang cukup panjang, sekali</a></p>"
+                    for i in range(40))
+    body = "<p>" + "Kalimat isi berita utama, dengan detail kejadian. " * 6 + "</p>"
+    root = parse_html(f"<html><body><div class='list'>{items}</div><div>{body * 3}</div></body></html>")
+    assert extract_main_content(root).startswith("Kalimat isi berita utama")
+
+
+def test_noise_nested_inside_the_article_is_left_out():
+    paragraph = "<p>" + "Banjir merendam ratusan rumah warga, dan petugas mengevakuasi korban. " * 4 + "</p>"
+    root = parse_html(
+        "<html><body><article>" + paragraph * 3
+        + "<aside>Baca juga: berita lainnya</aside><nav>Menu kanal</nav>"
+        + "<div><footer>Dilarang mengutip tanpa izin</footer></div>"
+        + "<script>var tracker = 1;</script></article></body></html>"
+    )
+    content = extract_main_content(root)
+
+    assert content.startswith("Banjir merendam") and content.endswith("mengevakuasi korban.")
+    for noise in ("Baca juga", "Menu kanal", "Dilarang mengutip", "tracker"):
+        assert noise not in content
+
+
+def test_block_inside_a_skipped_container_keeps_its_text():
+    paragraph = "<p>" + "Harga kopi robusta naik, dan petani di Lampung Barat menikmati hasil panen. " * 4 + "</p>"
+    root = parse_html(f"<html><body><header><div class='isi'>{paragraph * 3}</div></header></body></html>")
+    # Only SKIP_TAGS subtrees below the chosen block are left out
+    assert extract_main_content(root).startswith("Harga kopi robusta")
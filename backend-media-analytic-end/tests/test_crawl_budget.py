@@ -0,0 +1,40 @@
+"""
+Test: crawl run deadline, per-source budget and cancellation
+"""
+
+import threading
+import time
+
+from src.crawler.budget import CrawlBudget, CANCELLED, RUN_DEADLINE, SOURCE_BUDGET
+
+
+def test_source_budget_only_stops_the_current_source():
+    budget = CrawlBudget(run_seconds=60, source_seconds=0.05)
+    budget.start_source()
+    assert budget.exhausted() is None
+    time.sleep(0.06)
+    assert budget.exhausted() == SOURCE_BUDGET
+    assert budget.exhausted(source_only=True) is None
+    budget.start_source()
+    assert budget.exhausted() is None
+    assert budget.stop_reason is None
+
+
+def test_run_deadline_and_capped_timeouts():
+    budget = CrawlBudget(run_seconds=0.2)
+    assert budget.timeout(15) <= 0.2 + 1  # at least the 1s minimum
+    assert budget.timeout(0.5, minimum=0.01) <= 0.2
+    time.sleep(0.21)
+    assert budget.exhausted(source_only=True) == RUN_DEADLINE
+    assert budget.stop_reason == RUN_DEADLINE
+    assert CrawlBudget().timeout(15) == 15
+
+
+def test_any_joined_requester_can_cancel():
+    budget = CrawlBudget(run_seconds=60)
+    joined = threading.Event()
+    budget.add_cancel_event(joined)
+    assert not budget.cancelled
+    joined.set()
+    assert budget.exhausted() == CANCELLED
+    assert budget.stop_reason == CANCELLED
@@ -0,0 +1,244 @@
+"""
+Test: crawl jobs run in the background, report per-source progress and can be cancelled,
+from any worker (job state lives in the database)
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+from src.crawler.jobs import CrawlJobManager, SUCCEEDED, FAILED, CANCELLED, SKIPPED, FINISHED
+from src.crawler.budget import CrawlBudget
+from src.crawler.news_crawler import NewsCrawler
+from src.database.models import NewsSource, CrawlJobRecord
+from src.database.repository import get_session, create_crawl_job, update_crawl_job
+
+
+def _wait(manager, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    state = manager.get(job_id)
+    while state["status"] not in FINISHED and time.monotonic() < deadline:
+        time.sleep(0.01)
+        state = manager.get(job_id)
+    return state
+
+
+def _wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_job_tracks_progress_events_and_result(temp_db):
+    manager = CrawlJobManager(max_workers=1, history_size=10)
+    release = threading.Event()
+
+    def work(job):
+        release.wait(5)
+        job.handle_event("crawl_started", sources_total=2)
+        job.handle_event("source_started", source="Kompas")
+        job.handle_event("source_finished", source="Kompas", articles_count=4, error=None)
+        job.handle_event("source_started", source="Detik")
+        job.handle_event("source_finished", source="Detik", articles_count=0, error="timeout")
+        job.handle_event("articles_saved", articles_count=4, inserted_count=3)
+        return {"status": "success", "articles_count": 4}
+
+    job = manager.submit("manual", work)
+    assert manager.get(job.id)["status"] in ("queued", "running")
+    release.set()
+
+    state = _wait(manager, job.id)
+    assert state["status"] == SUCCEEDED
+    assert state["progress"] == {"sources_total": 2, "sources_done": 2, "percent": 100.0}
+    assert state["sources"]["Kompas"]["status"] == SUCCEEDED
+    assert state["sources"]["Detik"]["error"] == "timeout"
+    assert (state["articles_count"], state["inserted_count"]) == (4, 3)
+
+
+def test_failed_jobs_and_history_pruning(temp_db):
+    manager = CrawlJobManager(max_workers=1, history_size=2)
+    error_job = manager.submit("manual", lambda job: {"status": "error", "message": "boom"})
+    raising_job = manager.submit("manual", lambda job: 1 / 0)
+
+    state = _wait(manager, error_job.id)
+    assert state["status"] == FAILED and state["error"] == "boom"
+    assert _wait(manager, raising_job.id)["status"] == FAILED
+
+    last = manager.submit("manual", lambda job: {"status": "success"})
+    _wait_until(lambda: manager.get(error_job.id) is None)
+    assert manager.get(error_job.id) is None
+    assert manager.list()[0]["job_id"] == last.id
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, content):
+        self.content = content
+        self.text = content.decode()
+
+    def raise_for_status(self):
+        pass
+
+
+class _BlockingHttp:
+    """Serves a 5-entry feed per source; the first article page blocks until the job is cancelled"""
+
+    class rate_limiter:
+        @staticmethod
+        def configure_source(source):
+            pass
+
+    def __init__(self, cancel_event):
+        self.cancel_event = cancel_event
+        self.fetching = threading.Event()
+        self.feeds = []
+
+    def get_page(self, url, on_chunk=None, **kwargs):
+        if url.endswith("/rss"):
+            self.feeds.append(url)
+            return _Response(_feed(url.split("/")[2].split(".")[0]))
+        self.fetching.set()
+        self.cancel_event.wait(5)
+        response = _Response(ARTICLE)
+        if on_chunk:
+            on_chunk(response.content)
+        return response
+
+
+class _Analyzer:
+    def predict(self, text):
+        return {"sentiment": "neutral", "confidence": 0.5, "prob_negative": 0.2, "prob_neutral": 0.5,
+                "prob_positive": 0.3}
+
+
+ARTICLE = ("<html><body><div class='detail__body-text'>"
+           + "<p>Banjir merendam rumah warga di Bandar Lampung sejak pagi hari ini.</p>" * 10
+           + "</div></body></html>").encode()
+
+
+def _feed(host):
+    items = "".join(
+        f"<item><title>Banjir rendam Bandar Lampung {host} {i}. Warga mengungsi.</title>"
+        f"<link>https://{host}.example/read/{i}</link><guid>{host}-{i}</guid><description>pendek</description></item>"
+        for i in range(5)
+    )
+    return f"<rss version='2.0'><channel><title>{host}</title>{items}</channel></rss>".encode()
+
+
+def test_cancel_stops_a_running_crawl_and_skips_remaining_sources(temp_db):
+    session = get_session()
+    for name in ("alpha", "beta", "gamma"):
+        session.add(NewsSource(name=name, base_url=f"https://{name}.example", crawl_type="rss",
+                               config={"rss_url": f"https://{name}.example/rss"}, active=True))
+    session.commit()
+    manager = CrawlJobManager(max_workers=1, history_size=10)
+    http = None
+
+    def work(job):
+        nonlocal http
+        http = _BlockingHttp(job.cancel_event)
+        budget = CrawlBudget(cancel_event=job.cancel_event)
+        crawler = NewsCrawler(db_session=session, analyzer=_Analyzer(), http_client=http)
+        crawler.crawl_all(progress=job.handle_event, budget=budget)
+        return {"status": "cancelled" if budget.stop_reason == "cancelled" else "success"}
+
+    try:
+        job = manager.submit("manual", work)
+        _wait_until(lambda: http is not None and http.fetching.is_set())
+        manager.cancel(job.id)
+        state = _wait(manager, job.id)
+    finally:
+        session.close()
+
+    # Only the source being crawled when the job was cancelled got fetched
+    assert len(http.feeds) == 1
+    crawled = http.feeds[0].split("/")[2].split(".")[0]
+    assert state["status"] == CANCELLED and state["cancel_requested"]
+    assert state["sources"][crawled]["status"] == SUCCEEDED and state["sources"][crawled]["truncated"]
+    assert 0 < state["sources"][crawled]["articles_count"] < 5
+    assert sorted(name for name, entry in state["sources"].items() if entry["status"] == SKIPPED) == \
+        sorted({"alpha", "beta", "gamma"} - {crawled})
+    assert state["progress"]["percent"] == 100.0
+
+
+def test_cancel_before_start_and_after_finish(temp_db):
+    manager = CrawlJobManager(max_workers=1, history_size=10)
+    release = threading.Event()
+    blocker = manager.submit("manual", lambda job: release.wait(5) and {"status": "success"})
+    queued = manager.submit("manual", lambda job: {"status": "success"})
+    manager.cancel(queued.id)
+    release.set()
+
+    state = _wait(manager, queued.id)
+    assert state["status"] == CANCELLED and state["started_at"] is None
+    assert _wait(manager, blocker.id)["status"] == SUCCEEDED
+    assert not manager.cancel(blocker.id)["cancel_requested"]
+
+
+def test_submit_once_returns_the_queued_or_running_job(temp_db):
+    manager = CrawlJobManager(max_workers=1, history_size=10)
+    release = threading.Event()
+    first, existing = manager.submit_once("manual", lambda job: release.wait(5) and {"status": "success"})
+    assert not existing
+
+    # Right after the first POST the job may still be queued: no second crawl
+    second, existing = manager.submit_once("manual", lambda job: {"status": "success"})
+    assert existing and second["job_id"] == first["job_id"]
+    assert len(manager.list()) == 1
+
+    # A job being cancelled no longer blocks a new one
+    manager.cancel(first["job_id"])
+    third, existing = manager.submit_once("manual", lambda job: {"status": "success"})
+    assert not existing and third["job_id"] != first["job_id"]
+    release.set()
+    assert _wait(manager, third["job_id"])["status"] == SUCCEEDED
+
+
+def test_jobs_are_shared_between_workers(temp_db):
+    running_here = CrawlJobManager(max_workers=1, history_size=10, heartbeat_interval=0.05)
+    other_worker = CrawlJobManager(max_workers=1, history_size=10, heartbeat_interval=0.05)
+    other_worker.worker_id = "other-host:1"
+    started = threading.Event()
+
+    def work(job):
+        job.handle_event("crawl_started", sources_total=1)
+        started.set()
+        job.cancel_event.wait(5)
+        return {"status": "cancelled" if job.cancel_event.is_set() else "success"}
+
+    try:
+        job, existing = running_here.submit_once("manual", work)
+        assert started.wait(5)
+
+        # Another worker sees the job and does not start a second manual crawl
+        assert other_worker.get(job["job_id"])["progress"]["sources_total"] == 1
+        assert [j["job_id"] for j in other_worker.list()] == [job["job_id"]]
+        same, existing = other_worker.submit_once("manual", lambda job: {"status": "success"})
+        assert existing and same["job_id"] == job["job_id"]
+
+        # Cancelling through the other worker stops the crawl on this one
+        other_worker.cancel(job["job_id"])
+        state = _wait(other_worker, job["job_id"])
+        assert state["status"] == CANCELLED and state["cancel_requested"]
+    finally:
+        running_here.shutdown()
+        other_worker.shutdown()
+
+
+def test_job_of_a_stopped_worker_no_longer_blocks(temp_db):
+    manager = CrawlJobManager(max_workers=1, history_size=10)
+    session = get_session()
+    try:
+        create_crawl_job(session, "deadbeef", "manual", "gone-host:1", single_flight=True)
+        update_crawl_job(session, "deadbeef", status="running")
+        session.query(CrawlJobRecord).update({CrawlJobRecord.heartbeat_at: datetime.utcnow() - timedelta(hours=1)})
+        session.commit()
+    finally:
+        session.close()
+
+    job, existing = manager.submit_once("manual", lambda job: {"status": "success"})
+    assert not existing
+    assert _wait(manager, job["job_id"])["status"] == SUCCEEDED
+    stale = manager.get("deadbeef")
+    assert stale["status"] == FAILED and stale["error"] == "Worker running the job stopped"
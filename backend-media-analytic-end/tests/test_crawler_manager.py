@@ -0,0 +1,81 @@
+"""
+Test: HybridCrawlerManager single-flight crawls, non-blocking status and interval bounds
+"""
+
+import threading
+import time
+
+from src.crawler.hybrid_config import HybridCrawlerConfig
+from src.crawler.hybrid_manager import HybridCrawlerManager
+
+
+def _blocking_manager():
+    manager = HybridCrawlerManager()
+    manager.is_leader = True
+    manager.restore_state()
+    release = threading.Event()
+    calls = []
+
+    def fake_perform_crawl(run, source_ids=None):
+        calls.append(run.trigger)
+        release.wait(5)
+        return 1
+
+    manager._perform_crawl = fake_perform_crawl
+    return manager, release, calls
+
+
+def _wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_status_does_not_block_and_shows_running_crawl(temp_db):
+    manager, release, calls = _blocking_manager()
+    crawls_before = manager.get_status()["total_crawls"]
+    worker = threading.Thread(target=manager.run_manual_crawl)
+    worker.start()
+    _wait_until(lambda: calls)
+
+    started = time.monotonic()
+    status = manager.get_status()
+    assert time.monotonic() - started < 0.1
+    assert status["crawl_in_progress"] is True
+    assert status["current_crawl"]["trigger"] == "manual"
+    assert manager.update_interval(120)["status"] == "success"
+
+    release.set()
+    worker.join(5)
+    status = manager.get_status()
+    assert status["crawl_in_progress"] is False
+    assert status["total_crawls"] == crawls_before + 1
+
+
+def test_concurrent_crawls_are_coalesced(temp_db):
+    manager, release, calls = _blocking_manager()
+    results = []
+    leader = threading.Thread(target=lambda: results.append(manager.run_manual_crawl()))
+    leader.start()
+    _wait_until(lambda: calls)
+
+    follower = threading.Thread(target=lambda: results.append(manager.run_manual_crawl()))
+    follower.start()
+    manager._source_crawl_job(1)  # postponed while a crawl is running
+
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert calls == ["manual"]
+    assert sorted(r["coalesced"] for r in results if "coalesced" in r) == [True]
+    assert len({r["crawl_number"] for r in results}) == 1
+
+
+def test_adaptive_interval_stays_within_configured_bounds():
+    manager = HybridCrawlerManager(HybridCrawlerConfig(min_interval=3600, max_interval=7200))
+    manager.crawl_interval = 86400  # a CRAWL_INTERVAL outside the adaptive bounds
+
+    assert manager._clamp_interval(86400) == 7200
+    assert manager._clamp_interval(60) == 3600
+    assert manager._clamp_interval(5000) == 5000
@@ -0,0 +1,144 @@
+"""
+Test: concurrent crawl type auto-detection (DynamicCrawler.detect_crawl_type)
+Requests are faked with a fixed latency; probes run in parallel, so detection
+takes about one round trip instead of one per probed path.
+"""
+
+import io
+import time
+from types import SimpleNamespace
+
+import pytest
+import requests
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.crawler import dynamic_crawler
+from src.crawler.dynamic_crawler import DynamicCrawler, article_link_pattern, detection_domain, looks_like_feed
+from src.database.models import Base
+from src.database.repository import get_detection, invalidate_detection, save_detection, save_link_patterns
+
+RTT = 0.2
+RSS = b"<?xml version='1.0'?><rss version='2.0'><channel><title>News</title></channel></rss>"
+HOMEPAGE = b"<html><head><title>News</title></head><body><p>Berita</p></body></html>"
+
+
+def _response(url, status, body=b"", media_type="text/html"):
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response.headers["Content-Type"] = media_type
+    response.raw = io.BytesIO(body)
+    return response
+
+
+def _session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+@pytest.fixture
+def site(monkeypatch):
+    """Fake site: {url: (status, body, content type)}; unknown URLs are 404"""
+    pages = {}
+    requested = []
+
+    def get(url, **kwargs):
+        requested.append(url)
+        time.sleep(RTT)
+        status, body, media_type = pages.get(url, (404, b"", "text/html"))
+        return _response(url, status, body, media_type)
+
+    def head(url, **kwargs):
+        return get(url)
+
+    monkeypatch.setattr(dynamic_crawler.requests, "get", get)
+    monkeypatch.setattr(dynamic_crawler.requests, "head", head)
+    monkeypatch.setattr(dynamic_crawler, "get_robots_cache",
+                        lambda: SimpleNamespace(get=lambda domain: SimpleNamespace(sitemaps=[])))
+    pages["https://news.example/"] = (200, HOMEPAGE, "text/html")
+    return SimpleNamespace(pages=pages, requested=requested)
+
+
+def test_feed_is_detected_in_about_one_round_trip(site):
+    site.pages["https://news.example/index.php/rss"] = (200, RSS, "application/rss+xml")
+
+    started = time.monotonic()
+    result = DynamicCrawler().detect_crawl_type("https://news.example/")
+    elapsed = time.monotonic() - started
+
+    assert result["type"] == "rss"
+    assert result["config"] == {"rss_url": "https://news.example/index.php/rss"}
+    assert elapsed < 2 * RTT  # sequential probing took 7+ round trips to reach the last path
+
+
+def test_html_pages_on_feed_paths_are_not_feeds(site):
+    # Sites that answer every path with the homepage
+    for path in ("/rss", "/feed"):
+        site.pages["https://news.example" + path] = (200, HOMEPAGE, "text/html")
+    site.pages["https://news.example/sitemap.xml"] = (200, b"<urlset/>", "application/xml")
+
+    result = DynamicCrawler().detect_crawl_type("https://news.example/")
+
+    assert result["type"] == "sitemap"
+    assert result["config"] == {"sitemap_url": "https://news.example/sitemap.xml"}
+
+
+def test_deadline_bounds_detection(site, monkeypatch):
+    def unresponsive(url, **kwargs):
+        time.sleep(1)
+        return _response(url, 200, HOMEPAGE)
+
+    monkeypatch.setattr(dynamic_crawler.requests, "get", unresponsive)
+
+    started = time.monotonic()
+    result = DynamicCrawler().detect_crawl_type("https://news.example/", timeout=0.3)
+
+    assert result["type"] == "html"
+    assert time.monotonic() - started < 0.8
+
+
+def test_looks_like_feed():
+    assert looks_like_feed("application/rss+xml", b"<?xml version='1.0'?><rss>")
+    assert looks_like_feed("text/html", b"<?xml version='1.0'?>\n<feed xmlns='http://www.w3.org/2005/Atom'>")
+    assert looks_like_feed("text/xml", b"<?xml version='1.0'?><rdf:RDF>")
+    assert not looks_like_feed("text/html", HOMEPAGE)
+    assert not looks_like_feed("application/xml", b"<!DOCTYPE html><html><body>")
+
+
+def test_detection_is_cached_per_domain(site):
+    session = _session()
+    site.pages["https://news.example/rss"] = (200, RSS, "application/rss+xml")
+
+    first = DynamicCrawler(db_session=session).detect_crawl_type("https://news.example/")
+    probed = len(site.requested)
+    second = DynamicCrawler(db_session=session).detect_crawl_type("https://www.news.example/kategori")
+
+    assert first["cached"] is False and second["cached"] is True
+    assert second["config"] == first["config"] == {"rss_url": "https://news.example/rss"}
+    assert len(site.requested) == probed  # no request for the cached domain
+    assert DynamicCrawler(db_session=session)._detect_rss_feeds("https://news.example") == ["https://news.example/rss"]
+
+    assert invalidate_detection(session, "news.example") == 1
+    assert DynamicCrawler(db_session=session).detect_crawl_type("https://news.example/")["cached"] is False
+
+
+def test_expired_entries_and_link_patterns():
+    session = _session()
+    assert save_detection(session, "news.example", "html", ttl_seconds=-1)
+    assert get_detection(session, "news.example") is None
+    assert not save_link_patterns(session, "news.example", ["/berita/"])
+
+    assert save_detection(session, "news.example", "html")
+    assert save_link_patterns(session, "news.example", ["/berita/"])
+    assert save_detection(session, "news.example", "sitemap", sitemap_url="https://news.example/sitemap.xml")
+    cached = get_detection(session, "news.example")
+    assert cached["crawl_type"] == "sitemap" and cached["link_patterns"] == ["/berita/"]  # kept on refresh
+
+
+def test_domain_and_link_pattern_keys():
+    assert detection_domain("https://WWW.News.Example/rss") == detection_domain("news.example") == "news.example"
+    assert article_link_pattern("https://news.example/berita/123/banjir-rendam-kota") == "/berita/"
+    assert article_link_pattern("https://news.example/2026/01/10/banjir") is None
+    assert article_link_pattern("https://news.example/banjir-rendam-kota") is None
@@ -0,0 +1,60 @@
+"""
+Test: event bus fan-out, topic filtering and bounded per-subscriber buffers
+"""
+
+from src.utils.event_bus import EventBus, EventRelay
+
+
+def test_topic_filter_and_fan_out():
+    bus = EventBus()
+    everything = bus.subscribe()
+    articles_only = bus.subscribe(["article_saved"])
+
+    bus.publish("source_started", {"source": "Kompas"})
+    bus.publish("article_saved", {"title": "Banjir"})
+
+    assert [e["topic"] for e in everything.drain()] == ["source_started", "article_saved"]
+    assert [e["data"] for e in articles_only.drain()] == [{"title": "Banjir"}]
+    assert everything.drain() == []
+
+
+def test_slow_subscriber_drops_oldest_without_blocking():
+    bus = EventBus()
+    slow = bus.subscribe(max_events=3)
+    for i in range(10):
+        bus.publish("source_finished", {"n": i})
+
+    assert [e["data"]["n"] for e in slow.drain()] == [7, 8, 9]
+    assert slow.dropped == 7
+    assert bus.stats() == {"subscribers": 1, "published": 10, "dropped": 7}
+
+    bus.unsubscribe(slow)
+    bus.publish("source_finished", {"n": 10})
+    assert slow.drain() == []
+
+
+def test_relay_delivers_events_of_other_workers(temp_db):
+    leader, follower = EventBus(), EventBus()
+    leader_relay = EventRelay(leader, interval=60)
+    follower_relay = EventRelay(follower, interval=60)
+    leader_relay.start()
+    follower_relay.start()
+    try:
+        leader.publish("source_started", {"source": "before anyone listened"})
+        leader_relay.sync()
+
+        client = follower.subscribe(["article_saved", "own"])  # SSE client on the other worker
+        follower_relay.sync()
+        leader.publish("article_saved", {"title": "Banjir"})
+        follower.publish("own", {"n": 1})
+        leader_relay.sync()
+        follower_relay.sync()
+        follower_relay.sync()
+
+        # Own events are delivered once (locally), earlier ones are not replayed
+        assert [(e["topic"], e["data"]) for e in client.drain()] == [("own", {"n": 1}),
+                                                                     ("article_saved", {"title": "Banjir"})]
+    finally:
+        leader_relay.stop()
+        follower_relay.stop()
+    assert leader.relay is None
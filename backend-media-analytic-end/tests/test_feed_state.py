@@ -0,0 +1,150 @@
+"""
+Test: per-feed high-water marks of incremental RSS crawling
+"""
+
+import time
+from datetime import datetime
+
+import feedparser
+import requests
+
+from src.crawler.feed_state import FeedState, MAX_SEEN_GUIDS, advance, entry_guid, entry_published, new_entries
+from src.crawler.news_crawler import NewsCrawler
+from src.database.models import NewsSource
+from src.database.repository import get_session
+
+
+def _feed(*items):
+    """feedparser entries of an RSS feed; items are (guid, pubDate or None)"""
+    xml = "".join(
+        f"<item><title>Berita {guid}</title><link>https://news.example/read/{guid}</link><guid>{guid}</guid>"
+        + (f"<pubDate>{pub}</pubDate>" if pub else "") + "</item>"
+        for guid, pub in items
+    )
+    return feedparser.parse(f"<rss version='2.0'><channel><title>News</title>{xml}</channel></rss>").entries
+
+
+FEED = _feed(("c", "Sun, 11 Jan 2026 10:00:00 +0700"), ("b", "Sat, 10 Jan 2026 12:00:00 GMT"),
+             ("a", "Sat, 10 Jan 2026 08:00:00 GMT"))
+
+
+def test_entry_guid_and_utc_publish_time():
+    assert entry_guid(FEED[0]) == "c"
+    assert entry_published(FEED[0]) == datetime(2026, 1, 11, 3, 0)
+    assert entry_published(_feed(("x", None))[0]) is None
+    assert entry_guid({"link": "https://news.example/read/y"}) == "https://news.example/read/y"
+    assert entry_published({"updated_parsed": time.strptime("2026-01-12", "%Y-%m-%d")}) == datetime(2026, 1, 12)
+
+
+def test_first_crawl_processes_everything_and_sets_the_mark():
+    assert new_entries(FEED, None) == FEED
+    assert new_entries(FEED, FeedState()) == FEED
+
+    state = advance(None, FEED, complete=True)
+    assert state.high_water_mark == datetime(2026, 1, 11, 3, 0)
+    assert state.seen_guids == ["c", "b", "a"]
+    assert new_entries(FEED, state) == []
+
+
+def test_only_entries_above_the_mark_or_unseen_are_new():
+    state = advance(None, FEED, complete=True)
+    newer = _feed(("d", "Sun, 11 Jan 2026 06:00:00 GMT"), ("undated", None), ("late", "Sat, 10 Jan 2026 09:00:00 GMT"),
+                  *[(guid, None) for guid in ("c", "b", "a")])
+    # "late" was published before the mark (added to the feed afterwards): the mark filters it
+    assert [entry_guid(e) for e in new_entries(newer, state)] == ["d", "undated"]
+
+    state = advance(state, new_entries(newer, state), complete=True)
+    assert state.high_water_mark == datetime(2026, 1, 11, 6, 0)
+    assert state.seen_guids[:2] == ["d", "undated"]
+    assert new_entries(newer, state) == []
+
+
+def test_interrupted_crawl_keeps_the_mark_and_picks_up_the_rest():
+    state = advance(None, FEED[:1], complete=False)
+    assert state.high_water_mark is None
+    assert [entry_guid(e) for e in new_entries(FEED, state)] == ["b", "a"]
+
+    state = advance(state, new_entries(FEED, state), complete=True)
+    assert state.high_water_mark == datetime(2026, 1, 10, 12, 0)  # "c" stays covered by its GUID
+    assert new_entries(FEED, state) == []
+
+
+def test_seen_guids_are_bounded():
+    entries = [{"id": f"g{i}"} for i in range(MAX_SEEN_GUIDS + 50)]
+    state = advance(None, entries, complete=True)
+    assert len(state.seen_guids) == MAX_SEEN_GUIDS
+    assert state.seen_guids[0] == "g0"
+
+
+class _Response:
+    def __init__(self, content):
+        self.content = content
+        self.text = content.decode()
+        self.status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+
+class _FlakyHttp:
+    """Serves FLAKY_FEED; article pages in self.failing time out"""
+
+    class rate_limiter:
+        @staticmethod
+        def configure_source(source):
+            pass
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.pages = []
+
+    def get_page(self, url, on_chunk=None, **kwargs):
+        if url.endswith("/rss"):
+            return _Response(FLAKY_FEED)
+        self.pages.append(url)
+        if url in self.failing:
+            raise requests.exceptions.Timeout("read timeout")
+        response = _Response(ARTICLE)
+        if on_chunk:
+            on_chunk(response.content)
+        return response
+
+
+class _Analyzer:
+    def predict(self, text):
+        return {"sentiment": "neutral", "confidence": 0.5, "prob_negative": 0.2, "prob_neutral": 0.5,
+                "prob_positive": 0.3}
+
+
+ARTICLE = ("<html><body><div class='detail__body-text'>"
+           + "<p>Banjir merendam rumah warga di Bandar Lampung sejak pagi hari ini.</p>" * 10
+           + "</div></body></html>").encode()
+FLAKY_FEED = ("<rss version='2.0'><channel><title>News</title>" + "".join(
+    f"<item><title>Banjir rendam Bandar Lampung {guid}. Warga mengungsi.</title>"
+    f"<link>https://news.example/read/{guid}</link><guid>{guid}</guid><pubDate>{pub}</pubDate>"
+    f"<description>pendek</description></item>"
+    for guid, pub in (("b", "Sat, 10 Jan 2026 12:00:00 GMT"), ("a", "Sat, 10 Jan 2026 08:00:00 GMT"))
+) + "</channel></rss>").encode()
+
+
+def test_entries_whose_page_failed_are_retried(temp_db):
+    session = get_session()
+    source = NewsSource(name="News", base_url="https://news.example", crawl_type="rss",
+                        config={"rss_url": "https://news.example/rss"}, active=True)
+    session.add(source)
+    session.commit()
+    try:
+        http = _FlakyHttp(failing={"https://news.example/read/b"})
+        NewsCrawler(db_session=session, analyzer=_Analyzer(), http_client=http).crawl_all()
+        session.refresh(source)
+        # "b" timed out: neither remembered nor passed by the mark
+        assert source.feed_seen_guids == ["a"]
+        assert source.feed_high_water_mark is None
+
+        http = _FlakyHttp()
+        NewsCrawler(db_session=session, analyzer=_Analyzer(), http_client=http).crawl_all()
+        session.refresh(source)
+        assert http.pages == ["https://news.example/read/b"]
+        assert source.feed_high_water_mark == datetime(2026, 1, 10, 12, 0)
+    finally:
+        session.close()
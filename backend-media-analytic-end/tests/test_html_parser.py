@@ -0,0 +1,87 @@
+"""
+Test: lxml parsing fast path matches what the crawlers got from BeautifulSoup
+"""
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.crawler.html_parser import (
+    parse_html, anchors, first_anchor, select, select_one, text_of, css_to_xpath, drop, HtmlFeed,
+)
+from src.crawler.dynamic_crawler import DynamicCrawler
+
+PAGE = b"""<!DOCTYPE html><html><head><meta charset="utf-8"><title>Index</title>
+<script>var links = "<a href='/x'>x</a>";</script></head><body>
+<header class="site-header"><nav><a href="/">Beranda</a></nav></header>
+<main><div class="latest__list" id="latest">
+  <article><div class="media"><a href="https://news.example/read/2026/01/10/123/banjir-bandar-lampung"><img src="i.jpg"></a></div>
+    <h3 class="media__title"><a class="title" href="https://news.example/read/2026/01/10/123/banjir-bandar-lampung">
+      Banjir <b>Rendam</b> Bandar Lampung</a></h3><!-- ad slot --><p>Ringkasan &amp; detail</p></article>
+  <article><h2>Harga Kopi Naik</h2><a href="/read/2026/01/11/124/harga-kopi-naik-di-lampung">Baca</a></article>
+</div></main>
+<aside class="sidebar"><a href="/read/2026/01/01/1/populer-sidebar-item">Populer sidebar item</a></aside>
+<footer><a href="/tentang-kami">Tentang Kami</a></footer></body></html>"""
+
+
+@pytest.mark.parametrize("selector", [
+    "article", "article a", "div.latest__list > article", "#latest a.title", "h3.media__title a, article h2",
+    "a[href^='https']", "a[href*=harga]", "a[class~=title]", "[id=latest]", "body *",
+])
+def test_selectors_match_beautifulsoup(selector):
+    root = parse_html(PAGE)
+    soup = BeautifulSoup(PAGE, "html.parser")
+    assert [text_of(e, " ") for e in select(root, selector)] == [e.get_text(" ", strip=True) for e in soup.select(selector)]
+
+
+def test_unsupported_selectors_are_rejected():
+    for selector in ["a:hover", "h2 + p", "a >", ""]:
+        with pytest.raises(ValueError):
+            css_to_xpath(selector)
+
+
+def test_anchor_and_text_helpers():
+    root = parse_html(PAGE)
+    soup = BeautifulSoup(PAGE, "html.parser")
+    assert [a.get("href") for a in anchors(root)] == [a["href"] for a in soup.find_all("a", href=True)]
+    assert [text_of(a) for a in anchors(root)] == [a.get_text(strip=True) for a in soup.find_all("a", href=True)]
+    assert text_of(root, " ") == soup.get_text(" ", strip=True)
+
+    article = select_one(root, "article")
+    assert first_anchor(article).get("href").endswith("banjir-bandar-lampung")
+    assert first_anchor(select_one(root, "footer")).get("href") == "/tentang-kami"
+    assert select_one(root, "table") is None
+
+
+def test_drop_keeps_following_text():
+    root = parse_html("<div>keep <span>gone</span> tail</div>")
+    drop(select(root, "span"))
+    assert text_of(root, " ").split() == ["keep", "tail"]
+
+
+def test_parse_html_edge_cases():
+    assert anchors(parse_html(b"")) == []
+    assert anchors(parse_html("   ")) == []
+    xml_decl = '<?xml version="1.0" encoding="utf-8"?><html><body><a href="/a">A</a></body></html>'
+    assert [text_of(a) for a in anchors(parse_html(xml_decl))] == ["A"]
+    latin = "<html><head><meta charset='iso-8859-1'></head><body><p>Caf\xe9</p></body></html>"
+    assert text_of(select_one(parse_html(latin.encode("iso-8859-1")), "p")) == "Caf\xe9"
+
+
+def test_incremental_parse_matches_parse_html():
+    for markup in [PAGE, b"", b"   ", b"<p>fragment</p>"]:
+        feed = HtmlFeed()
+        for i in range(0, len(markup), 7):
+            feed.feed(markup[i:i + 7])
+        root = feed.close()
+        assert root.tag == "html"
+        assert text_of(root, " ") == text_of(parse_html(markup), " ")
+        assert [a.get("href") for a in anchors(root)] == [a.get("href") for a in anchors(parse_html(markup))]
+
+
+def test_dynamic_crawler_link_detection_skips_page_chrome():
+    links = DynamicCrawler()._find_article_links(parse_html(PAGE), "https://news.example")
+    urls = [link["url"] for link in links]
+    assert "https://news.example/read/2026/01/10/123/banjir-bandar-lampung" in urls
+    assert not any("sidebar" in url or "tentang" in url for url in urls)
+    titles = {link["title"] for link in links}
+    assert "BanjirRendamBandar Lampung" in titles
@@ -0,0 +1,227 @@
+"""
+Test: retry with backoff, per-host circuit breakers and size-capped streaming
+downloads of the crawler HTTP client
+"""
+
+import io
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.crawler.budget import CrawlBudget
+from src.crawler.rate_limiter import HostRateLimiter
+from src.crawler.html_parser import HtmlFeed, text_of
+from src.crawler.http_client import (
+    HttpClient, CircuitOpenError, backoff_delay, retry_after_seconds, OPEN, HALF_OPEN, CLOSED,
+    UnsupportedContentType, ResponseTooLarge, read_body,
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """Replays a script of responses/exceptions and records requested URLs"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def get(self, url, timeout=None, **kwargs):
+        self.calls.append((url, timeout))
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _streamed(body, content_type="text/html; charset=utf-8", status_code=200, length=True):
+    """Real requests.Response over an in-memory body, as returned with stream=True"""
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = "https://news.example/read/1"
+    response.headers = CaseInsensitiveDict({"Content-Type": content_type} if content_type else {})
+    if length:
+        response.headers["Content-Length"] = str(len(body))
+    response.raw = io.BytesIO(body)
+    return response
+
+
+def _client(session, **kwargs):
+    client = HttpClient(session=session, **{"max_retries": 3, "base_delay": 1, "max_delay": 60,
+                                            "failure_threshold": 3, "cooldown_seconds": 300,
+                                            "rate_limiter": HostRateLimiter(requests_per_second=0,
+                                                                            respect_robots=False),
+                                            **kwargs})
+    client.slept = []
+    client.sleep = client.slept.append
+    return client
+
+
+def test_backoff_is_jittered_and_capped():
+    delays = [backoff_delay(5, base_delay=1, max_delay=10) for _ in range(200)]
+    assert all(0 <= d <= 10 for d in delays)
+    assert len(set(delays)) > 1
+    assert all(d <= 2 for d in (backoff_delay(1, base_delay=1, max_delay=10) for _ in range(50)))
+
+
+def test_retry_after_header():
+    assert retry_after_seconds(FakeResponse(429, {"Retry-After": "7"})) == 7
+    assert retry_after_seconds(FakeResponse(429, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0
+    assert retry_after_seconds(FakeResponse(429, {"Retry-After": "soon"})) is None
+    assert retry_after_seconds(FakeResponse(429)) is None
+
+
+def test_transient_errors_are_retried_until_success():
+    session = FakeSession(requests.exceptions.Timeout(), FakeResponse(503), FakeResponse(200))
+    client = _client(session)
+
+    assert client.get("https://news.example/a").status_code == 200
+    assert len(session.calls) == 3
+    assert len(client.slept) >= 2
+    assert client.breaker("https://news.example/b").state == CLOSED
+
+
+def test_429_waits_for_retry_after_and_404_is_not_retried():
+    session = FakeSession(FakeResponse(429, {"Retry-After": "4"}), FakeResponse(200))
+    client = _client(session)
+    client.get("https://news.example/a")
+    assert sum(client.slept) == 4
+
+    session = FakeSession(FakeResponse(404))
+    client = _client(session)
+    assert client.get("https://news.example/missing").status_code == 404
+    assert len(session.calls) == 1 and not client.slept
+
+
+def test_gives_up_after_max_retries():
+    session = FakeSession(requests.exceptions.Timeout())
+    client = _client(session, max_retries=2, failure_threshold=10)
+    with pytest.raises(requests.exceptions.Timeout):
+        client.get("https://down.example/a")
+    assert len(session.calls) == 3
+
+    session = FakeSession(FakeResponse(502))
+    client = _client(session, max_retries=1, failure_threshold=10)
+    assert client.get("https://down.example/a").status_code == 502
+
+
+def test_no_retry_when_the_budget_is_spent():
+    session = FakeSession(FakeResponse(503, {"Retry-After": "120"}), FakeResponse(200))
+    client = _client(session, max_delay=600)
+    budget = CrawlBudget(run_seconds=30)
+    assert client.get("https://news.example/a", timeout=20, budget=budget).status_code == 503
+    assert len(session.calls) == 1 and session.calls[0][1] <= 20
+
+    budget.cancel()
+    session = FakeSession(requests.exceptions.ConnectionError(), FakeResponse(200))
+    with pytest.raises(requests.exceptions.ConnectionError):
+        _client(session).get("https://news.example/a", budget=budget)
+
+
+def test_circuit_opens_for_a_failing_host_only():
+    session = FakeSession(requests.exceptions.ConnectTimeout())
+    client = _client(session, max_retries=0)
+    for _ in range(3):
+        with pytest.raises(requests.exceptions.Timeout):
+            client.get("https://down.example/article")
+
+    with pytest.raises(CircuitOpenError):
+        client.get("https://down.example/other")
+    assert len(session.calls) == 3  # skipped without a request
+    assert client.circuits()["down.example"]["state"] == OPEN
+    assert client.open_hosts() == ["down.example"]
+
+    session.outcomes = [FakeResponse(200)]
+    assert client.get("https://up.example/article").status_code == 200
+
+
+def test_half_open_trial_closes_or_reopens_the_circuit():
+    session = FakeSession(requests.exceptions.ConnectionError())
+    client = _client(session, max_retries=0, failure_threshold=1, cooldown_seconds=0)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get("https://flaky.example/a")
+    breaker = client.breaker("https://flaky.example/a")
+    assert breaker.state == HALF_OPEN
+
+    # Failed trial: open again
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get("https://flaky.example/a")
+    assert breaker.times_opened == 2
+
+    # Successful trial: closed
+    session.outcomes = [FakeResponse(200)]
+    client.get("https://flaky.example/a")
+    assert breaker.state == CLOSED and breaker.failures == 0
+
+
+def test_half_open_trial_is_released_on_any_error():
+    session = FakeSession(requests.exceptions.ConnectionError())
+    client = _client(session, max_retries=0, failure_threshold=1, cooldown_seconds=0)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get("https://flaky.example/a")
+    breaker = client.breaker("https://flaky.example/a")
+
+    # Trials failing with a non-retried request error or an unexpected exception
+    for error, expected in ((requests.exceptions.TooManyRedirects(), requests.exceptions.TooManyRedirects),
+                            (ValueError("bad header"), ValueError)):
+        session.outcomes = [error]
+        with pytest.raises(expected):
+            client.get("https://flaky.example/a")
+        assert not breaker.trial_in_flight
+
+    assert breaker.times_opened == 2  # the request error re-opened the circuit
+    session.outcomes = [FakeResponse(200)]
+    assert client.get("https://flaky.example/a").status_code == 200
+    assert breaker.state == CLOSED
+
+
+def test_read_body_streams_into_the_parser():
+    page = b"<html><body><article><p>" + b"Isi berita. " * 20000 + b"</p></article></body></html>"
+    feed = HtmlFeed()
+    chunks = []
+    response = _streamed(page)
+
+    def on_chunk(chunk):
+        chunks.append(len(chunk))
+        feed.feed(chunk)
+
+    assert read_body(response, max_bytes=len(page), on_chunk=on_chunk) == page
+    assert len(chunks) > 1
+    assert response.content == page and response.text.startswith("<html>")
+    assert text_of(feed.close()).startswith("Isi berita.")
+
+
+def test_read_body_rejects_wrong_types_and_oversized_bodies():
+    with pytest.raises(UnsupportedContentType):
+        read_body(_streamed(b"%PDF-1.7", "application/pdf"), content_types={"text/html"})
+    assert read_body(_streamed(b"<p>x</p>", None), content_types={"text/html"}) == b"<p>x</p>"
+    assert read_body(_streamed(b"<rss/>", "application/rss+xml"), content_types=None) == b"<rss/>"
+
+    with pytest.raises(ResponseTooLarge):  # announced by Content-Length
+        read_body(_streamed(b"x" * 2048), max_bytes=1024)
+    with pytest.raises(ResponseTooLarge):  # chunked, no Content-Length
+        read_body(_streamed(b"x" * 200000, length=False), max_bytes=100000)
+    assert len(read_body(_streamed(b"x" * 2048), max_bytes=0)) == 2048
+
+
+def test_get_page_reads_only_successful_html_responses():
+    session = FakeSession(_streamed(b"<html><body>ok</body></html>"))
+    client = _client(session)
+    assert client.get_page("https://news.example/a").text == "<html><body>ok</body></html>"
+
+    client = _client(FakeSession(_streamed(b"Not found", status_code=404)))
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get_page("https://news.example/missing").raise_for_status()
+
+    client = _client(FakeSession(_streamed(b"\x00" * 64, "video/mp4")))
+    with pytest.raises(UnsupportedContentType):
+        client.get_page("https://news.example/video")
+    assert client.breaker("https://news.example/video").state == CLOSED
@@ -0,0 +1,72 @@
+"""
+Test: keyword backfill is chunked, resumable and only rewrites changed rows
+"""
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.database.models import Base, Article
+from src.services.keyword_backfill import run_keyword_backfill, get_checkpoint
+from src.utils.keyword_extractor import extract_keywords_high_accuracy, format_keywords_for_db
+
+
+CONTENT = (
+    "Banjir melanda Bandar Lampung sejak pagi. Warga mengungsi ke balai desa. "
+    "Petugas BPBD membantu evakuasi korban banjir di sejumlah titik. "
+) * 3
+
+
+def _session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def _seed(session, count):
+    for i in range(count):
+        session.add(Article(
+            title=f"Banjir Rendam Kecamatan Nomor {i}",
+            content=CONTENT,
+            source="Test",
+            url=f"https://example.com/read/{i}",
+            keywords_flagged="lama",
+        ))
+    session.commit()
+
+
+def test_backfill_resumes_from_checkpoint():
+    session = _session()
+    _seed(session, 7)
+
+    first = run_keyword_backfill(session, job_name="t", chunk_size=3, workers=1, max_chunks=1)
+    assert first["processed_count"] == 3
+    assert not first["completed"]
+    assert get_checkpoint(session, "t").last_article_id == 3
+
+    second = run_keyword_backfill(session, job_name="t", chunk_size=3, workers=1)
+    assert second["processed_count"] == 7
+    assert second["updated_count"] == 7
+    assert second["completed"]
+
+    article = session.query(Article).filter_by(id=5).first()
+    expected = format_keywords_for_db(extract_keywords_high_accuracy(article.title, article.content, max_keywords=10))
+    assert article.keywords_flagged == expected
+
+
+def test_backfill_skips_unchanged_rows_and_restart():
+    session = _session()
+    _seed(session, 4)
+
+    run_keyword_backfill(session, job_name="t", chunk_size=10, workers=1)
+    again = run_keyword_backfill(session, job_name="t", chunk_size=10, workers=1, restart=True)
+    assert again["processed_count"] == 4
+    assert again["updated_count"] == 0
+
+
+def test_backfill_process_pool():
+    session = _session()
+    _seed(session, 6)
+
+    result = run_keyword_backfill(session, job_name="pool", chunk_size=4, workers=2)
+    assert result["processed_count"] == 6
+    assert session.query(Article).filter(Article.keywords_flagged == "lama").count() == 0
@@ -0,0 +1,115 @@
+"""
+Test: Count-Min + Space-Saving keyword sketches (accuracy, merge, serialization)
+"""
+
+import random
+import threading
+from datetime import date, datetime, timedelta
+
+from src.database.models import Article, KeywordSketchRecord
+from src.database.repository import (
+    get_session, get_top_keywords_from_sketches, rebuild_keyword_sketches, update_keyword_sketches,
+)
+from src.utils.sketches import CountMinSketch, KeywordSketch, top_k_from_sketches
+
+
+def _stream(seed, heavy, n=3000):
+    rnd = random.Random(seed)
+    items = []
+    for _ in range(n):
+        if rnd.random() < 0.4:
+            items.append(rnd.choice(heavy))
+        else:
+            items.append(f"kata{rnd.randint(0, 5000)}")
+    return items
+
+
+def test_count_min_never_underestimates():
+    cms = CountMinSketch(width=256, depth=4)
+    truth = {}
+    for item in _stream(1, ["banjir", "demo"]):
+        cms.add(item)
+        truth[item] = truth.get(item, 0) + 1
+    assert all(cms.estimate(item) >= count for item, count in truth.items())
+    assert cms.total == sum(truth.values())
+
+
+def test_heavy_hitters_survive_merge_and_serialization():
+    heavy = ["banjir", "demo", "korupsi", "pilkada", "kecelakaan"]
+    sketches = []
+    truth = {}
+    for day in range(10):
+        sketch = KeywordSketch(capacity=50)
+        for item in _stream(day, heavy):
+            sketch.add(item)
+            truth[item] = truth.get(item, 0) + 1
+        sketches.append(KeywordSketch.from_bytes(sketch.to_bytes()))
+
+    top = top_k_from_sketches(sketches, k=5)
+    assert {t["keyword"] for t in top} == set(heavy)
+    for t in top:
+        assert t["count"] >= truth[t["keyword"]]
+        assert t["count"] - t["error"] <= truth[t["keyword"]]
+
+    merged = KeywordSketch(capacity=50)
+    for sketch in sketches:
+        merged.merge(sketch)
+    assert {t["keyword"] for t in merged.top(5)} == set(heavy)
+    assert merged.total == sum(truth.values())
+
+
+def test_serialized_sketch_is_compact():
+    sketch = KeywordSketch()
+    sketch.add_all(_stream(3, ["banjir"], n=500))
+    assert len(sketch.to_bytes()) < 16 * 1024
+
+
+def _articles(n, day, source="News"):
+    return [{"source": source, "title": f"Banjir Di Bandar Lampung {i}", "keywords_flagged": "banjir, lampung",
+             "crawled_date": datetime.combine(day, datetime.min.time()) + timedelta(hours=1)} for i in range(n)]
+
+
+def test_concurrent_writers_do_not_lose_updates(temp_db):
+    day = date(2026, 1, 10)
+
+    def write():
+        session = get_session()
+        try:
+            for _ in range(5):
+                update_keyword_sketches(session, _articles(4, day))
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=write) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    session = get_session()
+    try:
+        rows = session.query(KeywordSketchRecord).filter_by(kind="keyword").all()
+        assert [r.article_count for r in rows] == [80]
+        assert KeywordSketch.from_bytes(rows[0].data).total == 160
+    finally:
+        session.close()
+
+
+def test_rebuild_covers_stored_articles(temp_db):
+    day = date(2026, 1, 10)
+    session = get_session()
+    try:
+        for article in _articles(3, day) + _articles(2, day + timedelta(days=1), source="Other"):
+            session.add(Article(url=f"https://news.example/{article['source']}/{article['title']}", content="",
+                                **article))
+        session.commit()
+        assert get_top_keywords_from_sketches(session, start_day=day, end_day=day)["items"] == []
+
+        result = rebuild_keyword_sketches(session, end_day=day + timedelta(days=1))
+        assert result["days"] == 2 and result["articles"] == 5
+        rebuild_keyword_sketches(session, end_day=day + timedelta(days=1))  # rerun replaces, does not add
+
+        top = get_top_keywords_from_sketches(session, start_day=day, end_day=day + timedelta(days=1))
+        assert {item["keyword"]: item["count"] for item in top["items"]}["banjir"] == 5
+    finally:
+        session.close()
@@ -0,0 +1,115 @@
+"""
+Test: scheduler lease used to elect a single background-scheduler worker,
+and auto crawl controls received by the other workers
+"""
+
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.crawler import hybrid_manager
+from src.crawler.hybrid_manager import HybridCrawlerManager
+from src.database.models import Base, CleanupSchedule
+from src.database.repository import (
+    acquire_lease, release_lease, get_lease, get_session, create_cleanup_schedule,
+)
+from src.utils.leader import LeaderElector
+
+
+def _session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def test_only_one_holder_until_the_lease_expires():
+    session = _session()
+    assert acquire_lease(session, "schedulers", "worker-a", ttl_seconds=30)
+    assert not acquire_lease(session, "schedulers", "worker-b", ttl_seconds=30)
+    assert acquire_lease(session, "schedulers", "worker-a", ttl_seconds=30)  # renewal
+    assert get_lease(session, "schedulers")["holder"] == "worker-a"
+
+    # worker-a dies: its lease runs out and worker-b takes over
+    assert acquire_lease(session, "schedulers", "worker-a", ttl_seconds=-1)
+    assert acquire_lease(session, "schedulers", "worker-b", ttl_seconds=30)
+    assert not acquire_lease(session, "schedulers", "worker-a", ttl_seconds=30)
+
+
+def test_release_hands_over_immediately():
+    session = _session()
+    assert acquire_lease(session, "schedulers", "worker-a", ttl_seconds=30)
+    assert not release_lease(session, "schedulers", "worker-b")
+    assert release_lease(session, "schedulers", "worker-a")
+    assert get_lease(session, "schedulers") is None
+    assert acquire_lease(session, "schedulers", "worker-b", ttl_seconds=30)
+
+
+def test_electors_fail_over(temp_db):
+    lease = f"test-{time.time_ns()}"
+    events = []
+    first = LeaderElector(lease, ttl_seconds=30, renew_interval=1)
+    second = LeaderElector(lease, ttl_seconds=30, renew_interval=1)
+    first.on_elected(lambda: events.append("first elected"))
+    second.on_elected(lambda: events.append("second elected"))
+
+    assert first.check() and not second.check()
+    first.stop()  # releases the lease
+    assert second.check()
+    assert events == ["first elected", "second elected"]
+    second.stop()
+
+
+def test_jobs_run_again_after_re_election(temp_db, monkeypatch):
+    manager = HybridCrawlerManager()
+    monkeypatch.setattr(hybrid_manager, "_manager", manager)
+    session = get_session()
+    try:
+        manager.become_leader()
+        manager.step_down()
+        manager.become_leader()  # leadership flap: scheduling must work again
+
+        schedule = create_cleanup_schedule(session, "test", days_threshold=3650, interval_minutes=60)
+        manager.sync_cleanup_jobs()  # due now: never ran
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            session.expire_all()
+            if session.get(CleanupSchedule, schedule.id).last_run is not None:
+                break
+            time.sleep(0.05)
+        assert session.get(CleanupSchedule, schedule.id).last_run is not None
+    finally:
+        session.close()
+        manager.shutdown()
+
+
+def test_renewal_callbacks_only_while_leading(temp_db):
+    elector = LeaderElector(f"test-{time.time_ns()}", ttl_seconds=30, renew_interval=1)
+    renewals = []
+    elector.on_renewed(lambda: renewals.append(elector.is_leader))
+
+    assert elector.check()  # elected, not a renewal
+    assert elector.check()
+    assert renewals == [True]
+    elector.stop()
+
+
+def test_auto_crawl_controls_on_a_follower_are_applied_by_the_leader(temp_db, monkeypatch):
+    leader, follower = HybridCrawlerManager(), HybridCrawlerManager()
+    monkeypatch.setattr(hybrid_manager, "_manager", leader)
+    try:
+        leader.become_leader()
+        assert not leader.is_auto_running
+
+        assert follower.start_auto_crawling()["status"] == "accepted"
+        assert follower.update_interval(7200)["status"] == "accepted"
+        assert not follower.is_auto_running and follower.scheduler is None
+
+        leader.apply_saved_state()  # next lease renewal
+        assert leader.is_auto_running and leader.crawl_interval == 7200
+
+        assert follower.stop_auto_crawling()["status"] == "accepted"
+        leader.apply_saved_state()
+        assert not leader.is_auto_running
+    finally:
+        leader.shutdown()
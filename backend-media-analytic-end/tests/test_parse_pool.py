@@ -0,0 +1,72 @@
+"""
+Test: process-pool parsing stage (parse_article, ArticleBatch, ParsePool)
+"""
+
+import os
+
+from src.crawler.parse_pool import (
+    ArticleBatch, ArticleTask, ParsePool, NOT_AUTHENTIC, TOO_SHORT, parse_article,
+)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "articles")
+
+with open(os.path.join(FIXTURES, "detik.html"), "rb") as f:
+    DETIK = f.read()
+
+TITLE = "Banjir rendam Bandar Lampung. Warga mengungsi."
+
+
+def _task(i=0, **kwargs):
+    fields = dict(url=f"https://news.example/read/{i}/banjir-bandar-lampung", title=TITLE, source="News",
+                  body=DETIK)
+    fields.update(kwargs)
+    return ArticleTask(**fields)
+
+
+def test_parse_article_extracts_content_and_keywords():
+    parsed = parse_article(_task())
+    assert parsed.rejected is None
+    assert parsed.page_text
+    assert parsed.content.startswith("Bandar Lampung - Hujan deras")
+    assert "Komentar pembaca" not in parsed.content
+    assert parsed.keywords_flagged
+
+
+def test_parse_article_rejections():
+    assert parse_article(_task(body=b"<html><body><p>Singkat.</p></body></html>")).rejected == TOO_SHORT
+    excluded = _task(url="https://news.example/kategori/banjir", exclude_keywords=("kategori",))
+    assert parse_article(excluded).rejected == NOT_AUTHENTIC
+    # Known content (RSS) is kept when the page has less text
+    summary = "Ringkasan berita banjir. " * 20
+    parsed = parse_article(_task(body=b"<html><body><p>Halaman.</p></body></html>", content=summary))
+    assert parsed.content == summary and parsed.rejected is None
+    # prefer_page: the page text wins once it is long enough
+    parsed = parse_article(_task(content=summary * 100, prefer_page=True))
+    assert parsed.content.startswith("Bandar Lampung - Hujan deras")
+
+
+def test_batch_keeps_order_and_stops_at_the_limit():
+    batch = ArticleBatch(ParsePool(0), limit=2)
+    batch.add(_task(0, body=b"<p>kosong</p>"))
+    assert not batch.full()
+    batch.add(_task(1))
+    assert not batch.full()
+    batch.add(_task(2))
+    assert batch.full()
+
+    assert [p.url.split("/")[4] for p in batch.accepted()] == ["1", "2"]
+    assert batch.rejected == {TOO_SHORT: 1}
+
+
+def test_worker_processes_match_inline_parsing():
+    tasks = [_task(i) for i in range(6)] + [_task(6, body=b"<p>kosong</p>")]
+    pool = ParsePool(2)
+    try:
+        batch = ArticleBatch(pool, limit=10)
+        for task in tasks:
+            batch.add(task)
+        results = batch.results()
+    finally:
+        pool.shutdown()
+
+    assert results == [parse_article(task) for task in tasks]
@@ -0,0 +1,162 @@
+"""
+Test: per-host token-bucket rate limiter and robots.txt Crawl-delay
+"""
+
+import pytest
+import requests
+
+from src.crawler.http_client import HttpClient, CircuitOpenError, OPEN
+from src.crawler.rate_limiter import HostRateLimiter, TokenBucket
+from src.crawler.robots import RobotsCache, RobotsInfo, parse_robots
+
+ROBOTS = """
+User-agent: Googlebot
+Crawl-delay: 1
+
+# everyone else
+User-agent: *
+Disallow: /search
+Crawl-delay: 5
+
+Sitemap: https://news.example/sitemap_index.xml
+"""
+
+
+class FakeRobots(RobotsCache):
+    def __init__(self, infos):
+        super().__init__(ttl_seconds=3600)
+        self.infos = infos
+        self.fetched = []
+
+    def _fetch(self, base):
+        self.fetched.append(base)
+        return self.infos.get(base, RobotsInfo())
+
+
+class FakeSession:
+    """Serves robots.txt (or raises) and an empty page for every other URL"""
+
+    def __init__(self, robots_txt=None, error=None):
+        self.robots_txt = robots_txt
+        self.error = error
+        self.calls = []
+
+    def get(self, url, timeout=None, **kwargs):
+        self.calls.append(url)
+        if self.error:
+            raise self.error
+        response = requests.Response()
+        response.status_code = 200 if self.robots_txt or not url.endswith("/robots.txt") else 404
+        response._content = (self.robots_txt or "").encode() if url.endswith("/robots.txt") else b""
+        return response
+
+
+def _client(limiter, cache, session):
+    client = HttpClient(session=session, max_retries=0, failure_threshold=1, cooldown_seconds=300,
+                        rate_limiter=limiter)
+    client.slept = []
+    client.sleep = client.slept.append
+    cache.http_client = client
+    return client
+
+
+def test_parse_robots_crawl_delay_and_sitemaps():
+    info = parse_robots(ROBOTS)
+    assert info.crawl_delay == 5
+    assert info.sitemaps == ["https://news.example/sitemap_index.xml"]
+    assert parse_robots(ROBOTS, agent="Googlebot").crawl_delay == 1
+    assert parse_robots("User-agent: *\nDisallow:\n").crawl_delay is None
+
+
+def test_robots_txt_is_fetched_once_per_host():
+    cache = FakeRobots({"https://news.example": parse_robots(ROBOTS)})
+    assert cache.get("https://news.example/a").crawl_delay == 5
+    assert cache.get("https://NEWS.example/b/c").sitemaps
+    cache.get("https://other.example/")
+    assert cache.fetched == ["https://news.example", "https://other.example"]
+
+
+def test_token_bucket_allows_burst_then_spaces_requests():
+    bucket = TokenBucket(rate=2, burst=3)
+    waits = [bucket.reserve() for _ in range(5)]
+    assert waits[:3] == [0, 0, 0]
+    assert 0.4 < waits[3] <= 0.5 and 0.9 < waits[4] <= 1.0
+    assert bucket.current_wait() > 1.0
+
+
+def test_hosts_are_limited_independently_with_source_overrides():
+    limiter = HostRateLimiter(requests_per_second=1, burst=1, respect_robots=False)
+    limiter.configure_source({"base_url": "https://slow.example",
+                              "config": {"rate_limit": {"requests_per_second": 0.2, "burst": 2}}})
+
+    assert [limiter.reserve("https://fast.example/a") > 0 for _ in range(2)] == [False, True]
+    slow = [limiter.reserve("https://slow.example/a") for _ in range(3)]
+    assert slow[:2] == [0, 0] and 4.5 < slow[2] <= 5
+
+    stats = limiter.stats()
+    assert stats["slow.example"]["requests_per_second"] == 0.2
+    assert (stats["slow.example"]["requests"], stats["slow.example"]["throttled"]) == (3, 1)
+    assert stats["fast.example"]["current_wait_seconds"] > 0
+
+
+def test_crawl_delay_slows_a_host_down():
+    robots = FakeRobots({"https://polite.example": RobotsInfo(crawl_delay=3)})
+    limiter = HostRateLimiter(requests_per_second=10, burst=5, respect_robots=True, robots_cache=robots)
+    waits = [limiter.reserve("https://polite.example/x") for _ in range(2)]
+    assert waits[0] == 0 and 2.9 < waits[1] <= 3
+    assert limiter.stats()["polite.example"]["crawl_delay"] == 3
+
+    unlimited = HostRateLimiter(requests_per_second=0, respect_robots=False)
+    assert all(unlimited.reserve("https://any.example/") == 0 for _ in range(20))
+
+
+def test_limit_follows_a_refetched_robots_txt():
+    robots = FakeRobots({"https://polite.example": RobotsInfo(crawl_delay=3)})
+    limiter = HostRateLimiter(requests_per_second=10, burst=5, respect_robots=True, robots_cache=robots)
+    limiter.reserve("https://polite.example/x")
+
+    # robots.txt drops its Crawl-delay; the entry expires (ROBOTS_CACHE_TTL) and is refetched
+    robots.infos["https://polite.example"] = RobotsInfo()
+    robots.clear()
+    assert all(limiter.reserve("https://polite.example/y") < 0.5 for _ in range(4))
+    stats = limiter.stats()["polite.example"]
+    assert (stats["crawl_delay"], stats["requests_per_second"], stats["burst"]) == (None, 10, 5)
+    assert stats["requests"] == 5
+
+    # ... and adds one back
+    robots.infos["https://polite.example"] = RobotsInfo(crawl_delay=2)
+    robots.clear()
+    assert limiter.reserve("https://polite.example/z") > 0
+    assert limiter.stats()["polite.example"]["crawl_delay"] == 2
+    assert robots.fetched == ["https://polite.example"] * 3
+
+
+def test_robots_txt_fetch_goes_through_the_host_limit():
+    cache = RobotsCache(ttl_seconds=3600)
+    limiter = HostRateLimiter(requests_per_second=1, burst=1, respect_robots=True, robots_cache=cache)
+    session = FakeSession("User-agent: *\nCrawl-delay: 4\n")
+    client = _client(limiter, cache, session)
+
+    client.get("https://polite.example/read/1")
+    assert session.calls == ["https://polite.example/robots.txt", "https://polite.example/read/1"]
+    # The robots.txt request used the host's slot: the article waited one Crawl-delay
+    assert 3.9 < sum(client.slept) <= 4
+    stats = limiter.stats()["polite.example"]
+    assert (stats["crawl_delay"], stats["requests"]) == (4, 2)
+
+
+def test_robots_txt_fetch_counts_against_the_circuit_breaker():
+    cache = RobotsCache(ttl_seconds=3600)
+    limiter = HostRateLimiter(requests_per_second=0, respect_robots=True, robots_cache=cache)
+    session = FakeSession(error=requests.exceptions.ConnectionError("refused"))
+    client = _client(limiter, cache, session)
+
+    assert cache.get("https://down.example/") == RobotsInfo()
+    assert client.circuits()["down.example"]["state"] == OPEN
+
+    # With the circuit open neither robots.txt nor pages are requested
+    cache.clear()
+    assert cache.get("https://down.example/") == RobotsInfo()
+    with pytest.raises(CircuitOpenError):
+        client.get("https://down.example/read/1")
+    assert session.calls == ["https://down.example/robots.txt"]
@@ -0,0 +1,60 @@
+"""
+Test: search result cache (normalized keys, LRU + TTL, generation invalidation)
+"""
+
+import time
+
+from src.utils.cache import SearchResultCache, normalize_search_params
+
+
+def _cache(**kwargs):
+    kwargs.setdefault("ttl_seconds", 60)
+    kwargs.setdefault("max_entries", 2)
+    return SearchResultCache(cache_type="memory", **kwargs)
+
+
+def test_equivalent_queries_share_an_entry():
+    cache = _cache()
+    cache.set(normalize_search_params("  Banjir ", None), [{"id": 1}])
+    assert cache.get(normalize_search_params("banjir", "")) == [{"id": 1}]
+    assert cache.get(normalize_search_params("banjir", "Kompas")) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["backend"]) == (1, 1, "memory")
+
+
+def test_lru_eviction_and_ttl():
+    cache = _cache()
+    a, b, c = (normalize_search_params(q, None) for q in ("a", "b", "c"))
+    cache.set(a, [1])
+    cache.set(b, [2])
+    cache.get(a)  # a becomes most recently used
+    cache.set(c, [3])
+    assert cache.get(b) is None
+    assert cache.get(a) == [1]
+
+    short = _cache(ttl_seconds=0.01)
+    short.set(a, [1])
+    time.sleep(0.02)
+    assert short.get(a) is None
+
+
+def test_generation_bump_invalidates():
+    cache = _cache()
+    params = normalize_search_params("demo", None)
+    cache.set(params, [{"id": 1}])
+    cache.bump_generation()
+    assert cache.get(params) is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_generation_is_shared_between_workers(temp_db):
+    # Two workers' memory caches: a crawl on one invalidates the other
+    leader = _cache(shared_generation=True)
+    follower = _cache(shared_generation=True)
+    params = normalize_search_params("demo", None)
+    follower.set(params, [{"id": 1}])
+    assert follower.get(params) == [{"id": 1}]
+
+    leader.bump_generation()
+    assert follower.get(params) is None
+    assert follower.generation == leader.generation == 1
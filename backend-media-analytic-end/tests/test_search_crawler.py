@@ -0,0 +1,94 @@
+"""
+Test: keyword live search goes through the shared HTTP client, honours the
+limit and matches index-page links of HTML sources
+"""
+
+import threading
+
+from src.crawler.search_crawler import KeywordSearchCrawler
+
+
+def _feed(source, count):
+    items = "".join(
+        f"<item><title>Banjir Lampung {source} {i}</title><link>https://{source}.example/read/{i}</link></item>"
+        for i in range(count)
+    )
+    return f"<rss version='2.0'><channel><title>{source}</title>{items}</channel></rss>".encode()
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeHttp:
+    """Serves a feed per host; hosts in slow block until released"""
+
+    def __init__(self, slow=()):
+        self.slow = set(slow)
+        self.release = threading.Event()
+        self.calls = []
+
+    def get_page(self, url, timeout=None, budget=None, content_types=None, **kwargs):
+        host = url.split("/")[2].split(".")[0]
+        self.calls.append((url, budget is not None))
+        if host in self.slow:
+            self.release.wait(5)
+        if host == "html":
+            return _Response(INDEX_PAGE)
+        return _Response(_feed(host, 5))
+
+
+INDEX_PAGE = b"""<html><body>
+<nav><a href="/kanal/banjir">Banjir</a></nav>
+<ul>
+  <li><a href="/read/1"><span>Banjir</span> rendam <b>Lampung</b> Selatan</a></li>
+  <li><a href="https://html.example/read/2">Harga kopi Lampung naik</a></li>
+  <li><a href=" /read/3 ">Warga Lampung waspada banjir susulan</a></li>
+  <li><a href="/read/1">Banjir rendam Lampung Selatan (ulang)</a></li>
+  <li><a>Banjir Lampung tanpa tautan</a></li>
+</ul>
+</body></html>"""
+
+
+def _sources(*names):
+    return [{"name": name, "base_url": f"https://{name}.example", "config": {"rss_url": f"https://{name}.example/rss"}}
+            for name in names]
+
+
+def test_fetches_use_the_shared_client_with_the_deadline():
+    http = FakeHttp()
+    crawler = KeywordSearchCrawler(max_workers=2, http_client=http)
+    results = list(crawler.search("banjir lampung", _sources("a", "b"), deadline_seconds=5))
+
+    assert sorted(r["source"] for r in results) == ["a", "b"]
+    assert all(len(r["articles"]) == 5 for r in results)
+    assert sorted(http.calls) == [("https://a.example/rss", True), ("https://b.example/rss", True)]
+
+
+def test_stops_once_the_limit_is_reached():
+    http = FakeHttp(slow={"slow"})
+    crawler = KeywordSearchCrawler(max_workers=3, http_client=http)
+    try:
+        results = list(crawler.search("banjir", _sources("a", "slow"), deadline_seconds=5, limit=3))
+    finally:
+        http.release.set()
+
+    # The slow source is not waited for (nor reported as timed out)
+    assert [(r["source"], len(r["articles"])) for r in results] == [("a", 3)]
+
+
+def test_html_sources_match_anchor_text():
+    crawler = KeywordSearchCrawler(max_workers=1, http_client=FakeHttp())
+    source = {"name": "html", "base_url": "https://html.example", "config": {}}
+    results = list(crawler.search("banjir lampung", [source], deadline_seconds=5))
+
+    assert [(a["title"], a["url"]) for a in results[0]["articles"]] == [
+        ("Banjir rendam Lampung Selatan", "https://html.example/read/1"),
+        ("Warga Lampung waspada banjir susulan", "https://html.example/read/3"),
+    ]
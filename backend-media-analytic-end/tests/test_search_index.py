@@ -0,0 +1,46 @@
+"""
+Test: full-text search index (tier 1 of search-crawl) and live keyword matching
+"""
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.database.models import Base, Article
+from src.database.repository import ensure_search_index, search_articles_indexed
+from src.crawler.search_crawler import keyword_tokens, matches_keyword
+
+
+def _session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    # Row added before the index exists must be picked up by the initial rebuild
+    session.add(Article(title="Banjir Rendam Bandar Lampung", content="Air setinggi lutut.",
+                        source="Kompas", url="https://example.com/1"))
+    session.commit()
+    assert ensure_search_index(engine)
+    return session
+
+
+def test_index_stays_in_sync_with_articles():
+    session = _session()
+    session.add(Article(title="Demo Mahasiswa di Tugu Adipura", content="Ribuan mahasiswa berdemo soal banjir.",
+                        source="Detik", url="https://example.com/2"))
+    session.commit()
+
+    assert [a["url"] for a in search_articles_indexed(session, "banjir lampung")] == ["https://example.com/1"]
+    assert len(search_articles_indexed(session, "BANJIR")) == 2
+    assert [a["source"] for a in search_articles_indexed(session, "banjir", source="Detik")] == ["Detik"]
+    assert search_articles_indexed(session, "mahasis")[0]["url"] == "https://example.com/2"
+
+    session.query(Article).filter_by(url="https://example.com/1").delete()
+    session.commit()
+    assert [a["url"] for a in search_articles_indexed(session, "banjir")] == ["https://example.com/2"]
+    assert search_articles_indexed(session, "!!") == []
+
+
+def test_live_matching_requires_every_word():
+    tokens = keyword_tokens("  Banjir Lampung ")
+    assert tokens == ["banjir", "lampung"]
+    assert matches_keyword("Banjir rendam Bandar Lampung", tokens)
+    assert not matches_keyword("Banjir rendam Jakarta", tokens)
@@ -0,0 +1,106 @@
+"""
+Test: streaming sitemap reader (indexes, gzip, news sitemaps, lastmod filtering)
+"""
+
+import gzip
+from datetime import datetime
+
+import pytest
+
+from src.crawler.sitemap import SitemapTooLarge, discover_urls, iter_sitemap, parse_lastmod
+
+NEWS_SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">
+  <url><loc>https://news.example/read/1/banjir-rendam-bandar-lampung</loc>
+    <lastmod>2026-01-10T08:00:00+07:00</lastmod></url>
+  <url><loc>https://news.example/read/2/harga-kopi-naik</loc>
+    <news:news><news:publication><news:name>News</news:name><news:language>id</news:language></news:publication>
+      <news:publication_date>2026-01-11T09:30:00Z</news:publication_date>
+      <news:title>Harga Kopi Naik di Lampung</news:title></news:news></url>
+  <url><loc>https://news.example/read/3/tanpa-tanggal</loc></url>
+</urlset>"""
+
+
+def _chunks(body, size=64):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+def _urlset(count, day):
+    urls = "".join(f"<url><loc>https://news.example/read/{day}/{i}</loc><lastmod>2026-01-{day:02d}T{i % 24:02d}:00:00Z"
+                   f"</lastmod></url>" for i in range(count))
+    return f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'.encode()
+
+
+def test_parse_lastmod_to_naive_utc():
+    assert parse_lastmod("2026-01-10T08:00:00+07:00") == datetime(2026, 1, 10, 1, 0)
+    assert parse_lastmod("2026-01-10T08:00:00Z") == datetime(2026, 1, 10, 8, 0)
+    assert parse_lastmod(" 2026-01-10 ") == datetime(2026, 1, 10)
+    assert parse_lastmod("kemarin") is None
+    assert parse_lastmod(None) is None
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_reads_plain_and_gzipped_news_sitemaps(compress):
+    body = gzip.compress(NEWS_SITEMAP) if compress else NEWS_SITEMAP
+    entries = list(iter_sitemap(_chunks(body)))
+
+    assert [e.url.rsplit("/", 1)[-1] for e in entries] == ["banjir-rendam-bandar-lampung", "harga-kopi-naik",
+                                                           "tanpa-tanggal"]
+    assert entries[0].lastmod == datetime(2026, 1, 10, 1, 0)
+    assert entries[1].lastmod == datetime(2026, 1, 11, 9, 30)  # publication_date
+    assert entries[1].title == "Harga Kopi Naik di Lampung"
+    assert entries[2].lastmod is None
+    assert not any(e.is_index for e in entries)
+
+
+def test_size_cap_applies_to_uncompressed_xml():
+    body = _urlset(2000, 5)
+    with pytest.raises(SitemapTooLarge):
+        list(iter_sitemap(_chunks(gzip.compress(body), 4096), max_bytes=len(body) // 2))
+    assert len(list(iter_sitemap(_chunks(gzip.compress(body), 4096), max_bytes=len(body)))) == 2000
+
+
+def test_only_new_urls_and_changed_child_sitemaps_are_read():
+    index = b"""<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+      <sitemap><loc>https://news.example/sitemap-old.xml</loc><lastmod>2026-01-02</lastmod></sitemap>
+      <sitemap><loc>https://news.example/sitemap-new.xml.gz</loc><lastmod>2026-01-12</lastmod></sitemap>
+    </sitemapindex>"""
+    bodies = {
+        "https://news.example/sitemap.xml": index,
+        "https://news.example/sitemap-old.xml": _urlset(50, 2),
+        "https://news.example/sitemap-new.xml.gz": gzip.compress(_urlset(30, 12) + b""),
+    }
+    fetched = []
+
+    def fetch(url):
+        fetched.append(url)
+        return _chunks(bodies[url], 512)
+
+    entries = discover_urls(fetch, "https://news.example/sitemap.xml", since=datetime(2026, 1, 12, 12, 0), limit=5)
+
+    assert fetched == ["https://news.example/sitemap.xml", "https://news.example/sitemap-new.xml.gz"]
+    assert len(entries) == 5
+    assert all(e.lastmod > datetime(2026, 1, 12, 12, 0) for e in entries)
+    assert [e.lastmod for e in entries] == sorted((e.lastmod for e in entries), reverse=True)
+    assert entries[0].url == "https://news.example/read/12/23"
+
+    # Nothing new since the last crawl
+    assert discover_urls(fetch, "https://news.example/sitemap-old.xml", since=datetime(2026, 1, 3)) == []
+
+
+def test_failing_child_is_skipped_but_a_failing_root_raises():
+    index = b"""<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+      <sitemap><loc>https://news.example/broken.xml</loc></sitemap>
+      <sitemap><loc>https://news.example/ok.xml</loc></sitemap></sitemapindex>"""
+    bodies = {"https://news.example/sitemap.xml": index, "https://news.example/broken.xml": b"<urlset><url><loc>",
+              "https://news.example/ok.xml": NEWS_SITEMAP}
+    entries = discover_urls(lambda url: _chunks(bodies[url]), "https://news.example/sitemap.xml")
+    assert len(entries) == 3
+    assert entries[-1].lastmod is None  # undated entries rank last
+
+    def unreachable(url):
+        raise ConnectionError(url)
+
+    with pytest.raises(ConnectionError):
+        discover_urls(unreachable, "https://news.example/sitemap.xml")
@@ -0,0 +1,82 @@
+"""
+Test: keyword trend engine buckets, eviction and burst scoring
+"""
+
+from datetime import datetime, timedelta
+
+from src.database.models import Article
+from src.database.repository import get_session
+from src.services.trend_engine import KeywordTrendEngine
+from src.utils.keyword_extractor import parse_keywords_from_db
+
+
+NOW = datetime(2026, 3, 10, 12, 30)
+
+
+def _article(hours_ago, keywords, source="Tribun Lampung"):
+    return {
+        "source": source,
+        "keywords_flagged": keywords,
+        "crawled_date": NOW - timedelta(hours=hours_ago),
+    }
+
+
+def test_parse_keywords_normalizes_and_dedupes():
+    assert parse_keywords_from_db("Banjir, banjir , Demo,,") == ["banjir", "demo"]
+    assert parse_keywords_from_db(None) == []
+
+
+def test_burst_keyword_ranks_above_steady_keyword():
+    engine = KeywordTrendEngine(window_hours=48)
+    baseline = []
+    for h in range(3, 48):
+        baseline.append(_article(h, "pemilu"))
+        if h % 12 == 0:
+            baseline.append(_article(h, "banjir"))
+    engine.ingest(baseline, now=NOW)
+
+    spike = [_article(h % 3, "banjir, pemilu") for h in range(9)]
+    engine.ingest(spike, now=NOW)
+
+    trending = engine.trending(recent_hours=3, min_count=2, now=NOW)
+    assert trending[0]["keyword"] == "banjir"
+    assert trending[0]["recent_count"] == 9
+    pemilu = next(t for t in trending if t["keyword"] == "pemilu")
+    assert pemilu["burst_score"] < trending[0]["burst_score"]
+
+
+def test_source_filter_and_eviction():
+    engine = KeywordTrendEngine(window_hours=24)
+    engine.ingest([_article(0, "demo", source="Kompas"), _article(1, "demo", source="Kompas"),
+                   _article(0, "demo", source="Detik")], now=NOW)
+    assert engine.trending(source="Kompas", now=NOW)[0]["recent_count"] == 2
+    assert engine.trending(source="Detik", min_count=2, now=NOW) == []
+
+    # Articles older than the window are ignored, and old buckets are evicted
+    assert engine.ingest([_article(30, "demo")], now=NOW) == 0
+    later = NOW + timedelta(hours=30)
+    engine.ingest([], now=later)
+    assert engine.stats()["buckets"] == 0
+
+
+def test_catch_up_counts_articles_saved_by_other_workers(temp_db):
+    session = get_session()
+    try:
+        def save(i, keywords):
+            session.add(Article(title=f"Berita {i}", url=f"https://news.example/{i}", content="", source="Kompas",
+                                keywords_flagged=keywords, crawled_date=NOW - timedelta(minutes=i)))
+            session.commit()
+
+        save(1, "banjir")
+        engine = KeywordTrendEngine(window_hours=24)
+        assert engine.catch_up(session, now=NOW) == 1  # first call: warm up
+
+        # Saved by the leader's crawl, not through this engine
+        save(2, "banjir")
+        save(3, "banjir, demo")
+        assert engine.catch_up(session, now=NOW) == 2
+        assert engine.catch_up(session, now=NOW) == 0
+        counts = {t["keyword"]: t["recent_count"] for t in engine.trending(min_count=1, now=NOW)}
+        assert counts == {"banjir": 3, "demo": 1}
+    finally:
+        session.close()